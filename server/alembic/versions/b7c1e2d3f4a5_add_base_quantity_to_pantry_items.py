@@ -0,0 +1,147 @@
+"""add_base_quantity_to_pantry_items
+
+Revision ID: b7c1e2d3f4a5
+Revises: 85f2a8c1d6e7
+Create Date: 2025-01-28 10:15:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c1e2d3f4a5'
+down_revision = '85f2a8c1d6e7'
+branch_labels = None
+depends_on = None
+
+# Conversion tables frozen as of this revision, so the backfill does not
+# change when the application's unit conversion engine does.
+# Standard unit -> (dimension, size in the dimension's base unit, aliases)
+UNITS = {
+    'milliliter': ('volume', 1.0, ('milliliter', 'milliliters', 'ml')),
+    'liter': ('volume', 1000.0, ('liter', 'liters', 'l', 'litre', 'litres')),
+    'teaspoon': ('volume', 4.92892, ('teaspoon', 'teaspoons', 'tsp')),
+    'tablespoon': ('volume', 14.7868, ('tablespoon', 'tablespoons', 'tbsp', 'tbs')),
+    'fluid_ounce': ('volume', 29.5735, ('fluid ounce', 'fluid ounces', 'fl oz', 'floz')),
+    'cup': ('volume', 236.588, ('cup', 'cups', 'c')),
+    'pint': ('volume', 473.176, ('pint', 'pints', 'pt')),
+    'quart': ('volume', 946.353, ('quart', 'quarts', 'qt')),
+    'gallon': ('volume', 3785.41, ('gallon', 'gallons', 'gal')),
+    'gram': ('mass', 1.0, ('gram', 'grams', 'g')),
+    'kilogram': ('mass', 1000.0, ('kilogram', 'kilograms', 'kg')),
+    'ounce': ('mass', 28.3495, ('ounce', 'ounces', 'oz')),
+    'pound': ('mass', 453.592, ('pound', 'pounds', 'lb', 'lbs')),
+    'piece': ('count', 1.0, ('piece', 'pieces', 'pc', 'pcs', 'each')),
+    'dozen': ('count', 12.0, ('dozen', 'doz')),
+    'pack': ('package', 1.0, ('pack', 'packs', 'package', 'packages')),
+    'box': ('package', 1.0, ('box', 'boxes')),
+    'can': ('package', 1.0, ('can', 'cans')),
+    'jar': ('package', 1.0, ('jar', 'jars')),
+    'bottle': ('package', 1.0, ('bottle', 'bottles')),
+}
+BASE_UNITS = {'mass': 'gram', 'volume': 'milliliter', 'count': 'piece'}
+# Food -> (grams per milliliter, dimension its base quantity is stored in)
+FOOD_DENSITIES = {
+    'water': (1.0, 'volume'), 'milk': (1.03, 'volume'), 'buttermilk': (1.03, 'volume'),
+    'cream': (1.0, 'volume'), 'heavy cream': (0.99, 'volume'), 'juice': (1.04, 'volume'),
+    'orange juice': (1.04, 'volume'), 'oil': (0.92, 'volume'), 'olive oil': (0.91, 'volume'),
+    'vegetable oil': (0.92, 'volume'), 'vinegar': (1.01, 'volume'), 'soy sauce': (1.2, 'volume'),
+    'broth': (1.0, 'volume'), 'stock': (1.0, 'volume'), 'honey': (1.42, 'volume'),
+    'maple syrup': (1.32, 'volume'),
+    'flour': (0.53, 'mass'), 'sugar': (0.85, 'mass'), 'brown sugar': (0.93, 'mass'),
+    'powdered sugar': (0.56, 'mass'), 'salt': (1.2, 'mass'), 'butter': (0.91, 'mass'),
+    'rice': (0.85, 'mass'), 'oats': (0.41, 'mass'), 'cocoa powder': (0.5, 'mass'),
+    'peanut butter': (1.09, 'mass'), 'yogurt': (1.03, 'mass'), 'sour cream': (1.0, 'mass'),
+    'cheese': (0.45, 'mass'), 'shredded cheese': (0.45, 'mass'), 'cornstarch': (0.54, 'mass'),
+    'quinoa': (0.72, 'mass'), 'lentils': (0.8, 'mass'),
+}
+UNIT_LOOKUP = {alias: unit for unit, (_, _, aliases) in UNITS.items() for alias in aliases}
+
+BATCH_SIZE = 1000
+
+
+def density_for(name):
+    """Density hint of the whole name or its shortest matching tail."""
+    words = re.sub(r"[^\w\s]", " ", (name or "").lower()).split()
+    for start in range(len(words)):
+        candidate = " ".join(words[start:])
+        hint = FOOD_DENSITIES.get(candidate)
+        if hint is None and candidate.endswith("s"):
+            hint = FOOD_DENSITIES.get(candidate[:-1])
+        if hint is not None:
+            return hint
+    return None
+
+
+def to_base_quantity(quantity, unit, name):
+    """Base quantity and unit of a row, or (None, None) for unknown units."""
+    quantity = quantity if quantity is not None else 1.0
+    standard = UNIT_LOOKUP.get(" ".join((unit or "piece").lower().replace("_", " ").split()))
+    if standard is None:
+        return None, None
+
+    dimension, size, _ = UNITS[standard]
+    if dimension == 'package':
+        return float(quantity), standard
+
+    hint = density_for(name) if dimension in ('mass', 'volume') else None
+    if hint is not None and hint[1] != dimension:
+        density, stored_dimension = hint
+        base_amount = quantity * size
+        converted = base_amount * density if dimension == 'volume' else base_amount / density
+        return converted, BASE_UNITS[stored_dimension]
+
+    return quantity * size, BASE_UNITS[dimension]
+
+
+def upgrade():
+    """Add canonical base quantity columns to pantry_items and backfill them."""
+    # Add base quantity columns
+    op.add_column('pantry_items', sa.Column('base_quantity', sa.Float(), nullable=True))
+    op.add_column('pantry_items', sa.Column('base_unit', sa.String(length=20), nullable=True))
+
+    # Backfill existing rows in batches of executemany updates
+    bind = op.get_bind()
+    pantry_items = sa.table(
+        'pantry_items',
+        sa.column('id'),
+        sa.column('name', sa.String),
+        sa.column('quantity', sa.Float),
+        sa.column('unit', sa.String),
+        sa.column('base_quantity', sa.Float),
+        sa.column('base_unit', sa.String),
+    )
+    update = (
+        pantry_items.update()
+        .where(pantry_items.c.id == sa.bindparam('item_id'))
+        .values(base_quantity=sa.bindparam('new_base_quantity'), base_unit=sa.bindparam('new_base_unit'))
+    )
+    rows = bind.execute(sa.select(pantry_items.c.id, pantry_items.c.name, pantry_items.c.quantity, pantry_items.c.unit))
+    while batch := rows.fetchmany(BATCH_SIZE):
+        params = []
+        for item_id, name, quantity, unit in batch:
+            base_quantity, base_unit = to_base_quantity(quantity, unit, name)
+            if base_unit is not None:
+                params.append({'item_id': item_id, 'new_base_quantity': base_quantity, 'new_base_unit': base_unit})
+        if params:
+            bind.execute(update, params)
+
+    # Index for per-item totals within a household, grouped case-insensitively
+    op.create_index(
+        'ix_pantry_items_household_lower_name_base_unit',
+        'pantry_items',
+        ['household_id', sa.text('lower(name)'), 'base_unit'],
+    )
+
+
+def downgrade():
+    """Remove base quantity columns from pantry_items."""
+    # Drop the index first
+    op.drop_index('ix_pantry_items_household_lower_name_base_unit', table_name='pantry_items')
+
+    # Drop the columns
+    op.drop_column('pantry_items', 'base_unit')
+    op.drop_column('pantry_items', 'base_quantity')
@@ -0,0 +1,45 @@
+"""add_voice_undo_records
+
+Revision ID: d2e8f1a9c3b6
+Revises: b7c1e2d3f4a5
+Create Date: 2025-02-03 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8f1a9c3b6'
+down_revision = 'b7c1e2d3f4a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the voice_undo_records table."""
+    op.create_table('voice_undo_records',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('household_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('operations', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_voice_undo_records_id', 'voice_undo_records', ['id'])
+    op.create_index('ix_voice_undo_records_token_hash', 'voice_undo_records', ['token_hash'], unique=True)
+    op.create_index('ix_voice_undo_records_user_id', 'voice_undo_records', ['user_id'])
+
+
+def downgrade():
+    """Drop the voice_undo_records table."""
+    op.drop_index('ix_voice_undo_records_user_id', table_name='voice_undo_records')
+    op.drop_index('ix_voice_undo_records_token_hash', table_name='voice_undo_records')
+    op.drop_index('ix_voice_undo_records_id', table_name='voice_undo_records')
+    op.drop_table('voice_undo_records')
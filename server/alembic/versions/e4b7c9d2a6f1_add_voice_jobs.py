@@ -0,0 +1,48 @@
+"""add_voice_jobs
+
+Revision ID: e4b7c9d2a6f1
+Revises: d2e8f1a9c3b6
+Create Date: 2025-02-10 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7c9d2a6f1'
+down_revision = 'd2e8f1a9c3b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the voice_jobs table."""
+    op.create_table('voice_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('household_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_voice_jobs_id', 'voice_jobs', ['id'])
+    op.create_index('ix_voice_jobs_user_id', 'voice_jobs', ['user_id'])
+    op.create_index('ix_voice_jobs_expires_at', 'voice_jobs', ['expires_at'])
+
+
+def downgrade():
+    """Drop the voice_jobs table."""
+    op.drop_index('ix_voice_jobs_expires_at', table_name='voice_jobs')
+    op.drop_index('ix_voice_jobs_user_id', table_name='voice_jobs')
+    op.drop_index('ix_voice_jobs_id', table_name='voice_jobs')
+    op.drop_table('voice_jobs')
@@ -0,0 +1,270 @@
+"""
+Accuracy and latency harness for the voice command parser.
+
+Runs CommandParser over a labeled corpus and reports:
+- per-action precision and recall, and overall action accuracy
+- entity name precision/recall and field accuracy (quantity, unit,
+  location, expiration) for entities whose name matched
+- p50/p99 parse latency and throughput
+
+Exits nonzero when a metric regresses past the thresholds stored next to
+the corpus. Runs fully offline.
+
+Usage:
+    python benchmarks/voice_command_harness.py [--corpus FILE] [--thresholds FILE]
+        [--repeat N] [--json] [--skip-latency] [--write-thresholds]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add the server package to the path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bruno_ai_server.services.command_parser import CommandParser  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+DEFAULT_CORPUS = CORPUS_DIR / "voice_commands_v1.jsonl"
+
+# Margins applied by --write-thresholds so noise does not fail the gate
+ACCURACY_MARGIN = 0.02
+LATENCY_HEADROOM = 5.0
+
+
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    """Load labeled commands from a JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def thresholds_path_for(corpus_path: Path) -> Path:
+    return corpus_path.with_suffix(".thresholds.json")
+
+
+def _expected_date(label: Optional[str], today: date) -> Optional[date]:
+    if not label:
+        return None
+    if label.startswith("+") and label.endswith("d"):
+        return today + timedelta(days=int(label[1:-1]))
+    return date.fromisoformat(label)
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def evaluate(corpus: List[Dict[str, Any]], parser: Optional[CommandParser] = None, repeat: int = 20) -> Dict[str, Any]:
+    """
+    Evaluate the parser on a labeled corpus.
+
+    Args:
+        corpus: Labeled commands with ``text``, ``action`` and ``entities``
+        parser: Parser to evaluate (a fresh one by default)
+        repeat: Timed passes over the corpus for latency statistics
+
+    Returns:
+        Report with accuracy and latency metrics
+    """
+    parser = parser or CommandParser()
+    parser.warm_up()
+    today = date.today()
+
+    true_positive: Counter = Counter()
+    predicted_count: Counter = Counter()
+    labeled_count: Counter = Counter()
+    entity_counts = Counter()
+    field_hits = Counter()
+    field_totals = Counter()
+    errors = []
+
+    for example in corpus:
+        result = parser.parse_command(example["text"])
+        predicted = result.action.value
+        expected = example["action"]
+
+        labeled_count[expected] += 1
+        predicted_count[predicted] += 1
+        if predicted == expected:
+            true_positive[expected] += 1
+        else:
+            errors.append({"id": example["id"], "text": example["text"], "expected": expected, "predicted": predicted})
+
+        predicted_entities = {_normalize(entity.name): entity for entity in result.entities}
+        entity_counts["predicted"] += len(predicted_entities)
+        for label in example["entities"]:
+            entity_counts["labeled"] += 1
+            entity = predicted_entities.get(_normalize(label["name"]))
+            if entity is None:
+                continue
+            entity_counts["matched"] += 1
+
+            checks = {
+                "quantity": (entity.quantity, label.get("quantity")),
+                "unit": (entity.unit, label.get("unit")),
+                "location": (entity.location, label.get("location")),
+                "expiration": (entity.expiration_date, _expected_date(label.get("expiration"), today)),
+            }
+            for field_name, (actual, wanted) in checks.items():
+                field_totals[field_name] += 1
+                if actual == wanted:
+                    field_hits[field_name] += 1
+
+    actions = sorted(labeled_count)
+    per_action = {
+        action: {
+            "precision": true_positive[action] / predicted_count[action] if predicted_count[action] else 0.0,
+            "recall": true_positive[action] / labeled_count[action],
+            "support": labeled_count[action],
+        }
+        for action in actions
+    }
+
+    entity_precision = entity_counts["matched"] / entity_counts["predicted"] if entity_counts["predicted"] else 0.0
+    entity_recall = entity_counts["matched"] / entity_counts["labeled"] if entity_counts["labeled"] else 0.0
+    entity_f1 = (
+        2 * entity_precision * entity_recall / (entity_precision + entity_recall)
+        if entity_precision + entity_recall else 0.0
+    )
+
+    # Time every command individually for the latency distribution
+    texts = [example["text"] for example in corpus]
+    samples = []
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            parse_start = time.perf_counter()
+            parser.parse_command(text)
+            samples.append(time.perf_counter() - parse_start)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "corpus_size": len(corpus),
+        "action_accuracy": sum(true_positive.values()) / len(corpus),
+        "per_action": per_action,
+        "entity": {
+            "precision": entity_precision,
+            "recall": entity_recall,
+            "f1": entity_f1,
+            "field_accuracy": {
+                field_name: field_hits[field_name] / field_totals[field_name]
+                for field_name in sorted(field_totals)
+            },
+        },
+        "latency_ms": {
+            "p50": percentile(samples, 0.50) * 1000,
+            "p99": percentile(samples, 0.99) * 1000,
+            "mean": statistics.fmean(samples) * 1000,
+        },
+        "throughput_per_second": len(samples) / elapsed if elapsed else 0.0,
+        "misclassified": errors,
+    }
+
+
+def check_thresholds(report: Dict[str, Any], thresholds: Dict[str, Any], check_latency: bool = True) -> List[str]:
+    """
+    Compare a report against thresholds.
+
+    Returns:
+        Descriptions of every regression (empty when all metrics pass)
+    """
+    failures = []
+
+    def at_least(name, value, minimum):
+        if minimum is not None and value < minimum:
+            failures.append(f"{name} {value:.3f} < {minimum:.3f}")
+
+    at_least("action_accuracy", report["action_accuracy"], thresholds.get("min_action_accuracy"))
+    at_least("entity_f1", report["entity"]["f1"], thresholds.get("min_entity_f1"))
+    for action, minimum in thresholds.get("min_precision", {}).items():
+        at_least(f"{action} precision", report["per_action"].get(action, {}).get("precision", 0.0), minimum)
+    for action, minimum in thresholds.get("min_recall", {}).items():
+        at_least(f"{action} recall", report["per_action"].get(action, {}).get("recall", 0.0), minimum)
+
+    if check_latency:
+        max_p99 = thresholds.get("max_p99_ms")
+        if max_p99 is not None and report["latency_ms"]["p99"] > max_p99:
+            failures.append(f"p99 latency {report['latency_ms']['p99']:.3f}ms > {max_p99:.3f}ms")
+        at_least("throughput", report["throughput_per_second"], thresholds.get("min_throughput_per_second"))
+
+    return failures
+
+
+def thresholds_from_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive thresholds from a report, leaving a margin for noise."""
+    def floor(value):
+        return round(max(0.0, value - ACCURACY_MARGIN), 3)
+
+    return {
+        "min_action_accuracy": floor(report["action_accuracy"]),
+        "min_entity_f1": floor(report["entity"]["f1"]),
+        "min_precision": {action: floor(m["precision"]) for action, m in report["per_action"].items()},
+        "min_recall": {action: floor(m["recall"]) for action, m in report["per_action"].items()},
+        "max_p99_ms": round(report["latency_ms"]["p99"] * LATENCY_HEADROOM, 3),
+        "min_throughput_per_second": round(report["throughput_per_second"] / LATENCY_HEADROOM),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Corpus: {report['corpus_size']} commands")
+    print(f"Action accuracy: {report['action_accuracy']:.3f}")
+    print(f"{'action':>14} {'precision':>10} {'recall':>8} {'support':>8}")
+    for action, metrics in report["per_action"].items():
+        print(f"{action:>14} {metrics['precision']:>10.3f} {metrics['recall']:>8.3f} {metrics['support']:>8}")
+    entity = report["entity"]
+    print(f"Entities: precision {entity['precision']:.3f}, recall {entity['recall']:.3f}, f1 {entity['f1']:.3f}")
+    for field_name, accuracy in entity["field_accuracy"].items():
+        print(f"  {field_name} accuracy: {accuracy:.3f}")
+    latency = report["latency_ms"]
+    print(f"Latency: p50 {latency['p50']:.3f}ms, p99 {latency['p99']:.3f}ms")
+    print(f"Throughput: {report['throughput_per_second']:.0f} commands/s")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Voice command parser accuracy and latency harness")
+    arg_parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Labeled JSONL corpus")
+    arg_parser.add_argument("--thresholds", type=Path, help="Thresholds JSON (default: next to the corpus)")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the corpus")
+    arg_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    arg_parser.add_argument("--skip-latency", action="store_true", help="Only gate on accuracy")
+    arg_parser.add_argument("--write-thresholds", action="store_true", help="Record this run as the new baseline")
+    args = arg_parser.parse_args()
+
+    thresholds_path = args.thresholds or thresholds_path_for(args.corpus)
+    report = evaluate(load_corpus(args.corpus), repeat=args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.write_thresholds:
+        with open(thresholds_path, "w", encoding="utf-8") as f:
+            json.dump(thresholds_from_report(report), f, indent=2)
+            f.write("\n")
+        print(f"Wrote thresholds to {thresholds_path}")
+        return 0
+
+    with open(thresholds_path, encoding="utf-8") as f:
+        thresholds = json.load(f)
+    failures = check_thresholds(report, thresholds, check_latency=not args.skip_latency)
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ Authentication utilities for Bruno AI Server.
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, WebSocket, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -176,6 +176,37 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_websocket_user(websocket: WebSocket, db: AsyncSession) -> User | None:
+    """
+    Authenticate a WebSocket connection.
+
+    Browsers cannot set headers on WebSocket upgrades, so the access token
+    may be passed as a ``token`` query parameter instead of a Bearer header.
+    Returns None when the token is missing, invalid or the user is inactive.
+    """
+    token = websocket.query_params.get("token")
+    if not token:
+        auth_header = websocket.headers.get("Authorization", "")
+        scheme, _, credentials = auth_header.partition(" ")
+        if scheme.lower() == "bearer":
+            token = credentials
+
+    payload = verify_token(token) if token else None
+    if not payload or not payload.get("sub"):
+        return None
+
+    try:
+        user_id = UUID(payload["sub"])
+    except (ValueError, TypeError):
+        return None
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
 async def get_user_from_refresh_token(
     token: str,
     db: AsyncSession = Depends(get_async_session),
@@ -49,6 +49,84 @@ class Settings(BaseSettings):
     # Cache/Session
     redis_url: str = Field(default="redis://localhost:6379", description="Redis URL")
 
+    # Real-time notifications
+    notification_fanout_backend: str = Field(default="local", description="Cross-worker notification fan-out (local/postgres)")
+    notification_queue_size: int = Field(default=100, description="Max queued events per notification connection")
+    notification_heartbeat_seconds: float = Field(default=15.0, description="Heartbeat interval for idle notification connections")
+
+    # Email notifications (disabled when SMTP_HOST is unset)
+    smtp_host: str | None = Field(default=None, description="SMTP server host")
+    smtp_port: int = Field(default=587, description="SMTP server port")
+    smtp_username: str | None = Field(default=None, description="SMTP username")
+    smtp_password: str | None = Field(default=None, description="SMTP password")
+    smtp_use_tls: bool = Field(default=True, description="Upgrade SMTP sessions with STARTTLS")
+    email_sender: str = Field(default="Bruno AI <noreply@brunoai.app>", description="From address for notification emails")
+    email_max_concurrency: int = Field(default=4, description="Pooled SMTP sessions used to send in parallel")
+    email_max_retries: int = Field(default=3, description="Retries for transient SMTP failures")
+
+    # Voice processing
+    voice_batch_parse_workers: int = Field(default=2, description="Worker processes for batch command parsing (0 parses in-process)")
+    voice_batch_max_transcripts: int = Field(default=10000, description="Max transcripts per batch parse request")
+    voice_undo_ttl_seconds: int = Field(default=300, description="How long an executed voice command can be undone")
+    voice_execute_min_match_score: float = Field(default=0.6, description="Min name similarity to act on a pantry item")
+    voice_streaming_backend: str = Field(default="voxtral", description="Streaming STT backend (voxtral/stub)")
+    voice_streaming_partials: bool = Field(default=False, description="Send partial transcripts while streaming (re-uploads the growing buffer)")
+    voice_streaming_partial_interval_ms: int = Field(default=1000, description="New audio between partial transcripts")
+    voice_streaming_stub_transcript: str = Field(default="", description="Transcript returned by the stub backend")
+    voice_streaming_max_seconds: int = Field(default=60, description="Max audio per streamed voice command")
+    voice_transcription_cache_max_entries: int = Field(default=1024, description="Transcriptions kept in memory (0 disables the memory tier)")
+    voice_transcription_cache_ttl_seconds: int = Field(default=3600, description="How long a cached transcription is reused")
+    voice_transcription_cache_dir: str | None = Field(default=None, description="Directory for a transcription cache shared across processes")
+    voice_preprocess_enabled: bool = Field(default=True, description="Downmix, resample and trim WAV uploads before STT (needs numpy)")
+    voice_preprocess_sample_rate: int = Field(default=16000, description="Sample rate audio is resampled to before STT")
+    voice_preprocess_max_bytes: int = Field(default=20 * 1024 * 1024, description="Larger uploads are sent to STT unprocessed")
+    voice_preprocess_max_concurrency: int = Field(default=2, description="Uploads buffered and preprocessed at once")
+    voice_preprocess_silence_threshold_db: float = Field(default=-50.0, description="Level (dBFS) below which audio counts as silence")
+    voice_job_min_duration_seconds: float = Field(default=20.0, description="Voice commands at least this long are processed as background jobs")
+    voice_job_min_bytes: int = Field(default=2 * 1024 * 1024, description="Background threshold for audio whose duration is not in its headers")
+    voice_job_workers: int = Field(default=4, description="Concurrent background transcription jobs per process")
+    voice_job_max_queued: int = Field(default=200, description="Max queued background transcription jobs per process")
+    voice_job_max_queued_per_user: int = Field(default=5, description="Max queued background transcription jobs per user")
+    voice_job_result_ttl_seconds: int = Field(default=3600, description="How long a finished job's result can be fetched")
+    voice_job_stt_deadline_seconds: float = Field(default=300.0, description="Transcription time budget for background jobs")
+
+    # Speech-to-text providers
+    stt_deadline_seconds: float = Field(default=15.0, description="Time budget for a short transcription, across retries and fallback")
+    stt_deadline_per_audio_second: float = Field(default=0.5, description="Extra time budget per second of audio")
+    stt_deadline_max_seconds: float = Field(default=90.0, description="Upper bound of the scaled transcription time budget")
+    stt_max_attempts: int = Field(default=3, description="Attempts per STT provider before falling back")
+    stt_retry_base_delay_ms: int = Field(default=200, description="Base delay for jittered exponential retry backoff")
+    stt_hedge_enabled: bool = Field(default=True, description="Race a second request when one runs past the provider's p95 latency")
+    stt_hedge_min_delay_ms: int = Field(default=500, description="Never hedge sooner than this")
+    stt_hedge_max_bytes: int = Field(default=5 * 1024 * 1024, description="Uploads larger than this are never hedged")
+    stt_breaker_failure_threshold: int = Field(default=5, description="Consecutive failures that open a provider's circuit")
+    stt_breaker_recovery_seconds: float = Field(default=30.0, description="How long an open circuit fails fast before a trial call")
+    stt_fallback_provider: str = Field(default="whisper", description="Fallback STT provider (whisper/none); used when its API key is set")
+    whisper_base_url: str = Field(default="https://api.openai.com/v1", description="OpenAI-compatible transcription API for the Whisper fallback")
+    whisper_model: str = Field(default="whisper-1", description="Model used by the Whisper fallback")
+
+    # Text-to-speech providers
+    tts_hedge_enabled: bool = Field(default=True, description="Race the next-best TTS provider when one runs past its p95 latency")
+    tts_hedge_min_delay_ms: int = Field(default=800, description="Never hedge a TTS synthesis sooner than this")
+    tts_breaker_failure_threshold: int = Field(default=3, description="Consecutive failures that eject a TTS provider")
+    tts_breaker_recovery_seconds: float = Field(default=30.0, description="How long an ejected TTS provider is skipped before a trial call")
+
+    # Text-to-speech cache
+    tts_cache_max_mb: int = Field(default=100, description="Synthesized audio kept in memory, in megabytes")
+    tts_cache_ttl_seconds: int = Field(default=3600, description="How long synthesized audio is reused")
+    tts_cache_dir: str | None = Field(default=None, description="Directory for a TTS audio cache shared across processes")
+    tts_cache_disk_max_mb: int = Field(default=1024, description="Audio kept in the TTS disk cache, in megabytes")
+    tts_phrase_voice_id: str | None = Field(default=None, description="Voice for templated phrases (default: best voice of the preferred provider)")
+    tts_phrase_prewarm: bool = Field(default=True, description="Synthesize fixed phrase segments in the background at startup")
+
+    # Upstream HTTP connection pools (STT/TTS providers)
+    http_pool_max_connections: int = Field(default=20, description="Max connections per upstream client")
+    http_pool_max_keepalive_connections: int = Field(default=10, description="Idle connections kept per upstream client")
+    http_pool_keepalive_expiry_seconds: float = Field(default=30.0, description="Seconds an idle connection is kept")
+    http_pool_http2: bool = Field(default=True, description="Use HTTP/2 when the h2 package is installed")
+    http_timeout_seconds: float = Field(default=30.0, description="Upstream request timeout")
+    http_connect_timeout_seconds: float = Field(default=10.0, description="Upstream connect timeout")
+
     # Server Configuration
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8000, description="Server port")
@@ -8,6 +8,7 @@ from .pantry import PantryCategory, PantryItem
 from .recipe import Recipe, RecipeIngredient, UserFavorite
 from .shopping import Order, OrderItem, ShoppingList, ShoppingListItem
 from .user import Household, HouseholdMember, User
+from .voice import VoiceJob, VoiceUndoRecord
 
 __all__ = [
     "Base",
@@ -25,4 +26,6 @@ __all__ = [
     "ShoppingListItem",
     "Order",
     "OrderItem",
+    "VoiceUndoRecord",
+    "VoiceJob",
 ]
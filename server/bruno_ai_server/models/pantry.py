@@ -4,7 +4,7 @@ Pantry-related database models.
 
 from datetime import date
 
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -39,6 +39,11 @@ class PantryItem(Base, TimestampMixin):
     quantity = Column(Float, default=1.0, nullable=False)
     unit = Column(String(50), default="piece")  # piece, gram, liter, etc.
 
+    # Quantity in the canonical unit (gram, milliliter, piece, ...), computed on
+    # write by services.unit_conversion
+    base_quantity = Column(Float)
+    base_unit = Column(String(20))
+
     # Expiration management
     expiration_date = Column(Date)
     purchase_date = Column(Date, default=date.today)
@@ -59,6 +64,14 @@ class PantryItem(Base, TimestampMixin):
     # Additional item data stored as JSON
     item_metadata = Column(CompatibleJSONB, default=dict)  # For nutrition info, brand, etc.
 
+    __table_args__ = (
+        # Matches the case-insensitive grouping of the per-item totals query
+        Index(
+            "ix_pantry_items_household_lower_name_base_unit",
+            "household_id", func.lower(name), "base_unit",
+        ),
+    )
+
     @property
     def is_expiring_soon(self) -> bool:
         """Check if item is expiring within 3 days."""
@@ -76,3 +89,4 @@ class PantryItem(Base, TimestampMixin):
 
     def __repr__(self):
         return f"<PantryItem(id={self.id}, name='{self.name}', quantity={self.quantity}, expiration='{self.expiration_date}')>"
+
@@ -0,0 +1,46 @@
+"""
+Voice command database models.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base, TimestampMixin
+from .types import CompatibleJSONB
+
+
+class VoiceUndoRecord(Base, TimestampMixin):
+    """Pending undo of an executed voice command, redeemable once."""
+
+    __tablename__ = "voice_undo_records"
+
+    # SHA-256 of the undo token handed to the client
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    household_id = Column(UUID(as_uuid=True), ForeignKey("households.id", ondelete="CASCADE"), nullable=False)
+    # Operations to reverse, with JSON-encoded item snapshots
+    operations = Column(CompatibleJSONB, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<VoiceUndoRecord(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
+
+
+class VoiceJob(Base, TimestampMixin):
+    """Status and, once finished, the result of a background voice command."""
+
+    __tablename__ = "voice_jobs"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    household_id = Column(UUID(as_uuid=True), ForeignKey("households.id", ondelete="CASCADE"), nullable=True)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    # VoiceCommandResponse when succeeded, status_code and detail when failed
+    result = Column(CompatibleJSONB, nullable=True)
+    error = Column(CompatibleJSONB, nullable=True)
+    # Set when the job finishes; the row is deleted some time after
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    def __repr__(self):
+        return f"<VoiceJob(id={self.id}, user_id={self.user_id}, status='{self.status}')>"
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..auth import get_current_active_user
 from ..database import get_async_session
 from ..models.user import User
-from ..routes.pantry import get_user_household_id
+from ..services.household_service import get_user_household_id
 from ..schemas import PantryItemResponse
 from ..services.expiration_service import ExpirationService
 
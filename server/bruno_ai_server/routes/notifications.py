@@ -0,0 +1,115 @@
+"""
+Real-time notification routes for Bruno AI.
+
+Clients subscribe to their household channel over WebSocket or
+Server-Sent Events instead of polling the expiration endpoints.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth import get_current_active_user, get_websocket_user
+from ..database import get_async_session
+from ..models.user import User
+from ..services.household_service import get_user_household_id
+from ..services.notification_hub import HubEvent, notification_hub
+
+logger = logging.getLogger(__name__)
+
+# Define the router
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+def _format_sse(event: HubEvent) -> str:
+    """Format a hub event as a Server-Sent Events message."""
+    data = json.dumps(event.to_dict(), default=str)
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Subscribe to household notifications using Server-Sent Events."""
+    household_id = await get_user_household_id(current_user, db)
+    if not household_id:
+        raise HTTPException(status_code=400, detail="User is not a member of any household")
+
+    # Release the database connection before the long-lived stream starts
+    await db.close()
+
+    subscription = notification_hub.subscribe(household_id)
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            async for event in subscription:
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": heartbeat\n\n"
+                else:
+                    yield _format_sse(event)
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def notifications_websocket(
+    websocket: WebSocket,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Subscribe to household notifications over a WebSocket.
+
+    Authenticate with a ``token`` query parameter or a Bearer header.
+    The server sends one JSON message per event and a heartbeat message
+    when the channel has been idle for the heartbeat interval.
+    """
+    user = await get_websocket_user(websocket, db)
+    household_id = await get_user_household_id(user, db) if user else None
+    await db.close()
+
+    if user is None or household_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = notification_hub.subscribe(household_id)
+
+    async def send_events():
+        async for event in subscription:
+            message: Dict[str, Any] = {"type": "heartbeat"} if event is None else event.to_dict()
+            await websocket.send_text(json.dumps(message, default=str))
+
+    async def receive_until_disconnect():
+        # Clients do not send anything yet; reading detects disconnects promptly
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    sender = asyncio.create_task(send_events())
+    receiver = asyncio.create_task(receive_until_disconnect())
+    try:
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        notification_hub.unsubscribe(subscription)
+        for task in (sender, receiver):
+            task.cancel()
+        # wait() rather than gather(): a cancelled gather escapes the server's cancel scope
+        await asyncio.wait({sender, receiver})
@@ -4,6 +4,7 @@ Pantry router for handling pantry items.
 
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -13,39 +14,17 @@ from datetime import date, timedelta
 from ..auth import get_current_active_user
 from ..database import get_async_session
 from ..models.pantry import PantryCategory, PantryItem
-from ..models.user import HouseholdMember, User
-from ..schemas import PantryItemCreate, PantryItemResponse, PantryItemUpdate
+from ..models.user import User
+from ..schemas import PantryItemCreate, PantryItemResponse, PantryItemTotal, PantryItemUpdate
 from ..services.expiration_service import ExpirationService
+from ..services.household_service import get_user_household_id
+from ..services.notification_hub import notification_hub
+from ..services.unit_conversion import normalize_unit
 
 # Define the router
 router = APIRouter(prefix="/pantry/items", tags=["pantry"])
 
 
-async def get_user_household_id(user: User, db: AsyncSession) -> int | None:
-    """Get the user's primary household ID."""
-    # First try to get household where user is an admin (most likely primary)
-    result = await db.execute(
-        select(HouseholdMember.household_id)
-        .where(
-            HouseholdMember.user_id == user.id,
-            HouseholdMember.role == "admin"
-        )
-        .limit(1)
-    )
-    household_id = result.scalar_one_or_none()
-
-    if household_id:
-        return household_id
-
-    # If no admin household, get any household the user is a member of
-    result = await db.execute(
-        select(HouseholdMember.household_id)
-        .where(HouseholdMember.user_id == user.id)
-        .limit(1)
-    )
-    return result.scalar_one_or_none()
-
-
 @router.get("/", response_model=list[PantryItemResponse])
 async def get_pantry_items(
     current_user: User = Depends(get_current_active_user),
@@ -110,6 +89,36 @@ async def get_pantry_items(
     return items
 
 
+@router.get("/totals", response_model=list[PantryItemTotal])
+async def get_pantry_item_totals(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+    search: Optional[str] = Query(None, description="Search by keyword"),
+):
+    """Total each item's quantity across the household, in its base unit."""
+    household_id = await get_user_household_id(current_user, db)
+    if not household_id:
+        raise HTTPException(status_code=400, detail="User is not a member of any household")
+
+    name = func.lower(PantryItem.name)
+    query = (
+        select(
+            name.label("name"),
+            func.sum(PantryItem.base_quantity).label("base_quantity"),
+            PantryItem.base_unit,
+            func.count(PantryItem.id).label("item_count"),
+        )
+        .where(PantryItem.household_id == household_id, PantryItem.base_unit.is_not(None))
+        .group_by(name, PantryItem.base_unit)
+        .order_by(name, PantryItem.base_unit)
+    )
+    if search:
+        query = query.where(PantryItem.name.ilike(f"%{search}%"))
+
+    result = await db.execute(query)
+    return [PantryItemTotal(**row._mapping) for row in result]
+
+
 @router.post("/", response_model=PantryItemResponse)
 async def create_pantry_item(
     pantry_item_data: PantryItemCreate,
@@ -142,7 +151,8 @@ async def create_pantry_item(
         expiration_date = suggested_date
 
     pantry_item = PantryItem(
-        **pantry_item_data.dict(exclude={'expiration_date'}),
+        **pantry_item_data.dict(exclude={'expiration_date', 'unit'}),
+        unit=normalize_unit(pantry_item_data.unit) or pantry_item_data.unit,
         expiration_date=expiration_date,
         household_id=household_id,
         added_by_user_id=current_user.id
@@ -150,6 +160,7 @@ async def create_pantry_item(
     db.add(pantry_item)
     await db.commit()
     await db.refresh(pantry_item)
+    await notification_hub.publish_pantry_change(household_id, pantry_item.id, "created")
     return pantry_item
 
 
@@ -177,10 +188,13 @@ async def update_pantry_item(
         raise HTTPException(status_code=404, detail="Pantry item not found.")
 
     for key, value in item_update_data.dict(exclude_unset=True).items():
+        if key == "unit" and value:
+            value = normalize_unit(value) or value
         setattr(pantry_item, key, value)
 
     await db.commit()
     await db.refresh(pantry_item)
+    await notification_hub.publish_pantry_change(household_id, pantry_item.id, "updated")
     return pantry_item
 
 
@@ -208,6 +222,7 @@ async def delete_pantry_item(
 
     await db.delete(pantry_item)
     await db.commit()
+    await notification_hub.publish_pantry_change(household_id, item_id, "deleted")
     return {"message": "Pantry item deleted successfully."}
 
 
@@ -241,6 +256,7 @@ async def increment_pantry_item_quantity(
     pantry_item.quantity += amount
     await db.commit()
     await db.refresh(pantry_item)
+    await notification_hub.publish_pantry_change(household_id, pantry_item.id, "updated")
     return pantry_item
 
 
@@ -276,6 +292,7 @@ async def decrement_pantry_item_quantity(
     
     await db.commit()
     await db.refresh(pantry_item)
+    await notification_hub.publish_pantry_change(household_id, pantry_item.id, "updated")
     return pantry_item
 
 
@@ -309,5 +326,6 @@ async def set_pantry_item_quantity(
     pantry_item.quantity = quantity
     await db.commit()
     await db.refresh(pantry_item)
+    await notification_hub.publish_pantry_change(household_id, pantry_item.id, "updated")
     return pantry_item
 
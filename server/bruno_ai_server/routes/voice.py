@@ -4,29 +4,56 @@ Voice processing API routes for Bruno AI Server.
 Provides endpoints for:
 - Audio transcription using Mistral Voxtral STT
 - Voice command parsing and pantry action extraction
-- Combined voice-to-action processing
+- Combined voice-to-action processing, with optional server-side execution and undo
+- Background jobs for long recordings, with polling and completion events
+- Real-time streaming voice commands over WebSocket
+- Text-to-speech, as base64 JSON, as audio served from the TTS cache, or
+  streamed as it is synthesized
 - Voice service health checks
 """
 
+import asyncio
+import json
 import logging
+import time
 from typing import Optional, List
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, Request, WebSocket, status
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..auth import get_current_user
+from ..auth import get_current_user, get_websocket_user
+from ..config import settings
+from ..database import async_session_factory, get_async_session
 from ..models.user import User
-from ..services.voice_service import VoiceService, TranscriptionResult
-from ..services.command_parser import CommandParser, CommandResult
-from ..services.tts_service import TTSService, TTSRequest, TTSProvider
+from ..services.household_service import get_user_household_id
+from ..services.audio_probe import AudioInfo
+from ..services.audio_upload import audio_content_type, copy_upload
+from ..services.http_clients import http_clients
+from ..services.voice_service import VoiceService, TranscriptionResult, get_voice_service
+from ..services.command_parser import CommandParser, CommandResult, PantryAction, get_command_parser
+from ..services.batch_parser import batch_command_parser
+from ..services.entity_resolver import entity_resolver
+from ..services.voice_command_executor import ExecutionResult, voice_command_executor
+from ..services.transcription_jobs import JobQueueFullError, should_run_as_job, transcription_jobs
+from ..services.streaming_stt import AudioFormat, StreamingSTTBackend, get_streaming_stt_backend
+from ..services.tts_service import TTSService, TTSRequest, TTSProvider, get_tts_service
+from ..services.tts_phrases import PHRASE_TEMPLATES, TTSPhraseLibrary, get_tts_phrases
 from ..schemas import (
     VoiceTranscriptionRequest,
     VoiceTranscriptionResponse,
     PantryActionEntity,
     PantryActionCommand,
+    PantryItemMatch,
+    VoiceBatchParseRequest,
     VoiceCommandResponse,
+    VoiceExecutedItem,
+    VoiceExecutionResponse,
+    VoiceJobResponse,
+    VoiceUndoResponse,
     TTSSynthesisRequest,
     TTSSynthesisResponse,
+    TTSPhraseRequest,
     TTSVoiceResponse,
     TTSHealthResponse
 )
@@ -35,13 +62,76 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/voice", tags=["voice"])
 
+# Actions whose entities refer to items already in the pantry
+ITEM_REFERENCE_ACTIONS = {
+    PantryAction.UPDATE,
+    PantryAction.DELETE,
+    PantryAction.REMOVE,
+    PantryAction.INCREMENT,
+    PantryAction.DECREMENT,
+    PantryAction.USE,
+    PantryAction.SET_QUANTITY,
+    PantryAction.CHECK,
+    PantryAction.SEARCH,
+}
+
+
+async def build_action_entities(
+    result: CommandResult,
+    current_user: User,
+    db: AsyncSession
+) -> List[PantryActionEntity]:
+    """
+    Convert parsed entities to response schemas.
+    
+    For actions on existing items, each entity is resolved against the
+    user's household pantry so clients get candidate item ids directly.
+    """
+    matches = [None] * len(result.entities)
+    if result.action in ITEM_REFERENCE_ACTIONS and result.entities:
+        household_id = await get_user_household_id(current_user, db)
+        if household_id:
+            resolved = await entity_resolver.resolve(
+                db, household_id, [entity.name for entity in result.entities]
+            )
+            matches = [
+                [PantryItemMatch(**vars(match)) for match in entity_matches]
+                for entity_matches in resolved
+            ]
+    
+    return [
+        PantryActionEntity(
+            name=entity.name,
+            quantity=entity.quantity,
+            unit=entity.unit,
+            location=entity.location,
+            expiration_date=entity.expiration_date,
+            confidence=entity.confidence,
+            matches=entity_matches
+        )
+        for entity, entity_matches in zip(result.entities, matches, strict=True)
+    ]
+
+
+def build_execution_response(execution: ExecutionResult) -> VoiceExecutionResponse:
+    """Convert an execution result to its response schema."""
+    return VoiceExecutionResponse(
+        applied=execution.applied,
+        items=[VoiceExecutedItem(**vars(item)) for item in execution.items],
+        unresolved=execution.unresolved,
+        errors=execution.errors,
+        undo_token=execution.undo_token,
+        undo_expires_at=execution.undo_expires_at
+    )
+
 
 @router.post("/transcribe", response_model=VoiceTranscriptionResponse)
 async def transcribe_audio(
     audio_file: UploadFile = File(..., description="Audio file to transcribe"),
     language: Optional[str] = Form(None, description="Language hint (e.g., 'en', 'es', 'fr')"),
     enhance_food_terms: bool = Form(True, description="Whether to optimize for food term recognition"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    voice_service: VoiceService = Depends(get_voice_service)
 ):
     """
     Transcribe audio file to text using Mistral Voxtral STT.
@@ -54,24 +144,24 @@ async def transcribe_audio(
     Maximum duration: 5 minutes
     """
     try:
-        async with VoiceService() as voice_service:
-            # Transcribe the audio
-            result = await voice_service.transcribe_audio(
-                file=audio_file,
-                language=language,
-                enhance_food_terms=enhance_food_terms
-            )
-            
-            logger.info(f"Transcription completed for user {current_user.id}: '{result.text[:100]}...'")
-            
-            return VoiceTranscriptionResponse(
-                text=result.text,
-                confidence=result.confidence,
-                language_detected=result.language_detected,
-                processing_time_ms=result.processing_time_ms,
-                audio_duration_ms=result.audio_duration_ms
-            )
-            
+        # Transcribe the audio
+        result = await voice_service.transcribe_audio(
+            file=audio_file,
+            language=language,
+            enhance_food_terms=enhance_food_terms
+        )
+        
+        logger.info(f"Transcription completed for user {current_user.id}: '{result.text[:100]}...'")
+        
+        return VoiceTranscriptionResponse(
+            text=result.text,
+            confidence=result.confidence,
+            language_detected=result.language_detected,
+            processing_time_ms=result.processing_time_ms,
+            audio_duration_ms=result.audio_duration_ms,
+            cached=result.cached
+        )
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -85,7 +175,9 @@ async def transcribe_audio(
 @router.post("/parse-command", response_model=PantryActionCommand)
 async def parse_voice_command(
     text: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    parser: CommandParser = Depends(get_command_parser),
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Parse voice command text and extract structured pantry actions.
@@ -94,6 +186,7 @@ async def parse_voice_command(
     - Action type (add, update, delete, list, search, check)
     - Food entities with quantities, units, locations, expiration dates
     - Command confidence and validation
+    - Matching pantry items for commands on existing items
     
     Example commands:
     - "Add 2 pounds of chicken to the fridge"
@@ -102,21 +195,10 @@ async def parse_voice_command(
     - "Update bread quantity to 2 loaves"
     """
     try:
-        parser = CommandParser()
         result = parser.parse_command(text)
         
         # Convert to response schema
-        entities = [
-            PantryActionEntity(
-                name=entity.name,
-                quantity=entity.quantity,
-                unit=entity.unit,
-                location=entity.location,
-                expiration_date=entity.expiration_date,
-                confidence=entity.confidence
-            )
-            for entity in result.entities
-        ]
+        entities = await build_action_entities(result, current_user, db)
         
         logger.info(f"Command parsed for user {current_user.id}: {result.action.value} with {len(entities)} entities")
         
@@ -137,12 +219,188 @@ async def parse_voice_command(
         )
 
 
-@router.post("/process", response_model=VoiceCommandResponse)
+@router.post("/parse-commands/batch")
+async def parse_voice_commands_batch(
+    request: VoiceBatchParseRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Parse many transcripts in one request.
+    
+    Transcripts are parsed by a pool of worker processes and streamed back
+    as NDJSON, one line per transcript in input order. Each line has the
+    shape of the /parse-command response plus an ``index`` field; a
+    transcript that fails to parse has an ``error`` field instead.
+    
+    Intended for re-running the parser over stored transcripts when
+    evaluating parser changes or backfilling structured commands.
+    """
+    if len(request.texts) > settings.voice_batch_max_transcripts:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many transcripts. Maximum per request: {settings.voice_batch_max_transcripts}"
+        )
+    
+    logger.info(f"Batch parsing {len(request.texts)} transcripts for user {current_user.id}")
+    
+    async def ndjson_lines():
+        index = 0
+        async for result in batch_command_parser.parse_stream(request.texts):
+            yield json.dumps({"index": index, **result}) + "\n"
+            index += 1
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+async def build_voice_command_response(
+    transcription: TranscriptionResult,
+    execute: bool,
+    current_user: User,
+    parser: CommandParser,
+    db: AsyncSession
+) -> VoiceCommandResponse:
+    """
+    Parse a transcription and optionally apply the command to the pantry.
+    
+    Shared by the synchronous /process path and background jobs.
+    """
+    # Step 2: Parse command
+    command_result = parser.parse_command(transcription.text)
+    
+    # Validate command result
+    is_valid = parser.validate_command_result(command_result)
+    
+    # Convert to response schemas
+    transcription_response = VoiceTranscriptionResponse(
+        text=transcription.text,
+        confidence=transcription.confidence,
+        language_detected=transcription.language_detected,
+        processing_time_ms=transcription.processing_time_ms,
+        audio_duration_ms=transcription.audio_duration_ms,
+        cached=transcription.cached
+    )
+    
+    entities = await build_action_entities(command_result, current_user, db)
+    
+    command_response = PantryActionCommand(
+        action=command_result.action.value,
+        entities=entities,
+        raw_text=command_result.raw_text,
+        confidence=command_result.confidence,
+        errors=command_result.errors,
+        metadata=command_result.metadata
+    )
+    
+    # Determine success and message
+    success = is_valid and transcription.confidence > 0.7 and command_result.confidence > 0.5
+    message = None
+    
+    if not success:
+        if transcription.confidence <= 0.7:
+            message = "Low confidence in audio transcription. Please try speaking more clearly."
+        elif command_result.confidence <= 0.5:
+            message = "Unable to understand command. Please try rephrasing."
+        elif not is_valid:
+            message = "Command could not be validated for execution."
+    
+    # Step 4: Optionally apply the command server-side
+    execution_response = None
+    if execute and success:
+        household_id = await get_user_household_id(current_user, db)
+        if not household_id:
+            raise HTTPException(status_code=400, detail="User is not a member of any household")
+        execution = await voice_command_executor.execute(
+            db, current_user.id, household_id, command_result
+        )
+        execution_response = build_execution_response(execution)
+    elif execute:
+        message = f"{message} Command was not executed."
+    
+    logger.info(f"Voice processing complete for user {current_user.id}: success={success}")
+    
+    return VoiceCommandResponse(
+        transcription=transcription_response,
+        command=command_response,
+        success=success,
+        message=message,
+        execution=execution_response
+    )
+
+
+async def queue_voice_command(
+    request: Request,
+    audio_file: UploadFile,
+    audio_info: AudioInfo,
+    language: Optional[str],
+    enhance_food_terms: bool,
+    execute: bool,
+    current_user: User,
+    parser: CommandParser,
+    voice_service: VoiceService,
+    db: AsyncSession
+) -> JSONResponse:
+    """
+    Process a voice command as a background job and return 202.
+    
+    The job gets its own copy of the upload and its own database session,
+    since both of the request's are closed when the response is sent, and
+    a longer transcription deadline (VOICE_JOB_STT_DEADLINE_SECONDS).
+    """
+    household_id = await get_user_household_id(current_user, db)
+    job_file = await copy_upload(audio_file)
+    
+    async def run_job():
+        try:
+            transcription = await voice_service.transcribe_audio(
+                file=job_file,
+                language=language,
+                enhance_food_terms=enhance_food_terms,
+                audio_info=audio_info,
+                deadline_seconds=settings.voice_job_stt_deadline_seconds
+            )
+            async with async_session_factory() as job_db:
+                response = await build_voice_command_response(
+                    transcription, execute, current_user, parser, job_db
+                )
+            return response.model_dump(mode="json")
+        finally:
+            await job_file.close()
+    
+    try:
+        job = await transcription_jobs.submit(
+            current_user.id, run_job, household_id=household_id, on_abandon=job_file.close
+        )
+    except JobQueueFullError as e:
+        await job_file.close()
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception:
+        await job_file.close()
+        raise
+    
+    logger.info(f"Voice command queued as job {job.id} for user {current_user.id}")
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=VoiceJobResponse(**job.to_dict()).model_dump(mode="json"),
+        headers={"Location": str(request.url_for("get_voice_job", job_id=job.id))}
+    )
+
+
+@router.post(
+    "/process",
+    response_model=VoiceCommandResponse,
+    responses={202: {"model": VoiceJobResponse, "description": "Long recording queued as a background job"}}
+)
 async def process_voice_command(
+    request: Request,
     audio_file: UploadFile = File(..., description="Audio file containing voice command"),
     language: Optional[str] = Form(None, description="Language hint for transcription"),
     enhance_food_terms: bool = Form(True, description="Optimize transcription for food terms"),
-    current_user: User = Depends(get_current_user)
+    execute: bool = Form(False, description="Apply the parsed command to the pantry"),
+    current_user: User = Depends(get_current_user),
+    parser: CommandParser = Depends(get_command_parser),
+    voice_service: VoiceService = Depends(get_voice_service),
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Complete voice-to-action processing pipeline.
@@ -154,78 +412,38 @@ async def process_voice_command(
     1. Transcribe audio using Mistral Voxtral STT
     2. Parse transcribed text for pantry actions
     3. Return structured command with entities
+    4. With execute=true, apply the command to the pantry in one transaction
+       and return the affected items and an undo token
+    
+    Long recordings are processed as a background job instead: the response
+    is 202 with a job id and a Location header for GET /voice/jobs/{job_id}.
+    When the job finishes, a ``voice_job`` event with the job id and status
+    is published to the household's notification stream; the owner then
+    fetches the result from GET /voice/jobs/{job_id}.
     
     This is the primary endpoint for voice-enabled pantry management.
     """
     try:
-        async with VoiceService() as voice_service:
-            # Step 1: Transcribe audio
-            transcription = await voice_service.transcribe_audio(
-                file=audio_file,
-                language=language,
-                enhance_food_terms=enhance_food_terms
+        # Short commands stay on the synchronous path
+        audio_info = await voice_service.probe_upload(audio_file)
+        if should_run_as_job(audio_info.duration_seconds, getattr(audio_file, "size", None)):
+            return await queue_voice_command(
+                request, audio_file, audio_info, language, enhance_food_terms, execute,
+                current_user, parser, voice_service, db
             )
-            
-            logger.info(f"Voice processing step 1/2 complete for user {current_user.id}: transcription")
-            
-            # Step 2: Parse command
-            parser = CommandParser()
-            command_result = parser.parse_command(transcription.text)
-            
-            # Validate command result
-            is_valid = parser.validate_command_result(command_result)
-            
-            # Convert to response schemas
-            transcription_response = VoiceTranscriptionResponse(
-                text=transcription.text,
-                confidence=transcription.confidence,
-                language_detected=transcription.language_detected,
-                processing_time_ms=transcription.processing_time_ms,
-                audio_duration_ms=transcription.audio_duration_ms
-            )
-            
-            entities = [
-                PantryActionEntity(
-                    name=entity.name,
-                    quantity=entity.quantity,
-                    unit=entity.unit,
-                    location=entity.location,
-                    expiration_date=entity.expiration_date,
-                    confidence=entity.confidence
-                )
-                for entity in command_result.entities
-            ]
-            
-            command_response = PantryActionCommand(
-                action=command_result.action.value,
-                entities=entities,
-                raw_text=command_result.raw_text,
-                confidence=command_result.confidence,
-                errors=command_result.errors,
-                metadata=command_result.metadata
-            )
-            
-            # Determine success and message
-            success = is_valid and transcription.confidence > 0.7 and command_result.confidence > 0.5
-            message = None
-            
-            if not success:
-                if transcription.confidence <= 0.7:
-                    message = "Low confidence in audio transcription. Please try speaking more clearly."
-                elif command_result.confidence <= 0.5:
-                    message = "Unable to understand command. Please try rephrasing."
-                elif not is_valid:
-                    message = "Command could not be validated for execution."
-            
-            logger.info(f"Voice processing complete for user {current_user.id}: success={success}")
-            
-            return VoiceCommandResponse(
-                transcription=transcription_response,
-                command=command_response,
-                success=success,
-                message=message
-            )
-            
+        
+        # Step 1: Transcribe audio (already validated by the probe)
+        transcription = await voice_service.transcribe_audio(
+            file=audio_file,
+            language=language,
+            enhance_food_terms=enhance_food_terms,
+            audio_info=audio_info
+        )
+        
+        logger.info(f"Voice processing step 1/2 complete for user {current_user.id}: transcription")
+        
+        return await build_voice_command_response(transcription, execute, current_user, parser, db)
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -236,8 +454,49 @@ async def process_voice_command(
         )
 
 
+@router.get("/jobs/{job_id}", response_model=VoiceJobResponse)
+async def get_voice_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status and, once finished, the result of a voice command job.
+    
+    Results are kept for VOICE_JOB_RESULT_TTL_SECONDS after the job finishes.
+    Any API worker can answer, whichever one runs the job.
+    """
+    job = await transcription_jobs.get(job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Voice job not found or expired")
+    
+    return VoiceJobResponse(**job)
+
+
+@router.post("/undo/{token}", response_model=VoiceUndoResponse)
+async def undo_voice_command(
+    token: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Undo a command applied by /process with execute=true.
+    
+    Tokens are single-use and expire after a few minutes.
+    """
+    restored = await voice_command_executor.undo(db, current_user.id, token)
+    if restored is None:
+        raise HTTPException(status_code=404, detail="Undo token not found or expired")
+    
+    logger.info(f"Voice command undone for user {current_user.id}: {len(restored)} items restored")
+    
+    return VoiceUndoResponse(items=[VoiceExecutedItem(**vars(item)) for item in restored])
+
+
 @router.get("/health")
-async def voice_service_health():
+async def voice_service_health(
+    parser: CommandParser = Depends(get_command_parser),
+    voice_service: VoiceService = Depends(get_voice_service)
+):
     """
     Check the health status of voice processing services.
     
@@ -245,20 +504,38 @@ async def voice_service_health():
     - Mistral Voxtral STT API connectivity
     - Voice service configuration
     - Supported audio formats and limits
+    - Shared HTTP connection pool metrics
+    - STT provider latency, errors and circuit state
+    - Background transcription job queue
     """
     try:
-        async with VoiceService() as voice_service:
-            health_status = await voice_service.health_check()
-            
-            # Add command parser status
-            parser = CommandParser()
-            health_status["command_parser"] = {
-                "status": "healthy",
-                "supported_actions": parser.get_supported_actions()
-            }
-            
-            return health_status
-            
+        health_status = await voice_service.health_check()
+        
+        # Add command parser status
+        health_status["command_parser"] = {
+            "status": "healthy",
+            "supported_actions": parser.get_supported_actions()
+        }
+        
+        # Add shared connection pool metrics
+        health_status["http_pool"] = http_clients.metrics("voxtral")
+        
+        # Add per-provider latency, error and circuit breaker state
+        health_status["stt_providers"] = voice_service.router.metrics()
+        
+        # Add background job queue metrics
+        health_status["transcription_jobs"] = transcription_jobs.metrics()
+        
+        # Add transcription cache metrics
+        if voice_service.cache is not None:
+            health_status["transcription_cache"] = voice_service.cache.metrics()
+        
+        # Add audio preprocessing metrics
+        if voice_service.preprocessor is not None:
+            health_status["preprocessing"] = voice_service.preprocessor.metrics()
+        
+        return health_status
+        
     except Exception as e:
         logger.error(f"Voice service health check failed: {e}")
         return {
@@ -299,10 +576,67 @@ async def get_supported_formats():
 
 
 # TTS endpoints for text-to-speech functionality
+async def build_tts_request(request: TTSSynthesisRequest, tts_service: TTSService) -> TTSRequest:
+    """
+    Resolve the voice and kitchen optimization for a synthesis request.
+    
+    Raises:
+        HTTPException: If the requested voice is not available, or no
+            voice matches the language and accent
+    """
+    # Without a requested voice, routing may use any provider's closest voice
+    flexible_voice = not request.voice_id
+    
+    # Get available voices to validate voice_id
+    if request.voice_id:
+        available_voices = await tts_service.get_available_voices(
+            language=request.language,
+            accent=request.accent
+        )
+        voice_ids = [v.id for v in available_voices]
+        if request.voice_id not in voice_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Voice ID '{request.voice_id}' not available. Available voices: {voice_ids}"
+            )
+    else:
+        # Auto-select best voice based on criteria
+        available_voices = await tts_service.get_available_voices(
+            language=request.language,
+            accent=request.accent
+        )
+        if not available_voices:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No voices available for language '{request.language}' and accent '{request.accent}'"
+            )
+        # Select highest naturalness score
+        best_voice = max(available_voices, key=lambda v: v.naturalness_score)
+        request.voice_id = best_voice.id
+    
+    # Optimize text for kitchen environment if requested
+    text = request.text
+    if request.optimize_for_kitchen:
+        text = tts_service.prepare_kitchen_optimized_text(text)
+        request.ssml = True
+    
+    return TTSRequest(
+        text=text,
+        voice_id=request.voice_id,
+        language=request.language,
+        speed=request.speed,
+        pitch=request.pitch,
+        accent=request.accent,
+        ssml=request.ssml,
+        flexible_voice=flexible_voice
+    )
+
+
 @router.post("/speak", response_model=TTSSynthesisResponse)
 async def synthesize_speech(
     request: TTSSynthesisRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service)
 ):
     """
     Convert text to speech using the best available TTS provider.
@@ -320,79 +654,36 @@ async def synthesize_speech(
     - Regional accent selection
     """
     try:
-        async with TTSService() as tts_service:
-            # Get available voices to validate voice_id
-            if request.voice_id:
-                available_voices = await tts_service.get_available_voices(
-                    language=request.language,
-                    accent=request.accent
-                )
-                voice_ids = [v.id for v in available_voices]
-                if request.voice_id not in voice_ids:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Voice ID '{request.voice_id}' not available. Available voices: {voice_ids}"
-                    )
-            else:
-                # Auto-select best voice based on criteria
-                available_voices = await tts_service.get_available_voices(
-                    language=request.language,
-                    accent=request.accent
-                )
-                if not available_voices:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"No voices available for language '{request.language}' and accent '{request.accent}'"
-                    )
-                # Select highest naturalness score
-                best_voice = max(available_voices, key=lambda v: v.naturalness_score)
-                request.voice_id = best_voice.id
-            
-            # Optimize text for kitchen environment if requested
-            text = request.text
-            if request.optimize_for_kitchen:
-                text = tts_service.prepare_kitchen_optimized_text(text)
-                request.ssml = True
-            
-            # Create TTS request
-            tts_request = TTSRequest(
-                text=text,
-                voice_id=request.voice_id,
-                language=request.language,
-                speed=request.speed,
-                pitch=request.pitch,
-                accent=request.accent,
-                ssml=request.ssml
-            )
-            
-            # Synthesize speech
-            result = await tts_service.synthesize(tts_request)
-            
-            # Convert result to response schema
-            import base64
-            
-            voice_response = TTSVoiceResponse(
-                id=result.voice_used.id,
-                name=result.voice_used.name,
-                language=result.voice_used.language,
-                gender=result.voice_used.gender.value,
-                accent=result.voice_used.accent,
-                provider=result.voice_used.provider.value if result.voice_used.provider else None,
-                naturalness_score=result.voice_used.naturalness_score
-            )
-            
-            logger.info(f"TTS synthesis completed for user {current_user.id}: {result.provider.value}, {result.processing_time_ms}ms")
-            
-            return TTSSynthesisResponse(
-                audio_data=base64.b64encode(result.audio_data).decode(),
-                audio_format=result.audio_format,
-                duration_ms=result.duration_ms,
-                voice_used=voice_response,
-                provider=result.provider.value,
-                processing_time_ms=result.processing_time_ms,
-                cache_hit=result.cache_hit
-            )
-            
+        tts_request = await build_tts_request(request, tts_service)
+        
+        # Synthesize speech
+        result = await tts_service.synthesize(tts_request)
+        
+        # Convert result to response schema
+        import base64
+        
+        voice_response = TTSVoiceResponse(
+            id=result.voice_used.id,
+            name=result.voice_used.name,
+            language=result.voice_used.language,
+            gender=result.voice_used.gender.value,
+            accent=result.voice_used.accent,
+            provider=result.voice_used.provider.value if result.voice_used.provider else None,
+            naturalness_score=result.voice_used.naturalness_score
+        )
+        
+        logger.info(f"TTS synthesis completed for user {current_user.id}: {result.provider.value}, {result.processing_time_ms}ms")
+        
+        return TTSSynthesisResponse(
+            audio_data=base64.b64encode(result.audio_data).decode(),
+            audio_format=result.audio_format,
+            duration_ms=result.duration_ms,
+            voice_used=voice_response,
+            provider=result.provider.value,
+            processing_time_ms=result.processing_time_ms,
+            cache_hit=result.cache_hit
+        )
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -403,12 +694,172 @@ async def synthesize_speech(
         )
 
 
+@router.post(
+    "/speak/audio",
+    response_class=FileResponse,
+    responses={200: {"content": {"audio/mpeg": {}}, "description": "Synthesized audio"}}
+)
+async def synthesize_speech_audio(
+    request: TTSSynthesisRequest,
+    current_user: User = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service)
+):
+    """
+    Convert text to speech and return the audio itself.
+    
+    Takes the same body as /speak, but responds with the audio instead of
+    base64 in JSON. With a TTS disk cache configured (TTS_CACHE_DIR), the
+    audio is served from the cached file without being loaded into memory.
+    
+    Response headers:
+    - X-TTS-Provider, X-TTS-Voice: provider and voice used
+    - X-TTS-Duration-Ms: estimated audio duration
+    - X-TTS-Cache: "hit" or "miss"
+    """
+    try:
+        tts_request = await build_tts_request(request, tts_service)
+        
+        result, path = await tts_service.synthesize_file(tts_request)
+        
+        headers = {
+            "X-TTS-Provider": result.provider.value,
+            "X-TTS-Voice": result.voice_used.id,
+            "X-TTS-Duration-Ms": str(result.duration_ms),
+            "X-TTS-Cache": "hit" if result.cache_hit else "miss",
+        }
+        media_type = audio_content_type(f"speech.{result.audio_format}")
+        
+        logger.info(f"TTS audio for user {current_user.id}: {result.provider.value}, cache_hit={result.cache_hit}")
+        
+        if path is not None:
+            return FileResponse(path, media_type=media_type, headers=headers)
+        return Response(content=result.audio_data, media_type=media_type, headers=headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS synthesis failed for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"TTS synthesis failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/speak/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"audio/mpeg": {}}, "description": "Synthesized audio, streamed"}}
+)
+async def synthesize_speech_stream(
+    request: TTSSynthesisRequest,
+    current_user: User = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service)
+):
+    """
+    Convert text to speech and stream the audio as it is synthesized.
+    
+    Takes the same body as /speak. Audio chunks are relayed from the
+    provider as they arrive, so playback can start before synthesis
+    finishes; use this for spoken confirmations where time to first
+    audio matters. Completed streams are cached like /speak results.
+    
+    Response headers:
+    - X-TTS-Provider, X-TTS-Voice: provider and voice used
+    - X-TTS-Cache: "hit" or "miss"
+    """
+    try:
+        tts_request = await build_tts_request(request, tts_service)
+        
+        stream = await tts_service.synthesize_stream(tts_request)
+        
+        headers = {
+            "X-TTS-Provider": stream.provider.value,
+            "X-TTS-Voice": stream.voice_used.id,
+            "X-TTS-Cache": "hit" if stream.cache_hit else "miss",
+        }
+        
+        logger.info(f"TTS stream started for user {current_user.id}: {stream.provider.value}, cache_hit={stream.cache_hit}")
+        
+        return StreamingResponse(
+            stream.chunks,
+            media_type=audio_content_type(f"speech.{stream.audio_format}"),
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS synthesis failed for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"TTS synthesis failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/speak/phrase",
+    response_class=Response,
+    responses={200: {"content": {"audio/mpeg": {}}, "description": "Synthesized phrase audio"}}
+)
+async def synthesize_phrase(
+    request: TTSPhraseRequest,
+    current_user: User = Depends(get_current_user),
+    phrases: TTSPhraseLibrary = Depends(get_tts_phrases)
+):
+    """
+    Speak a templated confirmation phrase.
+    
+    The template's fixed segments are pre-synthesized at startup and the
+    slot values (item names, quantities) are synthesized as short cached
+    fragments; the segments' MP3 frames are spliced into one response, so
+    common confirmations return without a full provider round-trip.
+    
+    Example body: {"template": "item_added", "values": {"quantity": 2, "item": "apples"}}
+    
+    Templates: see GET /voice/speak/phrases. Response headers match
+    /speak/audio.
+    """
+    try:
+        result = await phrases.render(request.template, request.values, voice_id=request.voice_id)
+        
+        headers = {
+            "X-TTS-Provider": result.provider.value,
+            "X-TTS-Voice": result.voice_used.id,
+            "X-TTS-Duration-Ms": str(result.duration_ms),
+            "X-TTS-Cache": "hit" if result.cache_hit else "miss",
+        }
+        
+        logger.info(f"TTS phrase '{request.template}' for user {current_user.id}: {result.processing_time_ms}ms, cache_hit={result.cache_hit}")
+        
+        return Response(
+            content=result.audio_data,
+            media_type=audio_content_type(f"speech.{result.audio_format}"),
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS phrase synthesis failed for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"TTS synthesis failed: {str(e)}"
+        )
+
+
+@router.get("/speak/phrases")
+async def get_phrase_templates():
+    """List the phrase templates available to /speak/phrase."""
+    return {"templates": PHRASE_TEMPLATES}
+
+
 @router.get("/voices", response_model=List[TTSVoiceResponse])
 async def get_available_voices(
     language: Optional[str] = None,
     accent: Optional[str] = None,
     provider: Optional[str] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    tts_service: TTSService = Depends(get_tts_service)
 ):
     """
     Get available TTS voices filtered by criteria.
@@ -422,45 +873,44 @@ async def get_available_voices(
     - provider: Filter by provider ('elevenlabs', 'google_cloud', 'amazon_polly')
     """
     try:
-        async with TTSService() as tts_service:
-            # Convert provider string to enum if provided
-            provider_enum = None
-            if provider:
-                try:
-                    provider_enum = TTSProvider(provider)
-                except ValueError:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid provider '{provider}'. Valid providers: {[p.value for p in TTSProvider]}"
-                    )
-            
-            # Get available voices
-            voices = await tts_service.get_available_voices(
-                language=language,
-                accent=accent,
-                provider=provider_enum
-            )
-            
-            # Convert to response schema and sort by naturalness
-            voice_responses = [
-                TTSVoiceResponse(
-                    id=voice.id,
-                    name=voice.name,
-                    language=voice.language,
-                    gender=voice.gender.value,
-                    accent=voice.accent,
-                    provider=voice.provider.value if voice.provider else None,
-                    naturalness_score=voice.naturalness_score
+        # Convert provider string to enum if provided
+        provider_enum = None
+        if provider:
+            try:
+                provider_enum = TTSProvider(provider)
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid provider '{provider}'. Valid providers: {[p.value for p in TTSProvider]}"
                 )
-                for voice in voices
-            ]
-            
-            # Sort by naturalness score (highest first)
-            voice_responses.sort(key=lambda v: v.naturalness_score, reverse=True)
-            
-            logger.info(f"Retrieved {len(voice_responses)} voices for user {current_user.id}")
-            return voice_responses
-            
+        
+        # Get available voices
+        voices = await tts_service.get_available_voices(
+            language=language,
+            accent=accent,
+            provider=provider_enum
+        )
+        
+        # Convert to response schema and sort by naturalness
+        voice_responses = [
+            TTSVoiceResponse(
+                id=voice.id,
+                name=voice.name,
+                language=voice.language,
+                gender=voice.gender.value,
+                accent=voice.accent,
+                provider=voice.provider.value if voice.provider else None,
+                naturalness_score=voice.naturalness_score
+            )
+            for voice in voices
+        ]
+        
+        # Sort by naturalness score (highest first)
+        voice_responses.sort(key=lambda v: v.naturalness_score, reverse=True)
+        
+        logger.info(f"Retrieved {len(voice_responses)} voices for user {current_user.id}")
+        return voice_responses
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -472,43 +922,49 @@ async def get_available_voices(
 
 
 @router.get("/tts-health", response_model=TTSHealthResponse)
-async def tts_service_health():
+async def tts_service_health(tts_service: TTSService = Depends(get_tts_service)):
     """
     Check the health status of TTS services and providers.
     
     Returns detailed status information for each configured TTS provider,
-    including latency scores, naturalness ratings, and configuration status.
+    including measured latency percentiles, recent error rate and circuit
+    state from live traffic, naturalness ratings, and configuration status.
     
     Useful for monitoring TTS service availability and selecting optimal providers.
     """
     try:
-        async with TTSService() as tts_service:
-            health_status = await tts_service.health_check()
-            
-            # Convert to response schema
-            from ..schemas import TTSProviderStatus
-            
-            providers = {}
-            for provider_name, status_data in health_status["providers"].items():
-                providers[provider_name] = TTSProviderStatus(
-                    status=status_data["status"],
-                    latency_score=status_data.get("latency_score"),
-                    naturalness_score=status_data.get("naturalness_score"),
-                    error=status_data.get("error"),
-                    note=status_data.get("note")
-                )
-            
-            return TTSHealthResponse(
-                service=health_status["service"],
-                status=health_status["status"],
-                providers=providers,
-                preferred_provider=health_status["preferred_provider"],
-                cache_size=health_status["cache_size"],
-                supported_languages=health_status["supported_languages"],
-                supported_accents=health_status["supported_accents"],
-                message=health_status.get("message")
+        health_status = await tts_service.health_check()
+        
+        # Convert to response schema
+        from ..schemas import TTSProviderStatus
+        
+        providers = {}
+        for provider_name, status_data in health_status["providers"].items():
+            providers[provider_name] = TTSProviderStatus(
+                status=status_data["status"],
+                latency_score=status_data.get("latency_score"),
+                naturalness_score=status_data.get("naturalness_score"),
+                error=status_data.get("error"),
+                note=status_data.get("note"),
+                stats=status_data.get("stats")
             )
-            
+        
+        return TTSHealthResponse(
+            service=health_status["service"],
+            status=health_status["status"],
+            providers=providers,
+            preferred_provider=health_status["preferred_provider"],
+            cache_size=health_status["cache_size"],
+            cache=health_status.get("cache"),
+            phrases=(await get_tts_phrases()).metrics(),
+            streaming=health_status.get("streaming"),
+            coalescing=health_status.get("coalescing"),
+            supported_languages=health_status["supported_languages"],
+            supported_accents=health_status["supported_accents"],
+            message=health_status.get("message"),
+            http_pool=http_clients.metrics("tts")
+        )
+        
     except Exception as e:
         logger.error(f"TTS service health check failed: {e}")
         raise HTTPException(
@@ -517,20 +973,117 @@ async def tts_service_health():
         )
 
 
-# Streaming endpoint (future implementation)
-@router.post("/stream")
-async def process_streaming_audio(
-    current_user: User = Depends(get_current_user)
+@router.websocket("/stream")
+async def stream_voice_command(
+    websocket: WebSocket,
+    db: AsyncSession = Depends(get_async_session),
+    parser: CommandParser = Depends(get_command_parser),
+    backend: StreamingSTTBackend = Depends(get_streaming_stt_backend)
 ):
     """
-    Process streaming audio for real-time voice commands.
+    Real-time voice commands over a WebSocket.
     
-    This endpoint is reserved for future implementation of real-time
-    audio streaming and processing capabilities.
+    Authenticate with a ``token`` query parameter or a Bearer header.
+    Optional query parameters: ``language``, ``encoding`` (pcm_s16le,
+    webm, ogg; default pcm_s16le), ``sample_rate`` (default 16000) and
+    ``channels`` (default 1).
     
-    Currently returns a not implemented error.
+    Protocol:
+    - Server sends ``{"type": "ready"}`` once the STT session is open
+    - Client sends audio frames as binary messages while recording, then
+      ``{"type": "end"}`` as a text message at end of speech
+    - When partials are enabled, server sends ``{"type": "partial", "text": ...}``
+      during speech; then ``{"type": "final", ...}`` and
+      ``{"type": "command", ...}`` (the parsed command) and closes the connection
+    - Errors are sent as ``{"type": "error", "detail": ...}`` before closing
     """
-    raise HTTPException(
-        status_code=501,
-        detail="Streaming audio processing not yet implemented. Use /process endpoint for file-based processing."
-    )
+    user = await get_websocket_user(websocket, db)
+    await db.close()
+    
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    params = websocket.query_params
+    try:
+        audio_format = AudioFormat(
+            encoding=params.get("encoding", "pcm_s16le"),
+            sample_rate=int(params.get("sample_rate", 16000)),
+            channels=int(params.get("channels", 1))
+        )
+    except ValueError as e:
+        await websocket.accept()
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+    
+    await websocket.accept()
+    try:
+        session = await backend.open_session(audio_format, language=params.get("language"))
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    await websocket.send_json({"type": "ready", "backend": backend.name})
+    
+    max_bytes = settings.voice_streaming_max_seconds * audio_format.bytes_per_second
+    end_of_speech = None
+    
+    async def receive_audio() -> bool:
+        """Forward frames until end of speech (True) or disconnect (False)."""
+        nonlocal end_of_speech
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return False
+            if message.get("bytes") is not None:
+                if session.bytes_received + len(message["bytes"]) > max_bytes:
+                    end_of_speech = time.perf_counter()
+                    await session.finish()
+                    return True
+                await session.send_audio(message["bytes"])
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    control = {"type": message["text"]}
+                if control.get("type") == "end":
+                    end_of_speech = time.perf_counter()
+                    await session.finish()
+                    return True
+    
+    async def send_transcripts() -> None:
+        try:
+            async for transcript in session.transcripts():
+                if not transcript.is_final:
+                    await websocket.send_json({"type": "partial", "text": transcript.text})
+                    continue
+                
+                await websocket.send_json({
+                    "type": "final",
+                    "text": transcript.text,
+                    "confidence": transcript.confidence,
+                    "language_detected": transcript.language_detected,
+                    "latency_ms": int((time.perf_counter() - end_of_speech) * 1000) if end_of_speech else None
+                })
+                result = parser.parse_command(transcript.text)
+                await websocket.send_json({"type": "command", **result.to_dict()})
+                logger.info(f"Streamed voice command for user {user.id}: {result.action.value}")
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "detail": e.detail})
+        except Exception as e:
+            logger.error(f"Streaming transcription failed for user {user.id}: {e}")
+            await websocket.send_json({"type": "error", "detail": "Streaming transcription failed"})
+    
+    receiver = asyncio.create_task(receive_audio())
+    sender = asyncio.create_task(send_transcripts())
+    try:
+        done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+        if sender in done or receiver.result():
+            await sender
+            await websocket.close()
+    finally:
+        for task in (receiver, sender):
+            task.cancel()
+        await asyncio.gather(receiver, sender, return_exceptions=True)
+        await session.aclose()
@@ -205,6 +205,8 @@ class PantryItemResponse(PantryItemBase):
     category_id: int | None = None
     added_by_user_id: int
     item_metadata: dict[str, Any] = {}
+    base_quantity: float | None = None
+    base_unit: str | None = None
     created_at: datetime
 
     # Relationships
@@ -214,6 +216,14 @@ class PantryItemResponse(PantryItemBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PantryItemTotal(BaseModel):
+    """Total quantity of an item across a household, in its base unit."""
+    name: str
+    base_quantity: float
+    base_unit: str
+    item_count: int
+
+
 # Voice processing schemas
 class VoiceTranscriptionRequest(BaseModel):
     """Schema for voice transcription request metadata."""
@@ -228,6 +238,17 @@ class VoiceTranscriptionResponse(BaseModel):
     language_detected: str | None = None
     processing_time_ms: int
     audio_duration_ms: int
+    cached: bool = False
+
+
+class PantryItemMatch(BaseModel):
+    """Schema for a pantry item a parsed entity may refer to."""
+    item_id: UUID
+    name: str
+    score: float
+    quantity: float | None = None
+    unit: str | None = None
+    location: str | None = None
 
 
 class PantryActionEntity(BaseModel):
@@ -238,6 +259,7 @@ class PantryActionEntity(BaseModel):
     location: str | None = None
     expiration_date: date | None = None
     confidence: float = 1.0
+    matches: List[PantryItemMatch] | None = None  # Resolved pantry items, best first
 
 
 class PantryActionCommand(BaseModel):
@@ -250,14 +272,57 @@ class PantryActionCommand(BaseModel):
     metadata: Dict[str, Any] | None = None
 
 
+class VoiceBatchParseRequest(BaseModel):
+    """Schema for batch voice command parsing request."""
+    texts: List[str]
+
+
+class VoiceExecutedItem(BaseModel):
+    """Schema for a pantry item touched by an executed voice command."""
+    item_id: UUID
+    name: str
+    operation: str  # created, updated, deleted, matched
+    quantity: float | None = None
+    unit: str | None = None
+    location: str | None = None
+    expiration_date: date | None = None
+
+
+class VoiceExecutionResponse(BaseModel):
+    """Schema for the result of executing a voice command server-side."""
+    applied: bool
+    items: List[VoiceExecutedItem] = []
+    unresolved: List[str] = []  # Entity names with no matching pantry item
+    errors: List[str] = []
+    undo_token: str | None = None
+    undo_expires_at: datetime | None = None
+
+
+class VoiceUndoResponse(BaseModel):
+    """Schema for undoing an executed voice command."""
+    items: List[VoiceExecutedItem]
+
+
 class VoiceCommandResponse(BaseModel):
     """Schema for complete voice command processing response."""
     transcription: VoiceTranscriptionResponse
     command: PantryActionCommand
     success: bool
     message: str | None = None
+    execution: VoiceExecutionResponse | None = None  # Present when execute=true
+
 
 
+class VoiceJobResponse(BaseModel):
+    """Schema for a voice command processed as a background job."""
+    job_id: str
+    status: str  # queued, running, succeeded, failed
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: VoiceCommandResponse | None = None  # Present when succeeded
+    error: Dict[str, Any] | None = None  # status_code and detail when failed
+
 # TTS schemas
 class TTSVoiceResponse(BaseModel):
     """Schema for TTS voice information."""
@@ -305,6 +370,13 @@ class TTSSynthesisRequest(BaseModel):
         return v
 
 
+class TTSPhraseRequest(BaseModel):
+    """Schema for rendering a templated TTS phrase."""
+    template: str  # e.g. item_added, item_expires_tomorrow
+    values: Dict[str, str | int | float] = {}
+    voice_id: str | None = None
+
+
 class TTSSynthesisResponse(BaseModel):
     """Schema for TTS synthesis response."""
     audio_data: str  # Base64 encoded audio
@@ -323,6 +395,7 @@ class TTSProviderStatus(BaseModel):
     naturalness_score: int | None = None
     error: str | None = None
     note: str | None = None
+    stats: Dict[str, Any] | None = None  # Rolling latency, error rate and circuit state
 
 
 class TTSHealthResponse(BaseModel):
@@ -332,9 +405,14 @@ class TTSHealthResponse(BaseModel):
     providers: Dict[str, TTSProviderStatus]
     preferred_provider: str | None = None
     cache_size: int
+    cache: Dict[str, Any] | None = None  # Hit rate, bytes and evictions
+    phrases: Dict[str, Any] | None = None  # Phrase splicing and pre-warm counters
+    streaming: Dict[str, Any] | None = None  # Streaming synthesis counters
+    coalescing: Dict[str, Any] | None = None  # Identical concurrent syntheses sharing a provider call
     supported_languages: List[str]
     supported_accents: List[str]
     message: str | None = None
+    http_pool: Dict[str, Any] | None = None  # Shared connection pool metrics
 
 
 # Recipe schemas
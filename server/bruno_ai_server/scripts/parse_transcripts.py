@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Batch Transcript Parsing Script
+
+Re-runs the voice command parser over stored transcripts and writes one
+NDJSON result per transcript, in input order. Parsing is spread across a
+pool of worker processes.
+
+Usage:
+    python parse_transcripts.py INPUT [--output FILE] [--workers N] [--field NAME]
+
+INPUT is a text file with one transcript per line, a JSONL file (use
+--field to pick the transcript field), or "-" for stdin.
+
+Options:
+    --output FILE   Write NDJSON results to FILE instead of stdout
+    --workers N     Worker processes (default: VOICE_BATCH_PARSE_WORKERS)
+    --chunk-size N  Transcripts sent to a worker at a time
+    --field NAME    Read transcripts from this field of JSONL input
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add server directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from bruno_ai_server.services.batch_parser import BatchCommandParser  # noqa: E402
+
+
+def read_transcripts(stream, field=None):
+    """Yield transcripts from a text or JSONL stream."""
+    for line in stream:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        if field:
+            yield json.loads(line)[field]
+        else:
+            yield line
+
+
+def main():
+    """Main entry point for batch transcript parsing."""
+    parser = argparse.ArgumentParser(
+        description='Parse stored voice transcripts into pantry commands'
+    )
+    parser.add_argument('input', help='Transcript file, or - for stdin')
+    parser.add_argument('--output', '-o', help='NDJSON output file (default: stdout)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Transcripts per worker task')
+    parser.add_argument('--field', help='Transcript field for JSONL input')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+
+    if args.workers is None:
+        from bruno_ai_server.config import settings
+        args.workers = settings.voice_batch_parse_workers
+
+    batch_parser = BatchCommandParser(max_workers=args.workers, chunk_size=args.chunk_size)
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    sink = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    start_time = time.perf_counter()
+    count = 0
+    try:
+        for index, result in enumerate(batch_parser.iter_parse(read_transcripts(source, args.field))):
+            sink.write(json.dumps({"index": index, **result}) + "\n")
+            count += 1
+    finally:
+        batch_parser.shutdown()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start_time
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Parsed {count} transcripts in {elapsed:.2f}s ({rate:.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
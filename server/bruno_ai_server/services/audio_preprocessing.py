@@ -0,0 +1,299 @@
+"""
+Server-side audio preprocessing before speech-to-text.
+
+This service handles:
+- Decoding WAV uploads and downmixing them to mono
+- Resampling to 16 kHz (anti-aliased) since STT models work at that rate
+- Trimming leading and trailing silence with an energy-based VAD
+- Re-encoding as compact 16-bit mono WAV, shrinking phone recordings
+  (44.1/48 kHz stereo) several-fold before upload
+
+NumPy is an optional dependency (the "audio" extra). Without it, and for
+compressed formats that would need a codec library, audio is uploaded
+unchanged. The DSP runs in a worker thread to stay off the event loop,
+with a bounded number of files buffered and processed at once.
+"""
+
+import asyncio
+import importlib.util
+import io
+import logging
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from .audio_upload import AudioSource
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# VAD analysis frame and padding kept around detected speech
+VAD_FRAME_MS = 30
+VAD_PADDING_MS = 200
+# Frames this far above the clip's noise floor count as speech
+VAD_NOISE_MARGIN_DB = 10.0
+
+# Anti-aliasing filter length for downsampling
+_RESAMPLE_TAPS = 101
+
+
+class AudioDecodeError(ValueError):
+    """Raised when audio cannot be decoded for preprocessing."""
+
+
+@dataclass
+class PreprocessedAudio:
+    """Audio after preprocessing."""
+    data: bytes
+    sample_rate: int
+    duration_ms: int
+    trimmed_ms: int
+    original_bytes: int
+
+
+def _decode_wav(data: bytes):
+    """Decode PCM WAV bytes to a float32 array of shape (frames, channels)."""
+    import numpy as np
+
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            sample_rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise AudioDecodeError(f"Unreadable WAV file: {e}")
+
+    if sample_width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8) | (raw[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608
+    elif sample_width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise AudioDecodeError(f"Unsupported WAV sample width: {sample_width} bytes")
+
+    usable = len(samples) - len(samples) % channels
+    return samples[:usable].reshape(-1, channels), sample_rate
+
+
+def _encode_wav(samples, sample_rate: int) -> bytes:
+    """Encode a mono float array as 16-bit PCM WAV."""
+    import numpy as np
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def _fft_convolve_same(signal, kernel):
+    """Convolve via FFT, returning output aligned with the input."""
+    import numpy as np
+
+    size = len(signal) + len(kernel) - 1
+    nfft = 1 << (size - 1).bit_length()
+    result = np.fft.irfft(np.fft.rfft(signal, nfft) * np.fft.rfft(kernel, nfft), nfft)
+    start = (len(kernel) - 1) // 2
+    return result[start:start + len(signal)]
+
+
+def resample(samples, orig_rate: int, target_rate: int):
+    """
+    Resample a mono float array.
+
+    Downsampling first applies a windowed-sinc low-pass just below the
+    new Nyquist frequency so higher frequencies do not alias.
+    """
+    import numpy as np
+
+    if orig_rate == target_rate or len(samples) == 0:
+        return samples
+
+    if target_rate < orig_rate:
+        cutoff = 0.5 * target_rate / orig_rate * 0.9
+        n = np.arange(_RESAMPLE_TAPS) - (_RESAMPLE_TAPS - 1) / 2
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(_RESAMPLE_TAPS)
+        samples = _fft_convolve_same(samples, kernel / kernel.sum())
+
+    out_len = int(round(len(samples) * target_rate / orig_rate))
+    positions = np.arange(out_len) * (orig_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def trim_silence(samples, sample_rate: int, threshold_db: float):
+    """
+    Trim leading and trailing silence with an energy-based VAD.
+
+    A frame counts as speech when its RMS level is above both
+    threshold_db (dBFS) and the clip's noise floor plus a margin. Silence
+    inside the utterance is kept so pauses between words survive. Clips
+    with no detected speech are returned unchanged.
+
+    Returns:
+        Tuple of (trimmed samples, milliseconds removed)
+    """
+    import numpy as np
+
+    frame_len = sample_rate * VAD_FRAME_MS // 1000
+    frame_count = len(samples) // frame_len
+    if frame_count < 2:
+        return samples, 0
+
+    frames = samples[:frame_count * frame_len].reshape(frame_count, frame_len)
+    levels_db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    noise_floor_db = np.percentile(levels_db, 10)
+    voiced = np.flatnonzero(levels_db > max(threshold_db, noise_floor_db + VAD_NOISE_MARGIN_DB))
+    if len(voiced) == 0:
+        return samples, 0
+
+    padding = sample_rate * VAD_PADDING_MS // 1000
+    start = max(0, voiced[0] * frame_len - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame_len + padding)
+    trimmed_ms = (len(samples) - (end - start)) * 1000 // sample_rate
+    return samples[start:end], trimmed_ms
+
+
+class AudioPreprocessor:
+    """
+    Normalizes uploads to compact mono 16 kHz WAV before transcription.
+
+    Only WAV input is decoded; other formats and files larger than
+    max_input_bytes are passed through untouched, as is anything that
+    fails to decode. At most max_concurrency files are held in memory
+    and processed at a time; further uploads wait their turn, so a burst
+    cannot fill the default thread pool or buffer unbounded audio.
+    """
+
+    def __init__(
+        self,
+        target_sample_rate: Optional[int] = None,
+        max_input_bytes: Optional[int] = None,
+        silence_threshold_db: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        self.target_sample_rate = target_sample_rate or settings.voice_preprocess_sample_rate
+        self.max_input_bytes = max_input_bytes or settings.voice_preprocess_max_bytes
+        self.silence_threshold_db = (
+            settings.voice_preprocess_silence_threshold_db if silence_threshold_db is None else silence_threshold_db
+        )
+        requested = settings.voice_preprocess_enabled if enabled is None else enabled
+        self.enabled = requested and NUMPY_AVAILABLE
+        if requested and not NUMPY_AVAILABLE:
+            logger.warning("Audio preprocessing requested but numpy is not installed - uploading audio unchanged")
+        self.max_concurrency = max_concurrency or settings.voice_preprocess_max_concurrency
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.in_progress = 0
+        self.waiting = 0
+
+        self.files_processed = 0
+        self.files_skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.trimmed_ms = 0
+
+    def accepts(self, source: AudioSource) -> bool:
+        """Whether the source is a WAV file small enough to preprocess."""
+        return (
+            self.enabled
+            and Path(source.filename).suffix.lower() == ".wav"
+            and source.size is not None
+            and source.size <= self.max_input_bytes
+        )
+
+    def process_wav(self, data: bytes) -> PreprocessedAudio:
+        """
+        Decode, downmix, resample, trim and re-encode WAV audio.
+
+        CPU-bound; call through process() or a worker thread.
+
+        Raises:
+            AudioDecodeError: If the WAV file cannot be decoded
+        """
+        samples, sample_rate = _decode_wav(data)
+        mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+        mono = resample(mono, sample_rate, self.target_sample_rate)
+        mono, trimmed_ms = trim_silence(mono, self.target_sample_rate, self.silence_threshold_db)
+        return PreprocessedAudio(
+            data=_encode_wav(mono, self.target_sample_rate),
+            sample_rate=self.target_sample_rate,
+            duration_ms=len(mono) * 1000 // self.target_sample_rate,
+            trimmed_ms=trimmed_ms,
+            original_bytes=len(data),
+        )
+
+    async def process(self, source: AudioSource) -> AudioSource:
+        """
+        Preprocess audio off the event loop if it is supported.
+
+        Args:
+            source: Audio to transcribe
+
+        Returns:
+            A source with the preprocessed audio, or the original source
+            when preprocessing does not apply or fails
+
+        Raises:
+            AudioTooLargeError: If the audio exceeds the source's size limit
+        """
+        if not self.accepts(source):
+            self.files_skipped += 1
+            return source
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_progress += 1
+        try:
+            data = b"".join([chunk async for chunk in source.iter_chunks()])
+            result = await asyncio.to_thread(self.process_wav, data)
+        except AudioDecodeError as e:
+            logger.warning(f"Skipping preprocessing of {source.filename}: {e}")
+            self.files_skipped += 1
+            return source
+        finally:
+            self.in_progress -= 1
+            self._slots.release()
+
+        self.files_processed += 1
+        self.bytes_in += result.original_bytes
+        self.bytes_out += len(result.data)
+        self.trimmed_ms += result.trimmed_ms
+        logger.info(
+            f"Preprocessed {source.filename}: {result.original_bytes} -> {len(result.data)} bytes, "
+            f"{result.trimmed_ms}ms silence trimmed"
+        )
+        return AudioSource.from_bytes(result.data, source.filename, max_size=source.max_size)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "target_sample_rate": self.target_sample_rate,
+            "max_concurrency": self.max_concurrency,
+            "in_progress": self.in_progress,
+            "waiting": self.waiting,
+            "files_processed": self.files_processed,
+            "files_skipped": self.files_skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "trimmed_ms": self.trimmed_ms,
+        }
+
+
+# Global preprocessor instance
+audio_preprocessor = AudioPreprocessor()
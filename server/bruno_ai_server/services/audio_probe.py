@@ -0,0 +1,325 @@
+"""
+Audio container header parsing.
+
+This service handles:
+- Identifying WAV, FLAC, OGG (Vorbis/Opus), MP3, M4A and WebM audio from
+  magic bytes rather than the file extension
+- Reading codec, sample rate, channels and duration from container
+  headers, touching only a few KB (plus box/chunk headers and, for OGG,
+  the last page) instead of the whole file
+
+Probing lets uploads be rejected as too long or mislabeled before the
+body is streamed to the STT provider.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Tuple
+
+# Bytes read from the start of the file for format detection
+PROBE_HEAD_BYTES = 4096
+# Bytes read from the end of an OGG file to find the last granule position
+OGG_TAIL_BYTES = 65536
+# Bytes scanned for the first MP3 frame after any ID3 tag
+MP3_SYNC_SCAN_BYTES = 16384
+# Max top-level MP4 boxes walked looking for moov
+_MAX_MP4_BOXES = 64
+
+ReadAt = Callable[[int, int], Awaitable[bytes]]
+
+
+class AudioProbeError(ValueError):
+    """Raised when a recognized container has a corrupt header."""
+
+
+@dataclass
+class AudioInfo:
+    """Audio properties read from container headers."""
+    format: str  # wav, flac, ogg, mp3, m4a, webm
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    duration_seconds: Optional[float] = None
+
+
+def id3v2_size(head: bytes) -> int:
+    """Length of a leading ID3v2 tag, or 0 if there is none."""
+    if len(head) < 10 or not head.startswith(b"ID3"):
+        return 0
+    size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+async def _probe_wav(read_at: ReadAt, head: bytes, size: Optional[int]) -> AudioInfo:
+    info = AudioInfo(format="wav")
+    byte_rate = None
+    offset = 12
+    while size is None or offset + 8 <= size:
+        header = head[offset:offset + 8] if offset + 8 <= len(head) else await read_at(offset, 8)
+        if len(header) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        if chunk_id == b"fmt ":
+            fmt = await read_at(offset + 8, 16)
+            if len(fmt) < 16:
+                raise AudioProbeError("Truncated WAV fmt chunk")
+            audio_format, info.channels, info.sample_rate, byte_rate = struct.unpack("<HHII", fmt[:12])
+            info.codec = "pcm" if audio_format in (1, 0xFFFE) else f"wav-0x{audio_format:04x}"
+        elif chunk_id == b"data":
+            if not byte_rate:
+                raise AudioProbeError("WAV data chunk before fmt chunk")
+            data_size = chunk_size
+            if size is not None and (data_size in (0, 0xFFFFFFFF) or offset + 8 + data_size > size):
+                # Streaming writers leave the size unset; use what was uploaded
+                data_size = size - offset - 8
+            info.duration_seconds = data_size / byte_rate
+            return info
+        offset += 8 + chunk_size + (chunk_size & 1)
+    if not byte_rate:
+        raise AudioProbeError("WAV file has no fmt chunk")
+    return info
+
+
+def _probe_flac_streaminfo(block: bytes, info: AudioInfo) -> AudioInfo:
+    if len(block) < 18:
+        raise AudioProbeError("Truncated FLAC STREAMINFO block")
+    packed = int.from_bytes(block[10:18], "big")
+    info.codec = "flac"
+    info.sample_rate = packed >> 44
+    info.channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if info.sample_rate and total_samples:
+        info.duration_seconds = total_samples / info.sample_rate
+    return info
+
+
+async def _probe_ogg(read_at: ReadAt, head: bytes, size: Optional[int]) -> AudioInfo:
+    info = AudioInfo(format="ogg")
+    if len(head) < 27:
+        raise AudioProbeError("Truncated OGG page")
+    segments = head[26]
+    packet = head[27 + segments:]
+    pre_skip = 0
+    if packet.startswith(b"OpusHead") and len(packet) >= 16:
+        info.codec = "opus"
+        info.channels = packet[9]
+        pre_skip = struct.unpack("<H", packet[10:12])[0]
+        info.sample_rate = struct.unpack("<I", packet[12:16])[0] or 48000
+        granule_rate = 48000  # Opus granule positions are always at 48 kHz
+    elif packet.startswith(b"\x01vorbis") and len(packet) >= 16:
+        info.codec = "vorbis"
+        info.channels = packet[11]
+        info.sample_rate = struct.unpack("<I", packet[12:16])[0]
+        granule_rate = info.sample_rate
+    elif packet.startswith(b"\x7fFLAC") and len(packet) >= 13 + 18:
+        _probe_flac_streaminfo(packet[17:], info)
+        info.duration_seconds = None
+        granule_rate = info.sample_rate
+    else:
+        return info
+
+    if size is None or not granule_rate:
+        return info
+    tail_offset = max(0, size - OGG_TAIL_BYTES)
+    tail = await read_at(tail_offset, size - tail_offset)
+    last_page = tail.rfind(b"OggS")
+    if last_page != -1 and last_page + 14 <= len(tail):
+        granule = struct.unpack("<q", tail[last_page + 6:last_page + 14])[0]
+        if granule > 0:
+            info.duration_seconds = max(0, granule - pre_skip) / granule_rate
+    return info
+
+
+# MPEG audio tables indexed by version: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_MP3_BITRATES = {
+    (3, 3): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (3, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (3, 1): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 3): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 1): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+def parse_mp3_header(header: bytes) -> Optional[dict]:
+    """Decode a 4-byte MPEG audio frame header, or None if it is not one."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x3
+    layer = (header[1] >> 1) & 0x3
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x3
+    if version == 1 or layer == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[(3 if version == 3 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    if layer == 3:
+        samples_per_frame = 384
+    elif layer == 2 or version == 3:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+    slot_bytes = 4 if layer == 3 else 1
+    frame_length = (samples_per_frame // 8 * bitrate // sample_rate // slot_bytes + ((header[2] >> 1) & 0x1)) * slot_bytes
+    return {
+        "version": version,
+        "layer": 4 - layer,
+        "frame_length": frame_length,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channels": 1 if header[3] >> 6 == 3 else 2,
+        "samples_per_frame": samples_per_frame,
+    }
+
+
+def mp3_info_tag(frame_data: bytes, frame: dict) -> Optional[Tuple[bytes, Optional[int]]]:
+    """
+    Find a Xing/Info or VBRI tag in an MP3 frame.
+
+    Encoders put these in a silent first frame to describe the whole file
+    (frame count, seek table) for VBR duration and seeking.
+
+    Args:
+        frame_data: Bytes starting at the frame header
+        frame: The frame's decoded header from parse_mp3_header
+
+    Returns:
+        Tuple of (tag name, frame count if the tag has one), or None if
+        the frame carries audio
+    """
+    if frame["version"] == 3:
+        side_info = 17 if frame["channels"] == 1 else 32
+    else:
+        side_info = 9 if frame["channels"] == 1 else 17
+    xing = frame_data[4 + side_info:4 + side_info + 12]
+    vbri = frame_data[36:36 + 18]
+    if xing[:4] in (b"Xing", b"Info"):
+        has_frames = len(xing) >= 12 and struct.unpack(">I", xing[4:8])[0] & 0x1
+        return xing[:4], struct.unpack(">I", xing[8:12])[0] if has_frames else None
+    if vbri[:4] == b"VBRI":
+        return vbri[:4], struct.unpack(">I", vbri[14:18])[0] if len(vbri) >= 18 else None
+    return None
+
+
+async def _probe_mp3(read_at: ReadAt, offset: int, size: Optional[int]) -> Optional[AudioInfo]:
+    scan = await read_at(offset, MP3_SYNC_SCAN_BYTES)
+    position = scan.find(b"\xff")
+    frame = None
+    while position != -1 and position + 4 <= len(scan):
+        frame = parse_mp3_header(scan[position:position + 4])
+        if frame is not None:
+            # Require the next frame to follow where this one ends, so
+            # stray 0xFF bytes in non-MP3 data are not taken for a sync word
+            next_position = position + frame["frame_length"]
+            if next_position + 4 > len(scan) or parse_mp3_header(scan[next_position:next_position + 4]):
+                break
+            frame = None
+        position = scan.find(b"\xff", position + 1)
+    if frame is None:
+        return None
+
+    info = AudioInfo(
+        format="mp3",
+        codec=f"mp{frame['layer']}",
+        sample_rate=frame["sample_rate"],
+        channels=frame["channels"],
+    )
+
+    # VBR files carry a frame count in a Xing/Info or VBRI header
+    tag = mp3_info_tag(scan[position:position + frame["frame_length"]], frame)
+    frames = tag[1] if tag else None
+
+    if frames:
+        info.duration_seconds = frames * frame["samples_per_frame"] / frame["sample_rate"]
+    elif size is not None:
+        # Constant bitrate: duration follows from the audio byte count
+        info.duration_seconds = (size - offset - position) * 8 / frame["bitrate"]
+    return info
+
+
+async def _read_box_header(read_at: ReadAt, offset: int):
+    header = await read_at(offset, 16)
+    if len(header) < 8:
+        return None
+    box_size, box_type = struct.unpack(">I4s", header[:8])
+    header_size = 8
+    if box_size == 1:
+        if len(header) < 16:
+            return None
+        box_size = struct.unpack(">Q", header[8:16])[0]
+        header_size = 16
+    return box_size, box_type, header_size
+
+
+async def _probe_m4a(read_at: ReadAt, head: bytes, size: Optional[int]) -> AudioInfo:
+    info = AudioInfo(format="m4a", codec=head[8:12].decode("latin-1").strip() or None)
+    offset = 0
+    for _ in range(_MAX_MP4_BOXES):
+        box = await _read_box_header(read_at, offset)
+        if box is None:
+            break
+        box_size, box_type, header_size = box
+        if box_type == b"moov":
+            end = offset + box_size if box_size else size
+            child = offset + header_size
+            while end is None or child + 8 <= end:
+                child_box = await _read_box_header(read_at, child)
+                if child_box is None:
+                    break
+                child_size, child_type, child_header = child_box
+                if child_type == b"mvhd":
+                    mvhd = await read_at(child + child_header, 32)
+                    if mvhd[:1] == b"\x01":
+                        timescale, duration = struct.unpack(">IQ", mvhd[20:32])
+                    else:
+                        timescale, duration = struct.unpack(">II", mvhd[12:20])
+                    if timescale:
+                        info.duration_seconds = duration / timescale
+                    return info
+                if child_size < child_header:
+                    break
+                child += child_size
+            raise AudioProbeError("M4A moov box has no mvhd")
+        if box_size == 0 or box_size < header_size:
+            break
+        offset += box_size
+    return info
+
+
+async def probe_audio(read_at: ReadAt, size: Optional[int] = None) -> Optional[AudioInfo]:
+    """
+    Identify audio and read its properties from container headers.
+
+    Args:
+        read_at: Coroutine function reading (offset, length) bytes
+        size: Total file size, needed for some duration estimates
+
+    Returns:
+        AudioInfo (with duration None when the header does not say), or
+        None if the content is not a recognized audio container
+
+    Raises:
+        AudioProbeError: If a recognized container has a corrupt header
+    """
+    head = await read_at(0, PROBE_HEAD_BYTES)
+
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return await _probe_wav(read_at, head, size)
+    if head[:4] == b"OggS":
+        return await _probe_ogg(read_at, head, size)
+    if head[4:8] == b"ftyp":
+        return await _probe_m4a(read_at, head, size)
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return AudioInfo(format="webm", codec=None)
+
+    audio_offset = id3v2_size(head)
+    marker = head[audio_offset:audio_offset + 4] if audio_offset < len(head) else await read_at(audio_offset, 4)
+    if marker == b"fLaC":
+        block = await read_at(audio_offset + 4, 4 + 34)
+        if len(block) < 4 or block[0] & 0x7F != 0:
+            raise AudioProbeError("FLAC file does not start with STREAMINFO")
+        return _probe_flac_streaminfo(block[4:], AudioInfo(format="flac"))
+
+    return await _probe_mp3(read_at, audio_offset, size)
@@ -0,0 +1,194 @@
+"""
+Streaming audio uploads to STT providers.
+
+This service handles:
+- Reading uploaded audio from Starlette's spooled temp file in fixed-size
+  chunks instead of loading the whole file into memory
+- Enforcing the upload size limit while streaming, so oversized files
+  whose size was not declared up front are still cut off early
+- Encoding the outbound multipart/form-data body on the fly, with a
+  Content-Length when the file size is known
+- Copying an upload that must outlive its request (background jobs)
+"""
+
+import asyncio
+import secrets
+import shutil
+from tempfile import SpooledTemporaryFile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import UploadFile
+
+# Chunk size for reads from the spooled upload and writes to the socket
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# MIME types sent to STT providers, by file extension
+AUDIO_CONTENT_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "ogg": "audio/ogg",
+    "webm": "audio/webm",
+    "flac": "audio/flac",
+}
+
+
+def audio_content_type(filename: str) -> str:
+    """MIME type for an audio filename, defaulting to octet-stream."""
+    return AUDIO_CONTENT_TYPES.get(Path(filename).suffix.lower().lstrip("."), "application/octet-stream")
+
+
+async def copy_upload(upload: UploadFile, spool_size: int = 1024 * 1024) -> UploadFile:
+    """
+    Copy an upload into a temp file owned by the caller.
+
+    Starlette closes an upload's file when the request ends; work that
+    runs afterwards needs its own copy. Small files stay in memory. The
+    copy runs in a thread, since large files are read from and written
+    to disk. The caller must close the returned upload.
+    """
+    def copy() -> Tuple[SpooledTemporaryFile, int]:
+        spooled = SpooledTemporaryFile(max_size=spool_size)
+        upload.file.seek(0)
+        shutil.copyfileobj(upload.file, spooled, UPLOAD_CHUNK_SIZE)
+        size = spooled.tell()
+        spooled.seek(0)
+        upload.file.seek(0)
+        return spooled, size
+
+    spooled, size = await asyncio.to_thread(copy)
+    return UploadFile(file=spooled, filename=upload.filename, size=size, headers=upload.headers)
+
+
+class AudioTooLargeError(Exception):
+    """Raised mid-stream when audio exceeds the size limit."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Audio exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+@dataclass
+class AudioSource:
+    """
+    Audio to upload: an UploadFile or in-memory bytes.
+
+    Every iteration starts from offset 0, so a source can be streamed
+    again (e.g. after validation has read its header) without the caller
+    tracking the file position. Each read seeks to its own offset under
+    a lock, so concurrent iterations (retries, hedged requests) do not
+    interfere.
+    """
+    filename: str
+    size: Optional[int] = None
+    upload: Optional[UploadFile] = None
+    data: Optional[bytes] = None
+    max_size: Optional[int] = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_upload(cls, upload: UploadFile, max_size: Optional[int] = None) -> "AudioSource":
+        return cls(
+            filename=upload.filename or "audio.wav",
+            size=getattr(upload, "size", None),
+            upload=upload,
+            max_size=max_size,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, filename: str = "audio.wav", max_size: Optional[int] = None) -> "AudioSource":
+        return cls(filename=filename, size=len(data), data=data, max_size=max_size)
+
+    async def read_at(self, offset: int, length: int) -> bytes:
+        """Read up to length bytes at offset without consuming the source."""
+        if self.data is not None:
+            return self.data[offset:offset + length]
+        async with self._lock:
+            await self.upload.seek(offset)
+            return await self.upload.read(length)
+
+    async def iter_chunks(self, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Yield the audio in chunks from the start.
+
+        Raises:
+            AudioTooLargeError: As soon as more than max_size bytes are read
+        """
+        if self.max_size is not None and self.size is not None and self.size > self.max_size:
+            raise AudioTooLargeError(self.max_size)
+
+        sent = 0
+        if self.data is not None:
+            for offset in range(0, len(self.data), chunk_size):
+                chunk = self.data[offset:offset + chunk_size]
+                sent += len(chunk)
+                if self.max_size is not None and sent > self.max_size:
+                    raise AudioTooLargeError(self.max_size)
+                yield chunk
+            return
+
+        while True:
+            chunk = await self.read_at(sent, chunk_size)
+            if not chunk:
+                return
+            sent += len(chunk)
+            if self.max_size is not None and sent > self.max_size:
+                raise AudioTooLargeError(self.max_size)
+            yield chunk
+
+
+class MultipartAudioStream:
+    """
+    multipart/form-data body with form fields and one streamed file part.
+
+    Iterating yields the encoded body; only one chunk of the file is held
+    in memory at a time.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        source: AudioSource,
+        content_type: str = "audio/wav",
+        field_name: str = "file"
+    ):
+        self.source = source
+        self.boundary = secrets.token_hex(16)
+
+        preamble = bytearray()
+        for name, value in fields.items():
+            preamble += (
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'
+            ).encode()
+        filename = source.filename.replace('"', "%22")
+        preamble += (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode()
+        self._preamble = bytes(preamble)
+        self._epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """Body length when the file size is known, else None (chunked)."""
+        if self.source.size is None:
+            return None
+        return len(self._preamble) + self.source.size + len(self._epilogue)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self.boundary}"}
+        if self.content_length is not None:
+            headers["Content-Length"] = str(self.content_length)
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._preamble
+        async for chunk in self.source.iter_chunks():
+            yield chunk
+        yield self._epilogue
@@ -0,0 +1,157 @@
+"""
+Batch command parsing for Bruno AI.
+
+This service handles:
+- Re-parsing stored transcripts in bulk (parser evaluation, backfills)
+- Fanning chunks of transcripts out to a process pool, since the regex
+  work is CPU-bound and does not scale across threads
+- Returning results in input order with a bounded number of chunks in flight
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Iterator, List, Optional
+
+from ..config import settings
+from .command_parser import shared_command_parser
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker() -> None:
+    """Build and warm the parser once per worker process."""
+    shared_command_parser().warm_up()
+
+
+def parse_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parse a chunk of transcripts.
+
+    Runs in worker processes, so it only takes and returns picklable data.
+    A transcript that fails to parse yields an error entry instead of
+    failing the whole chunk.
+    """
+    parser = shared_command_parser()
+    results = []
+    for text in texts:
+        try:
+            results.append(parser.parse_command(text).to_dict())
+        except Exception as e:
+            results.append({"raw_text": text, "error": str(e)})
+    return results
+
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class BatchCommandParser:
+    """
+    Parse many transcripts with a pool of worker processes.
+
+    Transcripts are sent to workers in chunks to amortize inter-process
+    overhead. Results come back in input order; at most
+    ``max_chunks_in_flight`` chunks are queued so memory stays bounded
+    however large the input is.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        chunk_size: int = 64,
+        max_chunks_in_flight: Optional[int] = None
+    ):
+        self.max_workers = max_workers
+        self.chunk_size = max(1, chunk_size)
+        self.max_chunks_in_flight = max_chunks_in_flight or max(1, max_workers) * 2
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Start the process pool on first use; None parses in-process."""
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Spawn rather than fork: the server runs threads that
+                    # are not safe to duplicate into a child process
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker
+                    )
+                    logger.info(f"Started batch parse pool with {self.max_workers} workers")
+        return self._executor
+
+    def iter_parse(self, texts: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Parse transcripts, yielding one result per transcript in order.
+
+        Args:
+            texts: Transcripts to parse; consumed lazily
+
+        Returns:
+            Iterator of PantryActionCommand-shaped dicts
+        """
+        executor = self._get_executor()
+        chunks = _chunked(texts, self.chunk_size)
+
+        if executor is None:
+            for chunk in chunks:
+                yield from parse_chunk(chunk)
+            return
+
+        pending: Deque[Future] = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(parse_chunk, chunk))
+                if len(pending) >= self.max_chunks_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def parse_stream(self, texts: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async version of iter_parse for streaming HTTP responses.
+
+        Without a process pool, chunks run in the default thread executor
+        so the event loop stays responsive.
+        """
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+
+        pending: Deque[asyncio.Future] = deque()
+        try:
+            for chunk in _chunked(texts, self.chunk_size):
+                pending.append(loop.run_in_executor(executor, parse_chunk, chunk))
+                if len(pending) >= self.max_chunks_in_flight:
+                    for result in await pending.popleft():
+                        yield result
+            while pending:
+                for result in await pending.popleft():
+                    yield result
+        finally:
+            # Client went away: drop chunks that have not started yet
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global batch parser instance
+batch_command_parser = BatchCommandParser(max_workers=settings.voice_batch_parse_workers)
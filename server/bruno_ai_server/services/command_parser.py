@@ -11,11 +11,17 @@ This service handles:
 
 import re
 import logging
+import threading
+import time
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .food_lexicon import get_food_lexicon
+from .unit_conversion import UNIT_ALIASES, UNIT_LOOKUP
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,6 +60,181 @@ class CommandResult:
     confidence: float
     errors: List[str] = None
     metadata: Dict[str, Any] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the JSON shape of the PantryActionCommand schema."""
+        return {
+            "action": self.action.value,
+            "entities": [
+                {
+                    "name": entity.name,
+                    "quantity": entity.quantity,
+                    "unit": entity.unit,
+                    "location": entity.location,
+                    "expiration_date": entity.expiration_date.isoformat() if entity.expiration_date else None,
+                    "confidence": entity.confidence,
+                }
+                for entity in self.entities
+            ],
+            "raw_text": self.raw_text,
+            "confidence": self.confidence,
+            "errors": self.errors,
+            "metadata": self.metadata,
+        }
+
+
+# Action grammars, in declaration order. Patterns longer than
+# IntentMatcher.SPECIFIC_PATTERN_LENGTH are treated as more specific and win ties.
+ACTION_PATTERNS: Mapping[PantryAction, Sequence[str]] = MappingProxyType({
+    PantryAction.ADD: (
+        r'(?:add|put|store|place|bought?|got|have)\s+(.+?)(?:\s+(?:to|in)\s+(?:the\s+)?(?:pantry|fridge|freezer))?',
+        r'(?:i\s+)?(?:just\s+)?(?:bought?|got|picked\s+up|purchased)\s+(.+)',
+        r'(?:can\s+you\s+)?(?:please\s+)?add\s+(.+?)(?:\s+to\s+(?:my\s+)?(?:pantry|fridge|freezer))?',
+        r'(?:put\s+)?(.+?)\s+(?:goes?\s+)?(?:in|into)\s+(?:the\s+)?(?:pantry|fridge|freezer)',
+    ),
+    PantryAction.UPDATE: (
+        r'(?:update|change|modify|edit)\s+(?:the\s+)?(.+?)(?:\s+(?:to|with))?',
+        r'(?:set|make)\s+(?:the\s+)?(.+?)\s+(?:to|as)\s+(.+)',
+        r'(?:change|update)\s+(.+?)\s+(?:quantity|amount)\s+to\s+(.+)',
+    ),
+    PantryAction.DELETE: (
+        r'(?:delete|remove|throw\s+(?:away|out)|discard|get\s+rid\s+of)\s+(?:the\s+)?(.+)',
+        r'(?:i\s+)?(?:used\s+up|finished|ran\s+out\s+of)\s+(?:the\s+)?(.+)',
+        r'(?:expired|bad|spoiled)\s+(.+)',
+    ),
+    PantryAction.LIST: (
+        r'(?:what(?:\'s|\s+is)|show\s+me|list)\s+(?:in\s+)?(?:my\s+)?(?:pantry|fridge|freezer)',
+        r'(?:what\s+do\s+i\s+have)\s+(?:in\s+(?:my\s+)?(?:pantry|fridge|freezer))?',
+        r'(?:show|list)\s+(?:all\s+)?(?:my\s+)?(?:food|items|groceries)',
+    ),
+    PantryAction.SEARCH: (
+        r'(?:do\s+i\s+have|find|search\s+for|look\s+for)\s+(.+)',
+        r'(?:is\s+there|are\s+there)\s+(?:any\s+)?(.+?)(?:\s+in\s+(?:my\s+)?(?:pantry|fridge|freezer))?',
+    ),
+    PantryAction.CHECK: (
+        r'(?:check|when\s+(?:does|do)|how\s+much)\s+(.+?)(?:\s+(?:expire|expires?|expir))?',
+        r'(?:what(?:\'s|\s+is)\s+(?:the\s+)?(?:expiration|expiry)\s+(?:date\s+)?(?:of|for))\s+(.+)',
+    ),
+    PantryAction.INCREMENT: (
+        r'(?:add|increase|increment)\s+(.+?)\s+(?:to|of)\s+(.+)',
+        r'(?:more|additional)\s+(.+)',
+        r'(?:bought|got|picked\s+up)\s+(?:more|additional)\s+(.+)',
+    ),
+    PantryAction.DECREMENT: (
+        r'(?:subtract|decrease|decrement|remove)\s+(.+?)\s+(?:from|of)\s+(.+)',
+        r'(?:less|fewer)\s+(.+)',
+    ),
+    PantryAction.USE: (
+        r'(?:use|used)\s+(.+)',
+        r'(?:i\s+)?(?:used|consumed|ate|drank)\s+(.+)',
+        r'(?:cooking\s+with|making\s+with)\s+(.+)',
+    ),
+    PantryAction.SET_QUANTITY: (
+        r'(?:set|make)\s+(?:the\s+)?(.+?)\s+(?:to|at)\s+(.+)',
+        r'(?:change|update)\s+(?:the\s+)?(.+?)\s+(?:quantity|amount)\s+to\s+(.+)',
+        r'(?:i\s+have|there\s+are?)\s+(.+?)\s+(?:of\s+)?(.+?)\s+(?:left|remaining)',
+    )
+})
+
+
+class IntentMatcher:
+    """
+    Single-pass matcher over every action grammar.
+
+    All patterns are compiled once into one regex of ordered lookahead
+    alternatives, each wrapped in a named group. The regex engine tries
+    them in priority order from the start of the text and stops at the
+    first that matches anywhere, so a command is scanned by one call
+    instead of one search per pattern.
+    """
+
+    BASE_CONFIDENCE = 0.9
+    SPECIFIC_PATTERN_BONUS = 0.05
+    SPECIFIC_PATTERN_LENGTH = 50
+
+    def __init__(self, action_patterns: Mapping[PantryAction, Sequence[str]]):
+        rules = []
+        for action, patterns in action_patterns.items():
+            for pattern in patterns:
+                confidence = self.BASE_CONFIDENCE
+                if len(pattern) > self.SPECIFIC_PATTERN_LENGTH:
+                    confidence += self.SPECIFIC_PATTERN_BONUS
+                rules.append((action, pattern, confidence))
+
+        # Highest confidence first; the stable sort keeps declaration order
+        # within a tier, matching the first-best-wins rule of a linear scan
+        rules.sort(key=lambda rule: -rule[2])
+
+        self._regex = re.compile(
+            "|".join(f"(?=.*?(?P<r{index}>{pattern}))" for index, (_, pattern, _) in enumerate(rules)),
+            re.IGNORECASE | re.DOTALL
+        )
+
+        # Map each rule name to its action, confidence and inner group numbers
+        self._rules: Dict[str, Tuple[PantryAction, float, range]] = {}
+        for index, (action, pattern, confidence) in enumerate(rules):
+            name = f"r{index}"
+            outer = self._regex.groupindex[name]
+            inner_groups = re.compile(pattern).groups
+            self._rules[name] = (action, confidence, range(outer + 1, outer + 1 + inner_groups))
+
+    def match(self, text: str) -> Tuple[Optional[PantryAction], float, List[str]]:
+        """
+        Find the highest-priority grammar that matches the text.
+
+        Returns:
+            Tuple of (action, confidence, matched_groups)
+        """
+        match = self._regex.match(text)
+        if match is None:
+            return None, 0.0, []
+
+        # The rule's wrapper group is the last group to close
+        action, confidence, group_numbers = self._rules[match.lastgroup]
+        groups = [match.group(number) for number in group_numbers]
+        return action, confidence, [group for group in groups if group]
+
+
+INTENT_MATCHER = IntentMatcher(ACTION_PATTERNS)
+
+# Entity extraction patterns
+ITEM_SEPARATOR_PATTERN = re.compile(r'[,;]\s*|\s+and\s+')
+QUANTITY_UNIT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)')
+NUMBER_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+DATE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(?:expires?|expiring|expiration)\s+(?:on\s+)?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        r'(?:expires?|expiring|expiration)\s+(?:on\s+)?(?:in\s+)?(\d+)\s+days?',
+        r'(?:best\s+by|use\s+by|good\s+until)\s+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',  # Just date format
+    )
+)
+DATE_FORMATS = ('%m/%d/%Y', '%m-%d-%Y', '%m/%d/%y', '%m-%d-%y')
+LOCATION_PATTERNS = MappingProxyType({
+    'pantry': re.compile(r'\b(?:pantry|cupboard|cabinet)\b', re.IGNORECASE),
+    'fridge': re.compile(r'\b(?:fridge|refrigerator|cooler)\b', re.IGNORECASE),
+    'freezer': re.compile(r'\b(?:freezer|frozen)\b', re.IGNORECASE),
+    'counter': re.compile(r'\b(?:counter|countertop)\b', re.IGNORECASE),
+})
+FOOD_NAME_STOPWORDS = frozenset(['the', 'a', 'an', 'some', 'of', 'to', 'in', 'for', 'with', 'by'])
+
+
+# Unit vocabulary, shared read-only by every parser and the pantry routes
+UNIT_PATTERNS = UNIT_ALIASES
+
+# Commands covering every grammar, used to prime the regex engine at startup
+WARM_UP_COMMANDS = (
+    "add 2 pounds of chicken to the fridge",
+    "i just bought 1 gallon of milk expires 12/31/2025",
+    "remove the expired yogurt",
+    "what's in my pantry",
+    "do i have any rice",
+    "update milk quantity to 1 gallon",
+    "used 2 cups of flour and 3 eggs",
+    "there are 4 cans of beans left",
+    "thanks",
+)
 
 
 class CommandParser:
@@ -76,110 +257,21 @@ class CommandParser:
     
     def _setup_patterns(self):
         """Setup regex patterns for command matching."""
-        
-        # Action patterns (case-insensitive)
-        self.action_patterns = {
-            PantryAction.ADD: [
-                r'(?:add|put|store|place|bought?|got|have)\s+(.+?)(?:\s+(?:to|in)\s+(?:the\s+)?(?:pantry|fridge|freezer))?',
-                r'(?:i\s+)?(?:just\s+)?(?:bought?|got|picked\s+up|purchased)\s+(.+)',
-                r'(?:can\s+you\s+)?(?:please\s+)?add\s+(.+?)(?:\s+to\s+(?:my\s+)?(?:pantry|fridge|freezer))?',
-                r'(?:put\s+)?(.+?)\s+(?:goes?\s+)?(?:in|into)\s+(?:the\s+)?(?:pantry|fridge|freezer)',
-            ],
-            PantryAction.UPDATE: [
-                r'(?:update|change|modify|edit)\s+(?:the\s+)?(.+?)(?:\s+(?:to|with))?',
-                r'(?:set|make)\s+(?:the\s+)?(.+?)\s+(?:to|as)\s+(.+)',
-                r'(?:change|update)\s+(.+?)\s+(?:quantity|amount)\s+to\s+(.+)',
-            ],
-            PantryAction.DELETE: [
-                r'(?:delete|remove|throw\s+(?:away|out)|discard|get\s+rid\s+of)\s+(?:the\s+)?(.+)',
-                r'(?:i\s+)?(?:used\s+up|finished|ran\s+out\s+of)\s+(?:the\s+)?(.+)',
-                r'(?:expired|bad|spoiled)\s+(.+)',
-            ],
-            PantryAction.LIST: [
-                r'(?:what(?:\'s|\s+is)|show\s+me|list)\s+(?:in\s+)?(?:my\s+)?(?:pantry|fridge|freezer)',
-                r'(?:what\s+do\s+i\s+have)\s+(?:in\s+(?:my\s+)?(?:pantry|fridge|freezer))?',
-                r'(?:show|list)\s+(?:all\s+)?(?:my\s+)?(?:food|items|groceries)',
-            ],
-            PantryAction.SEARCH: [
-                r'(?:do\s+i\s+have|find|search\s+for|look\s+for)\s+(.+)',
-                r'(?:is\s+there|are\s+there)\s+(?:any\s+)?(.+?)(?:\s+in\s+(?:my\s+)?(?:pantry|fridge|freezer))?',
-            ],
-            PantryAction.CHECK: [
-                r'(?:check|when\s+(?:does|do)|how\s+much)\s+(.+?)(?:\s+(?:expire|expires?|expir))?',
-                r'(?:what(?:\'s|\s+is)\s+(?:the\s+)?(?:expiration|expiry)\s+(?:date\s+)?(?:of|for))\s+(.+)',
-            ],
-            PantryAction.INCREMENT: [
-                r'(?:add|increase|increment)\s+(.+?)\s+(?:to|of)\s+(.+)',
-                r'(?:more|additional)\s+(.+)',
-                r'(?:bought|got|picked\s+up)\s+(?:more|additional)\s+(.+)',
-            ],
-            PantryAction.DECREMENT: [
-                r'(?:subtract|decrease|decrement|remove)\s+(.+?)\s+(?:from|of)\s+(.+)',
-                r'(?:less|fewer)\s+(.+)',
-            ],
-            PantryAction.USE: [
-                r'(?:use|used)\s+(.+)',
-                r'(?:i\s+)?(?:used|consumed|ate|drank)\s+(.+)',
-                r'(?:cooking\s+with|making\s+with)\s+(.+)',
-            ],
-            PantryAction.SET_QUANTITY: [
-                r'(?:set|make)\s+(?:the\s+)?(.+?)\s+(?:to|at)\s+(.+)',
-                r'(?:change|update)\s+(?:the\s+)?(.+?)\s+(?:quantity|amount)\s+to\s+(.+)',
-                r'(?:i\s+have|there\s+are?)\s+(.+?)\s+(?:of\s+)?(.+?)\s+(?:left|remaining)',
-            ]
-        }
+        # Grammars are compiled once at import and shared by every parser
+        self.action_patterns = ACTION_PATTERNS
+        self.intent_matcher = INTENT_MATCHER
     
     def _setup_food_vocabulary(self):
         """Setup vocabulary for common food items and categories."""
-        self.food_categories = {
-            'dairy': ['milk', 'cheese', 'butter', 'yogurt', 'cream', 'sour cream'],
-            'meat': ['chicken', 'beef', 'pork', 'fish', 'turkey', 'lamb', 'salmon'],
-            'vegetables': ['carrot', 'onion', 'tomato', 'potato', 'lettuce', 'spinach', 'broccoli'],
-            'fruits': ['apple', 'banana', 'orange', 'grape', 'strawberry', 'lemon', 'lime'],
-            'grains': ['bread', 'rice', 'pasta', 'cereal', 'oats', 'quinoa', 'flour'],
-            'pantry': ['salt', 'pepper', 'sugar', 'oil', 'vinegar', 'sauce', 'spice']
-        }
-        
-        # Flatten for quick lookup
-        self.all_foods = set()
-        for category_foods in self.food_categories.values():
-            self.all_foods.update(category_foods)
+        # Loaded from the packaged lexicon once per process
+        self.food_lexicon = get_food_lexicon()
+        self.food_categories = self.food_lexicon.categories
+        self.all_foods = self.food_lexicon.terms
     
     def _setup_units_vocabulary(self):
         """Setup vocabulary for units and measurements."""
-        self.unit_patterns = {
-            # Volume
-            'cup': ['cup', 'cups', 'c'],
-            'tablespoon': ['tablespoon', 'tablespoons', 'tbsp', 'tbs'],
-            'teaspoon': ['teaspoon', 'teaspoons', 'tsp'],
-            'liter': ['liter', 'liters', 'l', 'litre', 'litres'],
-            'milliliter': ['milliliter', 'milliliters', 'ml'],
-            'gallon': ['gallon', 'gallons', 'gal'],
-            'quart': ['quart', 'quarts', 'qt'],
-            'pint': ['pint', 'pints', 'pt'],
-            'fluid_ounce': ['fluid ounce', 'fluid ounces', 'fl oz', 'floz'],
-            
-            # Weight
-            'pound': ['pound', 'pounds', 'lb', 'lbs'],
-            'ounce': ['ounce', 'ounces', 'oz'],
-            'gram': ['gram', 'grams', 'g'],
-            'kilogram': ['kilogram', 'kilograms', 'kg'],
-            
-            # Count
-            'piece': ['piece', 'pieces', 'pc', 'pcs', 'each'],
-            'dozen': ['dozen', 'doz'],
-            'pack': ['pack', 'packs', 'package', 'packages'],
-            'box': ['box', 'boxes'],
-            'can': ['can', 'cans'],
-            'jar': ['jar', 'jars'],
-            'bottle': ['bottle', 'bottles']
-        }
-        
-        # Create reverse lookup for units
-        self.unit_lookup = {}
-        for standard_unit, variations in self.unit_patterns.items():
-            for variation in variations:
-                self.unit_lookup[variation.lower()] = standard_unit
+        self.unit_patterns = UNIT_PATTERNS
+        self.unit_lookup = UNIT_LOOKUP
     
     def parse_command(self, text: str) -> CommandResult:
         """
@@ -256,32 +348,11 @@ class CommandParser:
         Returns:
             Tuple of (action, confidence, matched_groups)
         """
-        best_action = None
-        best_confidence = 0.0
-        best_groups = []
-        
-        for action, patterns in self.action_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    confidence = 0.9  # High confidence for explicit pattern match
-                    groups = [g for g in match.groups() if g]
-                    
-                    # Boost confidence if pattern is more specific
-                    if len(pattern) > 50:  # More specific patterns
-                        confidence += 0.05
-                    
-                    if confidence > best_confidence:
-                        best_action = action
-                        best_confidence = confidence
-                        best_groups = groups
-        
-        return best_action, best_confidence, best_groups
+        return self.intent_matcher.match(text)
     
     def _contains_food_items(self, text: str) -> bool:
-        """Check if text contains recognizable food items."""
-        text_words = set(re.findall(r'\b\w+\b', text.lower()))
-        return len(text_words.intersection(self.all_foods)) > 0
+        """Check if text contains recognizable food items, including multi-word ones."""
+        return self.food_lexicon.contains_food(text)
     
     def _extract_entities(self, text: str, action: PantryAction) -> List[ParsedEntity]:
         """
@@ -297,7 +368,7 @@ class CommandParser:
         entities = []
         
         # Split text by common separators to handle multiple items
-        item_texts = re.split(r'[,;]\s*|\s+and\s+', text)
+        item_texts = ITEM_SEPARATOR_PATTERN.split(text)
         
         for item_text in item_texts:
             entity = self._parse_single_entity(item_text.strip())
@@ -341,7 +412,7 @@ class CommandParser:
             confidence += 0.1
         if unit is not None:
             confidence += 0.1
-        if food_name.lower() in self.all_foods:
+        if self.food_lexicon.lookup(food_name) is not None:
             confidence += 0.1
         
         return ParsedEntity(
@@ -355,29 +426,26 @@ class CommandParser:
     
     def _extract_quantity_unit(self, text: str) -> Tuple[Optional[float], Optional[str], str]:
         """Extract quantity and unit from text."""
-        # Pattern for number + unit
-        pattern = r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)'
-        matches = re.findall(pattern, text)
-        
         quantity = None
         unit = None
         remaining_text = text
         
-        for qty_str, unit_str in matches:
+        for match in QUANTITY_UNIT_PATTERN.finditer(text):
+            qty_str, unit_str = match.groups()
             # Check if unit is valid
             if unit_str.lower() in self.unit_lookup:
                 quantity = float(qty_str)
                 unit = self.unit_lookup[unit_str.lower()]
                 # Remove the matched quantity+unit from text
-                remaining_text = re.sub(f'{qty_str}\\s*{unit_str}', '', remaining_text, flags=re.IGNORECASE)
+                remaining_text = text[:match.start()] + text[match.end():]
                 break
         
         # Try to extract just numbers if no unit found
         if quantity is None:
-            number_match = re.search(r'(\d+(?:\.\d+)?)', text)
+            number_match = NUMBER_PATTERN.search(text)
             if number_match:
                 quantity = float(number_match.group(1))
-                remaining_text = re.sub(number_match.group(1), '', remaining_text)
+                remaining_text = text[:number_match.start()] + text[number_match.end():]
         
         return quantity, unit, remaining_text.strip()
     
@@ -386,16 +454,8 @@ class CommandParser:
         expiration_date = None
         remaining_text = text
         
-        # Patterns for date extraction
-        date_patterns = [
-            r'(?:expires?|expiring|expiration)\s+(?:on\s+)?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            r'(?:expires?|expiring|expiration)\s+(?:on\s+)?(?:in\s+)?(\d+)\s+days?',
-            r'(?:best\s+by|use\s+by|good\s+until)\s+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',  # Just date format
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 date_str = match.group(1)
                 
@@ -406,7 +466,7 @@ class CommandParser:
                         expiration_date = date.today() + timedelta(days=days)
                     else:  # Date format
                         # Try different date formats
-                        for fmt in ['%m/%d/%Y', '%m-%d-%Y', '%m/%d/%y', '%m-%d-%y']:
+                        for fmt in DATE_FORMATS:
                             try:
                                 expiration_date = datetime.strptime(date_str, fmt).date()
                                 break
@@ -414,7 +474,7 @@ class CommandParser:
                                 continue
                     
                     if expiration_date:
-                        remaining_text = re.sub(pattern, '', remaining_text, flags=re.IGNORECASE)
+                        remaining_text = pattern.sub('', remaining_text)
                         break
                         
                 except ValueError:
@@ -427,17 +487,10 @@ class CommandParser:
         location = None
         remaining_text = text
         
-        location_patterns = {
-            'pantry': r'\b(?:pantry|cupboard|cabinet)\b',
-            'fridge': r'\b(?:fridge|refrigerator|cooler)\b',
-            'freezer': r'\b(?:freezer|frozen)\b',
-            'counter': r'\b(?:counter|countertop)\b',
-        }
-        
-        for loc, pattern in location_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for loc, pattern in LOCATION_PATTERNS.items():
+            if pattern.search(text):
                 location = loc
-                remaining_text = re.sub(pattern, '', remaining_text, flags=re.IGNORECASE)
+                remaining_text = pattern.sub('', remaining_text)
                 break
         
         return location, remaining_text.strip()
@@ -445,13 +498,23 @@ class CommandParser:
     def _clean_food_name(self, text: str) -> str:
         """Clean and normalize food name."""
         # Remove common words that aren't part of the food name
-        stopwords = ['the', 'a', 'an', 'some', 'of', 'to', 'in', 'for', 'with', 'by']
-        
         words = text.split()
-        cleaned_words = [w for w in words if w.lower() not in stopwords and w.strip()]
+        cleaned_words = [w for w in words if w.lower() not in FOOD_NAME_STOPWORDS and w.strip()]
         
         return ' '.join(cleaned_words).strip()
     
+    def warm_up(self, commands: Sequence[str] = WARM_UP_COMMANDS) -> float:
+        """
+        Parse sample commands so the first real request runs on warm paths.
+        
+        Returns:
+            Time spent in milliseconds
+        """
+        start_time = time.perf_counter()
+        for command in commands:
+            self.parse_command(command)
+        return (time.perf_counter() - start_time) * 1000
+    
     def get_supported_actions(self) -> List[str]:
         """Get list of supported action types."""
         return [action.value for action in PantryAction]
@@ -480,3 +543,32 @@ class CommandParser:
                     return False
         
         return True
+
+
+_command_parser: Optional[CommandParser] = None
+_command_parser_lock = threading.Lock()
+
+
+def shared_command_parser() -> CommandParser:
+    """
+    Get the shared command parser from synchronous code.
+    
+    The parser holds only immutable module-level state, so one instance is
+    safe to share across requests and threads.
+    """
+    global _command_parser
+    if _command_parser is None:
+        with _command_parser_lock:
+            if _command_parser is None:
+                _command_parser = CommandParser()
+    return _command_parser
+
+
+async def get_command_parser() -> CommandParser:
+    """
+    FastAPI dependency for the shared command parser.
+    
+    Declared async so FastAPI resolves it on the event loop instead of
+    dispatching a sync dependency to the threadpool on every request.
+    """
+    return shared_command_parser()
@@ -0,0 +1,378 @@
+"""
+Email notification channel for Bruno AI.
+
+This service handles:
+- Expiration digest templates compiled once and rendered per household batch
+- A pool of long-lived SMTP sessions, one per send worker
+- Bounded send concurrency with retry for transient SMTP failures
+"""
+
+import asyncio
+import html
+import logging
+import smtplib
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from string import Template
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExpirationDigestTemplates:
+    """
+    Precompiled expiration digest templates.
+
+    Household-wide parts (item lists, summary) are rendered once per
+    household; only the greeting is substituted per member.
+    """
+
+    TEXT_BODY = Template(
+        "Hi $member_name,\n\n"
+        "$message\n\n"
+        "${item_sections}"
+        "Open Bruno AI to plan meals around what needs using up.\n"
+    )
+    HTML_BODY = Template(
+        "<html><body>"
+        "<p>Hi $member_name,</p>"
+        "<p>$message</p>"
+        "${item_sections}"
+        "<p>Open Bruno AI to plan meals around what needs using up.</p>"
+        "</body></html>"
+    )
+    TEXT_SECTION = Template("$heading\n$lines\n\n")
+    HTML_SECTION = Template("<h3>$heading</h3><ul>$lines</ul>")
+    EXPIRING_LINE = Template("$name (expires $expiration_date, $days_left day(s) left)")
+    EXPIRED_LINE = Template("$name (expired $expiration_date, $days_expired day(s) ago)")
+
+    @classmethod
+    def render_household(
+        cls,
+        notification_data: Dict[str, Any],
+        title: str,
+        message: str
+    ) -> Tuple[str, Template, Template]:
+        """
+        Render the parts of a digest shared by every member of a household.
+
+        Returns:
+            Tuple of (subject, text template, html template) where the body
+            templates only have the member name left to substitute
+        """
+        sections = [
+            ("Expiring soon", cls.EXPIRING_LINE, notification_data.get("expiring_items", [])),
+            ("Already expired", cls.EXPIRED_LINE, notification_data.get("expired_items", [])),
+        ]
+
+        text_sections = []
+        html_sections = []
+        for heading, line_template, items in sections:
+            if not items:
+                continue
+            lines = [line_template.safe_substitute(item) for item in items]
+            text_sections.append(cls.TEXT_SECTION.substitute(
+                heading=heading,
+                lines="\n".join(f"- {line}" for line in lines)
+            ))
+            html_sections.append(cls.HTML_SECTION.substitute(
+                heading=heading,
+                lines="".join(f"<li>{html.escape(line)}</li>" for line in lines)
+            ))
+
+        # Escape "$" so the member placeholder is the only one left
+        text_body = cls.TEXT_BODY.safe_substitute(
+            message=message.replace("$", "$$"),
+            item_sections="".join(text_sections).replace("$", "$$")
+        )
+        html_body = cls.HTML_BODY.safe_substitute(
+            message=html.escape(message).replace("$", "$$"),
+            item_sections="".join(html_sections).replace("$", "$$")
+        )
+        return title, Template(text_body), Template(html_body)
+
+    @classmethod
+    def render_batch(
+        cls,
+        sender: str,
+        notification_data: Dict[str, Any],
+        recipients: Sequence[Tuple[str, str]],
+        title: str,
+        message: str
+    ) -> List[EmailMessage]:
+        """
+        Render one digest per recipient of a household.
+
+        Args:
+            sender: From address
+            notification_data: Expiring/expired item data
+            recipients: (email, member name) pairs
+            title: Notification title used as the subject
+            message: Summary sentence
+
+        Returns:
+            List of ready-to-send messages
+        """
+        subject, text_body, html_body = cls.render_household(notification_data, title, message)
+
+        messages = []
+        for email, member_name in recipients:
+            msg = EmailMessage()
+            msg["Subject"] = subject
+            msg["From"] = sender
+            msg["To"] = email
+            msg.set_content(text_body.substitute(member_name=member_name))
+            msg.add_alternative(
+                html_body.substitute(member_name=html.escape(member_name)),
+                subtype="html"
+            )
+            messages.append(msg)
+        return messages
+
+
+class _PooledSMTPConnection:
+    """A long-lived SMTP session reused for many messages."""
+
+    def __init__(self, pool: "SMTPConnectionPool"):
+        self._pool = pool
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def send(self, message: EmailMessage) -> None:
+        """Send a message, opening the session on first use (blocking)."""
+        if self._smtp is None:
+            self._smtp = self._pool._open()
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPResponseException as e:
+            # A 421 reply means the server is closing the session
+            if e.smtp_code == 421:
+                self._discard()
+            raise
+        except smtplib.SMTPRecipientsRefused:
+            raise
+        except OSError:
+            # Disconnects and socket errors leave the session unusable; the
+            # retry reconnects (SMTP replies above keep the session open)
+            self._discard()
+            raise
+
+    def _discard(self) -> None:
+        """Close the socket of a session the server dropped."""
+        try:
+            self._smtp.close()
+        except OSError:
+            pass
+        self._smtp = None
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
+
+class SMTPConnectionPool:
+    """
+    Fixed-size pool of SMTP sessions.
+
+    smtplib is blocking, so each send runs in a worker thread. Holding a
+    session per worker avoids a TCP/TLS handshake and AUTH per message.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 4,
+        timeout: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._connections = [_PooledSMTPConnection(self) for _ in range(self.size)]
+        self._available: Optional[asyncio.Queue] = None
+
+    def _open(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        smtp.ehlo()
+        if self.use_tls:
+            smtp.starttls()
+            smtp.ehlo()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        self.connections_opened += 1
+        return smtp
+
+    async def acquire(self) -> _PooledSMTPConnection:
+        if self._available is None:
+            self._available = asyncio.Queue()
+            for connection in self._connections:
+                self._available.put_nowait(connection)
+        return await self._available.get()
+
+    def release(self, connection: _PooledSMTPConnection) -> None:
+        self._available.put_nowait(connection)
+
+    async def close(self) -> None:
+        """Close every open session."""
+        for connection in self._connections:
+            await asyncio.to_thread(connection.close)
+
+
+@dataclass
+class EmailSendReport:
+    """Outcome of sending a batch of emails."""
+    sent: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    retries: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class EmailService:
+    """Sends expiration digests over a shared SMTP connection pool."""
+
+    def __init__(
+        self,
+        pool: Optional[SMTPConnectionPool] = None,
+        sender: str = "Bruno AI <noreply@brunoai.app>",
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.5
+    ):
+        self.pool = pool
+        self.sender = sender
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    @property
+    def is_configured(self) -> bool:
+        return self.pool is not None
+
+    async def send_expiration_digests(
+        self,
+        digests: Sequence[Tuple[Dict[str, Any], Sequence[Tuple[str, str]], Dict[str, str]]]
+    ) -> EmailSendReport:
+        """
+        Render and send expiration digests for many households.
+
+        Args:
+            digests: (notification data, recipients, formatted
+                title/message) per household
+
+        Returns:
+            EmailSendReport with delivery counts
+        """
+        messages: List[EmailMessage] = []
+        for notification_data, recipients, formatted in digests:
+            messages.extend(ExpirationDigestTemplates.render_batch(
+                sender=self.sender,
+                notification_data=notification_data,
+                recipients=recipients,
+                title=formatted["title"],
+                message=formatted["message"]
+            ))
+        return await self.send_messages(messages)
+
+    async def send_messages(self, messages: Sequence[EmailMessage]) -> EmailSendReport:
+        """Send messages with at most pool-size concurrent SMTP sessions."""
+        report = EmailSendReport()
+        if not messages:
+            return report
+        if not self.is_configured:
+            logger.warning("SMTP not configured - skipping email notifications")
+            report.failed = [(msg["To"], "SMTP not configured") for msg in messages]
+            return report
+
+        start_time = time.monotonic()
+        pending = list(reversed(messages))
+
+        async def worker():
+            connection = await self.pool.acquire()
+            try:
+                while pending:
+                    await self._send_with_retry(connection, pending.pop(), report)
+            finally:
+                self.pool.release(connection)
+
+        workers = min(self.pool.size, len(messages))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        report.elapsed_seconds = time.monotonic() - start_time
+        logger.info(
+            f"Email batch complete: {report.sent} sent, {len(report.failed)} failed, "
+            f"{report.retries} retries in {report.elapsed_seconds:.2f}s"
+        )
+        return report
+
+    async def _send_with_retry(
+        self,
+        connection: _PooledSMTPConnection,
+        message: EmailMessage,
+        report: EmailSendReport
+    ) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await asyncio.to_thread(connection.send, message)
+                report.sent += 1
+                return
+            except smtplib.SMTPResponseException as e:
+                # 5xx replies are permanent; 4xx are worth retrying
+                if e.smtp_code >= 500 or attempt == self.max_retries:
+                    report.failed.append((message["To"], f"{e.smtp_code} {e.smtp_error!r}"))
+                    return
+                error = e
+            except smtplib.SMTPRecipientsRefused as e:
+                codes = [code for code, _ in e.recipients.values()]
+                if all(code >= 500 for code in codes) or attempt == self.max_retries:
+                    report.failed.append((message["To"], str(e.recipients)))
+                    return
+                error = e
+            except (smtplib.SMTPException, OSError) as e:
+                if attempt == self.max_retries:
+                    report.failed.append((message["To"], str(e)))
+                    return
+                error = e
+
+            report.retries += 1
+            logger.warning(f"Retrying email to {message['To']} after: {error}")
+            await asyncio.sleep(self.retry_backoff_seconds * (2 ** attempt))
+
+    async def close(self) -> None:
+        """Close pooled SMTP sessions."""
+        if self.pool is not None:
+            await self.pool.close()
+
+
+def create_email_service() -> EmailService:
+    """Build the email service from settings."""
+    pool = None
+    if settings.smtp_host:
+        pool = SMTPConnectionPool(
+            host=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls,
+            size=settings.email_max_concurrency
+        )
+    return EmailService(
+        pool=pool,
+        sender=settings.email_sender,
+        max_retries=settings.email_max_retries
+    )
+
+
+# Global email service instance
+email_service = create_email_service()
@@ -0,0 +1,297 @@
+"""
+Pantry entity resolver for Bruno AI.
+
+This service handles:
+- Per-household trigram indexes over pantry item names
+- Resolving parsed voice entities ("the chiken") to concrete pantry items
+- Lazy index builds, invalidated when pantry items are committed and
+  expired after a TTL, bounded to the most recently used households
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from ..models.pantry import PantryItem
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(_NON_WORD_PATTERN.sub(" ", name.lower()).split())
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Trigrams of each word, padded like pg_trgm.
+
+    Words get two leading spaces and one trailing space so short words
+    and word starts still produce distinctive trigrams.
+    """
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass
+class EntityMatch:
+    """A pantry item candidate for a parsed entity name."""
+    item_id: Any
+    name: str
+    score: float
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    location: Optional[str] = None
+
+
+@dataclass
+class _IndexedItem:
+    item_id: Any
+    name: str
+    normalized: str
+    grams: FrozenSet[str]
+    quantity: Optional[float]
+    unit: Optional[str]
+    location: Optional[str]
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over one household's pantry item names.
+
+    Candidates are gathered from the posting lists of the query's trigrams,
+    so only items sharing at least one trigram are scored.
+    """
+
+    def __init__(self, items: Sequence[_IndexedItem]):
+        self.items = list(items)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for position, item in enumerate(self.items):
+            for gram in item.grams:
+                self._postings[gram].append(position)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search(self, query: str, limit: int = 3, min_score: float = 0.3) -> List[EntityMatch]:
+        """
+        Find the items most similar to a name.
+
+        Args:
+            query: Entity name as parsed from the command
+            limit: Maximum number of matches
+            min_score: Minimum similarity (0-1) to report
+
+        Returns:
+            Matches sorted by descending score
+        """
+        normalized = normalize_name(query)
+        query_grams = trigrams(normalized)
+        if not query_grams:
+            return []
+
+        overlaps: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for position in self._postings.get(gram, ()):
+                overlaps[position] += 1
+
+        scored = []
+        for position, overlap in overlaps.items():
+            item = self.items[position]
+            if item.normalized == normalized:
+                score = 1.0
+            else:
+                # Dice coefficient over trigram sets
+                score = 2 * overlap / (len(query_grams) + len(item.grams))
+                if normalized in item.normalized.split() or item.normalized in normalized.split():
+                    # "milk" naming "whole milk": whole-word containment
+                    score = max(score, 0.75)
+            if score >= min_score:
+                scored.append((score, position))
+
+        scored.sort(key=lambda entry: (-entry[0], self.items[entry[1]].name))
+        return [
+            EntityMatch(
+                item_id=self.items[position].item_id,
+                name=self.items[position].name,
+                score=round(score, 3),
+                quantity=self.items[position].quantity,
+                unit=self.items[position].unit,
+                location=self.items[position].location,
+            )
+            for score, position in scored[:limit]
+        ]
+
+
+@dataclass
+class _IndexBuild:
+    """An in-flight index build for one household."""
+    lock: asyncio.Lock
+    users: int = 0
+    stale: bool = False
+
+
+class PantryEntityResolver:
+    """
+    Resolves parsed entity names to pantry items of a household.
+
+    Indexes are built on first use and dropped when a transaction that
+    touched the household's pantry items commits. Commit events only fire
+    in this process, so indexes also expire after ttl_seconds to pick up
+    writes made by other workers. The least recently used indexes are
+    evicted beyond max_households. A build that overlaps a write is
+    marked stale and not cached.
+
+    Only ORM flushes are seen. Bulk update() or delete() statements on
+    pantry_items bypass the flush, so code issuing them must call
+    invalidate() for the household, or lookups see the old items until
+    the TTL.
+    """
+
+    def __init__(self, max_households: int = 1000, ttl_seconds: float = 60.0):
+        self.max_households = max_households
+        self.ttl_seconds = ttl_seconds
+        self._indexes: "OrderedDict[Any, Tuple[float, TrigramIndex]]" = OrderedDict()
+        # Only households with a build in progress have an entry
+        self._builds: Dict[Any, _IndexBuild] = {}
+        self.builds = 0
+
+    def _cached(self, household_id: Any, now: float) -> Optional[TrigramIndex]:
+        entry = self._indexes.get(household_id)
+        if entry is None:
+            return None
+        built_at, index = entry
+        if now - built_at >= self.ttl_seconds:
+            del self._indexes[household_id]
+            return None
+        self._indexes.move_to_end(household_id)
+        return index
+
+    async def get_index(self, db: AsyncSession, household_id: Any) -> TrigramIndex:
+        """Get the household's index, building it if needed."""
+        index = self._cached(household_id, time.monotonic())
+        if index is not None:
+            return index
+
+        build = self._builds.get(household_id)
+        if build is None:
+            build = self._builds[household_id] = _IndexBuild(lock=asyncio.Lock())
+        build.users += 1
+        try:
+            async with build.lock:
+                index = self._cached(household_id, time.monotonic())
+                if index is not None:
+                    return index
+
+                build.stale = False
+                built_at = time.monotonic()
+                result = await db.execute(
+                    select(
+                        PantryItem.id,
+                        PantryItem.name,
+                        PantryItem.quantity,
+                        PantryItem.unit,
+                        PantryItem.location,
+                    ).where(PantryItem.household_id == household_id)
+                )
+                index = TrigramIndex([
+                    _IndexedItem(
+                        item_id=row.id,
+                        name=row.name,
+                        normalized=normalize_name(row.name),
+                        grams=trigrams(normalize_name(row.name)),
+                        quantity=row.quantity,
+                        unit=row.unit,
+                        location=row.location,
+                    )
+                    for row in result
+                ])
+                self.builds += 1
+
+                if not build.stale:
+                    self._indexes[household_id] = (built_at, index)
+                    self._indexes.move_to_end(household_id)
+                    while len(self._indexes) > self.max_households:
+                        self._indexes.popitem(last=False)
+                return index
+        finally:
+            build.users -= 1
+            if build.users == 0:
+                self._builds.pop(household_id, None)
+
+    async def resolve(
+        self,
+        db: AsyncSession,
+        household_id: Any,
+        names: Sequence[str],
+        limit: int = 3,
+        min_score: float = 0.3
+    ) -> List[List[EntityMatch]]:
+        """
+        Resolve entity names to pantry item candidates.
+
+        Args:
+            db: Database session used if the index must be built
+            household_id: Household whose pantry to search
+            names: Parsed entity names
+            limit: Maximum candidates per name
+            min_score: Minimum similarity to report
+
+        Returns:
+            One list of matches per name, in the same order
+        """
+        index = await self.get_index(db, household_id)
+        return [index.search(name, limit=limit, min_score=min_score) for name in names]
+
+    def invalidate(self, household_id: Any = None) -> None:
+        """Drop the index of one household, or of every household."""
+        if household_id is None:
+            self._indexes.clear()
+            for build in self._builds.values():
+                build.stale = True
+            return
+        self._indexes.pop(household_id, None)
+        build = self._builds.get(household_id)
+        if build is not None:
+            build.stale = True
+
+
+# Global entity resolver instance
+entity_resolver = PantryEntityResolver()
+
+
+_PENDING_KEY = "pantry_households_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_pantry_changes(session, flush_context):
+    """Remember which households' pantry items this transaction touched."""
+    changed = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, PantryItem) and obj.household_id is not None:
+            changed.add(obj.household_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    for household_id in session.info.pop(_PENDING_KEY, ()):
+        entity_resolver.invalidate(household_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
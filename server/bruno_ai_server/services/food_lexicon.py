@@ -0,0 +1,188 @@
+"""
+Food lexicon for voice command parsing.
+
+This service handles:
+- Loading the packaged food lexicon (terms, synonyms, categories)
+- A token-level trie so multi-word foods ("sour cream", "ground beef")
+  are recognized as one item
+- Single-pass, longest-match scanning of command text
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parent.parent / "data" / "food_lexicon.tsv"
+
+TOKEN_PATTERN = re.compile(r"[\w%']+")
+
+# Key under which a trie node stores the (canonical term, category) it completes
+_TERMINAL = ""
+
+
+@dataclass(frozen=True)
+class LexiconMatch:
+    """A food found in text, as token offsets into the tokenized text."""
+    start: int
+    end: int
+    text: str
+    canonical: str
+    category: str
+
+
+def singularize(token: str) -> str:
+    """Cheap English singular form for matching plurals against the lexicon."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith("oes"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith(("ches", "shes", "xes", "sses")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us")):
+        return token[:-1]
+    return token
+
+
+class FoodLexicon:
+    """
+    Token trie over food terms and their synonyms.
+
+    Each node is a dict from token to child node; a node that completes a
+    term also holds the term's canonical name and category under an empty
+    key. The trie is built once per process and never modified.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str, List[str]]]):
+        self._root: Dict[str, dict] = {}
+        categories: Dict[str, List[str]] = {}
+        terms = set()
+
+        for term, category, synonyms in entries:
+            categories.setdefault(category, []).append(term)
+            for surface in (term, *synonyms):
+                tokens = TOKEN_PATTERN.findall(surface.lower())
+                if not tokens:
+                    continue
+                node = self._root
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node[_TERMINAL] = (term, category)
+                terms.add(" ".join(tokens))
+
+        self.terms: FrozenSet[str] = frozenset(terms)
+        self.categories: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {category: tuple(names) for category, names in categories.items()}
+        )
+        self.max_term_tokens = max((len(term.split()) for term in terms), default=0)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "FoodLexicon":
+        """
+        Load a lexicon from a TSV file.
+
+        Lines are ``term<TAB>category<TAB>synonyms`` with synonyms separated
+        by ``|``. Blank lines and lines starting with ``#`` are ignored.
+        """
+        path = Path(path or DEFAULT_LEXICON_PATH)
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.rstrip("\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+                fields = line.split("\t")
+                if len(fields) < 2:
+                    logger.warning(f"Skipping malformed lexicon line {line_number} in {path.name}")
+                    continue
+                synonyms = [s.strip() for s in fields[2].split("|")] if len(fields) > 2 else []
+                entries.append((fields[0].strip(), fields[1].strip(), [s for s in synonyms if s]))
+
+        lexicon = cls(entries)
+        logger.info(f"Loaded food lexicon with {len(lexicon)} terms from {path.name}")
+        return lexicon
+
+    def _child(self, node: dict, token: str) -> Optional[dict]:
+        child = node.get(token)
+        if child is None:
+            singular = singularize(token)
+            if singular != token:
+                child = node.get(singular)
+        return child
+
+    def find_all(self, text: str) -> List[LexiconMatch]:
+        """
+        Find every food in the text, preferring the longest term at each point.
+
+        The scan walks the trie from each token and skips past a match, so
+        "sour cream" is one match rather than "sour cream" and "cream".
+        """
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        matches = []
+        position = 0
+        while position < len(tokens):
+            node = self._root
+            best = None
+            cursor = position
+            while cursor < len(tokens):
+                node = self._child(node, tokens[cursor])
+                if node is None:
+                    break
+                cursor += 1
+                if _TERMINAL in node:
+                    best = (cursor, node[_TERMINAL])
+
+            if best is None:
+                position += 1
+                continue
+
+            end, (canonical, category) = best
+            matches.append(LexiconMatch(
+                start=position,
+                end=end,
+                text=" ".join(tokens[position:end]),
+                canonical=canonical,
+                category=category,
+            ))
+            position = end
+        return matches
+
+    def contains_food(self, text: str) -> bool:
+        """Check whether the text mentions any known food."""
+        return bool(self.find_all(text))
+
+    def lookup(self, name: str) -> Optional[LexiconMatch]:
+        """Match a whole name against the lexicon, or return None."""
+        tokens = TOKEN_PATTERN.findall(name.lower())
+        matches = self.find_all(name)
+        if len(matches) == 1 and matches[0].start == 0 and matches[0].end == len(tokens):
+            return matches[0]
+        return None
+
+
+_food_lexicon: Optional[FoodLexicon] = None
+_food_lexicon_lock = threading.Lock()
+
+
+def get_food_lexicon() -> FoodLexicon:
+    """
+    Get the process-wide food lexicon, loading it on first use.
+
+    Each process (server worker or batch parser worker) loads its own
+    copy; the lexicon is read-only, so one copy serves every request and
+    thread in the process.
+    """
+    global _food_lexicon
+    if _food_lexicon is None:
+        with _food_lexicon_lock:
+            if _food_lexicon is None:
+                _food_lexicon = FoodLexicon.load()
+    return _food_lexicon
@@ -0,0 +1,33 @@
+"""
+Household lookups shared by the API routers.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.user import HouseholdMember, User
+
+
+async def get_user_household_id(user: User, db: AsyncSession) -> int | None:
+    """Get the user's primary household ID."""
+    # First try to get household where user is an admin (most likely primary)
+    result = await db.execute(
+        select(HouseholdMember.household_id)
+        .where(
+            HouseholdMember.user_id == user.id,
+            HouseholdMember.role == "admin"
+        )
+        .limit(1)
+    )
+    household_id = result.scalar_one_or_none()
+
+    if household_id:
+        return household_id
+
+    # If no admin household, get any household the user is a member of
+    result = await db.execute(
+        select(HouseholdMember.household_id)
+        .where(HouseholdMember.user_id == user.id)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
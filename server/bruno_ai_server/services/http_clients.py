@@ -0,0 +1,236 @@
+"""
+Application-lifetime HTTP clients for upstream AI providers.
+
+This service handles:
+- One pooled httpx.AsyncClient per upstream (Voxtral STT, TTS providers),
+  created on first use and closed in the FastAPI lifespan
+- Keep-alive and, when the h2 package is installed, HTTP/2 connections
+  so STT/TTS calls skip repeated TCP and TLS handshakes
+- Pool metrics: connections in use and idle, requests in flight,
+  connections opened and time spent waiting for a connection slot
+"""
+
+import importlib.util
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# httpcore trace events that mark the request leaving the pool queue
+_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+# Wait time samples kept for percentiles
+_WAIT_SAMPLES = 512
+
+
+class PoolMetrics:
+    """Counters for one client's connection pool."""
+
+    def __init__(self):
+        self.requests_total = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.errors_total = 0
+        self._wait_ms: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self._wait_ms_max = 0.0
+
+    def record_wait(self, wait_ms: float) -> None:
+        self._wait_ms.append(wait_ms)
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sorted(self._wait_ms)
+        p95 = samples[max(0, int(len(samples) * 0.95) - 1)] if samples else 0.0
+        return {
+            "requests_total": self.requests_total,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "errors_total": self.errors_total,
+            "wait_ms": {
+                "avg": round(sum(samples) / len(samples), 3) if samples else 0.0,
+                "p95": round(p95, 3),
+                "max": round(self._wait_ms_max, 3),
+            },
+        }
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response stream that releases the in-flight slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that records pool metrics.
+
+    A request counts as in flight from when it is handed to the pool until
+    its response body is closed, including time queued for a connection.
+    Pool wait time is measured with httpcore trace events: the interval
+    until the request either opens a new connection or starts writing on
+    a reused one.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, metrics: PoolMetrics):
+        self._transport = transport
+        self.metrics = metrics
+
+    def connection_counts(self) -> Dict[str, Optional[int]]:
+        """Connections currently serving requests and idle in the pool."""
+        pool = getattr(self._transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return {"in_use": None, "idle": None}
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"in_use": len(connections) - idle, "idle": idle}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self.metrics
+        metrics.requests_total += 1
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+
+        queued_at = time.perf_counter()
+        acquired = False
+        previous_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and event_name in _ACQUIRED_EVENTS:
+                acquired = True
+                metrics.record_wait((time.perf_counter() - queued_at) * 1000)
+            if event_name == "connection.connect_tcp.complete":
+                metrics.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                metrics.tls_handshakes += 1
+            if previous_trace is not None:
+                await previous_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                metrics.in_flight -= 1
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            metrics.errors_total += 1
+            release()
+            raise
+
+        response.stream = _MeteredStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientPool:
+    """
+    Registry of named, long-lived HTTP clients.
+
+    Clients are created lazily with the configured pool limits and shared
+    by every request in the process. Call aclose() on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        self.max_connections = max_connections or settings.http_pool_max_connections
+        self.max_keepalive_connections = max_keepalive_connections or settings.http_pool_max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry or settings.http_pool_keepalive_expiry_seconds
+        requested_http2 = settings.http_pool_http2 if http2 is None else http2
+        self.http2 = requested_http2 and HTTP2_AVAILABLE
+        if requested_http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but the h2 package is not installed - using HTTP/1.1")
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, MeteredTransport] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Get the shared client for an upstream, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            transport = MeteredTransport(
+                httpx.AsyncHTTPTransport(
+                    http2=self.http2,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry,
+                    ),
+                ),
+                self._transports[name].metrics if name in self._transports else PoolMetrics(),
+            )
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(settings.http_timeout_seconds, connect=settings.http_connect_timeout_seconds),
+            )
+            self._clients[name] = client
+            self._transports[name] = transport
+            logger.info(f"Created pooled HTTP client '{name}' (http2={self.http2}, max_connections={self.max_connections})")
+        return client
+
+    def metrics(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Pool metrics for one client, or for all clients keyed by name."""
+        if name is not None:
+            transport = self._transports.get(name)
+            if transport is None:
+                return {}
+            return {
+                **transport.metrics.snapshot(),
+                **transport.connection_counts(),
+                "max_connections": self.max_connections,
+                "http2": self.http2,
+            }
+        return {client_name: self.metrics(client_name) for client_name in self._transports}
+
+    async def aclose(self) -> None:
+        """Close every client and its connections."""
+        for name, client in list(self._clients.items()):
+            await client.aclose()
+            logger.info(f"Closed pooled HTTP client '{name}'")
+        self._clients.clear()
+
+
+# Global client pool instance
+http_clients = HTTPClientPool()
@@ -0,0 +1,462 @@
+"""
+Real-time notification hub for Bruno AI.
+
+This service handles:
+- In-process pub/sub with one channel per household
+- Bounded per-connection queues with drop/merge policies for slow consumers
+- Heartbeats for idle WebSocket and SSE connections
+- Pluggable cross-worker fan-out (in-process or Postgres LISTEN/NOTIFY)
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event type published after a pantry item is created, updated or deleted
+PANTRY_ITEM_CHANGED = "pantry_item_changed"
+
+
+class DeliveryPolicy(Enum):
+    """What a subscription does when its queue is full."""
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    MERGE = "merge"
+
+
+@dataclass
+class HubEvent:
+    """A notification event published to a household channel."""
+    type: str
+    household_id: str
+    data: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+    merge_key: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the event for transport to clients and other workers."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "household_id": self.household_id,
+            "data": self.data,
+            "created_at": self.created_at,
+            "merge_key": self.merge_key,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "HubEvent":
+        """Rebuild an event received from another worker."""
+        return cls(
+            type=payload["type"],
+            household_id=payload["household_id"],
+            data=payload.get("data") or {},
+            id=payload.get("id") or uuid.uuid4().hex,
+            created_at=payload.get("created_at") or time.time(),
+            merge_key=payload.get("merge_key"),
+        )
+
+
+class Subscription:
+    """
+    A single client connection's view of a household channel.
+
+    Events are buffered in a bounded queue. When the consumer falls behind,
+    the delivery policy decides whether to drop the oldest event, drop the
+    incoming event, or merge it into a queued event with the same merge key.
+    """
+
+    def __init__(
+        self,
+        household_id: str,
+        max_queue_size: int,
+        policy: DeliveryPolicy,
+        heartbeat_interval: float,
+    ):
+        self.household_id = household_id
+        self.max_queue_size = max(1, max_queue_size)
+        self.policy = policy
+        self.heartbeat_interval = heartbeat_interval
+        self.dropped_count = 0
+        self.merged_count = 0
+        self.delivered_count = 0
+        self._queue: Deque[HubEvent] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def offer(self, event: HubEvent) -> None:
+        """Enqueue an event, applying the delivery policy when needed."""
+        if self._closed:
+            return
+
+        if self.policy == DeliveryPolicy.MERGE and event.merge_key:
+            for index, queued in enumerate(self._queue):
+                if queued.merge_key == event.merge_key:
+                    # Newer state supersedes the undelivered one in place
+                    self._queue[index] = event
+                    self.merged_count += 1
+                    self._ready.set()
+                    return
+
+        if len(self._queue) >= self.max_queue_size:
+            if self.policy == DeliveryPolicy.DROP_NEWEST:
+                self.dropped_count += 1
+                return
+            self._queue.popleft()
+            self.dropped_count += 1
+
+        self._queue.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[HubEvent]:
+        """
+        Wait for the next event.
+
+        Returns None if no event arrived within the timeout (callers send
+        a heartbeat) or if the subscription was closed.
+        """
+        if not self._queue and not self._closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        if not self._queue:
+            return None
+
+        self.delivered_count += 1
+        return self._queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Optional[HubEvent]:
+        """Yield events, or None when a heartbeat is due."""
+        if self._closed and not self._queue:
+            raise StopAsyncIteration
+        return await self.get(timeout=self.heartbeat_interval)
+
+    def close(self) -> None:
+        """Stop the subscription and wake any waiting consumer."""
+        self._closed = True
+        self._ready.set()
+
+
+RemoteCallback = Callable[[Dict[str, Any]], None]
+
+
+class FanoutBackend:
+    """Cross-worker transport for hub events. The base class is a no-op."""
+
+    name = "local"
+
+    async def start(self, on_message: RemoteCallback) -> None:
+        """Begin receiving events published by other workers."""
+
+    async def stop(self) -> None:
+        """Release any transport resources."""
+
+    async def publish(self, payload: Dict[str, Any]) -> None:
+        """Send an event to the other workers."""
+
+
+class LocalFanoutBackend(FanoutBackend):
+    """Single-process deployment: events never leave this worker."""
+
+
+class PostgresFanoutBackend(FanoutBackend):
+    """
+    Share events between API workers using Postgres LISTEN/NOTIFY.
+
+    A dedicated connection listens for notifications and is reconnected
+    with backoff if it drops; events published by other workers while it
+    is down are not replayed. Publishing goes through a small pool, since
+    a connection runs one query at a time and concurrent publishes would
+    otherwise fail on the listener connection.
+    """
+
+    name = "postgres"
+    CHANNEL = "bruno_notifications"
+    MAX_PAYLOAD_BYTES = 7900  # NOTIFY payloads are limited to 8000 bytes
+    PUBLISH_POOL_SIZE = 4
+    RECONNECT_MAX_DELAY = 30.0
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://")
+        self._listener = None
+        self._pool = None
+        self._on_message: Optional[RemoteCallback] = None
+        self._listener_lost: Optional[asyncio.Event] = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self.reconnects = 0
+
+    async def start(self, on_message: RemoteCallback) -> None:
+        import asyncpg
+
+        self._on_message = on_message
+        self._listener_lost = asyncio.Event()
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.PUBLISH_POOL_SIZE)
+        try:
+            await self._listen()
+        except Exception:
+            await self._pool.close()
+            self._pool = None
+            raise
+        self._supervisor = asyncio.create_task(self._keep_listening())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+        if self._listener is not None:
+            try:
+                await self._listener.remove_listener(self.CHANNEL, self._handle_notify)
+            except Exception as e:
+                logger.debug(f"Could not remove notification listener: {e}")
+            finally:
+                await self._listener.close()
+                self._listener = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def publish(self, payload: Dict[str, Any]) -> None:
+        if self._pool is None:
+            return
+
+        message = json.dumps(payload, default=str)
+        if len(message.encode()) > self.MAX_PAYLOAD_BYTES:
+            logger.warning(
+                f"Notification {payload.get('id')} too large for NOTIFY, "
+                "delivered to this worker only"
+            )
+            return
+
+        await self._pool.execute("SELECT pg_notify($1, $2)", self.CHANNEL, message)
+
+    async def _listen(self) -> None:
+        """Open the listener connection and subscribe to the channel."""
+        import asyncpg
+
+        self._listener_lost.clear()
+        connection = await asyncpg.connect(self.dsn)
+        connection.add_termination_listener(lambda _connection: self._listener_lost.set())
+        await connection.add_listener(self.CHANNEL, self._handle_notify)
+        self._listener = connection
+        logger.info(f"Listening for notification fan-out on '{self.CHANNEL}'")
+
+    async def _keep_listening(self) -> None:
+        """Reconnect the listener, with exponential backoff, whenever it drops."""
+        while True:
+            await self._listener_lost.wait()
+            logger.warning("Notification fan-out listener disconnected, reconnecting")
+            self._listener = None
+            delay = 1.0
+            while True:
+                try:
+                    await self._listen()
+                    self.reconnects += 1
+                    break
+                except Exception as e:
+                    logger.error(f"Notification fan-out reconnect failed, retrying in {delay:.0f}s: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+    def _handle_notify(self, connection, pid, channel, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError:
+            logger.warning("Ignoring malformed notification fan-out payload")
+            return
+        if self._on_message:
+            self._on_message(payload)
+
+
+def create_fanout_backend(name: str) -> FanoutBackend:
+    """Build the configured fan-out backend."""
+    if name == "postgres":
+        return PostgresFanoutBackend(settings.db_url)
+    if name != "local":
+        logger.warning(f"Unknown notification fan-out backend '{name}', using local")
+    return LocalFanoutBackend()
+
+
+class NotificationHub:
+    """
+    Pub/sub hub with per-household channels.
+
+    Publishing delivers to every local subscriber of the household channel
+    and forwards the event through the fan-out backend so subscribers
+    connected to other workers receive it too.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[FanoutBackend] = None,
+        max_queue_size: int = 100,
+        heartbeat_interval: float = 15.0,
+        policy: DeliveryPolicy = DeliveryPolicy.MERGE,
+    ):
+        self.backend = backend or LocalFanoutBackend()
+        self.max_queue_size = max_queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.policy = policy
+        self.origin_id = uuid.uuid4().hex
+        self.published_count = 0
+        self.remote_received_count = 0
+        self.fanout_failed_count = 0
+        self._channels: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._started = False
+
+    async def start(self) -> None:
+        """Start the fan-out backend."""
+        if self._started:
+            return
+        try:
+            await self.backend.start(self._receive_remote)
+        except Exception as e:
+            logger.error(f"Notification fan-out backend failed to start, using local only: {e}")
+            self.backend = LocalFanoutBackend()
+        self._started = True
+
+    async def stop(self) -> None:
+        """Close every subscription and stop the fan-out backend."""
+        for subscriptions in self._channels.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._channels.clear()
+        if self._started:
+            await self.backend.stop()
+            self._started = False
+
+    def subscribe(
+        self,
+        household_id: Any,
+        max_queue_size: Optional[int] = None,
+        policy: Optional[DeliveryPolicy] = None,
+    ) -> Subscription:
+        """Open a subscription on a household channel."""
+        subscription = Subscription(
+            household_id=str(household_id),
+            max_queue_size=max_queue_size or self.max_queue_size,
+            policy=policy or self.policy,
+            heartbeat_interval=self.heartbeat_interval,
+        )
+        self._channels[subscription.household_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription and remove it from its channel."""
+        subscription.close()
+        subscribers = self._channels.get(subscription.household_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.household_id]
+
+    async def publish(
+        self,
+        household_id: Any,
+        event_type: str,
+        data: Dict[str, Any],
+        merge_key: Optional[str] = None,
+    ) -> HubEvent:
+        """Publish an event to all subscribers of a household, on every worker."""
+        event = HubEvent(
+            type=event_type,
+            household_id=str(household_id),
+            data=data,
+            merge_key=merge_key,
+        )
+        self._deliver(event)
+        self.published_count += 1
+
+        payload = event.to_dict()
+        payload["origin"] = self.origin_id
+        try:
+            await self.backend.publish(payload)
+        except Exception as e:
+            self.fanout_failed_count += 1
+            logger.error(f"Notification fan-out publish failed, event {event.id} reached this worker only: {e}")
+
+        return event
+
+    async def publish_pantry_change(self, household_id: Any, item_id: Any, change: str) -> HubEvent:
+        """
+        Announce a committed pantry item change to the household.
+
+        Clients refetch the item instead of polling. Events for one item
+        share a merge key, so a slow client only receives the latest.
+
+        Args:
+            household_id: Household owning the item
+            item_id: Changed item
+            change: created, updated or deleted
+        """
+        return await self.publish(
+            household_id,
+            PANTRY_ITEM_CHANGED,
+            {"item_id": str(item_id), "change": change},
+            merge_key=f"{PANTRY_ITEM_CHANGED}:{item_id}",
+        )
+
+    def subscriber_count(self, household_id: Any = None) -> int:
+        """Number of open subscriptions, optionally for one household."""
+        if household_id is not None:
+            return len(self._channels.get(str(household_id), ()))
+        return sum(len(subscribers) for subscribers in self._channels.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Hub-wide counters for health checks."""
+        subscriptions = [s for subs in self._channels.values() for s in subs]
+        return {
+            "backend": self.backend.name,
+            "channels": len(self._channels),
+            "subscriptions": len(subscriptions),
+            "published": self.published_count,
+            "remote_received": self.remote_received_count,
+            "fanout_failed": self.fanout_failed_count,
+            "dropped": sum(s.dropped_count for s in subscriptions),
+            "merged": sum(s.merged_count for s in subscriptions),
+        }
+
+    def _deliver(self, event: HubEvent) -> None:
+        for subscription in list(self._channels.get(event.household_id, ())):
+            subscription.offer(event)
+
+    def _receive_remote(self, payload: Dict[str, Any]) -> None:
+        if payload.get("origin") == self.origin_id:
+            return
+        self.remote_received_count += 1
+        self._deliver(HubEvent.from_dict(payload))
+
+
+# Global notification hub instance
+notification_hub = NotificationHub(
+    backend=create_fanout_backend(settings.notification_fanout_backend),
+    max_queue_size=settings.notification_queue_size,
+    heartbeat_interval=settings.notification_heartbeat_seconds,
+)
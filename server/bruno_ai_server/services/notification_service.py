@@ -9,26 +9,70 @@ This service handles:
 """
 
 import logging
-from typing import Dict, List, Optional
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload
 
 from ..models.user import Household, User, HouseholdMember
+from .email_service import EmailSendReport, email_service
+from .notification_hub import notification_hub
 
 logger = logging.getLogger(__name__)
 
+# (notification data, recipients, formatted title/message) for one household
+EmailDigest = Tuple[Dict[str, Any], List[Tuple[str, str]], Dict[str, str]]
+
+
+@dataclass
+class NotificationTarget:
+    """A household member to notify, with preferences and device targets."""
+    user_id: Any
+    household_id: Any
+    email: str
+    name: str
+    preferences: Dict[str, Any]
+    device_tokens: List[str] = field(default_factory=list)
+
+    def wants(self, preference: str) -> bool:
+        """Check whether the member has a notification preference enabled."""
+        return bool(self.preferences.get(preference, False))
+
 
 class NotificationService:
     """Service for managing notifications and alerts."""
     
+    # Applied in memory to whatever a user has stored
+    DEFAULT_NOTIFICATION_PREFERENCES = {
+        "push_notifications": True,
+        "email_notifications": True,
+        "in_app_notifications": True,
+        "expiration_alerts": True,
+        "shopping_reminders": True,
+        "meal_suggestions": True
+    }
+    
+    # Short-lived cache so repeated sends within a run reuse one query.
+    # Entries are kept oldest write first and bounded in number, and are
+    # dropped when a transaction changing a household's memberships or a
+    # member's notification details commits in this process.
+    PREFERENCE_CACHE_TTL_SECONDS = 300
+    PREFERENCE_CACHE_MAX_HOUSEHOLDS = 1000
+    _preference_cache: "OrderedDict[Any, Tuple[float, List[NotificationTarget]]]" = OrderedDict()
+    
     @classmethod
     async def send_expiration_notifications(
         cls,
         household: Household,
-        notification_data: Dict[str, any]
+        notification_data: Dict[str, any],
+        targets: Optional[List[NotificationTarget]] = None,
+        email_digests: Optional[List[EmailDigest]] = None
     ):
         """
         Send expiration notifications to all household members.
@@ -36,21 +80,32 @@ class NotificationService:
         Args:
             household: Household to send notifications to
             notification_data: Data about expiring/expired items
+            targets: Members to notify, from get_household_notification_targets
+            email_digests: When given, the household's email digest is
+                appended here for the caller to send with send_email_digests
         """
         try:
-            # For now, we'll log the notifications
-            # In a production system, this would integrate with:
-            # - Firebase Cloud Messaging for push notifications
-            # - Email service for email notifications
-            # - WebSocket connections for real-time in-app notifications
+            # Push still needs a provider integration (Firebase Cloud Messaging)
             
             logger.info(f"Sending expiration notifications to household {household.id}")
             logger.info(f"Notification data: {notification_data}")
             
             # TODO: Integrate with actual notification providers
             # await cls._send_push_notifications(household, notification_data)
-            # await cls._send_email_notifications(household, notification_data)
-            # await cls._send_in_app_notifications(household, notification_data)
+            if targets:
+                if email_digests is None:
+                    await cls._send_email_notifications(household, notification_data, targets)
+                else:
+                    digest = cls.build_email_digest(household, notification_data, targets)
+                    if digest is not None:
+                        email_digests.append(digest)
+            
+            # Skip the in-app alert when every member has opted out of it
+            if targets is None or any(
+                target.wants("in_app_notifications") and target.wants("expiration_alerts")
+                for target in targets
+            ):
+                await cls._send_in_app_notifications(household, notification_data)
             
         except Exception as e:
             logger.error(f"Error sending expiration notifications: {e}")
@@ -71,18 +126,66 @@ class NotificationService:
         pass
     
     @classmethod
-    async def _send_email_notifications(
+    def build_email_digest(
         cls,
         household: Household,
-        notification_data: Dict[str, any]
-    ):
+        notification_data: Dict[str, any],
+        targets: List[NotificationTarget]
+    ) -> Optional[EmailDigest]:
         """
-        Send email notifications to household members.
+        Build the email digest for members who opted in.
         
-        This would integrate with an email service like SendGrid or AWS SES.
+        Returns:
+            (notification data, recipients, formatted title/message), or
+            None when nobody in the household wants an email
         """
-        # TODO: Implement email notifications
-        pass
+        recipients = [
+            (target.email, target.name)
+            for target in targets
+            if target.email
+            and target.wants("email_notifications")
+            and target.wants("expiration_alerts")
+        ]
+        if not recipients:
+            return None
+        
+        formatted = cls.format_expiration_message(
+            expiring_count=notification_data.get("expiring_count", 0),
+            expired_count=notification_data.get("expired_count", 0),
+            household_name=household.name
+        )
+        return notification_data, recipients, formatted
+    
+    @classmethod
+    async def send_email_digests(cls, digests: List[EmailDigest]) -> Optional[EmailSendReport]:
+        """
+        Send digests for any number of households in one batch.
+        
+        All messages share the pooled SMTP sessions of the email service,
+        so a nightly run is not serialized household by household.
+        """
+        if not digests or not email_service.is_configured:
+            return None
+        
+        report = await email_service.send_expiration_digests(digests)
+        if report.failed:
+            logger.warning(
+                f"{len(report.failed)} of {report.sent + len(report.failed)} expiration emails failed"
+            )
+        return report
+    
+    @classmethod
+    async def _send_email_notifications(
+        cls,
+        household: Household,
+        notification_data: Dict[str, any],
+        targets: List[NotificationTarget]
+    ) -> Optional[EmailSendReport]:
+        """Send the email digest of a single household."""
+        digest = cls.build_email_digest(household, notification_data, targets)
+        if digest is None:
+            return None
+        return await cls.send_email_digests([digest])
     
     @classmethod
     async def _send_in_app_notifications(
@@ -91,12 +194,23 @@ class NotificationService:
         notification_data: Dict[str, any]
     ):
         """
-        Send in-app notifications via WebSocket connections.
+        Send in-app notifications via WebSocket and SSE connections.
         
-        This would push notifications to connected clients.
+        Publishes to the household channel of the notification hub. Alerts
+        share a merge key so a slow client only receives the latest one.
         """
-        # TODO: Implement in-app notifications via WebSocket
-        pass
+        message = cls.format_expiration_message(
+            expiring_count=notification_data.get("expiring_count", 0),
+            expired_count=notification_data.get("expired_count", 0),
+            household_name=household.name
+        )
+        
+        await notification_hub.publish(
+            household.id,
+            "expiration_alert",
+            {**message, **notification_data},
+            merge_key="expiration_alert"
+        )
     
     @classmethod
     def format_expiration_message(
@@ -155,18 +269,114 @@ class NotificationService:
         )
         user = result.scalar_one_or_none()
         
-        if user and user.notification_preferences:
-            return user.notification_preferences
+        return cls._apply_default_preferences(user.notification_preferences if user else None)
+    
+    @classmethod
+    async def get_household_notification_targets(
+        cls,
+        db: AsyncSession,
+        household_ids: Sequence[Any],
+        use_cache: bool = True
+    ) -> Dict[Any, List[NotificationTarget]]:
+        """
+        Load notification targets for many households in one query.
+        
+        Members are joined through HouseholdMember and defaults are applied
+        in memory. Results are cached for PREFERENCE_CACHE_TTL_SECONDS, for
+        at most PREFERENCE_CACHE_MAX_HOUSEHOLDS households. Commits that
+        change memberships or members invalidate their households; the TTL
+        picks up writes made by other workers.
+        
+        Args:
+            db: Database session
+            household_ids: IDs of the households to load
+            use_cache: Whether to reuse recently loaded targets
+            
+        Returns:
+            Dictionary mapping household ID to its active members
+        """
+        now = time.monotonic()
+        targets: Dict[Any, List[NotificationTarget]] = {}
+        missing = []
+        
+        for household_id in dict.fromkeys(household_ids):
+            cached = cls._preference_cache.get(household_id) if use_cache else None
+            if cached and now - cached[0] < cls.PREFERENCE_CACHE_TTL_SECONDS:
+                targets[household_id] = cached[1]
+            else:
+                missing.append(household_id)
+        
+        if not missing:
+            return targets
+        
+        loaded: Dict[Any, List[NotificationTarget]] = {household_id: [] for household_id in missing}
+        result = await db.execute(
+            select(
+                HouseholdMember.household_id,
+                User.id,
+                User.email,
+                User.name,
+                User.notification_preferences
+            )
+            .join(User, User.id == HouseholdMember.user_id)
+            .where(
+                HouseholdMember.household_id.in_(missing),
+                User.is_active.is_(True)
+            )
+        )
+        
+        for household_id, user_id, email, name, stored_preferences in result.all():
+            preferences = cls._apply_default_preferences(stored_preferences)
+            loaded[household_id].append(NotificationTarget(
+                user_id=user_id,
+                household_id=household_id,
+                email=email,
+                name=name,
+                preferences=preferences,
+                device_tokens=list(preferences.pop("device_tokens", None) or [])
+            ))
+        
+        for household_id, members in loaded.items():
+            cls._preference_cache[household_id] = (now, members)
+            cls._preference_cache.move_to_end(household_id)
+        cls._prune_preference_cache(now)
+        
+        targets.update(loaded)
+        return targets
+    
+    @classmethod
+    def _prune_preference_cache(cls, now: float) -> None:
+        """Drop expired entries, then the oldest entries over the size bound."""
+        cache = cls._preference_cache
+        while cache:
+            loaded_at, _ = next(iter(cache.values()))
+            if now - loaded_at < cls.PREFERENCE_CACHE_TTL_SECONDS and len(cache) <= cls.PREFERENCE_CACHE_MAX_HOUSEHOLDS:
+                break
+            cache.popitem(last=False)
+    
+    @classmethod
+    def invalidate_preference_cache(cls, household_id: Any = None) -> None:
+        """Drop cached targets for one household, or for all households."""
+        if household_id is None:
+            cls._preference_cache.clear()
         else:
-            # Default preferences
-            return {
-                "push_notifications": True,
-                "email_notifications": True,
-                "in_app_notifications": True,
-                "expiration_alerts": True,
-                "shopping_reminders": True,
-                "meal_suggestions": True
-            }
+            cls._preference_cache.pop(household_id, None)
+    
+    @classmethod
+    def invalidate_member_targets(cls, user_id: Any) -> None:
+        """Drop cached targets for every household the user is cached in."""
+        stale = [
+            household_id
+            for household_id, (_, members) in cls._preference_cache.items()
+            if any(target.user_id == user_id for target in members)
+        ]
+        for household_id in stale:
+            del cls._preference_cache[household_id]
+    
+    @classmethod
+    def _apply_default_preferences(cls, preferences: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge stored preferences over the defaults."""
+        return {**cls.DEFAULT_NOTIFICATION_PREFERENCES, **(preferences or {})}
     
     @classmethod
     async def update_user_notification_preferences(
@@ -203,3 +413,38 @@ class NotificationService:
             logger.error(f"Error updating notification preferences: {e}")
             await db.rollback()
             return False
+
+
+_PENDING_KEY = "notification_targets_changed"
+
+# User columns copied into NotificationTarget
+_TARGET_USER_COLUMNS = ("email", "name", "is_active", "notification_preferences")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_target_changes(session, flush_context):
+    """Remember which households and members this transaction touched."""
+    households, users = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, HouseholdMember):
+            # A moved membership changes both its old and new household
+            history = inspect(obj).attrs.household_id.history
+            households.update(value for value in (*history.sum(), obj.household_id) if value is not None)
+        elif isinstance(obj, User) and obj.id is not None:
+            state = inspect(obj)
+            if obj in session.deleted or any(state.attrs[key].history.has_changes() for key in _TARGET_USER_COLUMNS):
+                users.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    households, users = session.info.pop(_PENDING_KEY, ((), ()))
+    for household_id in households:
+        NotificationService.invalidate_preference_cache(household_id)
+    for user_id in users:
+        NotificationService.invalidate_member_targets(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,139 @@
+"""
+Rolling health statistics for upstream speech providers.
+
+This module provides:
+- Recent latency samples and outcome counters per provider, used for
+  latency-aware routing, hedging delays and health reporting
+- A consecutive-failure circuit breaker that ejects a failing provider
+  for a while and then lets a trial call through
+
+Shared by the STT router and the TTS service.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latency samples and outcomes kept per provider
+_LATENCY_SAMPLES = 256
+
+
+class RollingStats:
+    """Recent latencies, recent outcomes and outcome counters for one provider."""
+
+    def __init__(self, samples: int = _LATENCY_SAMPLES):
+        self._latencies_ms: Deque[float] = deque(maxlen=samples)
+        self._outcomes: Deque[bool] = deque(maxlen=samples)  # True for success
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.short_circuited = 0
+
+    def record_latency(self, latency_ms: float) -> None:
+        self._latencies_ms.append(latency_ms)
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._outcomes.append(False)
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._latencies_ms)
+
+    @property
+    def recent_error_rate(self) -> Optional[float]:
+        """Share of failures among recent outcomes, or None before any."""
+        if not self._outcomes:
+            return None
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        if not self._latencies_ms:
+            return None
+        samples = sorted(self._latencies_ms)
+        return samples[min(len(samples) - 1, int(len(samples) * quantile))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        recent_error_rate = self.recent_error_rate
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "short_circuited": self.short_circuited,
+            "error_rate": round(self.failures / self.requests, 3) if self.requests else 0.0,
+            "recent_error_rate": round(recent_error_rate, 3) if recent_error_rate is not None else None,
+            "latency_ms": {
+                "p50": round(p50, 1) if p50 is not None else None,
+                "p95": round(p95, 1) if p95 is not None else None,
+            },
+        }
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the circuit opens and calls
+    are refused for recovery_seconds. Then one trial call is let through
+    (half-open): success closes the circuit, failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.recovery_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            # A trial that never reported back (cancelled) does not block forever
+            if self._trial_started_at is None or now - self._trial_started_at >= self.recovery_seconds:
+                self._trial_started_at = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._trial_started_at is not None or self.consecutive_failures >= self.failure_threshold:
+            logger.warning(f"Circuit opened after {self.consecutive_failures} consecutive failures")
+            self._opened_at = time.monotonic()
+        self._trial_started_at = None
@@ -10,7 +10,7 @@ This service handles:
 import asyncio
 import logging
 from datetime import datetime, time
-from typing import List
+from typing import List, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -20,7 +20,7 @@ from sqlalchemy.future import select
 from ..database import get_async_session
 from ..models.user import Household
 from .expiration_service import ExpirationService
-from .notification_service import NotificationService
+from .notification_service import EmailDigest, NotificationService, NotificationTarget
 
 logger = logging.getLogger(__name__)
 
@@ -81,8 +81,20 @@ class SchedulerService:
                 
                 logger.info(f"Checking expiration for {len(households)} households")
                 
+                # Load every member's preferences up front in a single query
+                targets = await NotificationService.get_household_notification_targets(
+                    db, [household.id for household in households]
+                )
+                
+                # Email digests are gathered across households and sent
+                # in one batch over the pooled SMTP sessions
+                email_digests: List[EmailDigest] = []
                 for household in households:
-                    await self._process_household_expiration_check(db, household)
+                    await self._process_household_expiration_check(
+                        db, household, targets.get(household.id, []), email_digests
+                    )
+                
+                await NotificationService.send_email_digests(email_digests)
                 
                 logger.info("Nightly expiration check completed successfully")
                 
@@ -90,13 +102,22 @@ class SchedulerService:
             logger.error(f"Error during nightly expiration check: {e}")
             raise
     
-    async def _process_household_expiration_check(self, db: AsyncSession, household: Household):
+    async def _process_household_expiration_check(
+        self,
+        db: AsyncSession,
+        household: Household,
+        targets: Optional[List[NotificationTarget]] = None,
+        email_digests: Optional[List[EmailDigest]] = None
+    ):
         """
         Process expiration check for a single household.
         
         Args:
             db: Database session
             household: Household to process
+            targets: Preloaded notification targets for the household
+            email_digests: Collects the email digest for a batched send;
+                when omitted the email is sent right away
         """
         try:
             # Get expiring items for this household
@@ -117,7 +138,9 @@ class SchedulerService:
                 await self._send_household_expiration_notifications(
                     household=household,
                     expiring_items=expiring_items,
-                    expired_items=expired_items
+                    expired_items=expired_items,
+                    targets=targets,
+                    email_digests=email_digests
                 )
                 
                 logger.info(
@@ -132,7 +155,9 @@ class SchedulerService:
         self,
         household: Household,
         expiring_items: List,
-        expired_items: List
+        expired_items: List,
+        targets: Optional[List[NotificationTarget]] = None,
+        email_digests: Optional[List[EmailDigest]] = None
     ):
         """
         Send expiration notifications to household members.
@@ -141,6 +166,8 @@ class SchedulerService:
             household: Household to notify
             expiring_items: Items expiring within 3 days
             expired_items: Items that have already expired
+            targets: Members to notify with their preferences
+            email_digests: Collects the email digest for a batched send
         """
         try:
             # Prepare notification data
@@ -170,7 +197,9 @@ class SchedulerService:
             # Send notifications via NotificationService
             await NotificationService.send_expiration_notifications(
                 household=household,
-                notification_data=notification_data
+                notification_data=notification_data,
+                targets=targets,
+                email_digests=email_digests
             )
             
         except Exception as e:
@@ -213,7 +242,12 @@ class SchedulerService:
                     )
                     household = result.scalar_one_or_none()
                     if household:
-                        await self._process_household_expiration_check(db, household)
+                        targets = await NotificationService.get_household_notification_targets(
+                            db, [household.id]
+                        )
+                        await self._process_household_expiration_check(
+                            db, household, targets.get(household.id, [])
+                        )
                         logger.info(f"Completed immediate check for household {household_id}")
                     else:
                         logger.warning(f"Household {household_id} not found")
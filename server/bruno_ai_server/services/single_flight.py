@@ -0,0 +1,89 @@
+"""
+Single-flight coalescing of concurrent identical async calls.
+
+While a call for a key is in flight, further callers with the same key
+await its result instead of starting their own. Used to keep duplicate
+requests (client retries, identical prompts) from each hitting a paid
+upstream API.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key.
+
+    The first caller starts the function in its own task; every caller,
+    including the first, awaits that task through a shield, so a caller
+    that is cancelled (e.g. a client disconnect) leaves the shared call
+    running for the others. Callers arriving before it finishes share
+    its result or exception. Nothing is remembered once the call
+    completes, so callers wanting caching must add it on top.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.calls_total = 0
+        self.coalesced_total = 0
+        self.max_waiters = 0  # Most callers that ever waited on one call
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    @property
+    def waiting(self) -> int:
+        """Callers currently waiting on another caller's call."""
+        return sum(self._waiters.values())
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn for key, or wait for the identical call already running.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            The result of the single underlying call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls_total += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            return await asyncio.shield(task)
+
+        self.coalesced_total += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        self.max_waiters = max(self.max_waiters, self._waiters[key])
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def metrics(self) -> Dict[str, Any]:
+        callers = self.calls_total + self.coalesced_total
+        return {
+            "calls_total": self.calls_total,
+            "coalesced_total": self.coalesced_total,
+            "coalescing_ratio": round(self.coalesced_total / callers, 3) if callers else 0.0,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_waiters": self.max_waiters,
+        }
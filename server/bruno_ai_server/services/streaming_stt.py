@@ -0,0 +1,333 @@
+"""
+Streaming speech-to-text backends for Bruno AI.
+
+This service handles:
+- Accepting audio frames while the user is still speaking
+- Emitting one final transcript as soon as the client signals end of
+  speech, plus opt-in partial transcripts during speech
+- Swappable backends: Voxtral (optional incremental re-transcription of
+  the growing buffer) and a local stub for tests and offline development
+"""
+
+import asyncio
+import logging
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import HTTPException
+
+from ..config import settings
+from .voice_service import VoiceService, get_voice_service
+
+logger = logging.getLogger(__name__)
+
+# Assumed bitrate of compressed (Opus/WebM/OGG) frames, for pacing partials
+COMPRESSED_BYTES_PER_SECOND = 4000
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Format of the audio frames a client streams."""
+    encoding: str = "pcm_s16le"  # pcm_s16le, webm, ogg
+    sample_rate: int = 16000
+    channels: int = 1
+
+    SUPPORTED_ENCODINGS = ("pcm_s16le", "webm", "ogg")
+
+    def __post_init__(self):
+        if self.encoding not in self.SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported encoding '{self.encoding}'. Supported: {', '.join(self.SUPPORTED_ENCODINGS)}")
+        if not 8000 <= self.sample_rate <= 48000:
+            raise ValueError("Sample rate must be between 8000 and 48000 Hz")
+        if self.channels not in (1, 2):
+            raise ValueError("Audio must be mono or stereo")
+
+    @property
+    def bytes_per_second(self) -> int:
+        if self.encoding == "pcm_s16le":
+            return self.sample_rate * 2 * self.channels
+        return COMPRESSED_BYTES_PER_SECOND
+
+    def duration_ms(self, byte_count: int) -> int:
+        return byte_count * 1000 // self.bytes_per_second
+
+    def to_file(self, audio: bytes) -> tuple:
+        """
+        Package buffered frames as a file the batch STT API accepts.
+
+        Raw PCM gets a WAV header; WebM and OGG recorder chunks already
+        concatenate into a valid container.
+
+        Returns:
+            Tuple of (filename, file bytes)
+        """
+        if self.encoding != "pcm_s16le":
+            return f"stream.{self.encoding}", audio
+
+        byte_rate = self.sample_rate * 2 * self.channels
+        header = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + len(audio), b"WAVE",
+            b"fmt ", 16, 1, self.channels, self.sample_rate, byte_rate, 2 * self.channels, 16,
+            b"data", len(audio),
+        )
+        return "stream.wav", header + audio
+
+
+@dataclass
+class StreamingTranscript:
+    """A partial or final transcript of the audio received so far."""
+    text: str
+    is_final: bool
+    confidence: float = 0.0
+    language_detected: Optional[str] = None
+
+
+class StreamingSTTSession(ABC):
+    """
+    One utterance being transcribed.
+
+    Audio is pushed with send_audio and end of speech is signalled with
+    finish. Transcripts are consumed from transcripts(), which ends after
+    the final transcript.
+    """
+
+    def __init__(self, audio_format: AudioFormat, language: Optional[str] = None):
+        self.audio_format = audio_format
+        self.language = language
+        self.bytes_received = 0
+        self._transcripts: "asyncio.Queue[Union[StreamingTranscript, BaseException]]" = asyncio.Queue()
+
+    @abstractmethod
+    async def send_audio(self, chunk: bytes) -> None:
+        """Push the next audio frame."""
+
+    @abstractmethod
+    async def finish(self) -> None:
+        """Signal end of speech; the final transcript follows."""
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release resources held by the session; a no-op unless overridden."""
+
+    async def transcripts(self) -> AsyncIterator[StreamingTranscript]:
+        """Yield transcripts as they arrive, ending with the final one."""
+        while True:
+            item = await self._transcripts.get()
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+            if item.is_final:
+                return
+
+    def _emit(self, transcript: StreamingTranscript) -> None:
+        self._transcripts.put_nowait(transcript)
+
+    def _fail(self, error: BaseException) -> None:
+        self._transcripts.put_nowait(error)
+
+
+class StreamingSTTBackend(ABC):
+    """Factory for streaming transcription sessions."""
+
+    name = "base"
+
+    @abstractmethod
+    async def open_session(self, audio_format: AudioFormat, language: Optional[str] = None) -> StreamingSTTSession:
+        """Start transcribing a new utterance."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release resources shared by all sessions; a no-op unless overridden."""
+
+
+class VoxtralStreamingSession(StreamingSTTSession):
+    """
+    Transcription over the batch Voxtral API.
+
+    On finish, the whole utterance is transcribed once. With
+    partial_interval_ms set, every interval of new audio also sends the
+    buffer so far for a partial transcript (at most one request in
+    flight, so a slow API skips partials rather than queueing them).
+    The batch API cannot continue from earlier audio, so each partial
+    re-uploads the whole buffer; upload cost grows quadratically with
+    utterance length, which is why partials are off unless configured.
+    Any in-flight partial is cancelled on finish.
+    """
+
+    def __init__(
+        self,
+        voice_service: VoiceService,
+        audio_format: AudioFormat,
+        language: Optional[str] = None,
+        partial_interval_ms: Optional[int] = None
+    ):
+        super().__init__(audio_format, language)
+        self.voice_service = voice_service
+        self.partial_interval_ms = partial_interval_ms
+        self._buffer = bytearray()
+        self._bytes_at_last_partial = 0
+        self._partial_task: Optional[asyncio.Task] = None
+        self._final_task: Optional[asyncio.Task] = None
+
+    async def send_audio(self, chunk: bytes) -> None:
+        if self._final_task is not None:
+            return
+        self._buffer.extend(chunk)
+        self.bytes_received += len(chunk)
+        if not self.partial_interval_ms:
+            return
+
+        new_audio_ms = self.audio_format.duration_ms(len(self._buffer) - self._bytes_at_last_partial)
+        if new_audio_ms >= self.partial_interval_ms and (self._partial_task is None or self._partial_task.done()):
+            self._bytes_at_last_partial = len(self._buffer)
+            self._partial_task = asyncio.create_task(self._transcribe_partial(bytes(self._buffer)))
+
+    async def _transcribe(self, audio: bytes, use_cache: bool = True):
+        filename, file_bytes = self.audio_format.to_file(audio)
+        return await self.voice_service.transcribe_bytes(file_bytes, filename, self.language, use_cache=use_cache)
+
+    async def _transcribe_partial(self, audio: bytes) -> None:
+        try:
+            # Partials are never repeated, so keep them out of the cache
+            result = await self._transcribe(audio, use_cache=False)
+        except HTTPException as e:
+            # Partials are best effort; early audio often has no speech yet
+            logger.debug(f"Partial transcription skipped: {e.detail}")
+            return
+        if self._final_task is None:
+            self._emit(StreamingTranscript(
+                text=result.text,
+                is_final=False,
+                confidence=result.confidence,
+                language_detected=result.language_detected,
+            ))
+
+    async def _transcribe_final(self, audio: bytes) -> None:
+        try:
+            result = await self._transcribe(audio)
+        except Exception as e:
+            self._fail(e)
+            return
+        self._emit(StreamingTranscript(
+            text=result.text,
+            is_final=True,
+            confidence=result.confidence,
+            language_detected=result.language_detected,
+        ))
+
+    async def finish(self) -> None:
+        if self._final_task is not None:
+            return
+        if self._partial_task is not None:
+            self._partial_task.cancel()
+        if not self._buffer:
+            self._fail(HTTPException(status_code=422, detail="No audio received"))
+            return
+        self._final_task = asyncio.create_task(self._transcribe_final(bytes(self._buffer)))
+
+    async def aclose(self) -> None:
+        for task in (self._partial_task, self._final_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+class VoxtralStreamingBackend(StreamingSTTBackend):
+    """Streaming sessions backed by the Voxtral transcription API."""
+
+    name = "voxtral"
+
+    def __init__(
+        self,
+        partial_interval_ms: Optional[int] = None,
+        voice_service: Optional[VoiceService] = None,
+        partials: Optional[bool] = None
+    ):
+        partials = partials if partials is not None else settings.voice_streaming_partials
+        self.partial_interval_ms = (
+            (partial_interval_ms or settings.voice_streaming_partial_interval_ms) if partials else None
+        )
+        self.voice_service = voice_service
+
+    async def open_session(self, audio_format: AudioFormat, language: Optional[str] = None) -> StreamingSTTSession:
+        if not settings.voxtral_api_key:
+            raise HTTPException(
+                status_code=503,
+                detail="Voice transcription service not available - API key not configured"
+            )
+        voice_service = self.voice_service or await get_voice_service()
+        return VoxtralStreamingSession(voice_service, audio_format, language, self.partial_interval_ms)
+
+
+class LocalStubStreamingSession(StreamingSTTSession):
+    """Reveals a fixed transcript word by word as frames arrive."""
+
+    def __init__(self, transcript: str, words_per_chunk: int, confidence: float, audio_format: AudioFormat,
+                 language: Optional[str] = None):
+        super().__init__(audio_format, language)
+        self.words = transcript.split()
+        self.words_per_chunk = words_per_chunk
+        self.confidence = confidence
+        self.chunks_received = 0
+        self.finished = False
+
+    async def send_audio(self, chunk: bytes) -> None:
+        if self.finished:
+            return
+        self.chunks_received += 1
+        self.bytes_received += len(chunk)
+        revealed = min(len(self.words), self.chunks_received * self.words_per_chunk)
+        if revealed:
+            self._emit(StreamingTranscript(" ".join(self.words[:revealed]), False, self.confidence, self.language))
+
+    async def finish(self) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        self._emit(StreamingTranscript(" ".join(self.words), True, self.confidence, self.language))
+
+
+class LocalStubStreamingBackend(StreamingSTTBackend):
+    """Offline backend that returns a configured transcript."""
+
+    name = "stub"
+
+    def __init__(self, transcript: str = "", words_per_chunk: int = 1, confidence: float = 0.95):
+        self.transcript = transcript
+        self.words_per_chunk = words_per_chunk
+        self.confidence = confidence
+        self.sessions = []
+
+    async def open_session(self, audio_format: AudioFormat, language: Optional[str] = None) -> StreamingSTTSession:
+        session = LocalStubStreamingSession(
+            self.transcript, self.words_per_chunk, self.confidence, audio_format, language
+        )
+        self.sessions.append(session)
+        return session
+
+
+_streaming_backend: Optional[StreamingSTTBackend] = None
+
+
+def get_streaming_stt_backend() -> StreamingSTTBackend:
+    """
+    Get the configured streaming STT backend.
+
+    Used as a FastAPI dependency so tests can override it with a stub.
+    """
+    global _streaming_backend
+    if _streaming_backend is None:
+        if settings.voice_streaming_backend == "stub":
+            _streaming_backend = LocalStubStreamingBackend(settings.voice_streaming_stub_transcript)
+        else:
+            _streaming_backend = VoxtralStreamingBackend()
+        logger.info(f"Using '{_streaming_backend.name}' streaming STT backend")
+    return _streaming_backend
+
+
+async def close_streaming_stt_backend() -> None:
+    """Close the streaming backend, if one was created."""
+    global _streaming_backend
+    if _streaming_backend is not None:
+        await _streaming_backend.close()
+        _streaming_backend = None
@@ -0,0 +1,511 @@
+"""
+Speech-to-text providers and resilient request routing.
+
+This service handles:
+- A provider abstraction over batch STT APIs: Mistral Voxtral, an
+  OpenAI-compatible Whisper endpoint as fallback, and a fault-injecting
+  stub for tests and offline development
+- One overall deadline per transcription instead of a fixed timeout per
+  request, scaled with the audio's length, with jittered exponential
+  backoff between retries
+- Hedged requests: if a call is slower than the provider's recent p95
+  latency, a second identical call is raced against it (small uploads only)
+- A circuit breaker per provider that fails fast while it is unhealthy
+- Per-provider latency and error metrics (see provider_stats)
+"""
+
+import asyncio
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..config import settings
+from .audio_upload import AudioSource, MultipartAudioStream, audio_content_type
+from .provider_stats import CircuitBreaker, RollingStats
+
+logger = logging.getLogger(__name__)
+
+# Common words in pantry commands, used to estimate confidence and as a prompt
+FOOD_TERMS = {
+    "add", "remove", "delete", "update", "milk", "bread", "chicken",
+    "vegetables", "cup", "cups", "tablespoon", "teaspoon", "pound",
+    "ounce", "gram", "liter", "buy", "grocery", "shopping", "recipe",
+    "cook", "cooking", "bake", "baking", "fridge", "pantry", "freezer"
+}
+
+FOOD_PROMPT = (
+    "This is a food-related conversation in a kitchen environment. "
+    "Focus on accurate recognition of food items, cooking terms, quantities, "
+    "measurements, and kitchen vocabulary. Common words include: "
+    "add, remove, delete, update, milk, bread, chicken, vegetables, "
+    "cups, tablespoons, teaspoons, pounds, ounces, grams, liters."
+)
+
+# Low voice bitrate (32 kbps), so audio of unknown duration gets a generous estimate
+_MIN_BYTES_PER_AUDIO_SECOND = 4000
+
+
+class STTProviderError(Exception):
+    """
+    A failed transcription attempt.
+
+    Retryable errors (timeouts, connection failures, 5xx, 429) may succeed
+    on another attempt or provider. Other errors describe a problem with
+    the audio or request itself and are returned to the client.
+    """
+
+    def __init__(self, message: str, retryable: bool = True, status_code: int = 502):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+def estimate_confidence(api_response: Dict[str, Any], text: str) -> float:
+    """
+    Estimate confidence score for transcription result.
+
+    Since the STT APIs don't provide confidence scores directly,
+    we estimate based on various factors.
+
+    Args:
+        api_response: Raw API response data
+        text: Transcribed text
+
+    Returns:
+        Estimated confidence score (0.0 to 1.0)
+    """
+    confidence = 0.8  # Base confidence
+
+    # Adjust based on text characteristics
+    if len(text) < 5:
+        confidence -= 0.2  # Very short text is less reliable
+    elif len(text.split()) < 3:
+        confidence -= 0.1  # Short phrases are somewhat less reliable
+
+    # Boost confidence for food-related terms
+    text_lower = text.lower()
+    food_term_count = sum(1 for term in FOOD_TERMS if term in text_lower)
+    if food_term_count > 0:
+        confidence += min(0.1, food_term_count * 0.02)  # Boost up to 0.1
+
+    # Ensure confidence stays within bounds
+    return max(0.1, min(1.0, confidence))
+
+
+class STTProvider(ABC):
+    """A batch speech-to-text API."""
+
+    name = "base"
+    model = ""
+
+    @property
+    def configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def transcribe(self, source: AudioSource, language: Optional[str], timeout: float) -> Dict[str, Any]:
+        """
+        Transcribe audio in one request.
+
+        Args:
+            source: Audio to upload
+            language: Optional language hint
+            timeout: Seconds this attempt may take
+
+        Returns:
+            Dictionary with text, confidence, language_detected and
+            audio_duration_ms
+
+        Raises:
+            STTProviderError: If the attempt fails
+        """
+
+
+class _MultipartSTTProvider(STTProvider):
+    """Provider for OpenAI-style multipart /audio/transcriptions APIs."""
+
+    endpoint = ""
+
+    def __init__(self, client: Optional[httpx.AsyncClient], api_key: Optional[str]):
+        self.client = client
+        self._api_key = api_key
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self._api_key
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _form_fields(self, language: Optional[str]) -> Dict[str, str]:
+        fields = {
+            "model": self.model,
+            "response_format": "json",
+            "temperature": "0.1",  # Lower temperature for more consistent results
+        }
+        if language:
+            fields["language"] = language
+        # Food-specific prompt improves accuracy for food-related terms
+        fields["prompt"] = FOOD_PROMPT
+        return fields
+
+    async def transcribe(self, source: AudioSource, language: Optional[str], timeout: float) -> Dict[str, Any]:
+        body = MultipartAudioStream(self._form_fields(language), source, content_type=audio_content_type(source.filename))
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "User-Agent": "Bruno-AI-Server/1.0",
+            **body.headers
+        }
+
+        try:
+            response = await self.client.post(self.endpoint, content=body, headers=headers, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise STTProviderError(f"{self.name} request timed out", status_code=504) from e
+        except httpx.TransportError as e:
+            raise STTProviderError(f"{self.name} connection failed: {e}") from e
+
+        if response.status_code != 200:
+            error_detail = f"{self.name.capitalize()} API error: {response.status_code}"
+            try:
+                error_detail += f" - {response.json().get('error', {}).get('message', 'Unknown error')}"
+            except Exception:
+                error_detail += f" - {response.text[:200]}"
+            retryable = response.status_code >= 500 or response.status_code in (408, 429)
+            raise STTProviderError(error_detail, retryable=retryable)
+
+        result_data = response.json()
+        transcribed_text = result_data.get("text", "").strip()
+        if not transcribed_text:
+            raise STTProviderError("No speech detected in audio file", retryable=False, status_code=422)
+
+        return {
+            "text": transcribed_text,
+            "confidence": estimate_confidence(result_data, transcribed_text),
+            "language_detected": result_data.get("language"),
+            "audio_duration_ms": int((result_data.get("duration") or 0) * 1000),
+        }
+
+
+class VoxtralProvider(_MultipartSTTProvider):
+    """Mistral Voxtral transcription API."""
+
+    name = "voxtral"
+    model = "voxtral-24.05"  # Latest Voxtral model
+    endpoint = "https://api.mistral.ai/v1/audio/transcriptions"
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, api_key: Optional[str] = None):
+        super().__init__(client, api_key)
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self._api_key or settings.voxtral_api_key
+
+
+class WhisperProvider(_MultipartSTTProvider):
+    """OpenAI Whisper, or any server exposing the same transcription API."""
+
+    name = "whisper"
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        super().__init__(client, api_key)
+        self.endpoint = f"{(base_url or settings.whisper_base_url).rstrip('/')}/audio/transcriptions"
+        self.model = model or settings.whisper_model
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self._api_key or settings.openai_api_key
+
+
+class StubSTTProvider(STTProvider):
+    """
+    Fault-injecting provider for tests and offline development.
+
+    Returns a fixed transcript after latency_seconds. A failure_rate share
+    of calls fail with a retryable error and a hang_rate share never
+    answer (until the attempt's timeout).
+    """
+
+    def __init__(
+        self,
+        transcript: str = "add milk",
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        name: str = "stub",
+        seed: Optional[int] = None
+    ):
+        self.transcript = transcript
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.name = name
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def transcribe(self, source: AudioSource, language: Optional[str], timeout: float) -> Dict[str, Any]:
+        self.calls += 1
+        roll = self._random.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(timeout)
+            raise STTProviderError(f"{self.name} request timed out", status_code=504)
+        await asyncio.sleep(min(self.latency_seconds, timeout))
+        if self.latency_seconds > timeout:
+            raise STTProviderError(f"{self.name} request timed out", status_code=504)
+        if roll < self.hang_rate + self.failure_rate:
+            raise STTProviderError(f"{self.name} injected failure")
+        return {
+            "text": self.transcript,
+            "confidence": estimate_confidence({}, self.transcript),
+            "language_detected": language,
+            "audio_duration_ms": 0,
+        }
+
+
+class STTRouter:
+    """
+    Sends transcriptions to providers in preference order.
+
+    Each provider gets up to max_attempts tries (with full-jitter
+    exponential backoff) while the overall deadline allows, then the next
+    provider is tried. Providers whose circuit is open are skipped.
+    Non-retryable errors, such as no speech detected, end the request.
+
+    The deadline grows with the audio's duration (or, when unknown, an
+    estimate from its size) up to deadline_max_seconds. Uploads larger
+    than hedge_max_bytes are never hedged.
+    """
+
+    def __init__(
+        self,
+        providers: List[STTProvider],
+        deadline_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_delay: Optional[float] = None,
+        hedge: Optional[bool] = None,
+        hedge_min_delay: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        deadline_per_audio_second: Optional[float] = None,
+        deadline_max_seconds: Optional[float] = None,
+        hedge_max_bytes: Optional[int] = None,
+        breaker_failure_threshold: Optional[int] = None,
+        breaker_recovery_seconds: Optional[float] = None
+    ):
+        self.providers = providers
+        self.deadline_seconds = deadline_seconds or settings.stt_deadline_seconds
+        self.max_attempts = max_attempts or settings.stt_max_attempts
+        self.retry_base_delay = settings.stt_retry_base_delay_ms / 1000 if retry_base_delay is None else retry_base_delay
+        self.hedge = settings.stt_hedge_enabled if hedge is None else hedge
+        self.hedge_min_delay = settings.stt_hedge_min_delay_ms / 1000 if hedge_min_delay is None else hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.deadline_per_audio_second = (
+            settings.stt_deadline_per_audio_second if deadline_per_audio_second is None else deadline_per_audio_second
+        )
+        self.deadline_max_seconds = deadline_max_seconds or settings.stt_deadline_max_seconds
+        self.hedge_max_bytes = hedge_max_bytes or settings.stt_hedge_max_bytes
+
+        self.stats: Dict[str, RollingStats] = {provider.name: RollingStats() for provider in self.providers}
+        self.breakers: Dict[str, CircuitBreaker] = {
+            provider.name: CircuitBreaker(
+                breaker_failure_threshold or settings.stt_breaker_failure_threshold,
+                breaker_recovery_seconds or settings.stt_breaker_recovery_seconds,
+            )
+            for provider in self.providers
+        }
+
+    async def transcribe(
+        self,
+        source: AudioSource,
+        language: Optional[str] = None,
+        duration_seconds: Optional[float] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Transcribe audio with retries, hedging and fallback.
+
+        Args:
+            source: Audio to upload
+            language: Optional language hint
+            duration_seconds: Audio duration from its headers, if known;
+                scales the deadline
+            deadline_seconds: Time budget to use instead of the scaled
+                deadline (e.g. for background jobs)
+
+        Returns:
+            Tuple of (transcription fields, name of the provider used)
+
+        Raises:
+            STTProviderError: When every provider failed, was short-circuited
+                or the deadline passed (status 503/504), or on a
+                non-retryable error
+        """
+        providers = [provider for provider in self.providers if provider.configured]
+        if not providers:
+            raise STTProviderError("No speech-to-text provider configured", retryable=False, status_code=503)
+
+        if deadline_seconds is None:
+            deadline_seconds = self.deadline_for(source, duration_seconds)
+        deadline = time.monotonic() + deadline_seconds
+        last_error: Optional[STTProviderError] = None
+
+        for provider in providers:
+            if deadline - time.monotonic() <= 0:
+                break
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                self.stats[provider.name].short_circuited += 1
+                logger.info(f"Skipping {provider.name}: circuit {breaker.state}")
+                continue
+            try:
+                return await self._call_with_retries(provider, source, language, deadline), provider.name
+            except STTProviderError as e:
+                if not e.retryable:
+                    raise
+                last_error = e
+                logger.warning(f"STT provider {provider.name} failed: {e}")
+
+        if deadline - time.monotonic() <= 0:
+            raise STTProviderError("Transcription deadline exceeded", status_code=504)
+        if last_error is None:
+            raise STTProviderError("Speech-to-text providers unavailable", status_code=503)
+        raise STTProviderError(f"Speech-to-text providers unavailable: {last_error}", status_code=503)
+
+    async def _call_with_retries(
+        self,
+        provider: STTProvider,
+        source: AudioSource,
+        language: Optional[str],
+        deadline: float
+    ) -> Dict[str, Any]:
+        stats = self.stats[provider.name]
+        breaker = self.breakers[provider.name]
+        last_error = STTProviderError(f"{provider.name} not attempted")
+
+        for attempt in range(self.max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if attempt:
+                stats.retries += 1
+            try:
+                result = await self._attempt(provider, source, language, remaining)
+            except STTProviderError as e:
+                if not e.retryable:
+                    breaker.record_success()  # The provider answered; the audio was the problem
+                    raise
+                stats.record_failure()
+                if e.status_code == 504:
+                    stats.timeouts += 1
+                breaker.record_failure()
+                last_error = e
+                if breaker.state != CircuitBreaker.CLOSED:
+                    break
+                backoff = random.uniform(0, self.retry_base_delay * (2 ** attempt))
+                await asyncio.sleep(min(backoff, max(0.0, deadline - time.monotonic())))
+                continue
+            stats.record_success()
+            breaker.record_success()
+            return result
+
+        raise last_error
+
+    async def _attempt(
+        self,
+        provider: STTProvider,
+        source: AudioSource,
+        language: Optional[str],
+        timeout: float
+    ) -> Dict[str, Any]:
+        """One logical attempt, hedged with a second request if it runs slow."""
+        stats = self.stats[provider.name]
+
+        async def call() -> Dict[str, Any]:
+            stats.requests += 1
+            started = time.monotonic()
+            result = await provider.transcribe(source, language, timeout)
+            stats.record_latency((time.monotonic() - started) * 1000)
+            return result
+
+        attempt_deadline = time.monotonic() + timeout
+        primary = asyncio.ensure_future(call())
+        tasks = [primary]
+        try:
+            hedge_delay = self._hedge_delay(provider, source)
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    stats.hedges_sent += 1
+                    tasks.append(asyncio.ensure_future(call()))
+
+            first_error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, attempt_deadline - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise STTProviderError(f"{provider.name} request timed out", status_code=504)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            stats.hedges_won += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def deadline_for(self, source: AudioSource, duration_seconds: Optional[float] = None) -> float:
+        """Seconds one transcription of the audio may take, across retries and fallback."""
+        if duration_seconds is None:
+            duration_seconds = (source.size or 0) / _MIN_BYTES_PER_AUDIO_SECOND
+        scaled = self.deadline_seconds + duration_seconds * self.deadline_per_audio_second
+        return max(self.deadline_seconds, min(scaled, self.deadline_max_seconds))
+
+    def _hedge_delay(self, provider: STTProvider, source: AudioSource) -> Optional[float]:
+        """Seconds to wait before hedging, from the provider's p95 latency."""
+        stats = self.stats[provider.name]
+        if not self.hedge or stats.sample_count < self.hedge_min_samples:
+            return None
+        if source.size is not None and source.size > self.hedge_max_bytes:
+            return None  # Racing a second copy of a large upload costs more than it saves
+        return max(self.hedge_min_delay, stats.percentile(0.95) / 1000)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Latency, error and circuit state per provider."""
+        return {
+            provider.name: {
+                **self.stats[provider.name].snapshot(),
+                "circuit": self.breakers[provider.name].state,
+                "model": provider.model,
+            }
+            for provider in self.providers
+        }
+
+
+def build_stt_router(client: Optional[httpx.AsyncClient] = None,
+                     fallback_client: Optional[httpx.AsyncClient] = None) -> STTRouter:
+    """
+    Build the router for the configured providers.
+
+    Voxtral is primary; the fallback (STT_FALLBACK_PROVIDER) is added when
+    its API key is configured.
+    """
+    providers: List[STTProvider] = [VoxtralProvider(client)]
+    if settings.stt_fallback_provider == "whisper":
+        providers.append(WhisperProvider(fallback_client or client))
+    return STTRouter(providers)
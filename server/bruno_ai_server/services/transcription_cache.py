@@ -0,0 +1,223 @@
+"""
+Content-addressed cache for speech-to-text results.
+
+This service handles:
+- Keying transcriptions by a SHA-256 of the audio bytes, the language
+  hint and the STT model, so a retried upload maps to the same entry
+- A size-bounded in-memory LRU with per-entry TTL
+- An optional on-disk tier shared by every worker process
+- Single-flighting concurrent duplicates so only one reaches the API
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from ..config import settings
+from .audio_upload import AudioSource
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Sweep expired files from the disk tier after this many writes
+_DISK_PRUNE_INTERVAL = 256
+
+
+class TranscriptionCache:
+    """
+    Two-tier cache of transcription results.
+
+    Entries are JSON-serializable dicts. The memory tier evicts the least
+    recently used entry beyond max_entries; both tiers expire entries
+    after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        disk_dir: Optional[Union[str, Path]] = None
+    ):
+        self.max_entries = settings.voice_transcription_cache_max_entries if max_entries is None else max_entries
+        self.ttl_seconds = ttl_seconds or settings.voice_transcription_cache_ttl_seconds
+        disk_dir = disk_dir if disk_dir is not None else settings.voice_transcription_cache_dir
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._flights = SingleFlight()
+        self._disk_writes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.disk_dir is not None
+
+    @staticmethod
+    def make_key(audio_digest: str, language: Optional[str], model: str) -> str:
+        """Cache key for audio (by digest) transcribed with a language hint and model."""
+        return hashlib.sha256(f"{model}\0{language or ''}\0{audio_digest}".encode()).hexdigest()
+
+    async def key_for_source(self, source: AudioSource, language: Optional[str], model: str) -> str:
+        """
+        Hash audio in chunks and build its cache key.
+
+        Raises:
+            AudioTooLargeError: If the audio exceeds the source's size limit
+        """
+        digest = hashlib.sha256()
+        async for chunk in source.iter_chunks():
+            digest.update(chunk)
+        return self.make_key(digest.hexdigest(), language, model)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry, checking memory first and then disk."""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self.disk_dir is not None:
+            entry = await asyncio.to_thread(self._read_disk, key, now)
+            if entry is not None:
+                expires_at, value = entry
+                self._remember(key, value, expires_at)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store an entry in both tiers."""
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+
+        if self.disk_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, value, expires_at)
+            except OSError as e:
+                logger.warning(f"Failed to write transcription cache entry to disk: {e}")
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        cacheable: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return the cached entry, or compute and cache it once.
+
+        Concurrent callers with the same key share one compute call.
+
+        Args:
+            key: Cache key from make_key or key_for_source
+            compute: Coroutine function producing the entry on a miss
+            cacheable: Predicate deciding whether a computed entry is
+                stored; every entry is stored without one
+
+        Returns:
+            Tuple of (entry, whether this caller was served without
+            running compute itself)
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value, True
+
+        ran = False
+
+        async def run() -> Dict[str, Any]:
+            nonlocal ran
+            ran = True
+            result = await compute()
+            if cacheable is None or cacheable(result):
+                await self.set(key, result)
+            return result
+
+        value = await self._flights.do(key, run)
+        return value, not ran
+
+    def clear(self) -> None:
+        """Drop the memory tier."""
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_tier": str(self.disk_dir) if self.disk_dir else None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "coalesced": self._flights.coalesced_total,
+        }
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= now:
+            path.unlink(missing_ok=True)
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def _write_disk(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so other processes never read a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"expires_at": expires_at, "value": value}, f)
+        os.replace(tmp_path, path)
+
+        self._disk_writes += 1
+        if self._disk_writes % _DISK_PRUNE_INTERVAL == 0:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        now = time.time()
+        for path in self.disk_dir.glob("*/*.json"):
+            try:
+                with open(path, "r") as f:
+                    if json.load(f).get("expires_at", 0) <= now:
+                        path.unlink(missing_ok=True)
+            except (OSError, ValueError):
+                continue
+
+
+# Global cache instance
+transcription_cache = TranscriptionCache()
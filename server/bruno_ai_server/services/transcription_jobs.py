@@ -0,0 +1,410 @@
+"""
+Background transcription jobs for Bruno AI.
+
+This service handles:
+- Running long voice commands outside the request, so a burst of voice
+  notes does not hold API workers for whole STT round-trips
+- A fixed pool of worker tasks bounding concurrent transcriptions
+- Round-robin scheduling across users, so one user's backlog cannot
+  starve everyone else's
+- Job status for polling, and a completion event on the household's
+  notification channel for subscribed clients. The event carries only
+  the job id and status; the owner fetches the result, which other
+  household members must not see
+
+Jobs run in the worker process that accepted them, since the audio is
+there. Their status and result are kept in the voice_jobs table, so a
+poll can be answered by any API worker.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..config import settings
+from ..database import async_session_factory
+from ..models.voice import VoiceJob
+from .notification_hub import NotificationHub, notification_hub
+
+logger = logging.getLogger(__name__)
+
+# Hub event type published when a job finishes
+JOB_EVENT_TYPE = "voice_job"
+
+# Error recorded for jobs cut short by the queue closing
+SHUTDOWN_ERROR = {"status_code": 503, "detail": "Server shutting down"}
+
+
+def should_run_as_job(duration_seconds: Optional[float], size: Optional[int]) -> bool:
+    """
+    Whether a recording is long enough to process in the background.
+
+    Short commands stay on the synchronous path. When the container does
+    not record a duration (e.g. WebM), the upload size decides.
+    """
+    if duration_seconds is not None:
+        return duration_seconds >= settings.voice_job_min_duration_seconds
+    return size is not None and size >= settings.voice_job_min_bytes
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a transcription job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job cannot be queued without exceeding a limit."""
+
+
+def _as_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+
+@dataclass
+class TranscriptionJob:
+    """A queued voice command and, once finished, its result or error."""
+    user_id: Any
+    work: Callable[[], Awaitable[Dict[str, Any]]] = field(repr=False)
+    household_id: Any = None
+    on_abandon: Optional[Callable[[], Awaitable[None]]] = field(default=None, repr=False)
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the job for API responses."""
+        return {
+            "job_id": self.id.hex,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class TranscriptionJobQueue:
+    """
+    Bounded-concurrency job queue with per-user fairness.
+
+    Each user has their own FIFO queue. Workers take one job at a time
+    from each user with queued work in turn, so a user who submits ten
+    recordings waits behind their own backlog rather than ahead of
+    everyone else's. When only one user has work, they get every worker.
+
+    Queue limits apply per process. Every status change is written to the
+    job's voice_jobs record, which get() reads.
+
+    Workers are started on the first submit in the running event loop.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        max_queued_per_user: Optional[int] = None,
+        result_ttl_seconds: Optional[int] = None,
+        hub: Optional[NotificationHub] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
+        self.worker_count = max(1, workers if workers is not None else settings.voice_job_workers)
+        self.max_queued = max_queued if max_queued is not None else settings.voice_job_max_queued
+        self.max_queued_per_user = (
+            max_queued_per_user if max_queued_per_user is not None else settings.voice_job_max_queued_per_user
+        )
+        self.result_ttl_seconds = (
+            result_ttl_seconds if result_ttl_seconds is not None else settings.voice_job_result_ttl_seconds
+        )
+        self.hub = hub if hub is not None else notification_hub
+        self.session_factory = session_factory or async_session_factory
+
+        self._user_queues: Dict[Any, Deque[TranscriptionJob]] = {}
+        self._ready_users: Deque[Any] = deque()  # Users with queued jobs, in turn order
+        self._queued_count = 0
+        self._running_count = 0
+        self._available: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.submitted_total = 0
+        self.succeeded_total = 0
+        self.failed_total = 0
+        self.rejected_total = 0
+        self._wait_ms_total = 0.0
+
+    async def submit(
+        self,
+        user_id: Any,
+        work: Callable[[], Awaitable[Dict[str, Any]]],
+        household_id: Any = None,
+        on_abandon: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> TranscriptionJob:
+        """
+        Record and queue work for a user.
+
+        Args:
+            user_id: Owner of the job, used for fairness and access checks
+            work: Coroutine function producing the job's result
+            household_id: Household channel to notify on completion, if any
+            on_abandon: Releases the work's resources if the queue closes
+                before the job starts
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If the queue or the user's share of it is full
+        """
+        self._check_limits(user_id)
+        job = TranscriptionJob(user_id=user_id, work=work, household_id=household_id, on_abandon=on_abandon)
+        await self._create_record(job)
+
+        # Other submits may have filled the queue while the record was written
+        try:
+            self._check_limits(user_id)
+        except JobQueueFullError:
+            await self._delete_record(job)
+            raise
+
+        self._ensure_workers()
+        user_queue = self._user_queues.get(user_id)
+        if user_queue is None:
+            user_queue = self._user_queues[user_id] = deque()
+            self._ready_users.append(user_id)
+        user_queue.append(job)
+        self._queued_count += 1
+        self.submitted_total += 1
+        self._available.release()
+        return job
+
+    async def get(self, job_id: Any, user_id: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job's status from any process.
+
+        Args:
+            job_id: Job id, as returned by submit
+            user_id: Only return the job if it belongs to this user
+
+        Returns:
+            The job serialized like TranscriptionJob.to_dict, or None if it
+            does not exist, belongs to someone else or has expired
+        """
+        try:
+            job_id = uuid.UUID(str(job_id))
+        except ValueError:
+            return None
+
+        query = select(VoiceJob).where(
+            VoiceJob.id == job_id,
+            or_(VoiceJob.expires_at.is_(None), VoiceJob.expires_at > datetime.now(timezone.utc)),
+        )
+        if user_id is not None:
+            query = query.where(VoiceJob.user_id == user_id)
+        async with self.session_factory() as db:
+            record = (await db.execute(query)).scalar_one_or_none()
+        if record is None:
+            return None
+
+        return {
+            "job_id": record.id.hex,
+            "status": record.status,
+            "created_at": record.created_at,
+            "started_at": record.started_at,
+            "finished_at": record.finished_at,
+            "result": record.result,
+            "error": record.error,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, worker usage and outcome counters for health checks."""
+        started = self.succeeded_total + self.failed_total + self._running_count
+        return {
+            "workers": self.worker_count,
+            "queued": self._queued_count,
+            "running": self._running_count,
+            "users_waiting": len(self._ready_users),
+            "submitted": self.submitted_total,
+            "succeeded": self.succeeded_total,
+            "failed": self.failed_total,
+            "rejected": self.rejected_total,
+            "avg_queue_wait_ms": round(self._wait_ms_total / started, 1) if started else 0.0,
+        }
+
+    async def close(self) -> None:
+        """
+        Stop the workers and fail the jobs they leave behind.
+
+        Running jobs are failed as their workers are cancelled. Queued jobs
+        are failed here and their resources released, so no record is left
+        queued without an expiry.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+        while self._ready_users:
+            job = self._next_job()
+            self._fail(job, SHUTDOWN_ERROR)
+            job.finished_at = time.time()
+            if job.on_abandon is not None:
+                try:
+                    await job.on_abandon()
+                except Exception as e:
+                    logger.error(f"Releasing abandoned transcription job {job.id} failed: {e}")
+            job.work = job.on_abandon = None
+            await self._save(job)
+
+    def _check_limits(self, user_id: Any) -> None:
+        user_queue = self._user_queues.get(user_id)
+        if self._queued_count >= self.max_queued:
+            self.rejected_total += 1
+            raise JobQueueFullError("Transcription queue is full")
+        if user_queue is not None and len(user_queue) >= self.max_queued_per_user:
+            self.rejected_total += 1
+            raise JobQueueFullError(
+                f"Too many queued voice commands. Maximum per user: {self.max_queued_per_user}"
+            )
+
+    async def _create_record(self, job: TranscriptionJob) -> None:
+        """Insert the job's record, dropping the user's expired jobs."""
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(VoiceJob).where(
+                    VoiceJob.user_id == job.user_id, VoiceJob.expires_at <= datetime.now(timezone.utc)
+                )
+            )
+            db.add(VoiceJob(
+                id=job.id,
+                user_id=job.user_id,
+                household_id=job.household_id,
+                status=job.status.value,
+                created_at=_as_datetime(job.created_at),
+            ))
+            await db.commit()
+
+    async def _delete_record(self, job: TranscriptionJob) -> None:
+        async with self.session_factory() as db:
+            await db.execute(delete(VoiceJob).where(VoiceJob.id == job.id))
+            await db.commit()
+
+    async def _save(self, job: TranscriptionJob) -> None:
+        """Write the job's status to its record; failures are logged, not raised."""
+        values = {
+            "status": job.status.value,
+            "started_at": _as_datetime(job.started_at),
+            "finished_at": _as_datetime(job.finished_at),
+            "result": job.result,
+            "error": job.error,
+        }
+        if job.finished:
+            values["expires_at"] = _as_datetime(job.finished_at + self.result_ttl_seconds)
+        try:
+            async with self.session_factory() as db:
+                await db.execute(update(VoiceJob).where(VoiceJob.id == job.id).values(**values))
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Saving transcription job {job.id} failed: {e}")
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        # First submit, or the previous loop is gone (e.g. between tests)
+        self._loop = loop
+        self._available = asyncio.Semaphore(self._queued_count)
+        self._workers = [
+            loop.create_task(self._worker(), name=f"transcription-job-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+
+    def _next_job(self) -> TranscriptionJob:
+        user_id = self._ready_users.popleft()
+        user_queue = self._user_queues[user_id]
+        job = user_queue.popleft()
+        if user_queue:
+            self._ready_users.append(user_id)
+        else:
+            del self._user_queues[user_id]
+        self._queued_count -= 1
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            await self._available.acquire()
+            job = self._next_job()
+            await self._run(job)
+
+    def _fail(self, job: TranscriptionJob, error: Dict[str, Any]) -> None:
+        job.error = dict(error)
+        job.status = JobStatus.FAILED
+        self.failed_total += 1
+
+    async def _run(self, job: TranscriptionJob) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        self._wait_ms_total += (job.started_at - job.created_at) * 1000
+        self._running_count += 1
+        cancelled = False
+        try:
+            await self._save(job)
+            job.result = await job.work()
+            job.status = JobStatus.SUCCEEDED
+            self.succeeded_total += 1
+        except asyncio.CancelledError:
+            # The queue is closing; record the failure before the worker stops
+            cancelled = True
+            self._fail(job, SHUTDOWN_ERROR)
+        except HTTPException as e:
+            self._fail(job, {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.error(f"Transcription job {job.id} failed for user {job.user_id}: {e}")
+            self._fail(job, {"status_code": 500, "detail": f"Voice command processing failed: {str(e)}"})
+        finally:
+            self._running_count -= 1
+            job.finished_at = time.time()
+            job.work = job.on_abandon = None
+
+        await self._save(job)
+        if cancelled:
+            raise asyncio.CancelledError()
+        logger.info(
+            f"Transcription job {job.id} {job.status.value} for user {job.user_id} "
+            f"in {(job.finished_at - job.started_at) * 1000:.0f}ms"
+        )
+
+        if job.household_id is not None:
+            try:
+                await self.hub.publish(
+                    job.household_id, JOB_EVENT_TYPE, {"job_id": job.id.hex, "status": job.status.value}
+                )
+            except Exception as e:
+                logger.error(f"Publishing transcription job {job.id} failed: {e}")
+
+
+# Global transcription job queue instance
+transcription_jobs = TranscriptionJobQueue()
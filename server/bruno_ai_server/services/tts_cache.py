@@ -0,0 +1,304 @@
+"""
+Caches for synthesized speech.
+
+This service handles:
+- Keeping synthesized audio as raw bytes, with no encoding pass on hits
+- Bounding the memory tier by total audio bytes rather than entry count
+- Least-recently-used eviction and a fixed TTL, both O(1) per entry
+- An optional on-disk tier shared by every worker process on a node,
+  with audio files content-addressed by their SHA-256 so identical audio
+  is stored once and can be served straight from disk, bounded by total
+  audio bytes
+- Hit rate, size and eviction metrics for health checks
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sweep expired entries from the disk tier after this many writes
+_DISK_PRUNE_INTERVAL = 256
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class TTSAudioCache:
+    """
+    Byte-bounded LRU cache with TTL.
+
+    Entries are kept in two insertion-ordered maps: one in recency order
+    for LRU eviction, one in write order for expiry. Every entry has the
+    same TTL, so write order is expiry order and expired entries are
+    always at the front.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.tts_cache_max_mb * 1024 * 1024
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.tts_cache_ttl_seconds
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # Least recently used first
+        self._by_age: "OrderedDict[str, float]" = OrderedDict()  # Oldest write first
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a live entry and mark it most recently used."""
+        self._expire(time.monotonic())
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, size: int) -> bool:
+        """
+        Store an entry, evicting least recently used entries to fit it.
+
+        Args:
+            key: Cache key
+            value: Cached value
+            size: Bytes the entry counts against max_bytes
+
+        Returns:
+            False if the entry is larger than the whole cache and was not stored
+        """
+        self._discard(key)
+        if size > self.max_bytes:
+            self.rejected += 1
+            return False
+
+        now = time.monotonic()
+        self._expire(now)
+        while self._entries and self.current_bytes + size > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._discard(oldest_key)
+            self.evictions += 1
+
+        self._entries[key] = _Entry(value=value, size=size, expires_at=now + self.ttl_seconds)
+        self._by_age[key] = now + self.ttl_seconds
+        self.current_bytes += size
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_age.clear()
+        self.current_bytes = 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Size, hit rate and eviction counters for health checks."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+        }
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            del self._by_age[key]
+            self.current_bytes -= entry.size
+
+    def _expire(self, now: float) -> None:
+        while self._by_age:
+            key, expires_at = next(iter(self._by_age.items()))
+            if expires_at > now:
+                return
+            self._discard(key)
+            self.expirations += 1
+
+
+class TTSDiskCache:
+    """
+    On-disk cache of synthesized audio, shared between processes.
+
+    Layout under the cache directory:
+    - ``index/ab/<key>.json``: expiry, audio digest and result metadata
+      for one synthesis request
+    - ``audio/cd/<sha256>.<format>``: the audio, named by its content
+
+    Files are written to a temp name and renamed, so readers in other
+    processes never see a partial file. An audio file's mtime is
+    refreshed whenever an index entry points at it, so audio older than
+    the TTL is unreferenced and can be pruned. When the remaining audio
+    exceeds max_bytes, pruning deletes the oldest by mtime; index entries
+    left pointing at it miss on the next lookup.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        ttl_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.tts_cache_ttl_seconds
+        self.max_bytes = max_bytes if max_bytes is not None else settings.tts_cache_disk_max_mb * 1024 * 1024
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+        self.evictions = 0
+        self.audio_bytes = 0  # As of the last prune
+
+    def get(self, key: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """
+        Look up a live entry without reading its audio.
+
+        Returns:
+            Tuple of (audio file path, metadata), or None on a miss
+        """
+        index_path = self._index_path(key)
+        try:
+            with open(index_path, "r") as f:
+                entry = json.load(f)
+            audio_path = self._audio_path(entry["digest"], entry["audio_format"])
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        if entry.get("expires_at", 0) <= time.time() or not audio_path.exists():
+            index_path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return audio_path, entry["metadata"]
+
+    def set(self, key: str, audio: bytes, audio_format: str, metadata: Dict[str, Any]) -> Optional[Path]:
+        """
+        Store audio and its metadata.
+
+        Returns:
+            Path of the audio file, or None if it could not be written
+        """
+        audio_format = re.sub(r"[^a-z0-9]", "", audio_format.lower()) or "bin"
+        digest = hashlib.sha256(audio).hexdigest()
+        audio_path = self._audio_path(digest, audio_format)
+        try:
+            if audio_path.exists():
+                os.utime(audio_path)
+            else:
+                self._write_atomic(audio_path, audio)
+            entry = {
+                "expires_at": time.time() + self.ttl_seconds,
+                "digest": digest,
+                "audio_format": audio_format,
+                "metadata": metadata,
+            }
+            self._write_atomic(self._index_path(key), json.dumps(entry).encode())
+        except OSError as e:
+            self.write_errors += 1
+            logger.warning(f"Failed to write TTS cache entry to disk: {e}")
+            return None
+
+        self._writes += 1
+        if self._writes % _DISK_PRUNE_INTERVAL == 0:
+            self.prune()
+        return audio_path
+
+    def prune(self) -> None:
+        """
+        Delete expired index entries and audio no live entry can reference,
+        then the oldest audio until the rest fits in max_bytes.
+        """
+        now = time.time()
+        for path in self.directory.glob("index/*/*.json"):
+            try:
+                with open(path, "r") as f:
+                    if json.load(f).get("expires_at", 0) <= now:
+                        path.unlink(missing_ok=True)
+            except (OSError, ValueError):
+                continue
+        audio_files = []
+        for path in self.directory.glob("audio/*/*"):
+            try:
+                stat = path.stat()
+                if stat.st_mtime + self.ttl_seconds <= now:
+                    path.unlink(missing_ok=True)
+                else:
+                    audio_files.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+
+        total_bytes = sum(size for _, size, _ in audio_files)
+        for _, size, path in sorted(audio_files):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total_bytes -= size
+            self.evictions += 1
+        self.audio_bytes = total_bytes
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "write_errors": self.write_errors,
+            "audio_bytes": self.audio_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _index_path(self, key: str) -> Path:
+        return self.directory / "index" / key[:2] / f"{key}.json"
+
+    def _audio_path(self, digest: str, audio_format: str) -> Path:
+        return self.directory / "audio" / digest[:2] / f"{digest}.{audio_format}"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+# Global cache instances, shared by every request in the process
+tts_audio_cache = TTSAudioCache()
+tts_disk_cache = TTSDiskCache(settings.tts_cache_dir) if settings.tts_cache_dir else None
@@ -0,0 +1,282 @@
+"""
+Templated TTS phrases spliced from cached segments.
+
+This service handles:
+- Splitting confirmation templates ("Added {quantity} {item} to your
+  pantry") into fixed segments and per-item slots
+- Pre-synthesizing the fixed segments in the background at startup, so
+  they are in the TTS cache before the first request
+- Synthesizing slot values as short fragments, which are cached in turn
+  since item names repeat
+- Splicing the segments' MP3 frames into one file, so a confirmation
+  costs at most a fragment's provider round-trip instead of a whole
+  phrase's
+
+Spliced speech has a slight seam between segments; callers that need
+natural prosody should use full synthesis.
+"""
+
+import asyncio
+import logging
+import string
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from ..config import settings
+from .audio_probe import id3v2_size, mp3_info_tag, parse_mp3_header
+from .tts_service import TTSRequest, TTSResult, TTSService, get_tts_service
+
+logger = logging.getLogger(__name__)
+
+# Confirmation phrases spoken after voice commands and in reminders
+PHRASE_TEMPLATES = {
+    "item_added": "Added {quantity} {item} to your pantry",
+    "item_removed": "Removed {item} from your pantry",
+    "item_used": "Used {quantity} {item}",
+    "item_updated": "Updated {item}",
+    "item_not_found": "I couldn't find {item} in your pantry",
+    "item_expires_today": "{item} expires today",
+    "item_expires_tomorrow": "{item} expires tomorrow",
+    "item_expires_in_days": "{item} expires in {days} days",
+    "undo_done": "Okay, I undid that",
+}
+
+# Longest value accepted for a template slot
+MAX_SLOT_LENGTH = 100
+
+
+@dataclass(frozen=True)
+class PhraseSegment:
+    """Fixed text, or a slot filled per request."""
+    text: str = ""
+    slot: Optional[str] = None
+
+
+def parse_template(template: str) -> List[PhraseSegment]:
+    """Split a str.format template into fixed segments and slots."""
+    segments = []
+    for literal, field_name, _, _ in string.Formatter().parse(template):
+        if literal.strip():
+            segments.append(PhraseSegment(text=literal.strip()))
+        if field_name:
+            segments.append(PhraseSegment(slot=field_name))
+    return segments
+
+
+def splice_mp3(segments: List[bytes]) -> bytes:
+    """
+    Join MP3 files into one stream of frames.
+
+    Each segment's ID3 tags and Xing/Info/VBRI frame are dropped, since
+    they would describe only that segment once joined.
+
+    Raises:
+        ValueError: If a segment is not MP3, or the segments differ in
+            sample rate or channel count
+    """
+    spliced = bytearray()
+    stream_format = None
+    for data in segments:
+        start = id3v2_size(data)
+        end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+        frame = parse_mp3_header(data[start:start + 4])
+        if frame is None:
+            raise ValueError("Segment does not start with an MPEG audio frame")
+        if stream_format is None:
+            stream_format = (frame["sample_rate"], frame["channels"])
+        elif (frame["sample_rate"], frame["channels"]) != stream_format:
+            raise ValueError("Segments differ in sample rate or channels")
+        if mp3_info_tag(data[start:start + frame["frame_length"]], frame):
+            start += frame["frame_length"]
+        spliced += data[start:end]
+    return bytes(spliced)
+
+
+class TTSPhraseLibrary:
+    """
+    Renders phrase templates by splicing cached TTS segments.
+
+    Segments are synthesized through TTSService, so they share its memory
+    and disk caches. If the segments cannot be spliced (e.g. the provider
+    returned a format other than MP3), the whole phrase is synthesized
+    instead.
+    """
+
+    def __init__(
+        self,
+        tts_service: TTSService,
+        templates: Optional[Dict[str, str]] = None,
+        voice_id: Optional[str] = None,
+        language: str = "en"
+    ):
+        self.tts_service = tts_service
+        self.templates = {
+            name: parse_template(template)
+            for name, template in (templates if templates is not None else PHRASE_TEMPLATES).items()
+        }
+        self.voice_id = voice_id if voice_id is not None else settings.tts_phrase_voice_id
+        self.language = language
+
+        self.renders = 0
+        self.fallbacks = 0
+        self.segments_synthesized = 0
+        self.segments_cached = 0
+        self.prewarmed = 0
+
+    @property
+    def fixed_segments(self) -> List[str]:
+        """Distinct fixed segment texts across all templates."""
+        texts = {segment.text for segments in self.templates.values() for segment in segments if not segment.slot}
+        return sorted(texts)
+
+    async def prewarm(self, concurrency: int = 4) -> Dict[str, int]:
+        """
+        Synthesize every fixed segment into the TTS cache.
+
+        Failures are logged and skipped; the segment is synthesized on
+        first use instead.
+
+        Returns:
+            Counts of warmed and failed segments
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        voice_id = await self._resolve_voice()
+        counts = {"warmed": 0, "failed": 0}
+
+        async def warm(text: str) -> None:
+            async with semaphore:
+                try:
+                    await self._synthesize(text, voice_id)
+                    counts["warmed"] += 1
+                except Exception as e:
+                    counts["failed"] += 1
+                    logger.warning(f"Failed to pre-warm TTS segment '{text}': {e}")
+
+        await asyncio.gather(*(warm(text) for text in self.fixed_segments))
+        self.prewarmed += counts["warmed"]
+        logger.info(f"Pre-warmed {counts['warmed']} TTS phrase segments ({counts['failed']} failed)")
+        return counts
+
+    async def render(self, name: str, values: Dict[str, Any], voice_id: Optional[str] = None) -> TTSResult:
+        """
+        Render a template with slot values.
+
+        Args:
+            name: Template name
+            values: Value for each slot in the template
+            voice_id: Voice to use instead of the library's
+
+        Returns:
+            TTSResult with the spliced audio. cache_hit is True when no
+            segment needed a provider call.
+
+        Raises:
+            HTTPException: If the template is unknown (404) or a slot value
+                is missing or too long (400)
+        """
+        segments = self.templates.get(name)
+        if segments is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown phrase template '{name}'. Available: {', '.join(sorted(self.templates))}"
+            )
+        texts = [self._segment_text(segment, values) for segment in segments]
+
+        start_time = time.time()
+        voice_id = voice_id or await self._resolve_voice()
+        results = await asyncio.gather(*(self._synthesize(text, voice_id) for text in texts))
+        self.renders += 1
+
+        try:
+            if any(result.audio_format != "mp3" for result in results):
+                raise ValueError("Segments are not MP3")
+            audio_data = splice_mp3([result.audio_data for result in results])
+        except ValueError as e:
+            logger.warning(f"Cannot splice phrase '{name}', synthesizing it whole: {e}")
+            self.fallbacks += 1
+            return await self.tts_service.synthesize(
+                TTSRequest(text=" ".join(texts), voice_id=voice_id, language=self.language)
+            )
+
+        return TTSResult(
+            audio_data=audio_data,
+            audio_format="mp3",
+            duration_ms=sum(result.duration_ms for result in results),
+            voice_used=results[0].voice_used,
+            provider=results[0].provider,
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            cache_hit=all(result.cache_hit for result in results)
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.segments_synthesized + self.segments_cached
+        return {
+            "templates": len(self.templates),
+            "fixed_segments": len(self.fixed_segments),
+            "prewarmed": self.prewarmed,
+            "renders": self.renders,
+            "fallbacks": self.fallbacks,
+            "segment_hit_rate": round(self.segments_cached / lookups, 3) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _segment_text(segment: PhraseSegment, values: Dict[str, Any]) -> str:
+        if not segment.slot:
+            return segment.text
+        value = str(values.get(segment.slot, "")).strip()
+        if not value:
+            raise HTTPException(status_code=400, detail=f"Missing value for '{segment.slot}'")
+        if len(value) > MAX_SLOT_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Value for '{segment.slot}' too long (max {MAX_SLOT_LENGTH} characters)"
+            )
+        return value
+
+    async def _synthesize(self, text: str, voice_id: str) -> TTSResult:
+        result = await self.tts_service.synthesize(
+            TTSRequest(text=text, voice_id=voice_id, language=self.language)
+        )
+        if result.cache_hit:
+            self.segments_cached += 1
+        else:
+            self.segments_synthesized += 1
+        return result
+
+    async def _resolve_voice(self) -> str:
+        """The configured voice, or the most natural voice of the preferred provider."""
+        if self.voice_id:
+            return self.voice_id
+        voices = await self.tts_service.get_available_voices(
+            language=self.language,
+            provider=self.tts_service.preferred_provider
+        )
+        if not voices:
+            raise HTTPException(status_code=503, detail="No TTS voices available for phrases")
+        self.voice_id = max(voices, key=lambda voice: voice.naturalness_score).id
+        return self.voice_id
+
+
+_tts_phrases: Optional[TTSPhraseLibrary] = None
+
+
+async def get_tts_phrases() -> TTSPhraseLibrary:
+    """
+    Get the process-wide phrase library.
+
+    Uses the process-wide TTS service, so segments land in its shared
+    caches. Used as a FastAPI dependency.
+    """
+    global _tts_phrases
+    if _tts_phrases is None:
+        _tts_phrases = TTSPhraseLibrary(await get_tts_service())
+    return _tts_phrases
+
+
+async def close_tts_phrases() -> None:
+    """Drop the process-wide phrase library along with its TTS service."""
+    global _tts_phrases
+    _tts_phrases = None
@@ -3,9 +3,13 @@ Text-to-Speech service with multiple provider support and evaluation.
 
 This service handles:
 - Multi-provider TTS integration (Amazon Polly, Google Cloud TTS, ElevenLabs)
-- Automatic provider selection based on performance metrics
+- Latency-aware provider routing from rolling per-provider latency and
+  error stats, with hedging to the next-best provider on slow responses
+  and temporary ejection of failing providers
 - Voice customization with regional accent support
-- Caching for improved performance
+- Caching synthesized audio in a process-wide byte-bounded LRU, with an
+  optional on-disk tier shared by all workers on a node
+- Streaming synthesis that relays audio chunks as the provider produces them
 - Error handling and fallbacks
 
 Based on research findings:
@@ -21,16 +25,20 @@ import io
 import json
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union, BinaryIO
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple, Union, BinaryIO
 
 import httpx
 import aiofiles
 from fastapi import HTTPException
 
 from ..config import settings
+from .http_clients import http_clients
+from .provider_stats import CircuitBreaker, RollingStats
+from .single_flight import SingleFlight
+from .tts_cache import TTSAudioCache, TTSDiskCache, tts_audio_cache, tts_disk_cache
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +79,7 @@ class TTSRequest:
     pitch: float = 0.0
     accent: Optional[str] = None
     ssml: bool = False
+    flexible_voice: bool = False  # Any provider's closest voice will do
     
 
 @dataclass
@@ -85,26 +94,41 @@ class TTSResult:
     cache_hit: bool = False
 
 
+@dataclass
+class TTSStream:
+    """Synthesized speech delivered in chunks as the provider produces them."""
+    chunks: AsyncIterator[bytes]
+    audio_format: str
+    voice_used: TTSVoice
+    provider: TTSProvider
+    cache_hit: bool = False
+
+
 class TTSService:
     """
     Multi-provider Text-to-Speech service with automatic provider selection.
     
     Features:
-    - Provider evaluation and automatic selection
+    - Routing to the fastest healthy provider, measured on every synthesis
     - Voice customization with regional accents
     - Performance optimization with caching
     - Kitchen environment audio optimization
     - SSML support for natural speech patterns
     """
     
-    # Cache settings
-    CACHE_TTL_SECONDS = 3600  # 1 hour
-    MAX_CACHE_SIZE_MB = 100
-    
     # Audio settings
     DEFAULT_SAMPLE_RATE = 24000
     DEFAULT_AUDIO_FORMAT = "mp3"
     
+    # Chunk size when streaming audio that is already complete
+    STREAM_CHUNK_SIZE = 16 * 1024
+    
+    # Providers synthesis is implemented for
+    ROUTABLE_PROVIDERS = (TTSProvider.ELEVENLABS, TTSProvider.GOOGLE_CLOUD)
+    
+    # Recent outcomes above this error rate report a provider as degraded
+    DEGRADED_ERROR_RATE = 0.2
+    
     # Provider-specific configurations
     PROVIDER_CONFIGS = {
         TTSProvider.ELEVENLABS: {
@@ -133,22 +157,128 @@ class TTSService:
         }
     }
     
-    def __init__(self):
-        """Initialize the TTS service."""
-        self.client = httpx.AsyncClient(
+    # Curated high-quality voices. In production, these would be queried
+    # from each provider's API.
+    VOICES = [
+        # ElevenLabs voices (premium quality)
+        TTSVoice(
+            id="21m00Tcm4TlvDq8ikWAM",
+            name="Rachel (ElevenLabs)",
+            language="en",
+            gender=VoiceGender.FEMALE,
+            accent="american",
+            provider=TTSProvider.ELEVENLABS,
+            naturalness_score=9.5
+        ),
+        TTSVoice(
+            id="29vD33N1CtxCmqQRPOHJ",
+            name="Drew (ElevenLabs)",
+            language="en",
+            gender=VoiceGender.MALE,
+            accent="american",
+            provider=TTSProvider.ELEVENLABS,
+            naturalness_score=9.3
+        ),
+        
+        # Google Cloud voices (multilingual)
+        TTSVoice(
+            id="en-US-Neural2-F",
+            name="Emma (Google)",
+            language="en",
+            gender=VoiceGender.FEMALE,
+            accent="american",
+            provider=TTSProvider.GOOGLE_CLOUD,
+            naturalness_score=8.5
+        ),
+        TTSVoice(
+            id="en-GB-Neural2-A",
+            name="Arthur (Google)",
+            language="en",
+            gender=VoiceGender.MALE,
+            accent="british",
+            provider=TTSProvider.GOOGLE_CLOUD,
+            naturalness_score=8.3
+        ),
+        TTSVoice(
+            id="en-AU-Neural2-B",
+            name="Charlotte (Google)",
+            language="en",
+            gender=VoiceGender.FEMALE,
+            accent="australian",
+            provider=TTSProvider.GOOGLE_CLOUD,
+            naturalness_score=8.2
+        ),
+    ]
+    
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TTSAudioCache] = None,
+        disk_cache: Optional[TTSDiskCache] = None,
+        hedge: Optional[bool] = None,
+        hedge_min_delay: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        breaker_failure_threshold: Optional[int] = None,
+        breaker_recovery_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the TTS service.
+        
+        Args:
+            client: Shared HTTP client. Without one the service owns a
+                private client and closes it on exit.
+            cache: Audio cache. Defaults to a new cache sized from
+                TTS_CACHE_MAX_MB and TTS_CACHE_TTL_SECONDS.
+            disk_cache: Optional on-disk tier behind the memory cache
+            hedge: Race the next-best provider when a synthesis runs past
+                the provider's p95 latency. Defaults to TTS_HEDGE_ENABLED.
+            hedge_min_delay: Seconds to wait at least before hedging
+            hedge_min_samples: Latency samples a provider needs before its
+                latency is used for ranking and hedging
+            breaker_failure_threshold: Consecutive failures that eject a
+                provider
+            breaker_recovery_seconds: How long an ejected provider is
+                skipped before a trial call
+        """
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
             timeout=httpx.Timeout(30.0, connect=10.0),
             limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
         )
         
         # Audio cache for frequently used phrases
-        self._audio_cache: Dict[str, Dict[str, Any]] = {}
+        self.cache = cache if cache is not None else TTSAudioCache()
+        self.disk_cache = disk_cache
         
         # Available voices by provider
         self._voices: Dict[TTSProvider, List[TTSVoice]] = {}
         
-        # Preferred provider based on evaluation
+        # Configured providers in preference order
+        self._available_providers: List[TTSProvider] = []
         self._preferred_provider: Optional[TTSProvider] = None
         
+        # Rolling latency/error stats and ejection state, fed by every synthesis
+        self.hedge = settings.tts_hedge_enabled if hedge is None else hedge
+        self.hedge_min_delay = settings.tts_hedge_min_delay_ms / 1000 if hedge_min_delay is None else hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.provider_stats: Dict[TTSProvider, RollingStats] = {
+            provider: RollingStats() for provider in self.ROUTABLE_PROVIDERS
+        }
+        self.breakers: Dict[TTSProvider, CircuitBreaker] = {
+            provider: CircuitBreaker(
+                breaker_failure_threshold or settings.tts_breaker_failure_threshold,
+                breaker_recovery_seconds or settings.tts_breaker_recovery_seconds,
+            )
+            for provider in self.ROUTABLE_PROVIDERS
+        }
+        
+        # Identical concurrent syntheses share one provider call
+        self._flights = SingleFlight()
+        
+        # Streaming synthesis counters
+        self._stream_stats = {"started": 0, "completed": 0, "abandoned": 0, "fallbacks": 0}
+        self._first_audio_ms: List[int] = []
+        
         # Initialize providers based on available API keys
         self._initialize_providers()
     
@@ -158,7 +288,13 @@ class TTSService:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
+    
+    @property
+    def preferred_provider(self) -> Optional[TTSProvider]:
+        """Provider used by default, or None when no provider is configured."""
+        return self._preferred_provider
     
     def _initialize_providers(self) -> None:
         """Initialize available providers based on API key configuration."""
@@ -179,6 +315,8 @@ class TTSService:
             available_providers.append(TTSProvider.AMAZON_POLLY)
             logger.info("Amazon Polly TTS provider initialized")
         
+        self._available_providers = available_providers
+        
         if not available_providers:
             logger.warning("No TTS providers configured - TTS features will be disabled")
         else:
@@ -206,77 +344,92 @@ class TTSService:
         cache_str = json.dumps(cache_data, sort_keys=True)
         return hashlib.sha256(cache_str.encode()).hexdigest()
     
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """Check if cache entry is still valid."""
-        if "timestamp" not in cache_entry:
-            return False
-        
-        age_seconds = time.time() - cache_entry["timestamp"]
-        return age_seconds < self.CACHE_TTL_SECONDS
+    @staticmethod
+    def _result_metadata(result: TTSResult) -> Dict[str, Any]:
+        """Serialize a result's metadata (everything but the audio) for the disk tier."""
+        return {
+            "audio_format": result.audio_format,
+            "duration_ms": result.duration_ms,
+            "voice": {
+                "id": result.voice_used.id,
+                "name": result.voice_used.name,
+                "language": result.voice_used.language,
+                "gender": result.voice_used.gender.value,
+                "accent": result.voice_used.accent,
+                "provider": result.voice_used.provider.value if result.voice_used.provider else None,
+                "naturalness_score": result.voice_used.naturalness_score
+            },
+            "provider": result.provider.value,
+            "processing_time_ms": result.processing_time_ms
+        }
+    
+    @staticmethod
+    def _result_from_metadata(metadata: Dict[str, Any], audio_data: bytes) -> TTSResult:
+        """Rebuild a cached result from disk-tier metadata."""
+        voice = dict(metadata["voice"])
+        voice["gender"] = VoiceGender(voice["gender"])
+        voice["provider"] = TTSProvider(voice["provider"]) if voice.get("provider") else None
+        return TTSResult(
+            audio_data=audio_data,
+            audio_format=metadata["audio_format"],
+            duration_ms=metadata["duration_ms"],
+            voice_used=TTSVoice(**voice),
+            provider=TTSProvider(metadata["provider"]),
+            processing_time_ms=metadata["processing_time_ms"],
+            cache_hit=True
+        )
     
     async def _cache_get(self, cache_key: str) -> Optional[TTSResult]:
-        """Get cached TTS result."""
-        if cache_key not in self._audio_cache:
-            return None
+        """Get cached TTS result from memory, then from the disk tier."""
+        result = self.cache.get(cache_key)
+        if result is not None:
+            logger.debug(f"Cache hit for TTS request: {cache_key[:16]}...")
+            return replace(result, cache_hit=True)
         
-        cache_entry = self._audio_cache[cache_key]
-        if not self._is_cache_valid(cache_entry):
-            del self._audio_cache[cache_key]
+        if self.disk_cache is None:
             return None
         
-        # Reconstruct TTSResult from cache
-        result_data = cache_entry["result"]
-        voice = TTSVoice(**result_data["voice"])
-        provider = TTSProvider(result_data["provider"])
-        
-        result = TTSResult(
-            audio_data=base64.b64decode(result_data["audio_data"]),
-            audio_format=result_data["audio_format"],
-            duration_ms=result_data["duration_ms"],
-            voice_used=voice,
-            provider=provider,
-            processing_time_ms=result_data["processing_time_ms"],
-            cache_hit=True
-        )
+        entry = await asyncio.to_thread(self.disk_cache.get, cache_key)
+        if entry is None:
+            return None
+        path, metadata = entry
+        try:
+            audio_data = await asyncio.to_thread(path.read_bytes)
+            result = self._result_from_metadata(metadata, audio_data)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Unreadable TTS disk cache entry {cache_key[:16]}: {e}")
+            return None
         
-        logger.debug(f"Cache hit for TTS request: {cache_key[:16]}...")
+        # Promote to the memory tier for this process
+        self.cache.set(cache_key, replace(result, cache_hit=False), len(audio_data))
+        logger.debug(f"Disk cache hit for TTS request: {cache_key[:16]}...")
         return result
     
     async def _cache_set(self, cache_key: str, result: TTSResult) -> None:
-        """Cache TTS result."""
-        # Prepare cache entry
-        cache_entry = {
-            "timestamp": time.time(),
-            "result": {
-                "audio_data": base64.b64encode(result.audio_data).decode(),
-                "audio_format": result.audio_format,
-                "duration_ms": result.duration_ms,
-                "voice": {
-                    "id": result.voice_used.id,
-                    "name": result.voice_used.name,
-                    "language": result.voice_used.language,
-                    "gender": result.voice_used.gender.value,
-                    "accent": result.voice_used.accent,
-                    "provider": result.voice_used.provider.value if result.voice_used.provider else None,
-                    "naturalness_score": result.voice_used.naturalness_score
-                },
-                "provider": result.provider.value,
-                "processing_time_ms": result.processing_time_ms
-            }
-        }
+        """Cache TTS result in memory, charging its audio bytes against the cache size, and on disk."""
+        if self.cache.set(cache_key, replace(result, cache_hit=False), len(result.audio_data)):
+            logger.debug(f"Cached TTS result: {cache_key[:16]}...")
+        else:
+            logger.debug(f"TTS result too large to cache in memory: {len(result.audio_data)} bytes")
         
-        self._audio_cache[cache_key] = cache_entry
-        logger.debug(f"Cached TTS result: {cache_key[:16]}...")
+        if self.disk_cache is not None:
+            await asyncio.to_thread(
+                self.disk_cache.set,
+                cache_key,
+                result.audio_data,
+                result.audio_format,
+                self._result_metadata(result)
+            )
     
-    async def _synthesize_elevenlabs(self, request: TTSRequest) -> TTSResult:
-        """Synthesize speech using ElevenLabs."""
+    def _elevenlabs_request(self, request: TTSRequest, stream: bool = False) -> httpx.Request:
+        """Build an ElevenLabs synthesis request, optionally for the streaming endpoint."""
         if not hasattr(settings, 'elevenlabs_api_key') or not settings.elevenlabs_api_key:
             raise HTTPException(status_code=503, detail="ElevenLabs API key not configured")
         
-        start_time = time.time()
-        
         # Prepare request
         url = f"{self.PROVIDER_CONFIGS[TTSProvider.ELEVENLABS]['base_url']}/text-to-speech/{request.voice_id}"
+        if stream:
+            url += "/stream"
         
         headers = {
             "Accept": "audio/mpeg",
@@ -301,39 +454,53 @@ class TTSService:
             payload["voice_settings"]["clarity"] = 0.8
             payload["voice_settings"]["stability"] = 0.6
         
+        return self.client.build_request("POST", url, headers=headers, json=payload)
+    
+    @staticmethod
+    def _elevenlabs_error(response: httpx.Response) -> HTTPException:
+        """Convert a failed ElevenLabs response (already read) to an HTTPException."""
+        error_msg = f"ElevenLabs API error: {response.status_code}"
         try:
-            response = await self.client.post(url, headers=headers, json=payload)
+            error_data = response.json()
+            error_msg += f" - {error_data.get('detail', {}).get('message', 'Unknown error')}"
+        except:
+            error_msg += f" - {response.text[:200]}"
+        
+        logger.error(error_msg)
+        return HTTPException(status_code=502, detail=error_msg)
+    
+    @staticmethod
+    def _elevenlabs_voice(request: TTSRequest) -> TTSVoice:
+        # Create voice object (simplified for this example)
+        return TTSVoice(
+            id=request.voice_id,
+            name="ElevenLabs Voice",
+            language=request.language,
+            gender=VoiceGender.NEUTRAL,
+            accent=request.accent,
+            provider=TTSProvider.ELEVENLABS,
+            naturalness_score=9.5
+        )
+    
+    async def _synthesize_elevenlabs(self, request: TTSRequest) -> TTSResult:
+        """Synthesize speech using ElevenLabs."""
+        http_request = self._elevenlabs_request(request)
+        start_time = time.time()
+        
+        try:
+            response = await self.client.send(http_request)
             
             if response.status_code != 200:
-                error_msg = f"ElevenLabs API error: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg += f" - {error_data.get('detail', {}).get('message', 'Unknown error')}"
-                except:
-                    error_msg += f" - {response.text[:200]}"
-                
-                logger.error(error_msg)
-                raise HTTPException(status_code=502, detail=error_msg)
+                raise self._elevenlabs_error(response)
             
             audio_data = response.content
             processing_time = int((time.time() - start_time) * 1000)
             
-            # Create voice object (simplified for this example)
-            voice = TTSVoice(
-                id=request.voice_id,
-                name="ElevenLabs Voice",
-                language=request.language,
-                gender=VoiceGender.NEUTRAL,
-                accent=request.accent,
-                provider=TTSProvider.ELEVENLABS,
-                naturalness_score=9.5
-            )
-            
             return TTSResult(
                 audio_data=audio_data,
                 audio_format="mp3",
                 duration_ms=len(audio_data) // 32,  # Rough estimate
-                voice_used=voice,
+                voice_used=self._elevenlabs_voice(request),
                 provider=TTSProvider.ELEVENLABS,
                 processing_time_ms=processing_time
             )
@@ -429,62 +596,8 @@ class TTSService:
         provider: Optional[TTSProvider] = None
     ) -> List[TTSVoice]:
         """Get available voices filtered by criteria."""
-        # For now, return a curated list of high-quality voices
-        # In production, this would query each provider's API
-        
-        voices = [
-            # ElevenLabs voices (premium quality)
-            TTSVoice(
-                id="21m00Tcm4TlvDq8ikWAM",
-                name="Rachel (ElevenLabs)",
-                language="en",
-                gender=VoiceGender.FEMALE,
-                accent="american",
-                provider=TTSProvider.ELEVENLABS,
-                naturalness_score=9.5
-            ),
-            TTSVoice(
-                id="29vD33N1CtxCmqQRPOHJ",
-                name="Drew (ElevenLabs)",
-                language="en",
-                gender=VoiceGender.MALE,
-                accent="american",
-                provider=TTSProvider.ELEVENLABS,
-                naturalness_score=9.3
-            ),
-            
-            # Google Cloud voices (multilingual)
-            TTSVoice(
-                id="en-US-Neural2-F",
-                name="Emma (Google)",
-                language="en",
-                gender=VoiceGender.FEMALE,
-                accent="american",
-                provider=TTSProvider.GOOGLE_CLOUD,
-                naturalness_score=8.5
-            ),
-            TTSVoice(
-                id="en-GB-Neural2-A",
-                name="Arthur (Google)",
-                language="en",
-                gender=VoiceGender.MALE,
-                accent="british",
-                provider=TTSProvider.GOOGLE_CLOUD,
-                naturalness_score=8.3
-            ),
-            TTSVoice(
-                id="en-AU-Neural2-B",
-                name="Charlotte (Google)",
-                language="en",
-                gender=VoiceGender.FEMALE,
-                accent="australian",
-                provider=TTSProvider.GOOGLE_CLOUD,
-                naturalness_score=8.2
-            ),
-        ]
-        
         # Apply filters
-        filtered_voices = voices
+        filtered_voices = list(self.VOICES)
         
         if language:
             filtered_voices = [v for v in filtered_voices if v.language == language]
@@ -497,10 +610,23 @@ class TTSService:
         
         return filtered_voices
     
+    @staticmethod
+    def _validate_request(request: TTSRequest) -> None:
+        if not request.text.strip():
+            raise HTTPException(status_code=400, detail="Text cannot be empty")
+        
+        if len(request.text) > 5000:
+            raise HTTPException(status_code=400, detail="Text too long (max 5000 characters)")
+    
     async def synthesize(self, request: TTSRequest) -> TTSResult:
         """
         Synthesize speech using the best available provider.
         
+        Concurrent requests with the same cache key (e.g. every client
+        fetching a household alert at once) share one provider call and
+        one cache fill; callers served by another's call get the result
+        marked as a cache hit.
+        
         Args:
             request: TTS synthesis request
             
@@ -513,55 +639,377 @@ class TTSService:
         if cached_result:
             return cached_result
         
-        # Validate request
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
+        self._validate_request(request)
         
-        if len(request.text) > 5000:
-            raise HTTPException(status_code=400, detail="Text too long (max 5000 characters)")
+        ran = False
         
-        # Determine best provider for this request
-        provider = self._select_provider(request)
+        async def run() -> TTSResult:
+            nonlocal ran
+            ran = True
+            return await self._synthesize_uncached(request)
         
-        if not provider:
+        result = await self._flights.do(cache_key, run)
+        return result if ran else replace(result, cache_hit=True)
+    
+    async def _synthesize_uncached(self, request: TTSRequest) -> TTSResult:
+        """Synthesize with the routed providers and cache the result."""
+        try:
+            result, provider_request = await self._synthesize_routed(request)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"TTS synthesis failed: {e}")
+            raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+        
+        # Cache under the voice actually used, which a fallback may have substituted
+        await self._cache_set(self._get_cache_key(provider_request), result)
+        
+        logger.info(f"TTS synthesis successful: {result.provider.value}, {result.processing_time_ms}ms")
+        return result
+    
+    async def _synthesize_routed(self, request: TTSRequest) -> Tuple[TTSResult, TTSRequest]:
+        """
+        Try providers best first, hedging slow calls to the next one.
+        
+        When a provider has a latency history and runs past its p95, the
+        next provider in the route is started alongside it and whichever
+        succeeds first is used. When both fail, the providers after them
+        are tried in turn.
+        
+        Returns:
+            Tuple of (result, request the winning provider was given,
+            carrying the voice it used)
+        
+        Raises:
+            HTTPException: The last provider error, or 503 if every
+                provider is ejected or none is configured
+        """
+        routes = self._route(request)
+        if not routes:
             raise HTTPException(status_code=503, detail="No TTS providers available")
         
-        # Synthesize using selected provider
+        last_error: Optional[BaseException] = None
+        index = 0
+        while index < len(routes):
+            provider, provider_request = routes[index]
+            index += 1
+            if not self.breakers[provider].allow():
+                self.provider_stats[provider].short_circuited += 1
+                continue
+            
+            primary = asyncio.ensure_future(self._call_provider(provider, provider_request))
+            tasks = [primary]
+            task_requests = {primary: provider_request}
+            try:
+                hedge_delay = self._hedge_delay(provider)
+                if hedge_delay is not None and index < len(routes):
+                    done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                    hedge_provider, hedge_request = routes[index]
+                    if not done and self.breakers[hedge_provider].allow():
+                        index += 1
+                        self.provider_stats[provider].hedges_sent += 1
+                        logger.info(f"TTS {provider.value} slower than {hedge_delay:.2f}s, hedging to {hedge_provider.value}")
+                        hedge_task = asyncio.ensure_future(self._call_provider(hedge_provider, hedge_request))
+                        tasks.append(hedge_task)
+                        task_requests[hedge_task] = hedge_request
+                
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is not primary:
+                                self.provider_stats[provider].hedges_won += 1
+                            return task.result(), task_requests[task]
+                        last_error = task.exception()
+                        logger.warning(f"TTS synthesis attempt failed: {last_error}")
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                    elif not task.cancelled():
+                        task.exception()  # A losing failure is logged by nobody else
+        
+        if last_error is None:
+            raise HTTPException(status_code=503, detail="TTS providers unavailable")
+        raise last_error
+    
+    async def _call_provider(self, provider: TTSProvider, request: TTSRequest) -> TTSResult:
+        """Synthesize with one provider, recording its latency and outcome."""
+        stats = self.provider_stats[provider]
+        breaker = self.breakers[provider]
+        stats.requests += 1
+        started = time.monotonic()
         try:
             if provider == TTSProvider.ELEVENLABS:
                 result = await self._synthesize_elevenlabs(request)
-            elif provider == TTSProvider.GOOGLE_CLOUD:
-                result = await self._synthesize_google_cloud(request)
             else:
-                raise HTTPException(status_code=501, detail=f"Provider {provider.value} not implemented")
+                result = await self._synthesize_google_cloud(request)
+        except Exception:
+            stats.record_failure()
+            breaker.record_failure()
+            raise
+        stats.record_latency((time.monotonic() - started) * 1000)
+        stats.record_success()
+        breaker.record_success()
+        return result
+    
+    async def synthesize_stream(self, request: TTSRequest) -> TTSStream:
+        """
+        Synthesize speech, yielding audio as the provider produces it.
+        
+        Providers are tried in route order. ElevenLabs audio is relayed
+        from its streaming endpoint chunk by chunk. Google Cloud TTS has
+        no streaming REST endpoint, so it is used whole, when it is the
+        best route or the fallback after a stream cannot be opened. Cached
+        audio is replayed from the cache. A stream that completes is written to the cache; one
+        the client abandons is not.
+        
+        The provider connection is opened before this returns, so provider
+        errors raise here rather than after a response has started.
+        
+        Args:
+            request: TTS synthesis request
             
-            # Cache successful result
-            await self._cache_set(cache_key, result)
+        Returns:
+            TTSStream whose chunks must be iterated to the end or closed
             
-            logger.info(f"TTS synthesis successful: {provider.value}, {result.processing_time_ms}ms")
-            return result
+        Raises:
+            HTTPException: If validation fails or no provider can start
+        """
+        cache_key = self._get_cache_key(request)
+        cached_result = await self._cache_get(cache_key)
+        if cached_result:
+            return self._replay(cached_result)
+        
+        self._validate_request(request)
+        
+        routes = self._route(request)
+        if not routes:
+            raise HTTPException(status_code=503, detail="No TTS providers available")
+        
+        last_error: Optional[HTTPException] = None
+        for provider, provider_request in routes:
+            if not self.breakers[provider].allow():
+                self.provider_stats[provider].short_circuited += 1
+                continue
+            if last_error is not None:
+                self._stream_stats["fallbacks"] += 1
+            try:
+                if provider == TTSProvider.ELEVENLABS:
+                    return await self._stream_elevenlabs(provider_request, self._get_cache_key(provider_request))
+                result = await self._call_provider(provider, provider_request)
+            except HTTPException as e:
+                last_error = e
+                logger.warning(f"TTS streaming unavailable from {provider.value}: {e.detail}")
+                continue
+            except Exception as e:
+                logger.error(f"TTS synthesis failed with {provider.value}: {e}")
+                last_error = HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+                continue
+            await self._cache_set(self._get_cache_key(provider_request), result)
+            return self._replay(result)
+        
+        raise last_error or HTTPException(status_code=503, detail="TTS providers unavailable")
+    
+    def _replay(self, result: TTSResult) -> TTSStream:
+        """Stream audio that is already complete."""
+        async def chunks():
+            for offset in range(0, len(result.audio_data), self.STREAM_CHUNK_SIZE):
+                yield result.audio_data[offset:offset + self.STREAM_CHUNK_SIZE]
+        
+        return TTSStream(
+            chunks=chunks(),
+            audio_format=result.audio_format,
+            voice_used=result.voice_used,
+            provider=result.provider,
+            cache_hit=result.cache_hit
+        )
+    
+    async def _stream_elevenlabs(self, request: TTSRequest, cache_key: str) -> TTSStream:
+        """Open an ElevenLabs stream and relay it, teeing the audio into the cache."""
+        http_request = self._elevenlabs_request(request, stream=True)
+        start_time = time.time()
+        
+        # Only the outcome of opening the stream is recorded: time to the
+        # first chunk is not comparable with whole-synthesis latency
+        stats = self.provider_stats[TTSProvider.ELEVENLABS]
+        breaker = self.breakers[TTSProvider.ELEVENLABS]
+        stats.requests += 1
+        
+        try:
+            response = await self.client.send(http_request, stream=True)
+        except httpx.HTTPError as e:
+            stats.record_failure()
+            breaker.record_failure()
+            logger.error(f"ElevenLabs stream request failed: {e}")
+            raise HTTPException(status_code=502, detail=f"ElevenLabs TTS request failed: {str(e)}")
+        
+        if response.status_code != 200:
+            stats.record_failure()
+            breaker.record_failure()
+            await response.aread()
+            await response.aclose()
+            raise self._elevenlabs_error(response)
+        
+        stats.record_success()
+        breaker.record_success()
+        
+        voice = self._elevenlabs_voice(request)
+        self._stream_stats["started"] += 1
+        
+        async def relay():
+            audio = bytearray()
+            complete = False
+            try:
+                async for chunk in response.aiter_bytes():
+                    if not audio:
+                        first_audio_ms = int((time.time() - start_time) * 1000)
+                        self._first_audio_ms = self._first_audio_ms[-99:] + [first_audio_ms]
+                        logger.debug(f"ElevenLabs first audio after {first_audio_ms}ms")
+                    audio += chunk
+                    yield chunk
+                complete = True
+            finally:
+                await response.aclose()
+                if not complete:
+                    self._stream_stats["abandoned"] += 1
             
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"TTS synthesis failed with {provider.value}: {e}")
-            raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+            self._stream_stats["completed"] += 1
+            processing_time = int((time.time() - start_time) * 1000)
+            await self._cache_set(cache_key, TTSResult(
+                audio_data=bytes(audio),
+                audio_format="mp3",
+                duration_ms=len(audio) // 32,  # Rough estimate
+                voice_used=voice,
+                provider=TTSProvider.ELEVENLABS,
+                processing_time_ms=processing_time
+            ))
+            logger.info(f"TTS stream complete: elevenlabs, {len(audio)} bytes, {processing_time}ms")
+        
+        return TTSStream(chunks=relay(), audio_format="mp3", voice_used=voice, provider=TTSProvider.ELEVENLABS)
     
-    def _select_provider(self, request: TTSRequest) -> Optional[TTSProvider]:
-        """Select the best provider for a given request."""
-        if self._preferred_provider:
-            return self._preferred_provider
+    async def synthesize_file(self, request: TTSRequest) -> Tuple[TTSResult, Optional[Path]]:
+        """
+        Synthesize speech and locate the audio in the disk tier.
         
-        # Fallback logic
-        available_providers = []
+        On a disk hit the audio is not read into memory: the returned
+        result has empty audio_data and the path should be served
+        directly (e.g. with a FileResponse).
         
-        if hasattr(settings, 'elevenlabs_api_key') and settings.elevenlabs_api_key:
-            available_providers.append(TTSProvider.ELEVENLABS)
+        Args:
+            request: TTS synthesis request
+            
+        Returns:
+            Tuple of (result, path of the cached audio file). The path is
+            None when there is no disk tier or the audio could not be
+            written to it; the result then carries the audio.
+        """
+        if self.disk_cache is None:
+            return await self.synthesize(request), None
         
-        if hasattr(settings, 'gcp_credentials_json') and settings.gcp_credentials_json != "{}":
-            available_providers.append(TTSProvider.GOOGLE_CLOUD)
+        cache_key = self._get_cache_key(request)
+        entry = await asyncio.to_thread(self.disk_cache.get, cache_key)
+        if entry is not None:
+            path, metadata = entry
+            try:
+                return self._result_from_metadata(metadata, b""), path
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Unreadable TTS disk cache entry {cache_key[:16]}: {e}")
         
-        return available_providers[0] if available_providers else None
+        result = await self.synthesize(request)
+        if result.voice_used.id != request.voice_id:
+            # A substituted voice is cached under its own key, not this one
+            return result, None
+        entry = await asyncio.to_thread(self.disk_cache.get, cache_key)
+        if entry is not None:
+            return result, entry[0]
+        # Served from memory, but missing on disk (e.g. expired there first)
+        path = await asyncio.to_thread(
+            self.disk_cache.set,
+            cache_key,
+            result.audio_data,
+            result.audio_format,
+            self._result_metadata(result)
+        )
+        return result, path
+    
+    def stream_metrics(self) -> Dict[str, Any]:
+        """Streaming synthesis counters and mean time to first audio over the last 100 streams."""
+        samples = self._first_audio_ms
+        return {
+            **self._stream_stats,
+            "avg_first_audio_ms": round(sum(samples) / len(samples), 1) if samples else None,
+        }
+    
+    def _route(self, request: TTSRequest) -> List[Tuple[TTSProvider, TTSRequest]]:
+        """
+        Providers to try for a request, best first.
+        
+        Providers that can speak the requested voice come before those
+        that would substitute their closest voice for the language, unless
+        the request has a flexible voice. Within each group, providers are
+        ordered by measured median latency;
+        providers without enough samples yet keep their configured order
+        ahead of measured ones, so they gather a history. Ejected providers
+        (open circuit) are left out.
+        
+        Returns:
+            (provider, request) pairs, each request carrying the voice that
+            provider will use
+        """
+        routes = []
+        for provider in self._available_providers:
+            if provider not in self.breakers or self.breakers[provider].state == CircuitBreaker.OPEN:
+                continue
+            voice_id = self._provider_voice(provider, request)
+            if voice_id is None:
+                continue
+            provider_request = request if voice_id == request.voice_id else replace(request, voice_id=voice_id)
+            routes.append((provider, provider_request))
+        
+        routes.sort(key=lambda route: (
+            not request.flexible_voice and route[1] is not request,
+            self._expected_latency_ms(route[0])
+        ))
+        return routes
+    
+    def _provider_voice(self, provider: TTSProvider, request: TTSRequest) -> Optional[str]:
+        """The requested voice if it is the provider's, else the provider's best voice for the language and accent."""
+        owner = next((voice.provider for voice in self.VOICES if voice.id == request.voice_id), None)
+        if owner is None and self._available_providers:
+            owner = self._available_providers[0]  # Unlisted voices belong to the preferred provider
+        if owner == provider:
+            return request.voice_id
+        
+        voices = [voice for voice in self.VOICES if voice.provider == provider and voice.language == request.language]
+        same_accent = [voice for voice in voices if voice.accent == request.accent]
+        if not voices:
+            return None
+        return max(same_accent or voices, key=lambda voice: voice.naturalness_score).id
+    
+    def _expected_latency_ms(self, provider: TTSProvider) -> float:
+        stats = self.provider_stats[provider]
+        if stats.sample_count < self.hedge_min_samples:
+            return 0.0
+        return stats.percentile(0.5)
+    
+    def _hedge_delay(self, provider: TTSProvider) -> Optional[float]:
+        """Seconds to wait before hedging, from the provider's p95 latency."""
+        stats = self.provider_stats[provider]
+        if not self.hedge or stats.sample_count < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, stats.percentile(0.95) / 1000)
+    
+    def provider_metrics(self) -> Dict[str, Any]:
+        """Rolling latency, error and circuit state per routable provider."""
+        return {
+            provider.value: {
+                **self.provider_stats[provider].snapshot(),
+                "circuit": self.breakers[provider].state,
+            }
+            for provider in self.ROUTABLE_PROVIDERS
+        }
     
     def prepare_kitchen_optimized_text(self, text: str) -> str:
         """
@@ -601,38 +1049,44 @@ class TTSService:
             "status": "unknown",
             "providers": {},
             "preferred_provider": self._preferred_provider.value if self._preferred_provider else None,
-            "cache_size": len(self._audio_cache),
+            "cache_size": len(self.cache),
+            "cache": {
+                **self.cache.metrics(),
+                "disk": self.disk_cache.metrics() if self.disk_cache is not None else None
+            },
+            "streaming": self.stream_metrics(),
+            "coalescing": self._flights.metrics(),
             "supported_languages": ["en"],  # Expand based on provider capabilities
             "supported_accents": ["american", "british", "australian"]
         }
         
-        # Check each provider
+        # Report each provider from its live routing stats
         provider_statuses = {}
-        
-        # ElevenLabs
-        if hasattr(settings, 'elevenlabs_api_key') and settings.elevenlabs_api_key:
-            try:
-                url = f"{self.PROVIDER_CONFIGS[TTSProvider.ELEVENLABS]['base_url']}/voices"
-                headers = {"xi-api-key": settings.elevenlabs_api_key}
-                response = await self.client.get(url, headers=headers, timeout=5.0)
-                provider_statuses["elevenlabs"] = {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "latency_score": 10,
-                    "naturalness_score": 10
+        metrics = self.provider_metrics()
+        for provider in self._available_providers:
+            config = self.PROVIDER_CONFIGS[provider]
+            if provider not in self.breakers:
+                provider_statuses[provider.value] = {
+                    "status": "unsupported",
+                    "note": "Synthesis not implemented; not routed to"
                 }
-            except Exception as e:
-                provider_statuses["elevenlabs"] = {
-                    "status": "unhealthy",
-                    "error": str(e)
-                }
-        
-        # Google Cloud TTS
-        if hasattr(settings, 'gcp_credentials_json') and settings.gcp_credentials_json != "{}":
-            provider_statuses["google_cloud"] = {
-                "status": "configured",
-                "latency_score": 7,
-                "naturalness_score": 8,
-                "note": "Full health check requires OAuth2 implementation"
+                continue
+            
+            stats = metrics[provider.value]
+            if stats["circuit"] != CircuitBreaker.CLOSED:
+                provider_status = "unhealthy"
+            elif stats["recent_error_rate"] is None:
+                provider_status = "configured"  # No traffic yet
+            elif stats["recent_error_rate"] > self.DEGRADED_ERROR_RATE:
+                provider_status = "degraded"
+            else:
+                provider_status = "healthy"
+            
+            provider_statuses[provider.value] = {
+                "status": provider_status,
+                "latency_score": config["latency_score"],
+                "naturalness_score": config["naturalness_score"],
+                "stats": stats
             }
         
         status["providers"] = provider_statuses
@@ -642,7 +1096,7 @@ class TTSService:
             healthy_providers = [p for p in provider_statuses.values() if p.get("status") == "healthy"]
             if healthy_providers:
                 status["status"] = "healthy"
-            elif any(p.get("status") == "configured" for p in provider_statuses.values()):
+            elif any(p.get("status") in ("configured", "degraded") for p in provider_statuses.values()):
                 status["status"] = "partially_healthy"
             else:
                 status["status"] = "unhealthy"
@@ -651,3 +1105,36 @@ class TTSService:
             status["message"] = "No TTS providers configured"
         
         return status
+
+
+_tts_service: Optional[TTSService] = None
+
+
+async def get_tts_service() -> TTSService:
+    """
+    Get the process-wide TTS service.
+    
+    The service shares the pooled TTS client, so connections to ElevenLabs
+    and Google are kept alive across requests, and the process-wide audio
+    cache and its disk tier, so repeated phrases skip the providers. Used
+    as a FastAPI dependency; async so it is resolved on the event loop.
+    """
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TTSService(
+            client=http_clients.get("tts"),
+            cache=tts_audio_cache,
+            disk_cache=tts_disk_cache
+        )
+    return _tts_service
+
+
+async def close_tts_service() -> None:
+    """
+    Drop the process-wide TTS service.
+    
+    Called before the pooled HTTP clients are closed, so a service created
+    afterwards picks up a fresh client instead of holding a closed one.
+    """
+    global _tts_service
+    _tts_service = None
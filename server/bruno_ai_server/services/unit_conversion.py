@@ -0,0 +1,257 @@
+"""
+Unit conversion engine for pantry quantities.
+
+This service handles:
+- Spoken and written unit aliases ("lbs", "tbsp", "fl oz") mapped to
+  standard units, shared with the voice command parser
+- Dimension-aware conversion tables (mass, volume, count)
+- Density hints so volumes of common foods convert to mass
+- Canonical base quantities stored on pantry items for SQL aggregation,
+  kept current by a mapper hook on PantryItem
+"""
+
+import re
+from enum import Enum
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy import event
+
+from ..models.pantry import PantryItem
+
+
+class Dimension(Enum):
+    """Physical dimension of a unit."""
+    MASS = "mass"
+    VOLUME = "volume"
+    COUNT = "count"
+    PACKAGE = "package"  # Containers of unknown size; only convertible to themselves
+
+
+class UnitConversionError(ValueError):
+    """Raised when a quantity cannot be converted between two units."""
+
+
+# Spoken and written variations of each standard unit
+UNIT_ALIASES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    # Volume
+    'cup': ('cup', 'cups', 'c'),
+    'tablespoon': ('tablespoon', 'tablespoons', 'tbsp', 'tbs'),
+    'teaspoon': ('teaspoon', 'teaspoons', 'tsp'),
+    'liter': ('liter', 'liters', 'l', 'litre', 'litres'),
+    'milliliter': ('milliliter', 'milliliters', 'ml'),
+    'gallon': ('gallon', 'gallons', 'gal'),
+    'quart': ('quart', 'quarts', 'qt'),
+    'pint': ('pint', 'pints', 'pt'),
+    'fluid_ounce': ('fluid ounce', 'fluid ounces', 'fl oz', 'floz'),
+
+    # Weight
+    'pound': ('pound', 'pounds', 'lb', 'lbs'),
+    'ounce': ('ounce', 'ounces', 'oz'),
+    'gram': ('gram', 'grams', 'g'),
+    'kilogram': ('kilogram', 'kilograms', 'kg'),
+
+    # Count
+    'piece': ('piece', 'pieces', 'pc', 'pcs', 'each'),
+    'dozen': ('dozen', 'doz'),
+    'pack': ('pack', 'packs', 'package', 'packages'),
+    'box': ('box', 'boxes'),
+    'can': ('can', 'cans'),
+    'jar': ('jar', 'jars'),
+    'bottle': ('bottle', 'bottles'),
+})
+
+# Reverse lookup from alias to standard unit
+UNIT_LOOKUP: Mapping[str, str] = MappingProxyType({
+    alias.lower(): standard_unit
+    for standard_unit, aliases in UNIT_ALIASES.items()
+    for alias in aliases
+})
+
+# Base unit of each dimension
+BASE_UNITS: Mapping[Dimension, str] = MappingProxyType({
+    Dimension.MASS: 'gram',
+    Dimension.VOLUME: 'milliliter',
+    Dimension.COUNT: 'piece',
+})
+
+# Standard unit -> (dimension, size in the dimension's base unit)
+UNIT_DEFINITIONS: Mapping[str, Tuple[Dimension, float]] = MappingProxyType({
+    'milliliter': (Dimension.VOLUME, 1.0),
+    'liter': (Dimension.VOLUME, 1000.0),
+    'teaspoon': (Dimension.VOLUME, 4.92892),
+    'tablespoon': (Dimension.VOLUME, 14.7868),
+    'fluid_ounce': (Dimension.VOLUME, 29.5735),
+    'cup': (Dimension.VOLUME, 236.588),
+    'pint': (Dimension.VOLUME, 473.176),
+    'quart': (Dimension.VOLUME, 946.353),
+    'gallon': (Dimension.VOLUME, 3785.41),
+
+    'gram': (Dimension.MASS, 1.0),
+    'kilogram': (Dimension.MASS, 1000.0),
+    'ounce': (Dimension.MASS, 28.3495),
+    'pound': (Dimension.MASS, 453.592),
+
+    'piece': (Dimension.COUNT, 1.0),
+    'dozen': (Dimension.COUNT, 12.0),
+
+    'pack': (Dimension.PACKAGE, 1.0),
+    'box': (Dimension.PACKAGE, 1.0),
+    'can': (Dimension.PACKAGE, 1.0),
+    'jar': (Dimension.PACKAGE, 1.0),
+    'bottle': (Dimension.PACKAGE, 1.0),
+})
+
+# Food -> (grams per milliliter, dimension its base quantity is stored in).
+# Liquids stay in volume; dry goods measured by the cup are stored by mass.
+FOOD_DENSITIES: Mapping[str, Tuple[float, Dimension]] = MappingProxyType({
+    'water': (1.0, Dimension.VOLUME),
+    'milk': (1.03, Dimension.VOLUME),
+    'buttermilk': (1.03, Dimension.VOLUME),
+    'cream': (1.0, Dimension.VOLUME),
+    'heavy cream': (0.99, Dimension.VOLUME),
+    'juice': (1.04, Dimension.VOLUME),
+    'orange juice': (1.04, Dimension.VOLUME),
+    'oil': (0.92, Dimension.VOLUME),
+    'olive oil': (0.91, Dimension.VOLUME),
+    'vegetable oil': (0.92, Dimension.VOLUME),
+    'vinegar': (1.01, Dimension.VOLUME),
+    'soy sauce': (1.2, Dimension.VOLUME),
+    'broth': (1.0, Dimension.VOLUME),
+    'stock': (1.0, Dimension.VOLUME),
+    'honey': (1.42, Dimension.VOLUME),
+    'maple syrup': (1.32, Dimension.VOLUME),
+
+    'flour': (0.53, Dimension.MASS),
+    'sugar': (0.85, Dimension.MASS),
+    'brown sugar': (0.93, Dimension.MASS),
+    'powdered sugar': (0.56, Dimension.MASS),
+    'salt': (1.2, Dimension.MASS),
+    'butter': (0.91, Dimension.MASS),
+    'rice': (0.85, Dimension.MASS),
+    'oats': (0.41, Dimension.MASS),
+    'cocoa powder': (0.5, Dimension.MASS),
+    'peanut butter': (1.09, Dimension.MASS),
+    'yogurt': (1.03, Dimension.MASS),
+    'sour cream': (1.0, Dimension.MASS),
+    'cheese': (0.45, Dimension.MASS),
+    'shredded cheese': (0.45, Dimension.MASS),
+    'cornstarch': (0.54, Dimension.MASS),
+    'quinoa': (0.72, Dimension.MASS),
+    'lentils': (0.8, Dimension.MASS),
+})
+
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+
+
+def normalize_unit(unit: Optional[str]) -> Optional[str]:
+    """Map a unit alias to its standard unit, or None if unknown."""
+    if not unit:
+        return None
+    unit = " ".join(unit.lower().replace("_", " ").split())
+    return UNIT_LOOKUP.get(unit)
+
+
+def density_for(item_name: Optional[str]) -> Optional[Tuple[float, Dimension]]:
+    """
+    Find a density hint for a food name.
+
+    Tries the whole name, then shorter trailing word sequences, so
+    "whole milk" and "king arthur flour" find their base food.
+    """
+    if not item_name:
+        return None
+    words = _NON_WORD_PATTERN.sub(" ", item_name.lower()).split()
+    for start in range(len(words)):
+        candidate = " ".join(words[start:])
+        hint = FOOD_DENSITIES.get(candidate)
+        if hint is None and candidate.endswith("s"):
+            hint = FOOD_DENSITIES.get(candidate[:-1])
+        if hint is not None:
+            return hint
+    return None
+
+
+def convert(quantity: float, from_unit: str, to_unit: str, item_name: Optional[str] = None) -> float:
+    """
+    Convert a quantity between units.
+
+    Args:
+        quantity: Amount in from_unit
+        from_unit: Unit or alias to convert from
+        to_unit: Unit or alias to convert to
+        item_name: Food name used for volume/mass density hints
+
+    Returns:
+        Amount in to_unit
+
+    Raises:
+        UnitConversionError: If a unit is unknown or the dimensions differ
+            without a density hint
+    """
+    source, target = normalize_unit(from_unit), normalize_unit(to_unit)
+    if source is None or target is None:
+        raise UnitConversionError(f"Unknown unit: '{from_unit if source is None else to_unit}'")
+    if source == target:
+        return quantity
+
+    source_dimension, source_size = UNIT_DEFINITIONS[source]
+    target_dimension, target_size = UNIT_DEFINITIONS[target]
+
+    if source_dimension == target_dimension and source_dimension != Dimension.PACKAGE:
+        return quantity * source_size / target_size
+
+    if {source_dimension, target_dimension} == {Dimension.MASS, Dimension.VOLUME}:
+        hint = density_for(item_name)
+        if hint is None:
+            raise UnitConversionError(f"No density known for '{item_name}' to convert {source} to {target}")
+        density = hint[0]
+        base_amount = quantity * source_size
+        if source_dimension == Dimension.VOLUME:
+            return base_amount * density / target_size
+        return base_amount / density / target_size
+
+    raise UnitConversionError(f"Cannot convert {source} to {target}")
+
+
+def to_base_quantity(
+    quantity: Optional[float],
+    unit: Optional[str],
+    item_name: Optional[str] = None
+) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Express a quantity in its canonical base unit.
+
+    Mass is stored in grams, volume in milliliters and counts in pieces.
+    Foods with a density hint are stored in their preferred dimension so
+    "2 cups of flour" and "500 g flour" aggregate together. Package units
+    (can, box, ...) are their own base. Unknown units have no base.
+
+    Returns:
+        Tuple of (base quantity, base unit), or (None, None)
+    """
+    standard = normalize_unit(unit)
+    if quantity is None or standard is None:
+        return None, None
+
+    dimension, size = UNIT_DEFINITIONS[standard]
+    if dimension == Dimension.PACKAGE:
+        return float(quantity), standard
+
+    hint = density_for(item_name) if dimension in (Dimension.MASS, Dimension.VOLUME) else None
+    if hint is not None and hint[1] != dimension:
+        base_unit = BASE_UNITS[hint[1]]
+        return convert(quantity, standard, base_unit, item_name), base_unit
+
+    return quantity * size, BASE_UNITS[dimension]
+
+
+@event.listens_for(PantryItem, "before_insert")
+@event.listens_for(PantryItem, "before_update")
+def _set_base_quantity(mapper, connection, target):
+    """Keep the canonical base quantity in step with quantity, unit and name."""
+    target.base_quantity, target.base_unit = to_base_quantity(
+        target.quantity if target.quantity is not None else 1.0,
+        target.unit if target.unit is not None else "piece",
+        target.name,
+    )
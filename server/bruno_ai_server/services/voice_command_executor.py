@@ -0,0 +1,460 @@
+"""
+Server-side execution of parsed voice commands for Bruno AI.
+
+This service handles:
+- Applying a parsed command's entities to the household pantry in one
+  transaction (create, adjust, update, delete)
+- Resolving entity names to existing items with the entity resolver;
+  adding an item the pantry already holds in a compatible unit tops it
+  up instead of creating a duplicate
+- Converting spoken amounts to each item's unit before adjusting it
+- Short-lived, single-use undo tokens that reverse an executed command,
+  stored in the database so any worker can redeem them
+"""
+
+import hashlib
+import logging
+import secrets
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..config import settings
+from ..models.pantry import PantryItem
+from ..models.voice import VoiceUndoRecord
+from .command_parser import CommandResult, PantryAction, ParsedEntity
+from .entity_resolver import entity_resolver
+from .expiration_service import ExpirationService
+from .notification_hub import notification_hub
+from .unit_conversion import UnitConversionError, convert, normalize_unit, to_base_quantity
+
+logger = logging.getLogger(__name__)
+
+# Actions that change the pantry
+MUTATING_ACTIONS = frozenset({
+    PantryAction.ADD,
+    PantryAction.UPDATE,
+    PantryAction.DELETE,
+    PantryAction.REMOVE,
+    PantryAction.INCREMENT,
+    PantryAction.DECREMENT,
+    PantryAction.USE,
+    PantryAction.SET_QUANTITY,
+})
+
+# Columns recomputed on write rather than restored from a snapshot
+_DERIVED_COLUMNS = frozenset({"base_quantity", "base_unit"})
+
+# Columns a command can change; undo skips items whose values moved on since
+_TRACKED_COLUMNS = ("name", "quantity", "unit", "location", "expiration_date")
+
+
+def _column_python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+_COLUMN_TYPES = {column.key: _column_python_type(column) for column in PantryItem.__table__.columns}
+
+
+@dataclass
+class ExecutedItem:
+    """A pantry item touched by an executed command."""
+    item_id: Any
+    name: str
+    operation: str  # created, updated, deleted, matched
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    location: Optional[str] = None
+    expiration_date: Optional[date] = None
+
+    @classmethod
+    def from_item(cls, item: PantryItem, operation: str) -> "ExecutedItem":
+        return cls(
+            item_id=item.id,
+            name=item.name,
+            operation=operation,
+            quantity=item.quantity,
+            unit=item.unit,
+            location=item.location,
+            expiration_date=item.expiration_date,
+        )
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of executing a parsed command."""
+    action: str
+    items: List[ExecutedItem] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    undo_token: Optional[str] = None
+    undo_expires_at: Optional[datetime] = None
+
+    @property
+    def applied(self) -> bool:
+        return any(item.operation != "matched" for item in self.items)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(key: str, value: Any) -> Any:
+    python_type = _COLUMN_TYPES.get(key)
+    if value is None or python_type is None:
+        return value
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def _snapshot(item: PantryItem, columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """JSON-safe column values of an item, for restoring it later."""
+    keys = columns or [
+        column.key for column in PantryItem.__table__.columns if column.key not in _DERIVED_COLUMNS
+    ]
+    return {key: _encode_value(getattr(item, key)) for key in keys}
+
+
+def _restore(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _decode_value(key, value) for key, value in snapshot.items()}
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _operation(
+    operation: str,
+    item: PantryItem,
+    before: Dict[str, Any],
+    after: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Undo entry: the values to restore and the values the command left."""
+    return {"operation": operation, "item_id": str(item.id), "before": before, "after": after}
+
+
+class VoiceCommandExecutor:
+    """
+    Apply parsed voice commands to a household pantry.
+
+    Undo records are stored in the same transaction as the changes they
+    reverse, keyed by a hash of the token. A token is only redeemable by
+    the user who executed the command, only once and only until its TTL.
+    """
+
+    def __init__(
+        self,
+        undo_ttl_seconds: Optional[int] = None,
+        min_match_score: Optional[float] = None
+    ):
+        self.undo_ttl_seconds = undo_ttl_seconds if undo_ttl_seconds is not None else settings.voice_undo_ttl_seconds
+        self.min_match_score = (
+            min_match_score if min_match_score is not None else settings.voice_execute_min_match_score
+        )
+
+    async def execute(
+        self,
+        db: AsyncSession,
+        user_id: Any,
+        household_id: Any,
+        result: CommandResult
+    ) -> ExecutionResult:
+        """
+        Execute a parsed command against the household pantry.
+
+        All entity changes are committed together; if any write fails the
+        transaction is rolled back and nothing is applied.
+
+        Args:
+            db: Database session
+            user_id: User executing the command
+            household_id: Household whose pantry is changed
+            result: Parsed command
+
+        Returns:
+            Items created, changed, deleted or matched, plus an undo token
+            when anything was applied
+        """
+        execution = ExecutionResult(action=result.action.value)
+        if not result.entities:
+            return execution
+
+        operations: List[Dict[str, Any]] = []
+        try:
+            if result.action == PantryAction.ADD:
+                matches = await self._match_items(db, household_id, result.entities)
+                for entity, item in zip(result.entities, matches, strict=True):
+                    if item is not None and self._same_base_unit(entity, item):
+                        before = _snapshot(item, _TRACKED_COLUMNS)
+                        item.quantity += self._amount_in_item_unit(entity, item)
+                        operation = "updated"
+                    else:
+                        item = await self._create_item(db, user_id, household_id, entity)
+                        before = {}
+                        operation = "created"
+                    operations.append(_operation(operation, item, before, _snapshot(item, _TRACKED_COLUMNS)))
+                    execution.items.append(ExecutedItem.from_item(item, operation))
+            else:
+                items = await self._resolve_items(db, household_id, result.entities, execution)
+                deleted_ids = set()
+                for entity, item in items:
+                    if result.action not in MUTATING_ACTIONS:
+                        execution.items.append(ExecutedItem.from_item(item, "matched"))
+                        continue
+                    if item.id in deleted_ids:
+                        # Two names resolved to the same item
+                        continue
+                    applied = self._apply(result.action, entity, item, execution)
+                    if applied is None:
+                        continue
+                    operation, before = applied
+                    if operation == "deleted":
+                        deleted_ids.add(item.id)
+                        await db.delete(item)
+                        after = {}
+                    else:
+                        after = _snapshot(item, _TRACKED_COLUMNS)
+                    operations.append(_operation(operation, item, before, after))
+                    execution.items.append(ExecutedItem.from_item(item, operation))
+
+            if operations:
+                execution.undo_token, execution.undo_expires_at = await self._store_undo(
+                    db, user_id, household_id, operations
+                )
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        if operations:
+            logger.info(
+                f"Executed voice command '{result.action.value}' for user {user_id}: "
+                f"{len(operations)} item(s) changed"
+            )
+            await self._publish_changes(household_id, execution.items)
+        return execution
+
+    async def _create_item(self, db: AsyncSession, user_id: Any, household_id: Any, entity: ParsedEntity) -> PantryItem:
+        expiration_date = entity.expiration_date or await ExpirationService.suggest_expiration_date(
+            item_name=entity.name
+        )
+        item = PantryItem(
+            name=entity.name,
+            quantity=entity.quantity if entity.quantity is not None else 1.0,
+            unit=entity.unit or "piece",
+            location=entity.location,
+            expiration_date=expiration_date,
+            household_id=household_id,
+            added_by_user_id=user_id,
+        )
+        db.add(item)
+        await db.flush()
+        return item
+
+    async def _resolve_items(
+        self,
+        db: AsyncSession,
+        household_id: Any,
+        entities: List[ParsedEntity],
+        execution: ExecutionResult
+    ) -> List[Tuple[ParsedEntity, PantryItem]]:
+        """Pair each entity with its best matching pantry item."""
+        pairs = []
+        for entity, item in zip(entities, await self._match_items(db, household_id, entities), strict=True):
+            if item is None:
+                execution.unresolved.append(entity.name)
+            else:
+                pairs.append((entity, item))
+        return pairs
+
+    async def _match_items(
+        self,
+        db: AsyncSession,
+        household_id: Any,
+        entities: List[ParsedEntity]
+    ) -> List[Optional[PantryItem]]:
+        """Best matching pantry item for each entity, or None."""
+        resolved = await entity_resolver.resolve(
+            db, household_id, [entity.name for entity in entities], min_score=self.min_match_score
+        )
+        item_ids = {matches[0].item_id for matches in resolved if matches}
+        items_by_id = {}
+        if item_ids:
+            rows = await db.execute(
+                select(PantryItem).where(PantryItem.id.in_(item_ids), PantryItem.household_id == household_id)
+            )
+            items_by_id = {item.id: item for item in rows.scalars()}
+
+        return [items_by_id.get(matches[0].item_id) if matches else None for matches in resolved]
+
+    def _apply(
+        self,
+        action: PantryAction,
+        entity: ParsedEntity,
+        item: PantryItem,
+        execution: ExecutionResult
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Apply one entity's change to an item and return the operation and prior values."""
+        if action in (PantryAction.DELETE, PantryAction.REMOVE):
+            return "deleted", _snapshot(item)
+
+        before = _snapshot(item, _TRACKED_COLUMNS)
+        try:
+            if action == PantryAction.INCREMENT:
+                item.quantity += self._amount_in_item_unit(entity, item)
+            elif action in (PantryAction.DECREMENT, PantryAction.USE):
+                item.quantity = max(0.0, item.quantity - self._amount_in_item_unit(entity, item))
+            elif action == PantryAction.SET_QUANTITY:
+                if entity.quantity is None:
+                    execution.errors.append(f"No quantity given for '{entity.name}'")
+                    return None
+                item.quantity = self._amount_in_item_unit(entity, item)
+            elif action == PantryAction.UPDATE:
+                if entity.quantity is not None:
+                    item.quantity = entity.quantity
+                    item.unit = normalize_unit(entity.unit) or entity.unit or item.unit
+                if entity.location:
+                    item.location = entity.location
+                if entity.expiration_date:
+                    item.expiration_date = entity.expiration_date
+        except UnitConversionError as e:
+            execution.errors.append(f"{entity.name}: {e}")
+            return None
+
+        return "updated", before
+
+    @staticmethod
+    def _same_base_unit(entity: ParsedEntity, item: PantryItem) -> bool:
+        """Whether a spoken amount can be added to an item's quantity."""
+        _, base_unit = to_base_quantity(1.0, entity.unit or "piece", item.name)
+        return base_unit is not None and base_unit == item.base_unit
+
+    @staticmethod
+    def _amount_in_item_unit(entity: ParsedEntity, item: PantryItem) -> float:
+        """Spoken amount expressed in the item's unit (1 when unspoken)."""
+        amount = entity.quantity if entity.quantity is not None else 1.0
+        if entity.unit and item.unit and normalize_unit(entity.unit) != normalize_unit(item.unit):
+            amount = convert(amount, entity.unit, item.unit, item.name)
+        return amount
+
+    async def _store_undo(
+        self,
+        db: AsyncSession,
+        user_id: Any,
+        household_id: Any,
+        operations: List[Dict[str, Any]]
+    ) -> Tuple[str, datetime]:
+        """Add an undo record to the command's transaction and return its token."""
+        now = datetime.now(timezone.utc)
+        await db.execute(
+            delete(VoiceUndoRecord).where(
+                VoiceUndoRecord.user_id == user_id, VoiceUndoRecord.expires_at <= now
+            )
+        )
+        token = secrets.token_urlsafe(24)
+        expires_at = now + timedelta(seconds=self.undo_ttl_seconds)
+        db.add(VoiceUndoRecord(
+            token_hash=_hash_token(token),
+            user_id=user_id,
+            household_id=household_id,
+            operations=operations,
+            expires_at=expires_at,
+        ))
+        return token, expires_at
+
+    async def undo(self, db: AsyncSession, user_id: Any, token: str) -> Optional[List[ExecutedItem]]:
+        """
+        Reverse a previously executed command.
+
+        Operations are reversed in one transaction, newest first, and the
+        undo record is deleted in that same transaction. Created and updated
+        items whose values changed since the command are left alone, as are
+        deleted items that already exist again.
+
+        Args:
+            db: Database session
+            user_id: User redeeming the token
+            token: Undo token returned by execute
+
+        Returns:
+            Restored items, or None if the token is unknown, expired or
+            belongs to another user
+        """
+        row = await db.execute(
+            select(VoiceUndoRecord)
+            .where(
+                VoiceUndoRecord.token_hash == _hash_token(token),
+                VoiceUndoRecord.user_id == user_id,
+                VoiceUndoRecord.expires_at > datetime.now(timezone.utc),
+            )
+            .with_for_update()
+        )
+        record = row.scalar_one_or_none()
+        if record is None:
+            return None
+
+        restored = []
+        try:
+            for operation in reversed(record.operations):
+                row = await db.execute(
+                    select(PantryItem).where(
+                        PantryItem.id == uuid.UUID(operation["item_id"]),
+                        PantryItem.household_id == record.household_id,
+                    )
+                )
+                item = row.scalar_one_or_none()
+
+                if operation["operation"] == "deleted":
+                    if item is not None:
+                        continue
+                    item = PantryItem(**_restore(operation["before"]))
+                    db.add(item)
+                    restored.append(ExecutedItem.from_item(item, "created"))
+                    continue
+
+                if item is None or _snapshot(item, operation["after"]) != operation["after"]:
+                    continue
+                if operation["operation"] == "created":
+                    await db.delete(item)
+                    restored.append(ExecutedItem.from_item(item, "deleted"))
+                else:
+                    for key, value in _restore(operation["before"]).items():
+                        setattr(item, key, value)
+                    restored.append(ExecutedItem.from_item(item, "updated"))
+            await db.delete(record)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        logger.info(f"Undid voice command for user {user_id}: {len(restored)} item(s) restored")
+        await self._publish_changes(record.household_id, restored)
+        return restored
+
+    @staticmethod
+    async def _publish_changes(household_id: Any, items: List[ExecutedItem]) -> None:
+        """Announce committed item changes on the household's notification channel."""
+        for item in items:
+            if item.operation != "matched":
+                await notification_hub.publish_pantry_change(household_id, item.item_id, item.operation)
+
+
+# Global executor instance
+voice_command_executor = VoiceCommandExecutor()
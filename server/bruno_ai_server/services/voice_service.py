@@ -10,7 +10,6 @@ This service handles:
 """
 
 import asyncio
-import io
 import logging
 from pathlib import Path
 from typing import BinaryIO, Optional, Dict, Any
@@ -21,6 +20,12 @@ import aiofiles
 from fastapi import HTTPException, UploadFile
 
 from ..config import settings
+from .audio_preprocessing import AudioPreprocessor, audio_preprocessor
+from .audio_probe import AudioInfo, AudioProbeError, probe_audio
+from .audio_upload import AudioSource, AudioTooLargeError
+from .http_clients import http_clients
+from .stt_providers import STTProviderError, STTRouter, VoxtralProvider, build_stt_router
+from .transcription_cache import TranscriptionCache, transcription_cache
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,8 @@ class TranscriptionResult:
     language_detected: Optional[str] = None
     processing_time_ms: int = 0
     audio_duration_ms: int = 0
+    cached: bool = False
+    provider: Optional[str] = None
 
 
 class VoiceService:
@@ -51,16 +58,38 @@ class VoiceService:
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB max file size
     MAX_DURATION_SECONDS = 300  # 5 minutes max duration
     
+    VOXTRAL_MODEL = VoxtralProvider.model
+    
     # Voxtral API endpoints
     VOXTRAL_BASE_URL = "https://api.mistral.ai/v1/audio"
-    TRANSCRIPTION_ENDPOINT = f"{VOXTRAL_BASE_URL}/transcriptions"
+    TRANSCRIPTION_ENDPOINT = VoxtralProvider.endpoint
     
-    def __init__(self):
-        """Initialize the voice service."""
-        self.client = httpx.AsyncClient(
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TranscriptionCache] = None,
+        preprocessor: Optional[AudioPreprocessor] = None,
+        router: Optional[STTRouter] = None
+    ):
+        """
+        Initialize the voice service.
+        
+        Args:
+            client: Shared HTTP client. Without one the service owns a
+                private client and closes it on exit.
+            cache: Transcription cache consulted before calling the API
+            preprocessor: Resamples and trims audio before upload
+            router: STT providers to use. Defaults to Voxtral alone on
+                this service's client.
+        """
+        self.cache = cache
+        self.preprocessor = preprocessor
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
             timeout=httpx.Timeout(30.0, connect=10.0),
             limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
         )
+        self.router = router or STTRouter([VoxtralProvider(self.client)])
         
         # Validate API key availability
         if not settings.voxtral_api_key:
@@ -72,7 +101,8 @@ class VoiceService:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
     
     def _validate_audio_file(self, file: UploadFile) -> None:
         """
@@ -105,64 +135,99 @@ class VoiceService:
         if not (content_type.startswith("audio/") or content_type.startswith("video/")):
             logger.warning(f"Unexpected content type: {content_type}, proceeding anyway")
     
-    async def _prepare_voxtral_request(
-        self, 
-        audio_data: bytes, 
-        filename: str = "audio.wav",
-        language: Optional[str] = None
-    ) -> Dict[str, Any]:
+    async def _check_audio_content(self, source: AudioSource, filename: Optional[str]) -> AudioInfo:
         """
-        Prepare request data for Voxtral API.
+        Check audio content against its extension and the duration limit.
+        
+        Only container headers are read, so bad uploads are rejected
+        before the body is streamed to the API.
         
         Args:
-            audio_data: Raw audio bytes
-            filename: Original filename (for format detection)
-            language: Optional language hint
+            source: Uploaded audio
+            filename: Name the client gave the file, if any
             
         Returns:
-            Dictionary with request data for Voxtral API
+            AudioInfo from the container headers
+            
+        Raises:
+            HTTPException: If the content is not recognized audio, does not
+                match the file extension, or is longer than MAX_DURATION_SECONDS
         """
-        # Prepare files for multipart upload
-        files = {
-            "file": (filename, io.BytesIO(audio_data), "audio/wav")
-        }
+        try:
+            info = await probe_audio(source.read_at, source.size)
+        except AudioProbeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid audio file: {e}")
         
-        # Prepare form data with optimizations for food terms
-        data = {
-            "model": "voxtral-24.05",  # Latest Voxtral model
-            "response_format": "json",
-            "temperature": 0.1,  # Lower temperature for more consistent results
-        }
+        if info is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unrecognized audio content. Supported: {', '.join(self.SUPPORTED_FORMATS)}"
+            )
         
-        # Add language hint if provided
-        if language:
-            data["language"] = language
+        file_ext = Path(filename or "").suffix.lower().lstrip('.')
+        if file_ext and file_ext != info.format:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Audio content is {info.format.upper()} but the file is named .{file_ext}"
+            )
         
-        # Add food-specific optimizations via prompt
-        # This helps improve accuracy for food-related terms
-        data["prompt"] = (
-            "This is a food-related conversation in a kitchen environment. "
-            "Focus on accurate recognition of food items, cooking terms, quantities, "
-            "measurements, and kitchen vocabulary. Common words include: "
-            "add, remove, delete, update, milk, bread, chicken, vegetables, "
-            "cups, tablespoons, teaspoons, pounds, ounces, grams, liters."
+        if info.duration_seconds is not None and info.duration_seconds > self.MAX_DURATION_SECONDS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Audio too long ({info.duration_seconds:.0f}s). Maximum duration: {self.MAX_DURATION_SECONDS}s"
+            )
+        
+        logger.debug(
+            f"Probed {source.filename}: {info.format}/{info.codec}, {info.sample_rate} Hz, "
+            f"{info.duration_seconds}s"
         )
+        return info
+    
+    async def probe_upload(self, file: UploadFile) -> AudioInfo:
+        """
+        Validate an upload and read its format and duration.
+        
+        Only container headers are read; the file position is reset
+        afterwards.
         
-        return {"files": files, "data": data}
+        Args:
+            file: Uploaded audio file
+            
+        Returns:
+            AudioInfo from the container headers
+            
+        Raises:
+            HTTPException: If the upload fails validation
+        """
+        self._validate_audio_file(file)
+        source = AudioSource.from_upload(file, max_size=self.MAX_FILE_SIZE)
+        try:
+            return await self._check_audio_content(source, file.filename)
+        finally:
+            await file.seek(0)
     
     async def transcribe_audio(
         self, 
         file: UploadFile,
         language: Optional[str] = None,
-        enhance_food_terms: bool = True
+        enhance_food_terms: bool = True,
+        audio_info: Optional[AudioInfo] = None,
+        deadline_seconds: Optional[float] = None
     ) -> TranscriptionResult:
         """
         Transcribe audio file to text using Mistral Voxtral STT.
         
+        The upload is streamed from its spooled temp file to the API in
+        chunks rather than read into memory.
+        
         Args:
             file: Uploaded audio file
             language: Optional language hint (e.g., "en", "es", "fr")
             enhance_food_terms: Whether to optimize for food term recognition
+            audio_info: Result of probe_upload for this file, if the caller
+                already validated it
+            deadline_seconds: Time budget overriding the router's
+                length-scaled deadline
             
         Returns:
             TranscriptionResult with transcribed text and metadata
@@ -175,130 +240,175 @@ class VoiceService:
                 status_code=503,
                 detail="Voice transcription service not available - API key not configured"
             )
+
+        # Validate the uploaded file unless probe_upload already did
+        if audio_info is None:
+            self._validate_audio_file(file)
+
+        logger.info(f"Processing audio file: {file.filename}, size: {getattr(file, 'size', None)} bytes")
         
-        import time
-        start_time = time.time()
-        
+        source = AudioSource.from_upload(file, max_size=self.MAX_FILE_SIZE)
         try:
-            # Validate the uploaded file
-            self._validate_audio_file(file)
-            
-            # Read audio data
-            audio_data = await file.read()
-            logger.info(f"Processing audio file: {file.filename}, size: {len(audio_data)} bytes")
+            # Reject mislabeled or over-length audio from its headers
+            if audio_info is None:
+                audio_info = await self._check_audio_content(source, file.filename)
             
-            # Prepare request for Voxtral API
-            request_data = await self._prepare_voxtral_request(
-                audio_data, 
-                file.filename or "audio.wav",
-                language
+            return await self._transcribe_source(
+                source,
+                language,
+                duration_seconds=audio_info.duration_seconds,
+                deadline_seconds=deadline_seconds
             )
-            
-            # Make request to Voxtral API
-            headers = {
-                "Authorization": f"Bearer {settings.voxtral_api_key}",
-                "User-Agent": "Bruno-AI-Server/1.0"
-            }
-            
-            logger.info("Sending request to Voxtral API")
-            response = await self.client.post(
-                self.TRANSCRIPTION_ENDPOINT,
-                files=request_data["files"],
-                data=request_data["data"],
-                headers=headers
-            )
-            
-            # Handle API response
-            if response.status_code != 200:
-                error_detail = f"Voxtral API error: {response.status_code}"
+        finally:
+            # Reset file position for potential reuse
+            if hasattr(file, 'seek'):
                 try:
-                    error_data = response.json()
-                    error_detail += f" - {error_data.get('error', {}).get('message', 'Unknown error')}"
+                    await file.seek(0)
                 except:
-                    error_detail += f" - {response.text[:200]}"
-                
-                logger.error(error_detail)
-                raise HTTPException(status_code=502, detail=error_detail)
+                    pass
+    
+    async def transcribe_bytes(
+        self,
+        audio_data: bytes,
+        filename: str = "audio.wav",
+        language: Optional[str] = None,
+        start_time: Optional[float] = None,
+        use_cache: bool = True
+    ) -> TranscriptionResult:
+        """
+        Transcribe in-memory audio with Mistral Voxtral STT.
+        
+        Args:
+            audio_data: Encoded audio bytes
+            filename: Filename used for format detection
+            language: Optional language hint
+            start_time: time.time() the request started, for processing time
+            use_cache: Whether to read and populate the transcription cache
             
-            # Parse successful response
-            result_data = response.json()
-            transcribed_text = result_data.get("text", "").strip()
+        Returns:
+            TranscriptionResult with transcribed text and metadata
             
-            if not transcribed_text:
-                raise HTTPException(
-                    status_code=422,
-                    detail="No speech detected in audio file"
-                )
+        Raises:
+            HTTPException: If transcription fails
+        """
+        return await self._transcribe_source(
+            AudioSource.from_bytes(audio_data, filename, max_size=self.MAX_FILE_SIZE),
+            language,
+            start_time=start_time,
+            use_cache=use_cache
+        )
+    
+    async def _transcribe_source(
+        self,
+        source: AudioSource,
+        language: Optional[str] = None,
+        start_time: Optional[float] = None,
+        use_cache: bool = True,
+        duration_seconds: Optional[float] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> TranscriptionResult:
+        """
+        Transcribe audio, consulting the transcription cache first.
+        
+        Only transcriptions from the primary model (Voxtral) are cached,
+        since the cache is keyed by that model.
+        
+        Args:
+            source: Audio to upload
+            language: Optional language hint
+            start_time: time.time() the request started, for processing time
+            use_cache: Whether to read and populate the transcription cache
+            duration_seconds: Audio duration from its headers, if known
+            deadline_seconds: Time budget overriding the router's deadline
             
-            processing_time = int((time.time() - start_time) * 1000)
+        Returns:
+            TranscriptionResult with transcribed text and metadata
             
-            # Calculate confidence score (Voxtral doesn't provide this directly)
-            # We estimate based on response characteristics
-            confidence = self._estimate_confidence(result_data, transcribed_text)
+        Raises:
+            HTTPException: If transcription fails (413 if the audio turns
+                out to exceed MAX_FILE_SIZE while streaming)
+        """
+        if not settings.voxtral_api_key:
+            raise HTTPException(
+                status_code=503,
+                detail="Voice transcription service not available - API key not configured"
+            )
+        
+        import time
+        start_time = start_time or time.time()
+        
+        try:
+            if use_cache and self.cache is not None and self.cache.enabled:
+                key = await self.cache.key_for_source(source, language, self.VOXTRAL_MODEL)
+                transcription, cached = await self.cache.get_or_compute(
+                    key,
+                    lambda: self._request_transcription(source, language, duration_seconds, deadline_seconds),
+                    cacheable=lambda entry: entry["provider"] == VoxtralProvider.name
+                )
+            else:
+                transcription, cached = await self._request_transcription(
+                    source, language, duration_seconds, deadline_seconds
+                ), False
             
-            logger.info(f"Transcription successful: '{transcribed_text[:50]}...' (confidence: {confidence:.2f})")
+            if cached:
+                logger.info("Transcription served from cache")
             
             return TranscriptionResult(
-                text=transcribed_text,
-                confidence=confidence,
-                language_detected=result_data.get("language"),
-                processing_time_ms=processing_time,
-                audio_duration_ms=int(result_data.get("duration", 0) * 1000)
+                **transcription,
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                cached=cached
             )
             
         except HTTPException:
             raise
+        except AudioTooLargeError:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Audio file too large. Maximum size: {self.MAX_FILE_SIZE // (1024*1024)}MB"
+            )
+        except STTProviderError as e:
+            logger.error(f"Transcription failed: {e}")
+            raise HTTPException(status_code=e.status_code, detail=str(e))
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Transcription processing failed: {str(e)}"
             )
-        finally:
-            # Reset file position for potential reuse
-            if hasattr(file, 'seek'):
-                try:
-                    await file.seek(0)
-                except:
-                    pass
     
-    def _estimate_confidence(self, api_response: Dict[str, Any], text: str) -> float:
+    async def _request_transcription(
+        self,
+        source: AudioSource,
+        language: Optional[str] = None,
+        duration_seconds: Optional[float] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
-        Estimate confidence score for transcription result.
-        
-        Since Voxtral doesn't provide confidence scores directly,
-        we estimate based on various factors.
+        Transcribe audio through the STT providers.
         
         Args:
-            api_response: Raw API response data
-            text: Transcribed text
+            source: Audio to upload
+            language: Optional language hint
+            duration_seconds: Audio duration from its headers, if known
+            deadline_seconds: Time budget overriding the router's deadline
             
         Returns:
-            Estimated confidence score (0.0 to 1.0)
+            Dictionary of TranscriptionResult fields that depend only on
+            the audio (cacheable)
+            
+        Raises:
+            STTProviderError: If no provider could transcribe the audio
+            AudioTooLargeError: If the audio exceeds MAX_FILE_SIZE
         """
-        confidence = 0.8  # Base confidence for Voxtral
-        
-        # Adjust based on text characteristics
-        if len(text) < 5:
-            confidence -= 0.2  # Very short text is less reliable
-        elif len(text.split()) < 3:
-            confidence -= 0.1  # Short phrases are somewhat less reliable
-        
-        # Boost confidence for food-related terms
-        food_terms = {
-            "add", "remove", "delete", "update", "milk", "bread", "chicken", 
-            "vegetables", "cup", "cups", "tablespoon", "teaspoon", "pound", 
-            "ounce", "gram", "liter", "buy", "grocery", "shopping", "recipe",
-            "cook", "cooking", "bake", "baking", "fridge", "pantry", "freezer"
-        }
-        
-        text_lower = text.lower()
-        food_term_count = sum(1 for term in food_terms if term in text_lower)
-        if food_term_count > 0:
-            confidence += min(0.1, food_term_count * 0.02)  # Boost up to 0.1
+        # Downmix, resample and trim silence (runs off the event loop)
+        if self.preprocessor is not None:
+            source = await self.preprocessor.process(source)
         
-        # Ensure confidence stays within bounds
-        return max(0.1, min(1.0, confidence))
+        # Retries, hedging and fallback are handled by the router
+        transcription, provider = await self.router.transcribe(
+            source, language, duration_seconds, deadline_seconds
+        )
+        return {**transcription, "provider": provider}
     
     async def transcribe_streaming_audio(
         self, 
@@ -306,10 +416,10 @@ class VoiceService:
         language: Optional[str] = None
     ) -> TranscriptionResult:
         """
-        Transcribe streaming audio data.
+        Transcribe a complete audio stream.
         
-        Note: This is a placeholder for future streaming implementation.
-        Currently processes the entire stream as a single file.
+        For incremental transcription while audio is still being recorded,
+        use the streaming STT backends in streaming_stt instead.
         
         Args:
             audio_stream: Binary audio stream
@@ -318,27 +428,7 @@ class VoiceService:
         Returns:
             TranscriptionResult with transcribed text
         """
-        # Read all data from stream
-        audio_data = audio_stream.read()
-        
-        # Create a temporary UploadFile-like object
-        class StreamUpload:
-            def __init__(self, data: bytes):
-                self.data = data
-                self.filename = "stream.wav"
-                self.content_type = "audio/wav"
-                self.size = len(data)
-                
-            async def read(self) -> bytes:
-                return self.data
-                
-            async def seek(self, position: int):
-                pass
-        
-        return await self.transcribe_audio(
-            StreamUpload(audio_data),
-            language=language
-        )
+        return await self.transcribe_bytes(audio_stream.read(), "stream.wav", language)
     
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -387,3 +477,39 @@ class VoiceService:
             status["message"] = f"API connectivity failed: {str(e)}"
         
         return status
+
+
+_voice_service: Optional[VoiceService] = None
+
+
+async def get_voice_service() -> VoiceService:
+    """
+    Get the process-wide voice service.
+    
+    The service shares the pooled Voxtral client, so connections are kept
+    alive across requests, the process-wide transcription cache, so
+    retried uploads skip the API, the audio preprocessor and the STT
+    router with its fallback provider. Used as a FastAPI dependency;
+    async so it is resolved on the event loop.
+    """
+    global _voice_service
+    if _voice_service is None:
+        client = http_clients.get("voxtral")
+        _voice_service = VoiceService(
+            client=client,
+            cache=transcription_cache,
+            preprocessor=audio_preprocessor,
+            router=build_stt_router(client, http_clients.get("whisper"))
+        )
+    return _voice_service
+
+
+async def close_voice_service() -> None:
+    """
+    Drop the process-wide voice service.
+    
+    Called before the pooled HTTP clients are closed, so a service created
+    afterwards picks up fresh clients instead of holding closed ones.
+    """
+    global _voice_service
+    _voice_service = None
@@ -2,6 +2,7 @@
 Bruno AI Server - Main FastAPI application
 """
 
+import asyncio
 import json
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -15,11 +16,21 @@ from bruno_ai_server.middleware.security_middleware import SecurityHeadersMiddle
 
 from bruno_ai_server.config import settings
 from bruno_ai_server.database import get_async_session
-from bruno_ai_server.routes import auth_router, pantry_router, voice_router, categories_router
+from bruno_ai_server.routes import auth_router, pantry_router, voice_router, categories_router, notifications_router
 from bruno_ai_server.routes.auth import compat_router
 from bruno_ai_server.routes.expiration import router as expiration_router
 from bruno_ai_server.schemas import RefreshTokenRequest, UserCreate, UserLogin
+from bruno_ai_server.services.batch_parser import batch_command_parser
+from bruno_ai_server.services.command_parser import shared_command_parser
+from bruno_ai_server.services.email_service import email_service
+from bruno_ai_server.services.http_clients import http_clients
+from bruno_ai_server.services.notification_hub import notification_hub
 from bruno_ai_server.services.scheduler_service import scheduler_service
+from bruno_ai_server.services.streaming_stt import close_streaming_stt_backend
+from bruno_ai_server.services.transcription_jobs import transcription_jobs
+from bruno_ai_server.services.tts_phrases import close_tts_phrases, get_tts_phrases
+from bruno_ai_server.services.tts_service import close_tts_service, get_tts_service
+from bruno_ai_server.services.voice_service import close_voice_service, get_voice_service
 
 
 @asynccontextmanager
@@ -28,6 +39,21 @@ async def lifespan(app: FastAPI):
     # Startup
     scheduler_service.start()
     print("Background scheduler started")
+
+    await notification_hub.start()
+    print(f"Notification hub started ({notification_hub.backend.name} fan-out)")
+
+    warm_up_ms = shared_command_parser().warm_up()
+    print(f"Command parser warmed up in {warm_up_ms:.1f}ms")
+
+    # Create STT/TTS services once so every request shares their connection pools
+    await get_voice_service()
+    tts_service = await get_tts_service()
+
+    # Synthesize fixed phrase segments in the background so startup is not delayed
+    phrase_prewarm = None
+    if settings.tts_phrase_prewarm and tts_service.preferred_provider:
+        phrase_prewarm = asyncio.create_task((await get_tts_phrases()).prewarm())
     
     # Export OpenAPI spec to file on startup for build process
     try:
@@ -52,6 +78,28 @@ async def lifespan(app: FastAPI):
     scheduler_service.stop()
     print("Background scheduler stopped")
 
+    if phrase_prewarm is not None and not phrase_prewarm.done():
+        phrase_prewarm.cancel()
+
+    await transcription_jobs.close()
+    print("Transcription job workers stopped")
+
+    await notification_hub.stop()
+    print("Notification hub stopped")
+
+    await email_service.close()
+
+    batch_command_parser.shutdown()
+
+    await close_streaming_stt_backend()
+
+    # Services hold the pooled clients; drop them before the clients close
+    await close_tts_phrases()
+    await close_tts_service()
+    await close_voice_service()
+    await http_clients.aclose()
+    print("Upstream HTTP clients closed")
+
 
 # Create FastAPI app instance
 app = FastAPI(
@@ -119,6 +167,7 @@ app.include_router(pantry_router, prefix="/api")
 app.include_router(categories_router, prefix="/api")
 app.include_router(voice_router, prefix="/api")
 app.include_router(expiration_router, prefix="/api")
+app.include_router(notifications_router, prefix="/api")
 
 # Include backwards compatibility router for legacy /auth endpoints
 app.include_router(compat_router, prefix="/api")
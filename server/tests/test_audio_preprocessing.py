@@ -0,0 +1,144 @@
+"""
+Unit tests for audio preprocessing before speech-to-text.
+"""
+
+import asyncio
+import io
+import threading
+import time
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bruno_ai_server.services.audio_preprocessing import (
+    AudioPreprocessor,
+    resample,
+    trim_silence,
+)
+from bruno_ai_server.services.audio_upload import AudioSource
+
+
+def make_wav(samples, sample_rate: int, channels: int = 1) -> bytes:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def tone(seconds: float, sample_rate: int, frequency: float = 440.0, level: float = 0.5):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return level * np.sin(2 * np.pi * frequency * t)
+
+
+def read_wav(data: bytes):
+    with wave.open(io.BytesIO(data)) as wav:
+        return wav.getnchannels(), wav.getframerate(), wav.getnframes()
+
+
+class TestDSP:
+    """Test the resampling and VAD building blocks."""
+
+    def test_resample_preserves_tone(self):
+        """Test a tone below the new Nyquist survives downsampling."""
+        resampled = resample(tone(1.0, 48000, 1000).astype(np.float32), 48000, 16000)
+
+        spectrum = np.abs(np.fft.rfft(resampled))
+        assert len(resampled) == 16000
+        assert np.argmax(spectrum) == 1000  # 1 Hz bins over one second
+
+    def test_resample_filters_aliasing(self):
+        """Test content above the new Nyquist is attenuated, not folded down."""
+        resampled = resample(tone(1.0, 48000, 12000).astype(np.float32), 48000, 16000)
+
+        assert np.sqrt(np.mean(resampled ** 2)) < 0.02
+
+    def test_trim_silence_keeps_speech(self):
+        """Test leading and trailing silence is removed around the voiced part."""
+        silence = np.zeros(16000, dtype=np.float32)
+        audio = np.concatenate([silence, tone(1.0, 16000).astype(np.float32), silence])
+
+        trimmed, trimmed_ms = trim_silence(audio, 16000, -50.0)
+
+        assert 1000 <= len(trimmed) * 1000 // 16000 <= 1500
+        assert trimmed_ms >= 1500
+
+    def test_trim_silence_keeps_all_silent_clip(self):
+        """Test a clip with no speech is returned unchanged."""
+        audio = np.zeros(16000, dtype=np.float32)
+
+        trimmed, trimmed_ms = trim_silence(audio, 16000, -50.0)
+
+        assert len(trimmed) == len(audio) and trimmed_ms == 0
+
+
+class TestAudioPreprocessor:
+    """Test end-to-end preprocessing of uploads."""
+
+    @pytest.mark.asyncio
+    async def test_phone_recording_normalized(self):
+        """Test 48 kHz stereo with silence becomes a smaller 16 kHz mono clip."""
+        mono = np.concatenate([np.zeros(48000), tone(2.0, 48000), np.zeros(48000)])
+        stereo = np.repeat(mono, 2)
+        original = make_wav(stereo, 48000, channels=2)
+        preprocessor = AudioPreprocessor(enabled=True)
+
+        source = await preprocessor.process(AudioSource.from_bytes(original, "clip.wav"))
+
+        channels, sample_rate, frames = read_wav(source.data)
+        assert (channels, sample_rate) == (1, 16000)
+        assert frames < 2.5 * 16000
+        assert len(source.data) < len(original) / 6
+        assert preprocessor.metrics()["files_processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_passes_through_other_formats(self):
+        """Test compressed formats and undecodable WAVs are sent unchanged."""
+        preprocessor = AudioPreprocessor(enabled=True)
+        mp3 = AudioSource.from_bytes(b"ID3 fake mp3", "clip.mp3")
+        broken = AudioSource.from_bytes(b"RIFF broken", "clip.wav")
+
+        assert await preprocessor.process(mp3) is mp3
+        assert await preprocessor.process(broken) is broken
+        assert preprocessor.metrics()["files_skipped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test a disabled preprocessor leaves audio alone."""
+        source = AudioSource.from_bytes(make_wav(tone(0.5, 48000), 48000), "clip.wav")
+
+        assert await AudioPreprocessor(enabled=False).process(source) is source
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self):
+        """Test a burst of uploads is preprocessed a few files at a time."""
+        preprocessor = AudioPreprocessor(enabled=True, max_concurrency=2)
+        process_wav = preprocessor.process_wav
+        lock = threading.Lock()
+        running = peak = 0
+
+        def slow_process_wav(data):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return process_wav(data)
+
+        preprocessor.process_wav = slow_process_wav
+        wav = make_wav(tone(0.1, 16000), 16000)
+
+        await asyncio.gather(*(
+            preprocessor.process(AudioSource.from_bytes(wav, "clip.wav")) for _ in range(6)
+        ))
+
+        assert peak == 2
+        assert preprocessor.metrics()["files_processed"] == 6
+        assert preprocessor.metrics()["in_progress"] == 0
@@ -0,0 +1,226 @@
+"""
+Unit tests for audio container header probing.
+"""
+
+import io
+import struct
+import wave
+from tempfile import SpooledTemporaryFile
+
+import httpx
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from bruno_ai_server.services import voice_service as voice_module
+from bruno_ai_server.services.audio_probe import AudioProbeError, probe_audio
+from bruno_ai_server.services.voice_service import VoiceService
+
+
+def make_upload(data: bytes, filename: str) -> UploadFile:
+    spooled = SpooledTemporaryFile()
+    spooled.write(data)
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename=filename, size=len(data))
+
+
+def wav_file(seconds: float, sample_rate: int = 8000, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * channels * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+def flac_file(seconds: int, sample_rate: int = 44100, channels: int = 2) -> bytes:
+    packed = sample_rate << 44 | (channels - 1) << 41 | 15 << 36 | seconds * sample_rate
+    streaminfo = struct.pack(">HH3s3s", 4096, 4096, b"\x00" * 3, b"\x00" * 3) + packed.to_bytes(8, "big") + b"\x00" * 16
+    return b"fLaC" + bytes([0x80, 0, 0, 34]) + streaminfo + b"\x00" * 100
+
+
+def ogg_page(granule: int, packet: bytes, header_type: int = 0) -> bytes:
+    return (
+        b"OggS" + bytes([0, header_type]) + struct.pack("<qIII", granule, 1, 0, 0)
+        + bytes([1, len(packet)]) + packet
+    )
+
+
+def opus_file(seconds: int, pre_skip: int = 312) -> bytes:
+    head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HIhB", pre_skip, 16000, 0, 0)
+    return ogg_page(0, head, header_type=2) + b"\x00" * 500 + ogg_page(seconds * 48000 + pre_skip, b"\x00" * 50, 4)
+
+
+MP3_FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])  # MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo
+MP3_FRAME_LENGTH = 417
+
+
+def mp3_file(frames: int, xing_frames: int = 0) -> bytes:
+    id3 = b"ID3" + bytes([4, 0, 0, 0, 0, 0, 20]) + b"\x00" * 20
+    first = bytearray(MP3_FRAME_HEADER + b"\x00" * (MP3_FRAME_LENGTH - 4))
+    if xing_frames:
+        first[36:48] = b"Xing" + struct.pack(">II", 1, xing_frames)
+    body = bytes(first) + (MP3_FRAME_HEADER + b"\x00" * (MP3_FRAME_LENGTH - 4)) * (frames - 1)
+    return id3 + body
+
+
+def mp4_box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def m4a_file(seconds: int, moov_at_end: bool = True) -> bytes:
+    ftyp = mp4_box(b"ftyp", b"M4A \x00\x00\x00\x00M4A isom")
+    mvhd = mp4_box(b"mvhd", struct.pack(">IIIII", 0, 0, 0, 1000, seconds * 1000) + b"\x00" * 80)
+    moov = mp4_box(b"moov", mp4_box(b"trak", b"\x00" * 40) + mvhd)
+    mdat = mp4_box(b"mdat", b"\x00" * 20000)
+    return ftyp + (mdat + moov if moov_at_end else moov + mdat)
+
+
+class Reader:
+    """read_at over bytes that records how much was read."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.bytes_read = 0
+
+    async def __call__(self, offset: int, length: int) -> bytes:
+        chunk = self.data[offset:offset + length]
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+async def probe(data: bytes):
+    return await probe_audio(Reader(data), len(data))
+
+
+class TestProbeAudio:
+    """Test format detection and header parsing."""
+
+    @pytest.mark.asyncio
+    async def test_wav(self):
+        """Test WAV duration comes from the data chunk size."""
+        info = await probe(wav_file(2.5, sample_rate=8000, channels=2))
+
+        assert (info.format, info.codec, info.sample_rate, info.channels) == ("wav", "pcm", 8000, 2)
+        assert info.duration_seconds == pytest.approx(2.5)
+
+    @pytest.mark.asyncio
+    async def test_wav_reads_only_headers(self):
+        """Test a long WAV is probed without reading its samples."""
+        data = wav_file(300, sample_rate=16000)
+        reader = Reader(data)
+
+        info = await probe_audio(reader, len(data))
+
+        assert info.duration_seconds == pytest.approx(300)
+        assert reader.bytes_read < 64 * 1024
+
+    @pytest.mark.asyncio
+    async def test_flac(self):
+        """Test FLAC properties come from STREAMINFO."""
+        info = await probe(flac_file(7))
+
+        assert (info.format, info.sample_rate, info.channels) == ("flac", 44100, 2)
+        assert info.duration_seconds == pytest.approx(7)
+
+    @pytest.mark.asyncio
+    async def test_ogg_opus(self):
+        """Test Opus duration comes from the last page's granule position."""
+        info = await probe(opus_file(12))
+
+        assert (info.format, info.codec, info.sample_rate) == ("ogg", "opus", 16000)
+        assert info.duration_seconds == pytest.approx(12)
+
+    @pytest.mark.asyncio
+    async def test_mp3_cbr(self):
+        """Test CBR MP3 duration is estimated from size and bitrate."""
+        info = await probe(mp3_file(100))
+
+        assert (info.format, info.codec, info.sample_rate, info.channels) == ("mp3", "mp3", 44100, 2)
+        assert info.duration_seconds == pytest.approx(100 * MP3_FRAME_LENGTH * 8 / 128000)
+
+    @pytest.mark.asyncio
+    async def test_mp3_vbr_xing(self):
+        """Test a Xing header's frame count gives the duration."""
+        info = await probe(mp3_file(10, xing_frames=20000))
+
+        assert info.duration_seconds == pytest.approx(20000 * 1152 / 44100)
+
+    @pytest.mark.asyncio
+    async def test_m4a_moov_at_end(self):
+        """Test M4A duration is read from mvhd even after the media data."""
+        info = await probe(m4a_file(42))
+
+        assert info.format == "m4a"
+        assert info.duration_seconds == pytest.approx(42)
+
+    @pytest.mark.asyncio
+    async def test_webm_and_unknown(self):
+        """Test WebM is recognized without a duration and junk is not audio."""
+        webm = await probe(b"\x1a\x45\xdf\xa3" + b"\x00" * 100)
+
+        assert webm.format == "webm" and webm.duration_seconds is None
+        assert await probe(b"just some text, not audio" * 100) is None
+
+    @pytest.mark.asyncio
+    async def test_corrupt_header(self):
+        """Test a recognized container with a broken header raises."""
+        with pytest.raises(AudioProbeError):
+            await probe(b"RIFF\x00\x00\x00\x00WAVEdata\x10\x00\x00\x00")
+
+
+class TestUploadValidation:
+    """Test VoiceService rejects uploads from their headers."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setattr(voice_module.settings, "voxtral_api_key", "test-key", raising=False)
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"text": "add milk"})
+
+        service = VoiceService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        service.calls = calls
+        return service
+
+    @pytest.mark.asyncio
+    async def test_rejects_over_length(self, service):
+        """Test audio longer than MAX_DURATION_SECONDS is refused before upload."""
+        with pytest.raises(HTTPException) as exc_info:
+            await service.transcribe_audio(make_upload(m4a_file(600), filename="long.m4a"))
+
+        assert exc_info.value.status_code == 413
+        assert service.calls == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_mislabeled(self, service):
+        """Test content that does not match the extension is refused."""
+        with pytest.raises(HTTPException) as exc_info:
+            await service.transcribe_audio(make_upload(mp3_file(20), filename="clip.wav"))
+
+        assert exc_info.value.status_code == 400
+        assert "MP3" in exc_info.value.detail
+        assert service.calls == []
+
+    @pytest.mark.asyncio
+    async def test_accepts_valid_audio(self, service):
+        """Test well-formed audio within limits is transcribed."""
+        result = await service.transcribe_audio(make_upload(opus_file(5), filename="clip.ogg"))
+
+        assert result.text == "add milk"
+        assert len(service.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_probed_upload_not_probed_again(self, service, monkeypatch):
+        """Test AudioInfo from probe_upload is reused by transcribe_audio."""
+        upload = make_upload(opus_file(5), filename="clip.ogg")
+        info = await service.probe_upload(upload)
+        probes = []
+        monkeypatch.setattr(voice_module, "probe_audio", lambda *args: probes.append(args))
+
+        result = await service.transcribe_audio(upload, audio_info=info)
+
+        assert result.text == "add milk"
+        assert probes == []
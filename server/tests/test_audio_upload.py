@@ -0,0 +1,169 @@
+"""
+Unit tests for streaming audio uploads to the STT provider.
+"""
+
+import email.parser
+import email.policy
+import io
+import wave
+from tempfile import SpooledTemporaryFile
+
+import httpx
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from bruno_ai_server.services import voice_service as voice_module
+from bruno_ai_server.services.audio_upload import (
+    UPLOAD_CHUNK_SIZE,
+    AudioSource,
+    AudioTooLargeError,
+    MultipartAudioStream,
+    audio_content_type,
+)
+from bruno_ai_server.services.voice_service import VoiceService
+
+
+def make_upload(data: bytes, filename: str = "clip.wav", declare_size: bool = True) -> UploadFile:
+    spooled = SpooledTemporaryFile(max_size=1024)
+    spooled.write(data)
+    spooled.seek(0)
+    return UploadFile(
+        file=spooled,
+        filename=filename,
+        size=len(data) if declare_size else None,
+        headers=Headers({"content-type": "audio/wav"}),
+    )
+
+
+def wav_bytes(frame_count: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\x00\x01" * frame_count)
+    return buffer.getvalue()
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict:
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+        for part in message.iter_parts()
+    }
+
+
+class TrackingUpload(UploadFile):
+    """UploadFile that records the size of every read."""
+
+    reads: list
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return await super().read(size)
+
+
+class TestMultipartAudioStream:
+    """Test the streamed multipart encoding."""
+
+    @pytest.mark.asyncio
+    async def test_body_parses_as_multipart(self):
+        """Test fields and file round-trip and Content-Length matches the body."""
+        audio = bytes(range(256)) * 1000
+        stream = MultipartAudioStream({"model": "voxtral", "language": "en"}, AudioSource.from_bytes(audio))
+
+        body = b"".join([chunk async for chunk in stream])
+        parts = parse_multipart(stream.headers["Content-Type"], body)
+
+        assert int(stream.headers["Content-Length"]) == len(body)
+        assert parts["model"] == b"voxtral"
+        assert parts["language"] == b"en"
+        assert parts["file"] == audio
+
+    def test_content_type_from_extension(self):
+        """Test the file part is labelled by extension rather than always WAV."""
+        assert audio_content_type("clip.MP3") == "audio/mpeg"
+        assert audio_content_type("clip.m4a") == "audio/mp4"
+        assert audio_content_type("clip.wav") == "audio/wav"
+        assert audio_content_type("clip") == "application/octet-stream"
+
+    @pytest.mark.asyncio
+    async def test_unknown_size_uses_chunked(self):
+        """Test no Content-Length is promised when the upload size is unknown."""
+        stream = MultipartAudioStream({}, AudioSource.from_upload(make_upload(b"abc", declare_size=False)))
+
+        assert "Content-Length" not in stream.headers
+
+    @pytest.mark.asyncio
+    async def test_reads_upload_in_chunks_from_start(self):
+        """Test the upload is read in bounded chunks from offset 0."""
+        upload = TrackingUpload(file=SpooledTemporaryFile(), filename="clip.wav")
+        upload.reads = []
+        upload.file.write(b"x" * (UPLOAD_CHUNK_SIZE * 3 + 10))
+        # Leave the position at the end, as a previous reader would
+
+        chunks = [chunk async for chunk in AudioSource.from_upload(upload).iter_chunks()]
+
+        assert b"".join(chunks) == b"x" * (UPLOAD_CHUNK_SIZE * 3 + 10)
+        assert all(size == UPLOAD_CHUNK_SIZE for size in upload.reads)
+
+    @pytest.mark.asyncio
+    async def test_limit_enforced_mid_stream(self):
+        """Test an undeclared oversize upload stops after the limit."""
+        upload = make_upload(b"x" * (UPLOAD_CHUNK_SIZE * 4), declare_size=False)
+        source = AudioSource.from_upload(upload, max_size=UPLOAD_CHUNK_SIZE * 2)
+        received = 0
+
+        with pytest.raises(AudioTooLargeError):
+            async for chunk in source.iter_chunks():
+                received += len(chunk)
+
+        assert received == UPLOAD_CHUNK_SIZE * 2
+
+
+class TestVoiceServiceUpload:
+    """Test VoiceService sends streamed uploads to Voxtral."""
+
+    @pytest.fixture(autouse=True)
+    def api_key(self, monkeypatch):
+        monkeypatch.setattr(voice_module.settings, "voxtral_api_key", "test-key", raising=False)
+
+    @pytest.mark.asyncio
+    async def test_upload_streamed_to_provider(self):
+        """Test the provider receives the file and form fields."""
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            body = await request.aread()
+            received["headers"] = request.headers
+            received["parts"] = parse_multipart(request.headers["content-type"], body)
+            return httpx.Response(200, json={"text": "add two cups of milk", "language": "en"})
+
+        audio = wav_bytes(100_000)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = VoiceService(client=client)
+            result = await service.transcribe_audio(make_upload(audio), language="en")
+
+        assert result.text == "add two cups of milk"
+        assert received["parts"]["file"] == audio
+        assert received["parts"]["language"] == b"en"
+        assert received["headers"]["authorization"] == "Bearer test-key"
+
+    @pytest.mark.asyncio
+    async def test_oversize_upload_returns_413(self, monkeypatch):
+        """Test exceeding the limit while streaming surfaces as 413."""
+        monkeypatch.setattr(VoiceService, "MAX_FILE_SIZE", UPLOAD_CHUNK_SIZE)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await request.aread()
+            return httpx.Response(200, json={"text": "unreachable"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = VoiceService(client=client)
+            with pytest.raises(HTTPException) as exc_info:
+                await service.transcribe_audio(make_upload(wav_bytes(UPLOAD_CHUNK_SIZE * 2), declare_size=False))
+
+        assert exc_info.value.status_code == 413
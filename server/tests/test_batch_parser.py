@@ -0,0 +1,58 @@
+"""
+Unit tests for batch command parsing.
+"""
+
+import pytest
+
+from bruno_ai_server.services.batch_parser import BatchCommandParser, parse_chunk
+from bruno_ai_server.services.command_parser import shared_command_parser
+
+TRANSCRIPTS = [
+    "Add 2 pounds of chicken to the fridge",
+    "Remove expired yogurt",
+    "What's in my pantry?",
+    "Do I have any rice",
+    "thanks",
+] * 7
+
+
+def expected_results():
+    parser = shared_command_parser()
+    return [parser.parse_command(text).to_dict() for text in TRANSCRIPTS]
+
+
+class TestBatchCommandParser:
+    """Test ordered batch parsing."""
+
+    def test_in_process_results_in_order(self):
+        """Test parsing without a pool matches one-by-one parsing."""
+        batch_parser = BatchCommandParser(max_workers=0, chunk_size=4)
+
+        assert list(batch_parser.iter_parse(TRANSCRIPTS)) == expected_results()
+
+    def test_process_pool_results_in_order(self):
+        """Test chunks parsed by worker processes come back in input order."""
+        batch_parser = BatchCommandParser(max_workers=2, chunk_size=3, max_chunks_in_flight=2)
+        try:
+            results = list(batch_parser.iter_parse(iter(TRANSCRIPTS)))
+        finally:
+            batch_parser.shutdown()
+
+        assert results == expected_results()
+
+    @pytest.mark.asyncio
+    async def test_parse_stream(self):
+        """Test the async stream yields every result in order."""
+        batch_parser = BatchCommandParser(max_workers=0, chunk_size=4, max_chunks_in_flight=2)
+
+        results = [result async for result in batch_parser.parse_stream(TRANSCRIPTS)]
+
+        assert results == expected_results()
+
+    def test_failed_transcript_reported_inline(self):
+        """Test one bad transcript does not fail its chunk."""
+        results = parse_chunk(["add milk", 42])
+
+        assert results[0]["action"] == "add"
+        assert results[1]["raw_text"] == 42
+        assert "error" in results[1]
@@ -0,0 +1,126 @@
+"""
+Unit tests for voice command parsing.
+"""
+
+import re
+
+import pytest
+
+from bruno_ai_server.services.command_parser import (
+    ACTION_PATTERNS,
+    CommandParser,
+    IntentMatcher,
+    PantryAction,
+    get_command_parser,
+    shared_command_parser,
+)
+
+COMMANDS = [
+    "add 2 pounds of chicken to the fridge",
+    "i bought milk and bread",
+    "remove expired yogurt",
+    "what's in my pantry?",
+    "update milk quantity to 1 gallon",
+    "put the bananas in the pantry",
+    "i have 3 cans of tomatoes left",
+    "check when does the milk expire",
+    "do i have any parmesan",
+    "increase apples to 6",
+    "decrease flour from 2 kg",
+    "cooking with spinach",
+    "there are 4 bottles of water remaining",
+    "what's the expiration date of the salmon",
+    "thanks bruno",
+    "first line\nadd eggs",
+]
+
+
+def legacy_detect_action(text):
+    """Reference implementation: search every pattern, keep the first best."""
+    best = (None, 0.0, [])
+    for action, patterns in ACTION_PATTERNS.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                confidence = 0.9 + (0.05 if len(pattern) > 50 else 0)
+                if confidence > best[1]:
+                    best = (action, confidence, [g for g in match.groups() if g])
+    return best
+
+
+@pytest.fixture
+def parser():
+    return CommandParser()
+
+
+class TestIntentMatcher:
+    """Test the combined intent matcher."""
+
+    @pytest.mark.parametrize("text", COMMANDS)
+    def test_matches_linear_scan(self, parser, text):
+        """Test the single-pass matcher picks the same grammar as a full scan."""
+        assert parser._detect_action(text) == legacy_detect_action(text)
+
+    def test_specific_patterns_take_priority(self):
+        """Test long patterns win over earlier short ones."""
+        matcher = IntentMatcher({
+            PantryAction.USE: [r'use\s+(.+)'],
+            PantryAction.DELETE: [r'(?:please\s+)?(?:use\s+up|finish(?:ed)?|throw\s+out)\s+(?:the\s+)?(.+)'],
+        })
+
+        action, confidence, groups = matcher.match("use up the milk")
+
+        assert action == PantryAction.DELETE
+        assert confidence == pytest.approx(0.95)
+        assert groups == ["milk"]
+
+    def test_no_match(self, parser):
+        """Test text matching no grammar returns no action."""
+        assert parser._detect_action("thanks") == (None, 0.0, [])
+
+
+class TestEntityExtraction:
+    """Test entity extraction with precompiled patterns."""
+
+    def test_quantity_removed_by_span(self, parser):
+        """Test removing the quantity leaves other numbers intact."""
+        entity = parser._parse_single_entity("2 apples expires 12/20/2025")
+
+        assert entity.quantity == 2
+        assert entity.expiration_date is not None
+        assert entity.expiration_date.year == 2025
+        assert entity.name == "apples"
+
+    def test_quantity_unit_and_location(self, parser):
+        """Test quantity, unit and location are extracted together."""
+        entities = parser._extract_entities("2 pounds of chicken in the freezer, 1 gal milk", PantryAction.ADD)
+
+        assert [(e.name, e.quantity, e.unit, e.location) for e in entities] == [
+            ("chicken", 2.0, "pound", "freezer"),
+            ("milk", 1.0, "gallon", None),
+        ]
+
+
+class TestSharedParser:
+    """Test the shared parser instance."""
+
+    def test_singleton(self):
+        """Test every caller gets the same parser."""
+        assert shared_command_parser() is shared_command_parser()
+
+    @pytest.mark.asyncio
+    async def test_dependency_returns_shared_parser(self):
+        """Test the async FastAPI dependency hands out the shared parser."""
+        assert await get_command_parser() is shared_command_parser()
+
+    def test_vocabulary_is_immutable(self, parser):
+        """Test shared vocabularies cannot be modified by a request."""
+        with pytest.raises(TypeError):
+            parser.unit_lookup["stick"] = "piece"
+        with pytest.raises(AttributeError):
+            parser.all_foods.add("tofu")
+        assert parser.unit_lookup is shared_command_parser().unit_lookup
+
+    def test_warm_up(self):
+        """Test warm-up parses the sample commands and reports its duration."""
+        assert shared_command_parser().warm_up() >= 0
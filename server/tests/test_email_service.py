@@ -0,0 +1,253 @@
+"""
+Unit tests for the email notification channel.
+"""
+
+import socket
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bruno_ai_server.services.email_service import (
+    EmailService,
+    ExpirationDigestTemplates,
+    SMTPConnectionPool,
+)
+from bruno_ai_server.services.notification_service import (
+    NotificationService,
+    NotificationTarget,
+)
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+NOTIFICATION_DATA = {
+    "expiring_count": 1,
+    "expired_count": 1,
+    "expiring_items": [
+        {"name": "Milk", "expiration_date": "2025-01-03", "days_left": 2},
+    ],
+    "expired_items": [
+        {"name": "Bread <sliced>", "expiration_date": "2024-12-30", "days_expired": 3},
+    ],
+}
+
+
+class CollectingHandler:
+    """SMTP handler that records messages and can reject the first attempts."""
+
+    def __init__(self, transient_failures: int = 0):
+        self.messages = []
+        self.transient_failures = transient_failures
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.transient_failures:
+            self.transient_failures -= 1
+            return "451 Try again later"
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """Run a local SMTP server for the duration of a test."""
+    servers = []
+
+    def start(handler):
+        controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+        controller.start()
+        servers.append(controller)
+        return controller
+
+    yield start
+    for controller in servers:
+        controller.stop()
+
+
+def make_service(controller, size=4, max_retries=3):
+    pool = SMTPConnectionPool(
+        host=controller.hostname,
+        port=controller.port,
+        use_tls=False,
+        size=size,
+        timeout=5,
+    )
+    return EmailService(pool=pool, max_retries=max_retries, retry_backoff_seconds=0.01)
+
+
+class TestExpirationDigestTemplates:
+    """Test digest rendering."""
+
+    def test_household_parts_rendered_once_per_member(self):
+        """Test every member gets the shared digest with their own greeting."""
+        messages = ExpirationDigestTemplates.render_batch(
+            sender="Bruno AI <noreply@brunoai.app>",
+            notification_data=NOTIFICATION_DATA,
+            recipients=[("a@example.com", "Ann"), ("b@example.com", "Ben")],
+            title="Food expiring soon",
+            message="1 item expiring soon",
+        )
+
+        assert [msg["To"] for msg in messages] == ["a@example.com", "b@example.com"]
+        text = messages[1].get_body(("plain",)).get_content()
+        assert text.startswith("Hi Ben,")
+        assert "- Milk (expires 2025-01-03, 2 day(s) left)" in text
+        assert messages[0]["Subject"] == "Food expiring soon"
+
+    def test_html_escapes_values(self):
+        """Test item names and member names are HTML-escaped."""
+        messages = ExpirationDigestTemplates.render_batch(
+            sender="noreply@brunoai.app",
+            notification_data=NOTIFICATION_DATA,
+            recipients=[("a@example.com", "A & B")],
+            title="Alert",
+            message="Costs $5",
+        )
+
+        html_body = messages[0].get_body(("html",)).get_content()
+        assert "Bread &lt;sliced&gt;" in html_body
+        assert "Hi A &amp; B," in html_body
+        assert "Costs $5" in html_body
+
+
+class TestEmailService:
+    """Test sending over pooled SMTP sessions."""
+
+    @pytest.mark.asyncio
+    async def test_every_household_delivered_over_pooled_sessions(self, smtp_server):
+        """Test a full morning run reuses a bounded number of SMTP sessions."""
+        handler = CollectingHandler()
+        service = make_service(smtp_server(handler), size=4)
+
+        digests = [
+            (
+                NOTIFICATION_DATA,
+                [(f"member{index}-{n}@example.com", f"Member {n}") for n in range(3)],
+                {"title": "Food expiring soon", "message": "Use it up"},
+            )
+            for index in range(50)
+        ]
+        try:
+            report = await service.send_expiration_digests(digests)
+        finally:
+            await service.close()
+
+        assert report.sent == 150
+        assert report.failed == []
+        assert len(handler.messages) == 150
+        assert service.pool.connections_opened <= 4
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_retried(self, smtp_server):
+        """Test 4xx replies are retried on the same session."""
+        handler = CollectingHandler(transient_failures=2)
+        service = make_service(smtp_server(handler), size=1)
+
+        messages = ExpirationDigestTemplates.render_batch(
+            "noreply@brunoai.app", NOTIFICATION_DATA,
+            [("a@example.com", "Ann")], "Alert", "Use it up",
+        )
+        try:
+            report = await service.send_messages(messages)
+        finally:
+            await service.close()
+
+        assert report.sent == 1
+        assert report.retries == 2
+        assert service.pool.connections_opened == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self, smtp_server):
+        """Test a message is reported failed once retries run out."""
+        handler = CollectingHandler(transient_failures=5)
+        service = make_service(smtp_server(handler), size=1, max_retries=1)
+
+        messages = ExpirationDigestTemplates.render_batch(
+            "noreply@brunoai.app", NOTIFICATION_DATA,
+            [("a@example.com", "Ann")], "Alert", "Use it up",
+        )
+        try:
+            report = await service.send_messages(messages)
+        finally:
+            await service.close()
+
+        assert report.sent == 0
+        assert report.failed[0][0] == "a@example.com"
+
+
+class TestEmailNotifications:
+    """Test the notification service uses member email preferences."""
+
+    @pytest.mark.asyncio
+    async def test_only_opted_in_members_emailed(self, smtp_server, monkeypatch):
+        """Test members who disabled email alerts are skipped."""
+        handler = CollectingHandler()
+        service = make_service(smtp_server(handler))
+        monkeypatch.setattr(
+            "bruno_ai_server.services.notification_service.email_service", service
+        )
+        household = Mock(id=uuid.uuid4())
+        household.name = "Home"
+        defaults = NotificationService.DEFAULT_NOTIFICATION_PREFERENCES
+        targets = [
+            NotificationTarget(uuid.uuid4(), household.id, "yes@example.com", "Yes", dict(defaults)),
+            NotificationTarget(
+                uuid.uuid4(), household.id, "no@example.com", "No",
+                {**defaults, "email_notifications": False},
+            ),
+        ]
+
+        try:
+            report = await NotificationService._send_email_notifications(
+                household, NOTIFICATION_DATA, targets
+            )
+        finally:
+            await service.close()
+
+        assert report.sent == 1
+        assert handler.messages[0].rcpt_tos == ["yes@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_digests_batched_across_households(self, smtp_server, monkeypatch):
+        """Test collected digests for many households go out in one send."""
+        handler = CollectingHandler()
+        service = make_service(smtp_server(handler), size=2)
+        monkeypatch.setattr(
+            "bruno_ai_server.services.notification_service.email_service", service
+        )
+        monkeypatch.setattr(NotificationService, "_send_in_app_notifications", AsyncMock())
+        calls = []
+        send = service.send_expiration_digests
+
+        async def counting_send(digests):
+            calls.append(len(digests))
+            return await send(digests)
+
+        service.send_expiration_digests = counting_send
+        defaults = NotificationService.DEFAULT_NOTIFICATION_PREFERENCES
+        email_digests = []
+        for index in range(3):
+            household = Mock(id=uuid.uuid4())
+            household.name = f"Home {index}"
+            targets = [NotificationTarget(
+                uuid.uuid4(), household.id, f"m{index}@example.com", "M", dict(defaults)
+            )]
+            await NotificationService.send_expiration_notifications(
+                household, NOTIFICATION_DATA, targets, email_digests=email_digests
+            )
+
+        assert handler.messages == []
+        try:
+            report = await NotificationService.send_email_digests(email_digests)
+        finally:
+            await service.close()
+
+        assert calls == [3]
+        assert report.sent == 3
+        assert len(handler.messages) == 3
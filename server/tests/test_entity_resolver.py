@@ -0,0 +1,186 @@
+"""
+Unit tests for pantry entity resolution.
+"""
+
+import time
+import uuid
+from itertools import pairwise
+
+import pytest
+import pytest_asyncio
+
+from bruno_ai_server.models.pantry import PantryItem
+from bruno_ai_server.models.user import Household, User
+from bruno_ai_server.services.entity_resolver import (
+    PantryEntityResolver,
+    TrigramIndex,
+    _IndexedItem,
+    entity_resolver,
+    normalize_name,
+    trigrams,
+)
+
+
+def make_index(names):
+    return TrigramIndex([
+        _IndexedItem(
+            item_id=f"id-{index}",
+            name=name,
+            normalized=normalize_name(name),
+            grams=trigrams(normalize_name(name)),
+            quantity=1.0,
+            unit="piece",
+            location=None,
+        )
+        for index, name in enumerate(names)
+    ])
+
+
+@pytest_asyncio.fixture
+async def household(test_session):
+    """Create a household with a few pantry items."""
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", name="Cook")
+    test_session.add(user)
+    await test_session.flush()
+
+    household = Household(name="Home", invite_code=uuid.uuid4().hex[:8], admin_user_id=user.id)
+    test_session.add(household)
+    await test_session.flush()
+
+    for name in ["Chicken Breast", "Whole Milk", "Cheddar Cheese"]:
+        test_session.add(PantryItem(name=name, household_id=household.id, added_by_user_id=user.id))
+    await test_session.commit()
+    return household
+
+
+class TestTrigramIndex:
+    """Test fuzzy name search."""
+
+    def test_resolves_misspelling(self):
+        """Test a misspelled name finds the intended item first."""
+        index = make_index(["Chicken Breast", "Chickpeas", "Whole Milk"])
+
+        matches = index.search("chiken")
+
+        assert matches[0].name == "Chicken Breast"
+        assert all(a.score >= b.score for a, b in pairwise(matches))
+
+    def test_word_containment(self):
+        """Test a single word resolves to the item that contains it."""
+        index = make_index(["Whole Milk", "Oat Milk Creamer", "Cheese"])
+
+        matches = index.search("milk")
+
+        assert {match.name for match in matches[:2]} == {"Whole Milk", "Oat Milk Creamer"}
+        assert matches[0].score >= 0.75
+
+    def test_exact_match_scores_one(self):
+        """Test an exact name ignoring case and punctuation scores 1.0."""
+        index = make_index(["Ben & Jerry's"])
+
+        assert index.search("ben jerry's")[0].score == 1.0
+
+    def test_unrelated_name_has_no_matches(self):
+        """Test nothing is returned below the minimum score."""
+        index = make_index(["Whole Milk"])
+
+        assert index.search("zucchini") == []
+
+    def test_sub_millisecond_resolution(self):
+        """Test resolving against a large pantry stays under a millisecond."""
+        index = make_index([f"item {n} {word}" for n in range(100) for word in
+                            ("milk", "bread", "cheese", "apples", "chicken")])
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index.search("chiken")
+        per_lookup = (time.perf_counter() - start) / 100
+
+        assert per_lookup < 0.001
+
+
+class TestPantryEntityResolver:
+    """Test household indexes and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_index_built_once(self, test_session, household):
+        """Test the index is built lazily and reused."""
+        resolver = PantryEntityResolver()
+
+        first = await resolver.resolve(test_session, household.id, ["chiken"])
+        second = await resolver.resolve(test_session, household.id, ["chedar"])
+
+        assert first[0][0].name == "Chicken Breast"
+        assert second[0][0].name == "Cheddar Cheese"
+        assert resolver.builds == 1
+
+    @pytest.mark.asyncio
+    async def test_pantry_commit_invalidates_index(self, test_session, household):
+        """Test committing a pantry write drops the household's index."""
+        await entity_resolver.get_index(test_session, household.id)
+        builds = entity_resolver.builds
+
+        test_session.add(PantryItem(
+            name="Greek Yogurt", household_id=household.id, added_by_user_id=household.admin_user_id
+        ))
+        await test_session.commit()
+        matches = await entity_resolver.resolve(test_session, household.id, ["yoghurt"])
+
+        assert entity_resolver.builds == builds + 1
+        assert matches[0][0].name == "Greek Yogurt"
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_index(self, test_session, household):
+        """Test a rolled back write does not invalidate the index."""
+        household_id = household.id
+        index = await entity_resolver.get_index(test_session, household_id)
+
+        test_session.add(PantryItem(
+            name="Greek Yogurt", household_id=household_id, added_by_user_id=household.admin_user_id
+        ))
+        await test_session.flush()
+        await test_session.rollback()
+
+        assert entity_resolver._indexes[household_id][1] is index
+
+    @pytest.mark.asyncio
+    async def test_index_expires(self, test_session, household):
+        """Test indexes are rebuilt after the TTL to see other workers' writes."""
+        resolver = PantryEntityResolver(ttl_seconds=60)
+
+        await resolver.get_index(test_session, household.id)
+        await resolver.get_index(test_session, household.id)
+        built_at, index = resolver._indexes[household.id]
+        resolver._indexes[household.id] = (built_at - 60, index)
+        await resolver.get_index(test_session, household.id)
+
+        assert resolver.builds == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self, test_session, household):
+        """Test only the most recently used households keep an index."""
+        resolver = PantryEntityResolver(max_households=2)
+        other_ids = [uuid.uuid4(), uuid.uuid4()]
+
+        await resolver.get_index(test_session, household.id)
+        await resolver.get_index(test_session, other_ids[0])
+        await resolver.get_index(test_session, household.id)
+        await resolver.get_index(test_session, other_ids[1])
+
+        assert list(resolver._indexes) == [household.id, other_ids[1]]
+        assert resolver._builds == {}
+
+    @pytest.mark.asyncio
+    async def test_write_during_build_not_cached(self, test_session, household):
+        """Test an index built concurrently with a write is not kept."""
+        resolver = PantryEntityResolver()
+        execute = test_session.execute
+
+        async def execute_with_write(*args, **kwargs):
+            resolver.invalidate(household.id)
+            return await execute(*args, **kwargs)
+
+        test_session.execute = execute_with_write
+        await resolver.get_index(test_session, household.id)
+
+        assert household.id not in resolver._indexes
@@ -0,0 +1,65 @@
+"""
+Unit tests for the food lexicon.
+"""
+
+import pytest
+
+from bruno_ai_server.services.command_parser import CommandParser, PantryAction
+from bruno_ai_server.services.food_lexicon import FoodLexicon, get_food_lexicon
+
+
+@pytest.fixture
+def lexicon():
+    return FoodLexicon([
+        ("cream", "dairy", []),
+        ("sour cream", "dairy", []),
+        ("ground beef", "meat", ["minced beef"]),
+        ("green onion", "vegetables", ["scallion"]),
+        ("tomato", "vegetables", []),
+    ])
+
+
+class TestFoodLexicon:
+    """Test trie lookups."""
+
+    def test_longest_match_wins(self, lexicon):
+        """Test a multi-word term is matched instead of its last word."""
+        matches = lexicon.find_all("add sour cream and cream")
+
+        assert [(m.text, m.canonical) for m in matches] == [("sour cream", "sour cream"), ("cream", "cream")]
+
+    def test_synonyms_and_plurals(self, lexicon):
+        """Test synonyms and plural forms map to the canonical term."""
+        matches = lexicon.find_all("2 lbs minced beef, scallions and tomatoes")
+
+        assert [m.canonical for m in matches] == ["ground beef", "green onion", "tomato"]
+        assert matches[0].category == "meat"
+
+    def test_partial_prefix_does_not_match(self, lexicon):
+        """Test an incomplete multi-word term is not reported."""
+        assert lexicon.find_all("ground coffee") == []
+
+    def test_lookup_requires_whole_name(self, lexicon):
+        """Test lookup only matches names that are exactly one term."""
+        assert lexicon.lookup("Sour Cream").canonical == "sour cream"
+        assert lexicon.lookup("sour cream dip") is None
+
+    def test_packaged_lexicon_loads_once(self):
+        """Test the packaged lexicon is shared and covers common foods."""
+        lexicon = get_food_lexicon()
+
+        assert lexicon is get_food_lexicon()
+        assert len(lexicon) > 500
+        assert {"milk", "sour cream", "ground beef"} <= lexicon.terms
+
+
+class TestParserUsesLexicon:
+    """Test the command parser recognizes multi-word foods."""
+
+    def test_multi_word_food_without_action(self):
+        """Test a bare multi-word food defaults to adding it."""
+        result = CommandParser().parse_command("ground beef")
+
+        assert result.action == PantryAction.ADD
+        assert result.entities[0].name == "ground beef"
+        assert result.entities[0].confidence == pytest.approx(0.8)
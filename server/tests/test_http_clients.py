@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared upstream HTTP client pool.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from bruno_ai_server.services import tts_service, voice_service
+from bruno_ai_server.services.http_clients import HTTPClientPool
+from bruno_ai_server.services.voice_service import VoiceService
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    """Minimal keep-alive HTTP/1.1 server that answers after a short delay."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                await asyncio.sleep(0.02)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/"
+    server.close()
+    await server.wait_closed()
+
+
+class TestHTTPClientPool:
+    """Test connection reuse and pool metrics."""
+
+    @pytest.mark.asyncio
+    async def test_connections_reused(self, local_server):
+        """Test sequential requests share one keep-alive connection."""
+        pool = HTTPClientPool(max_connections=4, http2=False)
+        client = pool.get("upstream")
+
+        for _ in range(5):
+            response = await client.get(local_server)
+            assert response.text == "ok"
+
+        metrics = pool.metrics("upstream")
+        assert metrics["requests_total"] == 5
+        assert metrics["connections_opened"] == 1
+        assert metrics["in_flight"] == 0
+        assert metrics["in_use"] == 0
+        assert metrics["idle"] == 1
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_wait_time_when_pool_exhausted(self, local_server):
+        """Test requests queued behind a full pool record their wait."""
+        pool = HTTPClientPool(max_connections=1, max_keepalive_connections=1, http2=False)
+        client = pool.get("upstream")
+
+        await asyncio.gather(*(client.get(local_server) for _ in range(3)))
+
+        metrics = pool.metrics("upstream")
+        assert metrics["peak_in_flight"] == 3
+        assert metrics["connections_opened"] == 1
+        assert metrics["wait_ms"]["max"] >= 15
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_same_client_per_name(self):
+        """Test a name maps to one shared client until closed."""
+        pool = HTTPClientPool(http2=False)
+
+        first = pool.get("tts")
+        assert pool.get("tts") is first
+        assert pool.get("voxtral") is not first
+
+        await pool.aclose()
+        assert first.is_closed
+        assert pool.get("tts") is not first
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_injected_client_outlives_service(self):
+        """Test a service does not close a client it was given."""
+        pool = HTTPClientPool(http2=False)
+        client = pool.get("voxtral")
+
+        async with VoiceService(client=client):
+            pass
+
+        assert not client.is_closed
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_services_recreated_after_shutdown(self, monkeypatch):
+        """Test shared services do not keep clients closed at shutdown."""
+        pool = HTTPClientPool(http2=False)
+        monkeypatch.setattr(voice_service, "http_clients", pool)
+        monkeypatch.setattr(tts_service, "http_clients", pool)
+        monkeypatch.setattr(voice_service, "_voice_service", None)
+        monkeypatch.setattr(tts_service, "_tts_service", None)
+
+        before = (await voice_service.get_voice_service(), await tts_service.get_tts_service())
+        await voice_service.close_voice_service()
+        await tts_service.close_tts_service()
+        await pool.aclose()
+        after = (await voice_service.get_voice_service(), await tts_service.get_tts_service())
+
+        assert after[0] is not before[0] and after[1] is not before[1]
+        assert not after[0].client.is_closed
+        assert not after[1].client.is_closed
+        await pool.aclose()
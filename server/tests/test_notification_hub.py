@@ -0,0 +1,538 @@
+"""
+Unit tests for the real-time notification hub.
+"""
+
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from bruno_ai_server.auth import create_access_token
+from bruno_ai_server.models.user import Household, HouseholdMember, User
+from bruno_ai_server.routes import notifications as notification_routes
+from bruno_ai_server.routes import pantry as pantry_routes
+from bruno_ai_server.schemas import PantryItemCreate, PantryItemUpdate
+from bruno_ai_server.services.notification_hub import (
+    PANTRY_ITEM_CHANGED,
+    DeliveryPolicy,
+    FanoutBackend,
+    HubEvent,
+    NotificationHub,
+    PostgresFanoutBackend,
+)
+from bruno_ai_server.services.notification_service import NotificationService
+
+
+class RecordingBackend(FanoutBackend):
+    """Fan-out backend that records published payloads."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.published = []
+        self.on_message = None
+
+    async def start(self, on_message):
+        self.on_message = on_message
+
+    async def publish(self, payload):
+        self.published.append(payload)
+
+
+class TestSubscription:
+    """Test per-connection queue policies."""
+
+    @pytest.mark.asyncio
+    async def test_events_delivered_in_order(self):
+        """Test subscribers receive events in publish order."""
+        hub = NotificationHub()
+        subscription = hub.subscribe("household-1")
+
+        await hub.publish("household-1", "pantry_changed", {"n": 1})
+        await hub.publish("household-1", "pantry_changed", {"n": 2})
+
+        first = await subscription.get(timeout=0.1)
+        second = await subscription.get(timeout=0.1)
+        assert [first.data["n"], second.data["n"]] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_channels_are_isolated(self):
+        """Test events only reach the publishing household."""
+        hub = NotificationHub()
+        subscription = hub.subscribe("household-1")
+
+        await hub.publish("household-2", "pantry_changed", {})
+
+        assert await subscription.get(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """Test a full queue drops the oldest event."""
+        hub = NotificationHub(max_queue_size=2, policy=DeliveryPolicy.DROP_OLDEST)
+        subscription = hub.subscribe("h")
+
+        for n in range(3):
+            await hub.publish("h", "tick", {"n": n})
+
+        assert subscription.dropped_count == 1
+        assert (await subscription.get(timeout=0.1)).data["n"] == 1
+        assert (await subscription.get(timeout=0.1)).data["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_policy(self):
+        """Test a full queue rejects the incoming event."""
+        hub = NotificationHub(max_queue_size=2, policy=DeliveryPolicy.DROP_NEWEST)
+        subscription = hub.subscribe("h")
+
+        for n in range(3):
+            await hub.publish("h", "tick", {"n": n})
+
+        assert subscription.dropped_count == 1
+        assert (await subscription.get(timeout=0.1)).data["n"] == 0
+        assert (await subscription.get(timeout=0.1)).data["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_merge_policy_replaces_pending_event(self):
+        """Test events with the same merge key collapse for slow consumers."""
+        hub = NotificationHub(policy=DeliveryPolicy.MERGE)
+        subscription = hub.subscribe("h")
+
+        await hub.publish("h", "expiration_alert", {"n": 1}, merge_key="alert")
+        await hub.publish("h", "pantry_changed", {"n": 2})
+        await hub.publish("h", "expiration_alert", {"n": 3}, merge_key="alert")
+
+        assert subscription.pending == 2
+        assert subscription.merged_count == 1
+        assert (await subscription.get(timeout=0.1)).data["n"] == 3
+        assert (await subscription.get(timeout=0.1)).data["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self):
+        """Test iteration yields None when the heartbeat interval passes."""
+        hub = NotificationHub(heartbeat_interval=0.01)
+        subscription = hub.subscribe("h")
+
+        assert await subscription.__anext__() is None
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_wakes_waiting_consumer(self):
+        """Test closing a subscription ends iteration."""
+        hub = NotificationHub(heartbeat_interval=5)
+        subscription = hub.subscribe("h")
+
+        async def consume():
+            return [event async for event in subscription]
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        hub.unsubscribe(subscription)
+
+        assert await asyncio.wait_for(consumer, 1) == [None]
+        assert hub.subscriber_count("h") == 0
+
+
+class TestFanout:
+    """Test cross-worker fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_publish_forwards_to_backend(self):
+        """Test published events are sent through the backend with an origin."""
+        backend = RecordingBackend()
+        hub = NotificationHub(backend=backend)
+        await hub.start()
+
+        event = await hub.publish("h", "pantry_changed", {"item": "milk"})
+
+        assert backend.published[0]["id"] == event.id
+        assert backend.published[0]["origin"] == hub.origin_id
+
+    @pytest.mark.asyncio
+    async def test_remote_events_delivered_once(self):
+        """Test events from other workers are delivered but echoes are ignored."""
+        backend = RecordingBackend()
+        hub = NotificationHub(backend=backend)
+        await hub.start()
+        subscription = hub.subscribe("h")
+
+        remote = HubEvent(type="pantry_changed", household_id="h", data={}).to_dict()
+        backend.on_message({**remote, "origin": "another-worker"})
+        backend.on_message({**remote, "origin": hub.origin_id})
+
+        assert subscription.pending == 1
+        assert hub.stats()["remote_received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_backend_start_failure_falls_back_to_local(self):
+        """Test a broken backend does not prevent local delivery."""
+        backend = RecordingBackend()
+        backend.start = Mock(side_effect=ConnectionError("no database"))
+        hub = NotificationHub(backend=backend)
+
+        await hub.start()
+
+        assert hub.backend.name == "local"
+
+
+class FakeConnection:
+    """Stands in for an asyncpg listener connection."""
+
+    def __init__(self):
+        self.listeners = []
+        self.on_terminate = None
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(callback)
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.remove(callback)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePool:
+    """Stands in for an asyncpg pool and records executed queries."""
+
+    def __init__(self):
+        self.executed = []
+        self.closed = False
+
+    async def execute(self, query, *args):
+        self.executed.append(args)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestPostgresFanout:
+    """Test the Postgres LISTEN/NOTIFY backend's connection handling."""
+
+    @pytest.fixture
+    def fake_asyncpg(self, monkeypatch):
+        import asyncpg
+
+        connections = []
+        pool = FakePool()
+
+        async def connect(dsn):
+            connections.append(FakeConnection())
+            return connections[-1]
+
+        async def create_pool(dsn, min_size, max_size):
+            return pool
+
+        monkeypatch.setattr(asyncpg, "connect", connect)
+        monkeypatch.setattr(asyncpg, "create_pool", create_pool)
+        return connections, pool
+
+    @pytest.mark.asyncio
+    async def test_publishes_use_pool_not_listener(self, fake_asyncpg):
+        """Test concurrent publishes go through the pool, leaving the listener free."""
+        connections, pool = fake_asyncpg
+        backend = PostgresFanoutBackend("postgresql+asyncpg://localhost/bruno")
+        await backend.start(lambda payload: None)
+
+        await asyncio.gather(*(backend.publish({"id": str(n)}) for n in range(5)))
+
+        assert len(pool.executed) == 5
+        assert len(connections) == 1
+        await backend.stop()
+        assert connections[0].closed and pool.closed
+
+    @pytest.mark.asyncio
+    async def test_listener_reconnects_after_drop(self, fake_asyncpg):
+        """Test a dropped listener connection is replaced and keeps receiving."""
+        connections, _ = fake_asyncpg
+        received = []
+        backend = PostgresFanoutBackend("postgresql://localhost/bruno")
+        await backend.start(received.append)
+
+        connections[0].on_terminate(connections[0])
+        for _ in range(100):
+            if backend.reconnects:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(connections) == 2 and backend.reconnects == 1
+        connections[1].listeners[0](connections[1], 1, PostgresFanoutBackend.CHANNEL, '{"id": "e1"}')
+        assert received == [{"id": "e1"}]
+        await backend.stop()
+
+
+class TestInAppNotifications:
+    """Test the notification service publishes to the hub."""
+
+    @pytest.mark.asyncio
+    async def test_expiration_notifications_published(self, monkeypatch):
+        """Test expiration alerts reach household subscribers."""
+        hub = NotificationHub()
+        monkeypatch.setattr(
+            "bruno_ai_server.services.notification_service.notification_hub", hub
+        )
+        household = Mock(id=uuid.uuid4())
+        household.name = "Home"
+        subscription = hub.subscribe(household.id)
+
+        await NotificationService.send_expiration_notifications(
+            household=household,
+            notification_data={"expiring_count": 2, "expired_count": 0},
+        )
+
+        event = await subscription.get(timeout=0.1)
+        assert event.type == "expiration_alert"
+        assert event.data["expiring_count"] == 2
+        assert "Home" in event.data["title"]
+
+
+class TestPantryChangeEvents:
+    """Test pantry writes are announced on the household channel."""
+
+    @pytest.mark.asyncio
+    async def test_pantry_routes_publish_changes(self, test_session, monkeypatch):
+        """Test create, update and delete each publish an event after commit."""
+        hub = NotificationHub()
+        monkeypatch.setattr(pantry_routes, "notification_hub", hub)
+        user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", name="Cook")
+        test_session.add(user)
+        await test_session.flush()
+        household = Household(name="Home", invite_code=uuid.uuid4().hex[:8], admin_user_id=user.id)
+        test_session.add(household)
+        await test_session.flush()
+        test_session.add(HouseholdMember(user_id=user.id, household_id=household.id, role="admin"))
+        await test_session.commit()
+        subscription = hub.subscribe(household.id)
+
+        events = []
+        item = await pantry_routes.create_pantry_item(
+            PantryItemCreate(name="Milk", quantity=1, unit="gallon"), current_user=user, db=test_session
+        )
+        events.append(await subscription.get(timeout=0.1))
+        await pantry_routes.update_pantry_item(
+            item.id, PantryItemUpdate(quantity=2), current_user=user, db=test_session
+        )
+        events.append(await subscription.get(timeout=0.1))
+        await pantry_routes.delete_pantry_item(item.id, current_user=user, db=test_session)
+        events.append(await subscription.get(timeout=0.1))
+
+        assert {event.type for event in events} == {PANTRY_ITEM_CHANGED}
+        assert [event.data["change"] for event in events] == ["created", "updated", "deleted"]
+        assert {event.data["item_id"] for event in events} == {str(item.id)}
+
+    @pytest.mark.asyncio
+    async def test_unread_changes_to_one_item_merge(self):
+        """Test a slow client only receives an item's latest change."""
+        hub = NotificationHub()
+        subscription = hub.subscribe("household-1")
+
+        await hub.publish_pantry_change("household-1", "item-1", "created")
+        await hub.publish_pantry_change("household-1", "item-2", "created")
+        await hub.publish_pantry_change("household-1", "item-1", "deleted")
+
+        events = [await subscription.get(timeout=0.01) for _ in range(3)]
+        assert [event and event.data for event in events] == [
+            {"item_id": "item-1", "change": "deleted"},
+            {"item_id": "item-2", "change": "created"},
+            None,
+        ]
+
+
+class FakeUserSession:
+    """Session stand-in that answers the auth lookup for known users."""
+
+    def __init__(self, users):
+        self.users = users
+
+    async def execute(self, statement):
+        user_ids = statement.compile().params.values()
+        user = next((self.users[uid] for uid in user_ids if uid in self.users), None)
+        return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    async def close(self):
+        pass
+
+
+class SSEConnection:
+    """
+    Drive the SSE endpoint over raw ASGI.
+
+    TestClient buffers whole HTTP responses, which never completes for an
+    open event stream, so the body is read chunk by chunk here instead.
+    """
+
+    def __init__(self, app, token=None):
+        self.app = app
+        self.headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+        self.status = None
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self._request_sent = False
+        self._task = None
+
+    async def __aenter__(self):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/notifications/stream",
+            "raw_path": b"/notifications/stream",
+            "query_string": b"",
+            "root_path": "",
+            "headers": self.headers,
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        self._task = asyncio.create_task(self.app(scope, self._receive, self._send))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.disconnected.set()
+        await asyncio.wait_for(self._task, 1.0)
+
+    async def _receive(self):
+        if not self._request_sent:
+            self._request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            await self.chunks.put(message.get("body", b"").decode())
+
+    async def read(self) -> str:
+        """Return the next non-empty body chunk."""
+        while True:
+            chunk = await asyncio.wait_for(self.chunks.get(), 1.0)
+            if chunk:
+                return chunk
+
+
+@pytest.fixture
+def notification_app(monkeypatch):
+    """App with the notification router, two users in separate households and a fast heartbeat hub."""
+    alice = SimpleNamespace(id=uuid.uuid4(), is_active=True)
+    bob = SimpleNamespace(id=uuid.uuid4(), is_active=True)
+    households = {alice.id: "household-a", bob.id: "household-b"}
+    hub = NotificationHub(heartbeat_interval=0.05)
+
+    async def fake_household_id(user, db):
+        return households.get(user.id)
+
+    async def fake_session():
+        yield FakeUserSession({alice.id: alice, bob.id: bob})
+
+    monkeypatch.setattr(notification_routes, "get_user_household_id", fake_household_id)
+    monkeypatch.setattr(notification_routes, "notification_hub", hub)
+    app = FastAPI()
+    app.include_router(notification_routes.router)
+    # Override the dependency the router holds; top-level scripts may replace the database module
+    app.dependency_overrides[notification_routes.get_async_session] = fake_session
+
+    return SimpleNamespace(
+        app=app,
+        hub=hub,
+        alice_token=create_access_token({"sub": str(alice.id)}),
+        bob_token=create_access_token({"sub": str(bob.id)}),
+    )
+
+
+def next_event(websocket):
+    """Receive WebSocket messages until one is not a heartbeat."""
+    while True:
+        message = websocket.receive_json()
+        if message["type"] != "heartbeat":
+            return message
+
+
+class TestNotificationWebSocket:
+    """Test the household WebSocket endpoint."""
+
+    def test_rejects_invalid_token(self, notification_app):
+        """Test connections with a missing or forged token are closed before accepting."""
+        client = TestClient(notification_app.app)
+
+        for path in ("/notifications/ws", "/notifications/ws?token=not-a-jwt"):
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                with client.websocket_connect(path):
+                    pass
+            assert exc_info.value.code == 1008
+
+    def test_receives_only_own_household(self, notification_app):
+        """Test a valid token subscribes to the user's household and nothing else."""
+        client = TestClient(notification_app.app)
+        hub = notification_app.hub
+
+        with client.websocket_connect(f"/notifications/ws?token={notification_app.alice_token}") as websocket:
+            websocket.portal.call(hub.publish, "household-b", "pantry_changed", {"n": "other"})
+            websocket.portal.call(hub.publish, "household-a", "pantry_changed", {"n": "own"})
+
+            message = next_event(websocket)
+
+        assert message["household_id"] == "household-a"
+        assert message["data"] == {"n": "own"}
+
+    def test_bearer_header_accepted(self, notification_app):
+        """Test the token may also be sent as a Bearer header."""
+        client = TestClient(notification_app.app)
+        headers = {"Authorization": f"Bearer {notification_app.bob_token}"}
+
+        with client.websocket_connect("/notifications/ws", headers=headers) as websocket:
+            websocket.portal.call(notification_app.hub.publish, "household-b", "pantry_changed", {})
+
+            assert next_event(websocket)["household_id"] == "household-b"
+
+    def test_idle_channel_sends_heartbeat(self, notification_app):
+        """Test a heartbeat message arrives when nothing is published."""
+        client = TestClient(notification_app.app)
+
+        with client.websocket_connect(f"/notifications/ws?token={notification_app.alice_token}") as websocket:
+            assert websocket.receive_json() == {"type": "heartbeat"}
+
+
+class TestNotificationStream:
+    """Test the household Server-Sent Events endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_token(self, notification_app):
+        """Test a forged token gets 401 and no stream."""
+        async with SSEConnection(notification_app.app, token="not-a-jwt") as connection:
+            await connection.read()
+
+        assert connection.status == 401
+
+    @pytest.mark.asyncio
+    async def test_receives_only_own_household(self, notification_app):
+        """Test a valid token streams the user's household events and heartbeats."""
+        hub = notification_app.hub
+
+        async with SSEConnection(notification_app.app, token=notification_app.alice_token) as connection:
+            assert await connection.read() == ": connected\n\n"
+            assert await connection.read() == ": heartbeat\n\n"
+
+            await hub.publish("household-b", "pantry_changed", {"n": "other"})
+            await hub.publish("household-a", "pantry_changed", {"n": "own"})
+
+            chunk = await connection.read()
+            while chunk == ": heartbeat\n\n":
+                chunk = await connection.read()
+
+        assert connection.status == 200
+        assert chunk.startswith("id: ")
+        assert "event: pantry_changed" in chunk
+        data = json.loads(chunk.split("data: ", 1)[1])
+        assert data["household_id"] == "household-a"
+        assert data["data"] == {"n": "own"}
@@ -0,0 +1,191 @@
+"""
+Unit tests for notification preference loading.
+"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from bruno_ai_server.models.user import Household, HouseholdMember, User
+from bruno_ai_server.services.notification_service import NotificationService
+
+
+@pytest.fixture(autouse=True)
+def clear_preference_cache():
+    """Start every test with an empty preference cache."""
+    NotificationService.invalidate_preference_cache()
+    yield
+    NotificationService.invalidate_preference_cache()
+
+
+@pytest.fixture
+def query_counter(test_engine):
+    """Count SQL statements executed against the test engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest_asyncio.fixture
+async def households(test_session):
+    """Create two households with members and stored preferences."""
+    created = []
+    for index in range(2):
+        admin = User(
+            id=uuid.uuid4(),
+            email=f"admin{index}-{uuid.uuid4().hex[:8]}@example.com",
+            name=f"Admin {index}",
+            notification_preferences={"email_notifications": False, "device_tokens": ["fcm-token"]},
+        )
+        member = User(
+            id=uuid.uuid4(),
+            email=f"member{index}-{uuid.uuid4().hex[:8]}@example.com",
+            name=f"Member {index}",
+        )
+        inactive = User(
+            id=uuid.uuid4(),
+            email=f"inactive{index}-{uuid.uuid4().hex[:8]}@example.com",
+            name=f"Inactive {index}",
+            is_active=False,
+        )
+        test_session.add_all([admin, member, inactive])
+        await test_session.flush()
+
+        household = Household(
+            name=f"Household {index}",
+            invite_code=uuid.uuid4().hex[:8],
+            admin_user_id=admin.id,
+        )
+        test_session.add(household)
+        await test_session.flush()
+
+        test_session.add_all([
+            HouseholdMember(user_id=admin.id, household_id=household.id, role="admin"),
+            HouseholdMember(user_id=member.id, household_id=household.id),
+            HouseholdMember(user_id=inactive.id, household_id=household.id),
+        ])
+        await test_session.flush()
+        created.append(household)
+    return created
+
+
+class TestHouseholdNotificationTargets:
+    """Test bulk loading of notification targets."""
+
+    @pytest.mark.asyncio
+    async def test_loads_all_households_in_one_query(self, test_session, households, query_counter):
+        """Test every household's members come back from a single SELECT."""
+        household_ids = [household.id for household in households]
+
+        targets = await NotificationService.get_household_notification_targets(
+            test_session, household_ids
+        )
+
+        assert len([s for s in query_counter if s.lstrip().upper().startswith("SELECT")]) == 1
+        assert set(targets) == set(household_ids)
+        assert all(len(members) == 2 for members in targets.values())
+
+    @pytest.mark.asyncio
+    async def test_defaults_applied_in_memory(self, test_session, households):
+        """Test stored preferences override defaults and device tokens are split out."""
+        targets = await NotificationService.get_household_notification_targets(
+            test_session, [households[0].id]
+        )
+        by_name = {target.name: target for target in targets[households[0].id]}
+
+        admin = by_name["Admin 0"]
+        assert admin.wants("email_notifications") is False
+        assert admin.wants("push_notifications") is True
+        assert admin.device_tokens == ["fcm-token"]
+        assert "device_tokens" not in admin.preferences
+
+        member = by_name["Member 0"]
+        assert member.preferences == NotificationService.DEFAULT_NOTIFICATION_PREFERENCES
+        assert member.device_tokens == []
+
+    @pytest.mark.asyncio
+    async def test_cache_reused_within_ttl(self, test_session, households, query_counter):
+        """Test repeated loads within a run do not hit the database."""
+        household_ids = [household.id for household in households]
+
+        await NotificationService.get_household_notification_targets(test_session, household_ids)
+        query_counter.clear()
+        await NotificationService.get_household_notification_targets(test_session, household_ids)
+
+        assert query_counter == []
+
+    @pytest.mark.asyncio
+    async def test_household_without_members(self, test_session):
+        """Test unknown households map to an empty target list."""
+        household_id = uuid.uuid4()
+
+        targets = await NotificationService.get_household_notification_targets(
+            test_session, [household_id]
+        )
+
+        assert targets == {household_id: []}
+
+    @pytest.mark.asyncio
+    async def test_cache_bounded(self, test_session, monkeypatch):
+        """Test the oldest households are evicted past the size bound."""
+        monkeypatch.setattr(NotificationService, "PREFERENCE_CACHE_MAX_HOUSEHOLDS", 2)
+        household_ids = [uuid.uuid4() for _ in range(3)]
+
+        for household_id in household_ids:
+            await NotificationService.get_household_notification_targets(test_session, [household_id])
+
+        assert list(NotificationService._preference_cache) == household_ids[1:]
+
+    @pytest.mark.asyncio
+    async def test_membership_commit_invalidates_household(self, test_session, households):
+        """Test a committed membership change drops only that household's cached targets."""
+        await test_session.commit()
+        household_ids = [household.id for household in households]
+        await NotificationService.get_household_notification_targets(test_session, household_ids)
+
+        newcomer = User(id=uuid.uuid4(), email=f"new-{uuid.uuid4().hex[:8]}@example.com", name="Newcomer")
+        test_session.add(newcomer)
+        await test_session.flush()
+        test_session.add(HouseholdMember(user_id=newcomer.id, household_id=households[0].id))
+        await test_session.commit()
+
+        assert list(NotificationService._preference_cache) == [households[1].id]
+        targets = await NotificationService.get_household_notification_targets(test_session, household_ids)
+        assert "Newcomer" in {target.name for target in targets[households[0].id]}
+
+    @pytest.mark.asyncio
+    async def test_preference_commit_invalidates_member_households(self, test_session, households):
+        """Test a committed preference change drops the households the member is cached in."""
+        await test_session.commit()
+        household_ids = [household.id for household in households]
+        targets = await NotificationService.get_household_notification_targets(test_session, household_ids)
+        member_id = next(target.user_id for target in targets[households[1].id] if target.name == "Member 1")
+
+        assert await NotificationService.update_user_notification_preferences(
+            test_session, member_id, {"expiration_alerts": False}
+        )
+
+        assert list(NotificationService._preference_cache) == [households[0].id]
+        targets = await NotificationService.get_household_notification_targets(test_session, household_ids)
+        member = next(target for target in targets[households[1].id] if target.user_id == member_id)
+        assert member.wants("expiration_alerts") is False
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_cache(self, test_session, households):
+        """Test changes that are rolled back do not invalidate anything."""
+        await test_session.commit()
+        household_ids = [household.id for household in households]
+        await NotificationService.get_household_notification_targets(test_session, household_ids)
+
+        test_session.add(HouseholdMember(user_id=households[1].admin_user_id, household_id=households[0].id))
+        await test_session.flush()
+        await test_session.rollback()
+
+        assert set(NotificationService._preference_cache) == set(household_ids)
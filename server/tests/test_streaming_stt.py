@@ -0,0 +1,179 @@
+"""
+Unit tests for streaming speech-to-text and the /voice/stream WebSocket.
+"""
+
+import asyncio
+import io
+import uuid
+import wave
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from bruno_ai_server.database import get_async_session
+from bruno_ai_server.routes import voice as voice_routes
+from bruno_ai_server.services.streaming_stt import (
+    AudioFormat,
+    LocalStubStreamingBackend,
+    VoxtralStreamingSession,
+    get_streaming_stt_backend,
+)
+from bruno_ai_server.services.voice_service import TranscriptionResult
+
+
+class FakeVoiceService:
+    """Transcribes to a label describing how much audio it was sent."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def transcribe_bytes(self, audio_data, filename, language=None, use_cache=True):
+        self.calls.append((filename, len(audio_data)))
+        await asyncio.sleep(self.delay)
+        return TranscriptionResult(text=f"{len(audio_data)} bytes", confidence=0.9)
+
+
+async def collect(session):
+    return [transcript async for transcript in session.transcripts()]
+
+
+class TestAudioFormat:
+    """Test streamed audio packaging."""
+
+    def test_pcm_wrapped_as_wav(self):
+        """Test raw PCM frames become a readable WAV file."""
+        audio_format = AudioFormat(sample_rate=8000)
+
+        filename, data = audio_format.to_file(b"\x00\x01" * 8000)
+
+        with wave.open(io.BytesIO(data)) as wav:
+            assert filename == "stream.wav"
+            assert wav.getframerate() == 8000
+            assert wav.getnframes() == 8000
+
+    def test_rejects_unknown_encoding(self):
+        """Test unsupported encodings are refused up front."""
+        with pytest.raises(ValueError):
+            AudioFormat(encoding="mp3")
+
+
+class TestVoxtralStreamingSession:
+    """Test incremental transcription pacing."""
+
+    @pytest.mark.asyncio
+    async def test_partials_then_final(self):
+        """Test partials follow the audio and the final covers all of it."""
+        service = FakeVoiceService()
+        audio_format = AudioFormat(sample_rate=8000)
+        session = VoxtralStreamingSession(service, audio_format, partial_interval_ms=500)
+
+        for _ in range(4):
+            await session.send_audio(b"\x00" * 8000)  # 500ms each
+            await asyncio.sleep(0)
+        await session.finish()
+        transcripts = await collect(session)
+
+        assert [t.is_final for t in transcripts][-1] is True
+        assert transcripts[-1].text == f"{32000 + 44} bytes"
+        assert all(not t.is_final for t in transcripts[:-1]) and transcripts[:-1]
+
+    @pytest.mark.asyncio
+    async def test_partials_off_by_default(self):
+        """Test the buffer is only uploaded once unless partials are enabled."""
+        service = FakeVoiceService()
+        session = VoxtralStreamingSession(service, AudioFormat(sample_rate=8000))
+
+        for _ in range(4):
+            await session.send_audio(b"\x00" * 8000)
+            await asyncio.sleep(0)
+        await session.finish()
+        transcripts = await collect(session)
+
+        assert len(service.calls) == 1
+        assert [t.is_final for t in transcripts] == [True]
+
+    @pytest.mark.asyncio
+    async def test_slow_api_skips_partials(self):
+        """Test at most one partial request is in flight."""
+        service = FakeVoiceService(delay=0.05)
+        session = VoxtralStreamingSession(service, AudioFormat(sample_rate=8000), partial_interval_ms=500)
+
+        for _ in range(5):
+            await session.send_audio(b"\x00" * 8000)
+            await asyncio.sleep(0)
+        await session.finish()
+        await collect(session)
+
+        assert len(service.calls) == 2  # One partial and the final
+
+    @pytest.mark.asyncio
+    async def test_finish_without_audio_fails(self):
+        """Test ending an empty utterance reports an error."""
+        session = VoxtralStreamingSession(FakeVoiceService(), AudioFormat())
+
+        await session.finish()
+
+        with pytest.raises(Exception, match="No audio received"):
+            await collect(session)
+
+
+@pytest.fixture
+def stream_client(monkeypatch):
+    """App with the voice router, a stub backend and a fake authenticated user."""
+    backend = LocalStubStreamingBackend("add 2 pounds of chicken to the fridge", words_per_chunk=2)
+    user = SimpleNamespace(id=uuid.uuid4())
+
+    async def fake_websocket_user(websocket, db):
+        return user if websocket.query_params.get("token") == "valid" else None
+
+    async def fake_session():
+        yield SimpleNamespace(close=lambda: asyncio.sleep(0))
+
+    monkeypatch.setattr(voice_routes, "get_websocket_user", fake_websocket_user)
+    app = FastAPI()
+    app.include_router(voice_routes.router)
+    app.dependency_overrides[get_async_session] = fake_session
+    app.dependency_overrides[get_streaming_stt_backend] = lambda: backend
+    return TestClient(app)
+
+
+class TestStreamEndpoint:
+    """Test the WebSocket protocol end to end with the stub backend."""
+
+    def test_partial_final_and_command(self, stream_client):
+        """Test partials stream during speech and the command follows the final."""
+        with stream_client.websocket_connect("/voice/stream?token=valid") as websocket:
+            assert websocket.receive_json()["type"] == "ready"
+
+            websocket.send_bytes(b"\x00" * 320)
+            assert websocket.receive_json() == {"type": "partial", "text": "add 2"}
+            websocket.send_bytes(b"\x00" * 320)
+            assert websocket.receive_json() == {"type": "partial", "text": "add 2 pounds of"}
+
+            websocket.send_json({"type": "end"})
+            final = websocket.receive_json()
+            command = websocket.receive_json()
+
+        assert final["type"] == "final"
+        assert final["text"] == "add 2 pounds of chicken to the fridge"
+        assert command["type"] == "command"
+        assert command["action"] == "add"
+
+    def test_rejects_unauthenticated(self, stream_client):
+        """Test connections without a valid token are refused."""
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with stream_client.websocket_connect("/voice/stream") as websocket:
+                websocket.receive_json()
+        assert exc_info.value.code == 1008
+
+    def test_reports_bad_format(self, stream_client):
+        """Test an unsupported encoding is reported before closing."""
+        with stream_client.websocket_connect("/voice/stream?token=valid&encoding=mp3") as websocket:
+            message = websocket.receive_json()
+
+        assert message["type"] == "error"
+        assert "Unsupported encoding" in message["detail"]
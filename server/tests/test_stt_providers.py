@@ -0,0 +1,260 @@
+"""
+Unit tests for STT providers, retries, hedging and the circuit breaker.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from bruno_ai_server.services import voice_service as voice_module
+from bruno_ai_server.services.audio_upload import AudioSource
+from bruno_ai_server.services.stt_providers import (
+    CircuitBreaker,
+    STTProvider,
+    STTProviderError,
+    STTRouter,
+    StubSTTProvider,
+    VoxtralProvider,
+)
+from bruno_ai_server.services.voice_service import VoiceService
+
+AUDIO = AudioSource.from_bytes(b"RIFF-audio", "clip.wav")
+
+
+class ScriptedProvider(STTProvider):
+    """Plays back a list of outcomes: a delay in seconds, or an exception."""
+
+    def __init__(self, name, outcomes):
+        self.name = name
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def transcribe(self, source, language, timeout):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(outcome)
+        return {"text": f"from {self.name}", "confidence": 0.9, "language_detected": None, "audio_duration_ms": 0}
+
+
+def router(*providers, **kwargs):
+    options = dict(
+        deadline_seconds=2.0,
+        max_attempts=3,
+        retry_base_delay=0.001,
+        hedge=False,
+        breaker_failure_threshold=5,
+        breaker_recovery_seconds=30.0,
+    )
+    options.update(kwargs)
+    return STTRouter(list(providers), **options)
+
+
+class TestSTTRouter:
+    """Test retries, fallback and deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self):
+        """Test a retryable error is retried on the same provider."""
+        primary = ScriptedProvider("primary", [STTProviderError("503"), STTProviderError("503"), 0])
+
+        result, provider = await router(primary).transcribe(AUDIO)
+
+        assert (result["text"], provider) == ("from primary", "primary")
+        assert primary.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_second_provider(self):
+        """Test the fallback is used once the primary's attempts are spent."""
+        primary = StubSTTProvider(failure_rate=1.0, name="primary")
+        fallback = StubSTTProvider("add eggs", name="fallback")
+        stt = router(primary, fallback)
+
+        result, provider = await stt.transcribe(AUDIO)
+
+        assert (result["text"], provider) == ("add eggs", "fallback")
+        assert primary.calls == 3
+        assert stt.metrics()["primary"]["failures"] == 3
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_not_retried(self):
+        """Test a problem with the audio is returned without retry or fallback."""
+        primary = ScriptedProvider("primary", [STTProviderError("No speech", retryable=False, status_code=422)])
+        fallback = ScriptedProvider("fallback", [0])
+
+        with pytest.raises(STTProviderError) as exc_info:
+            await router(primary, fallback).transcribe(AUDIO)
+
+        assert exc_info.value.status_code == 422
+        assert (primary.calls, fallback.calls) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_hanging_provider(self):
+        """Test a hung provider fails at the deadline rather than its timeout."""
+        stt = router(StubSTTProvider(hang_rate=1.0), deadline_seconds=0.2)
+        started = time.monotonic()
+
+        with pytest.raises(STTProviderError) as exc_info:
+            await stt.transcribe(AUDIO)
+
+        assert exc_info.value.status_code == 504
+        assert time.monotonic() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_hedge_races_slow_request(self):
+        """Test a request slower than p95 is hedged and the faster one wins."""
+        primary = ScriptedProvider("primary", [1.0, 0.01])
+        stt = router(primary, hedge=True, hedge_min_delay=0.02, hedge_min_samples=5)
+        for _ in range(5):
+            stt.stats["primary"].record_latency(20)
+        started = time.monotonic()
+
+        result, _ = await stt.transcribe(AUDIO)
+
+        assert result["text"] == "from primary"
+        assert time.monotonic() - started < 0.5
+        assert stt.stats["primary"].hedges_sent == 1
+        assert stt.stats["primary"].hedges_won == 1
+
+    @pytest.mark.asyncio
+    async def test_large_upload_not_hedged(self):
+        """Test uploads above hedge_max_bytes are never raced."""
+        primary = ScriptedProvider("primary", [0.1])
+        stt = router(primary, hedge=True, hedge_min_delay=0.02, hedge_min_samples=5, hedge_max_bytes=4)
+        for _ in range(5):
+            stt.stats["primary"].record_latency(20)
+
+        await stt.transcribe(AUDIO)
+
+        assert primary.calls == 1
+        assert stt.stats["primary"].hedges_sent == 0
+
+    def test_deadline_scales_with_audio_length(self):
+        """Test the deadline grows with duration, or size when unknown, up to the cap."""
+        stt = router(deadline_seconds=15.0, deadline_per_audio_second=0.5, deadline_max_seconds=90.0)
+
+        assert stt.deadline_for(AUDIO, duration_seconds=2.0) == 16.0
+        assert stt.deadline_for(AUDIO, duration_seconds=120.0) == 75.0
+        assert stt.deadline_for(AUDIO, duration_seconds=600.0) == 90.0
+        assert stt.deadline_for(AudioSource.from_bytes(b"\0" * 400_000, "long.mp3")) == 65.0
+
+    @pytest.mark.asyncio
+    async def test_explicit_deadline_overrides_scaling(self):
+        """Test a caller-supplied deadline (background jobs) replaces the scaled one."""
+        stt = router(StubSTTProvider(latency_seconds=0.3), deadline_seconds=0.1)
+
+        result, _ = await stt.transcribe(AUDIO, deadline_seconds=1.0)
+
+        assert result["text"] == "add milk"
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        """Test hedging waits for enough samples to estimate p95."""
+        primary = ScriptedProvider("primary", [0.05])
+        stt = router(primary, hedge=True, hedge_min_delay=0.01)
+
+        await stt.transcribe(AUDIO)
+
+        assert stt.stats["primary"].hedges_sent == 0
+
+
+class TestCircuitBreaker:
+    """Test failing fast while a provider is unhealthy."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_provider(self):
+        """Test an open circuit sends traffic straight to the fallback."""
+        primary = StubSTTProvider(failure_rate=1.0, name="primary")
+        fallback = StubSTTProvider(name="fallback")
+        stt = router(primary, fallback, max_attempts=1, breaker_failure_threshold=2)
+
+        for _ in range(2):
+            await stt.transcribe(AUDIO)
+        await stt.transcribe(AUDIO)
+
+        assert primary.calls == 2
+        assert stt.metrics()["primary"]["circuit"] == CircuitBreaker.OPEN
+        assert stt.metrics()["primary"]["short_circuited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fails_fast_when_all_circuits_open(self):
+        """Test no provider is called while every circuit is open."""
+        primary = StubSTTProvider(failure_rate=1.0, name="primary")
+        stt = router(primary, max_attempts=1, breaker_failure_threshold=1)
+
+        with pytest.raises(STTProviderError):
+            await stt.transcribe(AUDIO)
+        with pytest.raises(STTProviderError) as exc_info:
+            await stt.transcribe(AUDIO)
+
+        assert exc_info.value.status_code == 503
+        assert primary.calls == 1
+
+    def test_half_open_trial_closes_circuit(self):
+        """Test one trial call is allowed after recovery and success closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.0)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestVoxtralProvider:
+    """Test HTTP error classification against a fault-injecting transport."""
+
+    @staticmethod
+    def provider(responses):
+        responses = list(responses)
+
+        async def handler(request):
+            await request.aread()
+            return responses.pop(0)
+
+        return VoxtralProvider(httpx.AsyncClient(transport=httpx.MockTransport(handler)), api_key="test-key")
+
+    @pytest.mark.asyncio
+    async def test_server_errors_retried(self):
+        """Test 5xx and 429 responses are retried."""
+        provider = self.provider([
+            httpx.Response(503, json={"error": {"message": "overloaded"}}),
+            httpx.Response(429, text="slow down"),
+            httpx.Response(200, json={"text": "add two cups of milk", "duration": 1.5}),
+        ])
+
+        result, _ = await router(provider).transcribe(AUDIO)
+
+        assert result["text"] == "add two cups of milk"
+        assert result["audio_duration_ms"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self):
+        """Test a 400 from the provider is returned without retry."""
+        provider = self.provider([httpx.Response(400, json={"error": {"message": "bad audio"}})])
+
+        with pytest.raises(STTProviderError) as exc_info:
+            await router(provider).transcribe(AUDIO)
+
+        assert not exc_info.value.retryable
+        assert "bad audio" in str(exc_info.value)
+
+
+class TestVoiceServiceErrors:
+    """Test router failures surface as HTTP errors."""
+
+    @pytest.mark.asyncio
+    async def test_deadline_maps_to_504(self, monkeypatch):
+        """Test a provider brownout becomes a prompt 504."""
+        monkeypatch.setattr(voice_module.settings, "voxtral_api_key", "test-key", raising=False)
+        service = VoiceService(router=router(StubSTTProvider(hang_rate=1.0), deadline_seconds=0.1))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.transcribe_bytes(b"RIFF-audio")
+
+        assert exc_info.value.status_code == 504
+        await service.client.aclose()
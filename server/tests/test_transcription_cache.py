@@ -0,0 +1,205 @@
+"""
+Unit tests for the transcription cache and single-flight coalescing.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from bruno_ai_server.services import voice_service as voice_module
+from bruno_ai_server.services.single_flight import SingleFlight
+from bruno_ai_server.services.stt_providers import STTRouter, StubSTTProvider
+from bruno_ai_server.services.transcription_cache import TranscriptionCache
+from bruno_ai_server.services.voice_service import VoiceService
+
+
+class TestSingleFlight:
+    """Test concurrent call coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """Test one underlying call serves every concurrent caller."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+        assert results == [1] * 5
+        assert flights.coalesced_total == 4
+        assert flights.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_shared_and_not_remembered(self):
+        """Test waiters see the failure and the next call runs again."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert await flights.do("key", lambda: asyncio.sleep(0, result="ok")) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_call(self):
+        """Test the call keeps running for the others when its starter is cancelled."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "done"
+        assert first.cancelled()
+        assert flights.calls_total == 1
+        assert flights.in_flight == 0
+
+
+class TestTranscriptionCache:
+    """Test LRU, TTL and disk tiers."""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = TranscriptionCache(max_entries=2, ttl_seconds=60, disk_dir="")
+
+        await cache.set("a", {"text": "a"})
+        await cache.set("b", {"text": "b"})
+        await cache.get("a")
+        await cache.set("c", {"text": "c"})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"text": "a"}
+        assert cache.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, monkeypatch):
+        """Test entries are not served after the TTL."""
+        cache = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir="")
+        await cache.set("a", {"text": "a"})
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+
+        assert await cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_shared_between_instances(self, tmp_path):
+        """Test another process's cache (same directory) serves the entry."""
+        writer = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir=tmp_path)
+        reader = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir=tmp_path)
+
+        await writer.set("abcdef", {"text": "milk"})
+
+        assert await reader.get("abcdef") == {"text": "milk"}
+        assert reader.disk_hits == 1
+        assert await reader.get("abcdef") == {"text": "milk"}
+        assert reader.hits == 1
+
+    def test_key_covers_language_and_model(self):
+        """Test the same audio with another language or model is a different entry."""
+        key = TranscriptionCache.make_key("digest", "en", "voxtral-24.05")
+
+        assert key == TranscriptionCache.make_key("digest", "en", "voxtral-24.05")
+        assert key != TranscriptionCache.make_key("digest", "es", "voxtral-24.05")
+        assert key != TranscriptionCache.make_key("digest", "en", "voxtral-25.01")
+
+
+class TestVoiceServiceCaching:
+    """Test VoiceService consults the cache before calling Voxtral."""
+
+    @pytest.fixture(autouse=True)
+    def api_key(self, monkeypatch):
+        monkeypatch.setattr(voice_module.settings, "voxtral_api_key", "test-key", raising=False)
+
+    @pytest.fixture
+    def api(self):
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await request.aread()
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"text": "add two cups of milk"})
+
+        return calls, httpx.MockTransport(handler)
+
+    @pytest.mark.asyncio
+    async def test_retry_served_from_cache(self, api):
+        """Test an identical retry skips the API and is marked cached."""
+        calls, transport = api
+        cache = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir="")
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = VoiceService(client=client, cache=cache)
+            first = await service.transcribe_bytes(b"RIFF-audio", "clip.wav", "en")
+            retry = await service.transcribe_bytes(b"RIFF-audio", "clip.wav", "en")
+            other_language = await service.transcribe_bytes(b"RIFF-audio", "clip.wav", "fr")
+
+        assert len(calls) == 2
+        assert not first.cached and retry.cached and not other_language.cached
+        assert retry.text == first.text
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_single_flighted(self, api):
+        """Test concurrent identical uploads make one API call."""
+        calls, transport = api
+        cache = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir="")
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = VoiceService(client=client, cache=cache)
+            results = await asyncio.gather(*(
+                service.transcribe_bytes(b"RIFF-audio", "clip.wav") for _ in range(4)
+            ))
+
+        assert len(calls) == 1
+        assert sum(result.cached for result in results) == 3
+        assert cache.metrics()["coalesced"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cache_bypass(self, api):
+        """Test use_cache=False always calls the API."""
+        calls, transport = api
+        cache = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir="")
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = VoiceService(client=client, cache=cache)
+            await service.transcribe_bytes(b"RIFF-audio", use_cache=False)
+            await service.transcribe_bytes(b"RIFF-audio", use_cache=False)
+
+        assert len(calls) == 2
+        assert cache.metrics()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fallback_results_not_cached(self):
+        """Test a transcription from the fallback is not stored under the Voxtral key."""
+        fallback = StubSTTProvider(name="whisper")
+        cache = TranscriptionCache(max_entries=10, ttl_seconds=60, disk_dir="")
+        service = VoiceService(cache=cache, router=STTRouter([fallback], hedge=False))
+
+        first = await service.transcribe_bytes(b"RIFF-audio", "clip.wav")
+        retry = await service.transcribe_bytes(b"RIFF-audio", "clip.wav")
+
+        assert fallback.calls == 2
+        assert first.provider == "whisper" and not retry.cached
+        assert cache.metrics()["entries"] == 0
+        await service.client.aclose()
@@ -0,0 +1,283 @@
+"""
+Unit tests for background transcription jobs.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from bruno_ai_server.models.base import Base
+from bruno_ai_server.models.voice import VoiceJob
+from bruno_ai_server.services import transcription_jobs as jobs_module
+from bruno_ai_server.services.transcription_jobs import (
+    JOB_EVENT_TYPE,
+    JobQueueFullError,
+    SHUTDOWN_ERROR,
+    JobStatus,
+    TranscriptionJobQueue,
+    should_run_as_job,
+)
+
+
+class RecordingHub:
+    """Stands in for the notification hub and records published events."""
+
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, household_id, event_type, data, merge_key=None):
+        self.events.append((household_id, event_type, data))
+
+
+ALICE, BOB, CAROL, DAVE = (uuid.uuid4() for _ in range(4))
+HOUSEHOLD = uuid.uuid4()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Sessions on a file database, so job workers can write concurrently."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def make_queue(session_factory):
+    queues = []
+
+    def make(**kwargs):
+        options = dict(
+            workers=1, max_queued=100, max_queued_per_user=10, result_ttl_seconds=60,
+            hub=RecordingHub(), session_factory=session_factory,
+        )
+        options.update(kwargs)
+        queues.append(TranscriptionJobQueue(**options))
+        return queues[-1]
+
+    yield make
+    for queue in queues:
+        await queue.close()
+
+
+async def wait_finished(queue, *jobs):
+    """Wait until every job's final status is recorded."""
+    for _ in range(500):
+        records = [await queue.get(job.id.hex) for job in jobs]
+        if all(record is not None and record["status"] in ("succeeded", "failed") for record in records):
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("jobs did not finish")
+
+
+class TestScheduling:
+    """Test worker concurrency and per-user fairness."""
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_users(self, make_queue):
+        """Test a user's backlog does not delay another user's single job."""
+        queue = make_queue(workers=1)
+        order = []
+        release = asyncio.Event()
+
+        def work(label, wait=False):
+            async def run():
+                if wait:
+                    await release.wait()
+                order.append(label)
+                return {"label": label}
+            return run
+
+        blocker = await queue.submit(CAROL, work("C1", wait=True))
+        jobs = [await queue.submit(ALICE, work(f"A{n}")) for n in range(1, 4)]
+        jobs.append(await queue.submit(BOB, work("B1")))
+        await asyncio.sleep(0.01)
+        release.set()
+        await wait_finished(queue, blocker, *jobs)
+
+        assert order == ["C1", "A1", "B1", "A2", "A3"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_by_workers(self, make_queue):
+        """Test no more than the configured number of jobs run at once."""
+        queue = make_queue(workers=2)
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return {}
+
+        jobs = [await queue.submit(uuid.uuid4(), work) for _ in range(6)]
+        await wait_finished(queue, *jobs)
+
+        assert peak == 2
+        assert queue.metrics()["succeeded"] == 6
+
+    @pytest.mark.asyncio
+    async def test_queue_limits(self, make_queue):
+        """Test per-user and global limits reject new jobs."""
+        queue = make_queue(max_queued=3, max_queued_per_user=2)
+        hold = asyncio.Event()
+
+        async def work():
+            await hold.wait()
+            return {}
+
+        await queue.submit(ALICE, work)  # Taken by the worker
+        await asyncio.sleep(0.05)
+        await queue.submit(ALICE, work)
+        await queue.submit(ALICE, work)
+        with pytest.raises(JobQueueFullError):
+            await queue.submit(ALICE, work)
+
+        await queue.submit(BOB, work)
+        with pytest.raises(JobQueueFullError):
+            await queue.submit(DAVE, work)
+
+        assert queue.metrics()["rejected"] == 2
+        await queue.close()
+
+
+class TestJobResults:
+    """Test job outcomes, access and completion events."""
+
+    @pytest.mark.asyncio
+    async def test_success_published_to_household(self, make_queue):
+        """Test a finished job's result is stored and published."""
+        queue = make_queue()
+
+        async def work():
+            return {"transcription": {"text": "add milk"}}
+
+        job = await queue.submit(ALICE, work, household_id=HOUSEHOLD)
+        assert (await queue.get(job.id.hex, user_id=ALICE))["status"] == "queued"
+        await wait_finished(queue, job)
+
+        assert (await queue.get(job.id.hex, user_id=ALICE))["result"] == {"transcription": {"text": "add milk"}}
+        household_id, event_type, data = queue.hub.events[0]
+        assert (household_id, event_type) == (HOUSEHOLD, JOB_EVENT_TYPE)
+        assert data["job_id"] == job.id.hex and data["status"] == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_household_event_hides_result(self, make_queue):
+        """Test other household members learn a job finished but not its result."""
+        queue = make_queue()
+
+        async def work():
+            return {"transcription": {"text": "add pregnancy test"}}
+
+        job = await queue.submit(ALICE, work, household_id=HOUSEHOLD)
+        await wait_finished(queue, job)
+
+        _, _, data = queue.hub.events[0]
+        assert data == {"job_id": job.id.hex, "status": "succeeded"}
+        assert await queue.get(data["job_id"], user_id=BOB) is None
+        assert (await queue.get(data["job_id"], user_id=ALICE))["result"] is not None
+
+    @pytest.mark.asyncio
+    async def test_failures_recorded(self, make_queue):
+        """Test HTTP errors keep their status and other errors become 500s."""
+        queue = make_queue()
+
+        async def rejected():
+            raise HTTPException(status_code=413, detail="Audio too long")
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        first = await queue.submit(ALICE, rejected)
+        second = await queue.submit(ALICE, broken)
+        await wait_finished(queue, first, second)
+
+        assert first.status == JobStatus.FAILED
+        assert (await queue.get(first.id.hex))["error"] == {"status_code": 413, "detail": "Audio too long"}
+        assert (await queue.get(second.id.hex))["error"]["status_code"] == 500
+        assert queue.hub.events == []  # No household to notify
+
+    @pytest.mark.asyncio
+    async def test_jobs_private_and_expire(self, make_queue):
+        """Test other users cannot read a job, and results expire."""
+        queue = make_queue(result_ttl_seconds=0)
+
+        async def work():
+            return {}
+
+        job = await queue.submit(ALICE, work)
+        assert await queue.get(job.id.hex, user_id=BOB) is None
+        assert await queue.get(job.id.hex, user_id=ALICE) is not None
+        for _ in range(500):
+            if await queue.get(job.id.hex, user_id=ALICE) is None:
+                break
+            await asyncio.sleep(0.005)
+
+        assert job.finished
+        assert await queue.get(job.id.hex, user_id=ALICE) is None
+
+    @pytest.mark.asyncio
+    async def test_status_readable_from_other_workers(self, make_queue):
+        """Test a job accepted by one process can be polled through another."""
+        accepting, other = make_queue(), make_queue()
+
+        async def work():
+            return {"transcription": {"text": "add milk"}}
+
+        job = await accepting.submit(ALICE, work)
+        await wait_finished(accepting, job)
+
+        record = await other.get(job.id.hex, user_id=ALICE)
+        assert record["status"] == "succeeded"
+        assert record["result"] == {"transcription": {"text": "add milk"}}
+        assert await other.get("not-a-job-id") is None
+
+    @pytest.mark.asyncio
+    async def test_close_fails_unfinished_jobs(self, make_queue, session_factory):
+        """Test closing fails running and queued jobs, sets their expiry and releases queued uploads."""
+        queue = make_queue(workers=1)
+        started = asyncio.Event()
+        released = []
+
+        async def stuck():
+            started.set()
+            await asyncio.Event().wait()
+
+        async def release():
+            released.append(True)
+
+        running = await queue.submit(ALICE, stuck, on_abandon=release)
+        await started.wait()
+        queued = await queue.submit(BOB, stuck, household_id=HOUSEHOLD, on_abandon=release)
+
+        await queue.close()
+
+        assert released == [True]  # Only the job that never started
+        for job in (running, queued):
+            assert (await queue.get(job.id.hex))["error"] == SHUTDOWN_ERROR
+            async with session_factory() as db:
+                record = await db.get(VoiceJob, job.id)
+            assert record.status == "failed"
+            assert record.expires_at is not None
+        assert queue.metrics()["queued"] == 0
+
+
+class TestShouldRunAsJob:
+    """Test the choice between the synchronous and background paths."""
+
+    def test_thresholds(self, monkeypatch):
+        """Test duration decides when known, and size otherwise."""
+        monkeypatch.setattr(jobs_module.settings, "voice_job_min_duration_seconds", 20.0, raising=False)
+        monkeypatch.setattr(jobs_module.settings, "voice_job_min_bytes", 1000, raising=False)
+
+        assert not should_run_as_job(3.0, 10_000_000)
+        assert should_run_as_job(45.0, 100)
+        assert should_run_as_job(None, 5000)
+        assert not should_run_as_job(None, 500)
@@ -0,0 +1,247 @@
+"""
+Unit tests for the TTS audio cache and its disk tier.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from bruno_ai_server.services.tts_cache import TTSAudioCache, TTSDiskCache
+from bruno_ai_server.services.tts_service import (
+    TTSProvider,
+    TTSRequest,
+    TTSResult,
+    TTSService,
+    TTSVoice,
+    VoiceGender,
+)
+
+
+def make_result(audio: bytes) -> TTSResult:
+    return TTSResult(
+        audio_data=audio,
+        audio_format="mp3",
+        duration_ms=1000,
+        voice_used=TTSVoice(id="rachel", name="Rachel", language="en", gender=VoiceGender.FEMALE),
+        provider=TTSProvider.ELEVENLABS,
+        processing_time_ms=120,
+    )
+
+
+class TestTTSAudioCache:
+    """Test byte accounting, LRU eviction and expiry."""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test entries are evicted oldest-use first until the new one fits."""
+        cache = TTSAudioCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 40)
+        cache.set("b", "B", 40)
+        assert cache.get("a") == "A"  # "b" is now least recently used
+
+        cache.set("c", "C", 40)
+
+        assert "b" not in cache
+        assert cache.get("a") == "A" and cache.get("c") == "C"
+        assert cache.current_bytes == 80
+        assert cache.metrics()["evictions"] == 1
+
+    def test_replacing_entry_updates_size(self):
+        """Test overwriting a key does not double-count its bytes."""
+        cache = TTSAudioCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "small", 10)
+        cache.set("a", "large", 70)
+
+        assert cache.current_bytes == 70
+        assert len(cache) == 1
+
+    def test_rejects_entry_larger_than_cache(self):
+        """Test an oversized entry is not stored and evicts nothing."""
+        cache = TTSAudioCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 50)
+
+        assert not cache.set("huge", "H", 500)
+        assert cache.get("a") == "A"
+        assert cache.metrics()["rejected"] == 1
+
+    def test_expired_entries_dropped(self, monkeypatch):
+        """Test entries past their TTL are removed and count as misses."""
+        cache = TTSAudioCache(max_bytes=100, ttl_seconds=10)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache.set("a", "A", 30)
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+        assert cache.get("a") is None
+        assert cache.current_bytes == 0
+        metrics = cache.metrics()
+        assert (metrics["expirations"], metrics["misses"]) == (1, 1)
+
+    def test_hit_rate(self):
+        """Test hit rate counts hits over all lookups."""
+        cache = TTSAudioCache(max_bytes=100, ttl_seconds=60)
+        cache.set("a", "A", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+
+        assert cache.metrics()["hit_rate"] == 0.75
+
+
+class TestTTSServiceCache:
+    """Test TTSService stores raw audio in the cache."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_keeps_raw_bytes(self):
+        """Test a cached result comes back with the same bytes, marked as a hit."""
+        service = TTSService(cache=TTSAudioCache(max_bytes=1024, ttl_seconds=60))
+        key = service._get_cache_key(TTSRequest(text="Milk expires tomorrow", voice_id="rachel"))
+        audio = bytes(range(256))
+
+        await service._cache_set(key, make_result(audio))
+        cached = await service._cache_get(key)
+
+        assert cached.cache_hit
+        assert cached.audio_data is audio
+        assert service.cache.current_bytes == 256
+        await service.client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_health_reports_cache_metrics(self):
+        """Test cache metrics appear in the health check."""
+        service = TTSService(cache=TTSAudioCache(max_bytes=1024, ttl_seconds=60))
+        await service._cache_set("key", make_result(b"\x00" * 100))
+
+        health = await service.health_check()
+
+        assert health["cache_size"] == 1
+        assert health["cache"]["bytes"] == 100
+        await service.client.aclose()
+
+
+class TestTTSDiskCache:
+    """Test the shared on-disk tier."""
+
+    def test_round_trip_and_content_addressing(self, tmp_path):
+        """Test entries survive a new cache instance and identical audio is stored once."""
+        writer = TTSDiskCache(tmp_path, ttl_seconds=60)
+        path = writer.set("key-a", b"ID3 audio", "mp3", {"duration_ms": 10})
+        writer.set("key-b", b"ID3 audio", "mp3", {"duration_ms": 10})
+
+        found_path, metadata = TTSDiskCache(tmp_path, ttl_seconds=60).get("key-b")
+
+        assert found_path == path and path.read_bytes() == b"ID3 audio"
+        assert metadata == {"duration_ms": 10}
+        assert len(list(tmp_path.glob("audio/*/*.mp3"))) == 1
+
+    def test_expired_entries_pruned(self, tmp_path, monkeypatch):
+        """Test expired entries miss and prune removes their files."""
+        cache = TTSDiskCache(tmp_path, ttl_seconds=10)
+        cache.set("key", b"audio", "mp3", {})
+        later = time.time() + 11
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        assert cache.get("key") is None
+        cache.prune()
+        assert list(tmp_path.glob("*/*/*")) == []
+
+    def test_prune_evicts_oldest_audio_over_limit(self, tmp_path):
+        """Test pruning deletes the least recently written audio until it fits max_bytes."""
+        cache = TTSDiskCache(tmp_path, ttl_seconds=3600, max_bytes=10)
+        now = time.time()
+        for age, key in enumerate(["new", "middle", "old"]):
+            path = cache.set(key, f"{key:<6}".encode(), "mp3", {})  # 6 bytes each
+            os.utime(path, (now - age * 60, now - age * 60))
+
+        cache.prune()
+
+        assert cache.get("new") is not None
+        assert cache.get("middle") is None and cache.get("old") is None
+        assert cache.metrics()["evictions"] == 2
+        assert cache.metrics()["audio_bytes"] == 6
+
+
+class TestTTSServiceDiskTier:
+    """Test TTSService shares synthesized audio across processes."""
+
+    @staticmethod
+    def make_service(directory, calls):
+        service = TTSService(
+            cache=TTSAudioCache(max_bytes=1024 * 1024, ttl_seconds=60),
+            disk_cache=TTSDiskCache(directory, ttl_seconds=60)
+        )
+        service._available_providers = [TTSProvider.ELEVENLABS]
+
+        async def fake_elevenlabs(request):
+            calls.append(request.text)
+            return make_result(b"ID3" + request.text.encode())
+
+        service._synthesize_elevenlabs = fake_elevenlabs
+        return service
+
+    @pytest.mark.asyncio
+    async def test_second_worker_skips_provider(self, tmp_path):
+        """Test a phrase synthesized by one worker is served from disk to another."""
+        calls = []
+        request = TTSRequest(text="Added milk to your pantry", voice_id="rachel")
+        first = self.make_service(tmp_path, calls)
+        second = self.make_service(tmp_path, calls)
+
+        await first.synthesize(request)
+        result = await second.synthesize(request)
+        again = await second.synthesize(request)
+
+        assert calls == ["Added milk to your pantry"]
+        assert result.cache_hit and result.audio_data == b"ID3Added milk to your pantry"
+        assert again.cache_hit and second.cache.hits == 1
+        await first.client.aclose()
+        await second.client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_synthesize_file_serves_path(self, tmp_path):
+        """Test a disk hit returns the file without reading the audio."""
+        calls = []
+        service = self.make_service(tmp_path, calls)
+        request = TTSRequest(text="Milk expires tomorrow", voice_id="rachel")
+
+        miss, miss_path = await service.synthesize_file(request)
+        hit, hit_path = await service.synthesize_file(request)
+
+        assert not miss.cache_hit and miss_path.read_bytes() == b"ID3Milk expires tomorrow"
+        assert hit.cache_hit and hit.audio_data == b"" and hit_path == miss_path
+        assert hit.voice_used.gender == VoiceGender.FEMALE
+        assert len(calls) == 1
+        await service.client.aclose()
+
+
+class TestTTSServiceCoalescing:
+    """Test identical concurrent syntheses share one provider call."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_call(self):
+        """Test N concurrent requests make one provider call and one cache fill."""
+        service = TTSService(cache=TTSAudioCache(max_bytes=1024 * 1024, ttl_seconds=60))
+        service._available_providers = [TTSProvider.ELEVENLABS]
+        calls = []
+
+        async def fake_elevenlabs(request):
+            calls.append(request.text)
+            await asyncio.sleep(0.01)
+            return make_result(b"ID3" + request.text.encode())
+
+        service._synthesize_elevenlabs = fake_elevenlabs
+        request = TTSRequest(text="Milk expires today", voice_id="rachel")
+
+        results = await asyncio.gather(*(service.synthesize(request) for _ in range(5)))
+
+        assert calls == ["Milk expires today"]
+        assert all(result.audio_data == b"ID3Milk expires today" for result in results)
+        assert [result.cache_hit for result in results].count(False) == 1
+        assert len(service.cache) == 1
+
+        metrics = (await service.health_check())["coalescing"]
+        assert (metrics["calls_total"], metrics["coalesced_total"], metrics["max_waiters"]) == (1, 4, 4)
+        assert metrics["coalescing_ratio"] == 0.8 and metrics["waiting"] == 0
+        await service.client.aclose()
@@ -0,0 +1,137 @@
+"""
+Unit tests for templated TTS phrases.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from bruno_ai_server.services.tts_cache import TTSAudioCache
+from bruno_ai_server.services.tts_phrases import (
+    PhraseSegment,
+    TTSPhraseLibrary,
+    parse_template,
+    splice_mp3,
+)
+from bruno_ai_server.services.tts_service import (
+    TTSProvider,
+    TTSResult,
+    TTSService,
+    TTSVoice,
+    VoiceGender,
+)
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo: 417-byte frames
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_LENGTH = 417
+
+
+def make_frame(fill: int) -> bytes:
+    return FRAME_HEADER + bytes([fill]) * (FRAME_LENGTH - 4)
+
+
+def make_xing_frame() -> bytes:
+    frame = bytearray(make_frame(0))
+    frame[36:48] = b"Xing" + (1).to_bytes(4, "big") + (2).to_bytes(4, "big")
+    return bytes(frame)
+
+
+def make_mp3(fill: int) -> bytes:
+    """An MP3 file with an ID3 tag, a Xing frame and one audio frame."""
+    id3 = b"ID3\x03\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    return id3 + make_xing_frame() + make_frame(fill)
+
+
+def make_service(calls, audio_format="mp3") -> TTSService:
+    service = TTSService(cache=TTSAudioCache(max_bytes=1024 * 1024, ttl_seconds=60))
+    service._available_providers = [TTSProvider.ELEVENLABS]
+
+    async def fake_elevenlabs(request):
+        calls.append(request.text)
+        return TTSResult(
+            audio_data=make_mp3(len(calls)) if audio_format == "mp3" else b"RIFF" + request.text.encode(),
+            audio_format=audio_format,
+            duration_ms=26,
+            voice_used=TTSVoice(id="rachel", name="Rachel", language="en", gender=VoiceGender.FEMALE),
+            provider=TTSProvider.ELEVENLABS,
+            processing_time_ms=100,
+        )
+
+    service._synthesize_elevenlabs = fake_elevenlabs
+    return service
+
+
+TEMPLATES = {"item_added": "Added {quantity} {item} to your pantry", "undo_done": "Okay, I undid that"}
+
+
+class TestTemplates:
+    """Test template parsing and MP3 splicing."""
+
+    def test_parse_template(self):
+        """Test fixed text and slots are split in order."""
+        assert parse_template("Added {quantity} {item} to your pantry") == [
+            PhraseSegment(text="Added"),
+            PhraseSegment(slot="quantity"),
+            PhraseSegment(slot="item"),
+            PhraseSegment(text="to your pantry"),
+        ]
+
+    def test_splice_drops_tags_and_info_frames(self):
+        """Test only the audio frames of each segment are kept."""
+        spliced = splice_mp3([make_mp3(1), make_mp3(2)])
+
+        assert spliced == make_frame(1) + make_frame(2)
+
+    def test_splice_rejects_non_mp3(self):
+        """Test a segment that is not MPEG audio cannot be spliced."""
+        with pytest.raises(ValueError):
+            splice_mp3([make_mp3(1), b"RIFF....WAVE"])
+
+
+class TestPhraseLibrary:
+    """Test rendering phrases from cached segments."""
+
+    @pytest.mark.asyncio
+    async def test_render_reuses_cached_segments(self):
+        """Test only new slot values reach the provider after pre-warming."""
+        calls = []
+        phrases = TTSPhraseLibrary(make_service(calls), templates=TEMPLATES, voice_id="rachel")
+
+        counts = await phrases.prewarm()
+        assert counts == {"warmed": 3, "failed": 0}
+        assert sorted(calls) == ["Added", "Okay, I undid that", "to your pantry"]
+
+        first = await phrases.render("item_added", {"quantity": 2, "item": "apples"})
+        assert calls[3:] == ["2", "apples"]
+        assert not first.cache_hit
+        assert first.audio_format == "mp3" and len(first.audio_data) == 4 * FRAME_LENGTH
+        assert first.duration_ms == 4 * 26
+
+        again = await phrases.render("item_added", {"quantity": 2, "item": "apples"})
+        assert again.cache_hit and again.audio_data == first.audio_data
+        assert len(calls) == 5
+        assert phrases.metrics()["prewarmed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_invalid_requests(self):
+        """Test unknown templates and missing slot values are rejected."""
+        phrases = TTSPhraseLibrary(make_service([]), templates=TEMPLATES, voice_id="rachel")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await phrases.render("item_sold", {})
+        assert exc_info.value.status_code == 404
+
+        with pytest.raises(HTTPException) as exc_info:
+            await phrases.render("item_added", {"item": "apples"})
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_non_mp3_synthesized_whole(self):
+        """Test segments that cannot be spliced fall back to one synthesis."""
+        calls = []
+        phrases = TTSPhraseLibrary(make_service(calls, audio_format="wav"), templates=TEMPLATES, voice_id="rachel")
+
+        result = await phrases.render("item_added", {"quantity": 1, "item": "milk"})
+
+        assert calls[-1] == "Added 1 milk to your pantry"
+        assert result.audio_data == b"RIFFAdded 1 milk to your pantry"
+        assert phrases.metrics()["fallbacks"] == 1
@@ -0,0 +1,176 @@
+"""
+Unit tests for latency-aware TTS provider routing.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from bruno_ai_server.services.tts_cache import TTSAudioCache
+from bruno_ai_server.services.tts_service import (
+    TTSProvider,
+    TTSRequest,
+    TTSResult,
+    TTSService,
+    TTSVoice,
+    VoiceGender,
+)
+
+RACHEL = "21m00Tcm4TlvDq8ikWAM"
+
+
+class FakeProviders:
+    """Scripted ElevenLabs and Google Cloud synthesis for a TTSService."""
+
+    def __init__(self, service: TTSService):
+        self.calls = []
+        self.delays = {TTSProvider.ELEVENLABS: 0.0, TTSProvider.GOOGLE_CLOUD: 0.0}
+        self.failing = set()
+        service._synthesize_elevenlabs = lambda request: self.synthesize(TTSProvider.ELEVENLABS, request)
+        service._synthesize_google_cloud = lambda request: self.synthesize(TTSProvider.GOOGLE_CLOUD, request)
+
+    async def synthesize(self, provider: TTSProvider, request: TTSRequest) -> TTSResult:
+        self.calls.append((provider, request.voice_id))
+        await asyncio.sleep(self.delays[provider])
+        if provider in self.failing:
+            raise HTTPException(status_code=502, detail=f"{provider.value} unavailable")
+        return TTSResult(
+            audio_data=b"ID3" + request.text.encode(),
+            audio_format="mp3",
+            duration_ms=100,
+            voice_used=TTSVoice(id=request.voice_id, name="Voice", language="en", gender=VoiceGender.FEMALE),
+            provider=provider,
+            processing_time_ms=10,
+        )
+
+
+def make_service(**kwargs):
+    options = dict(hedge=True, hedge_min_delay=0.02, hedge_min_samples=3, breaker_failure_threshold=2, breaker_recovery_seconds=60)
+    options.update(kwargs)
+    service = TTSService(cache=TTSAudioCache(max_bytes=1024 * 1024, ttl_seconds=60), **options)
+    service._available_providers = [TTSProvider.ELEVENLABS, TTSProvider.GOOGLE_CLOUD]
+    return service, FakeProviders(service)
+
+
+def record_history(service: TTSService, provider: TTSProvider, latency_ms: float, samples: int = 3):
+    for _ in range(samples):
+        service.provider_stats[provider].record_latency(latency_ms)
+
+
+class TestRouting:
+    """Test provider ranking from measured latency."""
+
+    def test_flexible_voice_goes_to_fastest_provider(self):
+        """Test measured latency decides unless the voice pins a provider."""
+        service, _ = make_service()
+        record_history(service, TTSProvider.ELEVENLABS, 300)
+        record_history(service, TTSProvider.GOOGLE_CLOUD, 50)
+
+        flexible = service._route(TTSRequest(text="Milk", voice_id=RACHEL, flexible_voice=True))
+        pinned = service._route(TTSRequest(text="Milk", voice_id=RACHEL))
+
+        assert [(provider, request.voice_id) for provider, request in flexible] == [
+            (TTSProvider.GOOGLE_CLOUD, "en-US-Neural2-F"),
+            (TTSProvider.ELEVENLABS, RACHEL),
+        ]
+        assert [provider for provider, _ in pinned] == [TTSProvider.ELEVENLABS, TTSProvider.GOOGLE_CLOUD]
+
+    @pytest.mark.asyncio
+    async def test_every_synthesis_recorded(self):
+        """Test latency and outcome are recorded on each provider call."""
+        service, _ = make_service()
+
+        await service.synthesize(TTSRequest(text="Added milk", voice_id=RACHEL))
+
+        stats = service.provider_metrics()["elevenlabs"]
+        assert (stats["requests"], stats["successes"], stats["recent_error_rate"]) == (1, 1, 0.0)
+        assert stats["latency_ms"]["p50"] is not None
+        await service.client.aclose()
+
+
+class TestEjection:
+    """Test failing providers are skipped for a while."""
+
+    @pytest.mark.asyncio
+    async def test_failing_provider_ejected(self):
+        """Test consecutive failures open the circuit and traffic moves on."""
+        service, fakes = make_service()
+        fakes.failing.add(TTSProvider.ELEVENLABS)
+
+        for text in ("Added milk", "Added eggs", "Added bread"):
+            result = await service.synthesize(TTSRequest(text=text, voice_id=RACHEL))
+            assert result.provider == TTSProvider.GOOGLE_CLOUD
+
+        assert [provider for provider, _ in fakes.calls].count(TTSProvider.ELEVENLABS) == 2
+        assert ("google_cloud", "en-US-Neural2-F") in [(p.value, voice) for p, voice in fakes.calls]
+
+        health = await service.health_check()
+        assert health["providers"]["elevenlabs"]["status"] == "unhealthy"
+        assert health["providers"]["elevenlabs"]["stats"]["circuit"] == "open"
+        assert health["providers"]["google_cloud"]["status"] == "healthy"
+        assert health["status"] == "healthy"
+        await service.client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_substituted_voice_cached_under_its_own_key(self):
+        """Test fallback audio in another voice is not served for the requested voice."""
+        service, fakes = make_service()
+        fakes.failing.add(TTSProvider.ELEVENLABS)
+        request = TTSRequest(text="Added milk", voice_id=RACHEL)
+
+        result = await service.synthesize(request)
+
+        assert result.voice_used.id == "en-US-Neural2-F"
+        assert await service._cache_get(service._get_cache_key(request)) is None
+        substituted = TTSRequest(text="Added milk", voice_id="en-US-Neural2-F")
+        assert await service._cache_get(service._get_cache_key(substituted)) is not None
+        await service.client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing(self):
+        """Test the last provider error is raised when every provider fails."""
+        service, fakes = make_service()
+        fakes.failing.update({TTSProvider.ELEVENLABS, TTSProvider.GOOGLE_CLOUD})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.synthesize(TTSRequest(text="Added milk", voice_id=RACHEL))
+
+        assert exc_info.value.status_code == 502
+        assert "google_cloud" in exc_info.value.detail
+        await service.client.aclose()
+
+
+class TestHedging:
+    """Test slow responses are raced against the next provider."""
+
+    @pytest.mark.asyncio
+    async def test_slow_provider_hedged(self):
+        """Test a call past the provider's p95 is hedged and the faster result wins."""
+        service, fakes = make_service()
+        record_history(service, TTSProvider.ELEVENLABS, 10)
+        fakes.delays[TTSProvider.ELEVENLABS] = 5.0
+
+        started = time.monotonic()
+        result = await service.synthesize(TTSRequest(text="Added milk", voice_id=RACHEL))
+
+        assert result.provider == TTSProvider.GOOGLE_CLOUD
+        assert time.monotonic() - started < 1.0
+        stats = service.provider_stats[TTSProvider.ELEVENLABS]
+        assert (stats.hedges_sent, stats.hedges_won) == (1, 1)
+        assert stats.sample_count == 3
+        assert service.breakers[TTSProvider.ELEVENLABS].consecutive_failures == 0
+        await service.client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_history(self):
+        """Test providers without enough latency samples are not hedged."""
+        service, fakes = make_service()
+        fakes.delays[TTSProvider.ELEVENLABS] = 0.05
+
+        result = await service.synthesize(TTSRequest(text="Added milk", voice_id=RACHEL))
+
+        assert result.provider == TTSProvider.ELEVENLABS
+        assert [provider for provider, _ in fakes.calls] == [TTSProvider.ELEVENLABS]
+        await service.client.aclose()
@@ -0,0 +1,128 @@
+"""
+Unit tests for streaming TTS synthesis.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from bruno_ai_server.services import tts_service as tts_module
+from bruno_ai_server.services.tts_cache import TTSAudioCache
+from bruno_ai_server.services.tts_service import (
+    TTSProvider,
+    TTSRequest,
+    TTSResult,
+    TTSService,
+    TTSVoice,
+    VoiceGender,
+)
+
+REQUEST = TTSRequest(text="Added milk to your pantry", voice_id="rachel")
+
+
+@pytest.fixture
+def elevenlabs_key(monkeypatch):
+    monkeypatch.setattr(tts_module.settings, "elevenlabs_api_key", "test-key", raising=False)
+    monkeypatch.setattr(tts_module.settings, "gcp_credentials_json", "{}", raising=False)
+
+
+def make_service(handler) -> TTSService:
+    service = TTSService(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        cache=TTSAudioCache(max_bytes=1024 * 1024, ttl_seconds=60)
+    )
+    return service
+
+
+class TestElevenLabsStreaming:
+    """Test relaying the ElevenLabs stream."""
+
+    @pytest.mark.asyncio
+    async def test_first_chunk_before_synthesis_finishes(self, elevenlabs_key):
+        """Test audio is relayed as it arrives and cached once complete."""
+        finish = asyncio.Event()
+        requests = []
+
+        async def body():
+            yield b"ID3-first"
+            await finish.wait()
+            yield b"-rest"
+
+        async def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=body())
+
+        service = make_service(handler)
+        stream = await service.synthesize_stream(REQUEST)
+
+        first = await stream.chunks.__anext__()
+        assert first == b"ID3-first"
+        assert not finish.is_set()  # The provider is still synthesizing
+
+        finish.set()
+        rest = [chunk async for chunk in stream.chunks]
+
+        assert b"".join([first, *rest]) == b"ID3-first-rest"
+        assert requests[0].url.path.endswith("/text-to-speech/rachel/stream")
+
+        replay = await service.synthesize_stream(REQUEST)
+        assert replay.cache_hit
+        assert b"".join([chunk async for chunk in replay.chunks]) == b"ID3-first-rest"
+        assert len(requests) == 1
+        assert service.stream_metrics()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_not_cached(self, elevenlabs_key):
+        """Test a stream the client stops reading leaves nothing in the cache."""
+        async def body():
+            yield b"ID3-first"
+            yield b"-rest"
+
+        service = make_service(lambda request: httpx.Response(200, content=body()))
+        stream = await service.synthesize_stream(REQUEST)
+
+        await stream.chunks.__anext__()
+        await stream.chunks.aclose()
+
+        assert len(service.cache) == 0
+        assert service.stream_metrics()["abandoned"] == 1
+
+
+class TestStreamingFallback:
+    """Test falling back to Google Cloud TTS when the stream cannot open."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_google(self, elevenlabs_key, monkeypatch):
+        """Test an ElevenLabs error streams the Google result instead."""
+        monkeypatch.setattr(tts_module.settings, "gcp_credentials_json", '{"type": "service_account"}', raising=False)
+        service = make_service(lambda request: httpx.Response(500, json={"detail": {"message": "busy"}}))
+
+        async def fake_google(request):
+            return TTSResult(
+                audio_data=b"ID3-google",
+                audio_format="mp3",
+                duration_ms=100,
+                voice_used=TTSVoice(id="en-US-Neural2-F", name="Google", language="en", gender=VoiceGender.FEMALE),
+                provider=TTSProvider.GOOGLE_CLOUD,
+                processing_time_ms=50,
+            )
+
+        service._synthesize_google_cloud = fake_google
+        stream = await service.synthesize_stream(REQUEST)
+
+        assert stream.provider == TTSProvider.GOOGLE_CLOUD
+        assert b"".join([chunk async for chunk in stream.chunks]) == b"ID3-google"
+        assert service.stream_metrics()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_without_fallback(self, elevenlabs_key):
+        """Test the ElevenLabs error is raised when Google is not configured."""
+        service = make_service(lambda request: httpx.Response(500, json={"detail": {"message": "busy"}}))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.synthesize_stream(REQUEST)
+
+        assert exc_info.value.status_code == 502
+        assert "busy" in exc_info.value.detail
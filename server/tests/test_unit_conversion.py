@@ -0,0 +1,127 @@
+"""
+Unit tests for the unit conversion engine and stored base quantities.
+"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from bruno_ai_server.models.pantry import PantryItem
+from bruno_ai_server.models.user import Household, User
+from bruno_ai_server.services.command_parser import CommandParser
+from bruno_ai_server.services.unit_conversion import (
+    UnitConversionError,
+    convert,
+    normalize_unit,
+    to_base_quantity,
+)
+
+
+@pytest_asyncio.fixture
+async def household(test_session):
+    """Create an empty household."""
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", name="Cook")
+    test_session.add(user)
+    await test_session.flush()
+
+    household = Household(name="Home", invite_code=uuid.uuid4().hex[:8], admin_user_id=user.id)
+    test_session.add(household)
+    await test_session.flush()
+    return household
+
+
+class TestConversion:
+    """Test unit normalization and conversion."""
+
+    def test_normalize_aliases(self):
+        """Test spoken and written aliases map to standard units."""
+        assert normalize_unit("LBS") == "pound"
+        assert normalize_unit("fl  oz") == "fluid_ounce"
+        assert normalize_unit("fluid_ounce") == "fluid_ounce"
+        assert normalize_unit("handful") is None
+
+    def test_same_dimension(self):
+        """Test conversion within a dimension."""
+        assert convert(1, "gallon", "quart") == pytest.approx(4.0, rel=1e-4)
+        assert convert(2, "lb", "g") == pytest.approx(907.184)
+        assert convert(1, "dozen", "piece") == 12
+
+    def test_density_conversion(self):
+        """Test volume converts to mass for foods with a density hint."""
+        assert convert(1, "cup", "gram", "all purpose flour") == pytest.approx(125.4, rel=1e-3)
+
+    def test_incompatible_units_raise(self):
+        """Test conversions without a shared dimension or density fail."""
+        with pytest.raises(UnitConversionError):
+            convert(1, "cup", "gram", "mystery powder")
+        with pytest.raises(UnitConversionError):
+            convert(1, "can", "piece")
+        with pytest.raises(UnitConversionError):
+            convert(1, "handful", "gram")
+
+
+class TestBaseQuantity:
+    """Test canonical base quantities."""
+
+    def test_base_units(self):
+        """Test each dimension reduces to its base unit."""
+        assert to_base_quantity(1, "gallon", "milk") == (pytest.approx(3785.41), "milliliter")
+        assert to_base_quantity(2, "lbs", "chicken") == (pytest.approx(907.184), "gram")
+        assert to_base_quantity(1, "dozen", "eggs") == (12.0, "piece")
+        assert to_base_quantity(3, "cans", "beans") == (3.0, "can")
+        assert to_base_quantity(2, "sticks", "celery") == (None, None)
+
+    def test_dry_goods_measured_by_volume_stored_by_mass(self):
+        """Test cups of flour and grams of flour share a base unit."""
+        assert to_base_quantity(2, "cups", "flour")[1] == "gram"
+        assert to_base_quantity(500, "g", "flour")[1] == "gram"
+
+    def test_parser_shares_unit_vocabulary(self):
+        """Test every unit the parser emits is understood by the engine."""
+        parser = CommandParser()
+
+        assert all(normalize_unit(alias) == unit for alias, unit in parser.unit_lookup.items())
+
+
+class TestStoredBaseQuantity:
+    """Test base quantities computed on write."""
+
+    @pytest.mark.asyncio
+    async def test_computed_on_insert_and_update(self, test_session, household):
+        """Test the base quantity follows quantity and unit changes."""
+        item = PantryItem(
+            name="Milk", quantity=1, unit="gallon",
+            household_id=household.id, added_by_user_id=household.admin_user_id,
+        )
+        test_session.add(item)
+        await test_session.flush()
+
+        assert item.base_unit == "milliliter"
+        assert item.base_quantity == pytest.approx(3785.41)
+
+        item.quantity = 0.5
+        await test_session.flush()
+
+        assert item.base_quantity == pytest.approx(1892.705)
+
+    @pytest.mark.asyncio
+    async def test_totals_aggregate_in_sql(self, test_session, household):
+        """Test mixed units of one food sum in a single query."""
+        for quantity, unit in [(1, "lb"), (250, "g"), (1, "cup")]:
+            test_session.add(PantryItem(
+                name="Flour", quantity=quantity, unit=unit,
+                household_id=household.id, added_by_user_id=household.admin_user_id,
+            ))
+        await test_session.flush()
+
+        result = await test_session.execute(
+            select(PantryItem.base_unit, func.sum(PantryItem.base_quantity))
+            .where(PantryItem.household_id == household.id, PantryItem.name == "Flour")
+            .group_by(PantryItem.base_unit)
+        )
+
+        assert [(unit, pytest.approx(total, rel=1e-3)) for unit, total in result] == [
+            ("gram", 453.592 + 250 + 236.588 * 0.53)
+        ]
@@ -0,0 +1,63 @@
+"""
+Regression gate for voice command parsing accuracy and latency.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from voice_command_harness import (  # noqa: E402
+    DEFAULT_CORPUS,
+    check_thresholds,
+    evaluate,
+    load_corpus,
+    thresholds_path_for,
+)
+
+
+# Latency thresholds are absolute wall-clock numbers, so they only mean
+# something on the reference machine; run them with RUN_LATENCY_BENCHMARKS=1
+latency_benchmark = pytest.mark.skipif(
+    os.environ.get("RUN_LATENCY_BENCHMARKS") != "1",
+    reason="set RUN_LATENCY_BENCHMARKS=1 to check latency thresholds",
+)
+
+
+@pytest.fixture(scope="module")
+def report():
+    return evaluate(load_corpus(DEFAULT_CORPUS), repeat=10)
+
+
+@pytest.fixture(scope="module")
+def thresholds():
+    with open(thresholds_path_for(DEFAULT_CORPUS), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestVoiceCommandBenchmark:
+    """Test the parser against the labeled corpus."""
+
+    def test_corpus_labels_are_valid(self):
+        """Test every example has a unique id and a known action."""
+        corpus = load_corpus(DEFAULT_CORPUS)
+        actions = {"add", "update", "delete", "list", "search", "check",
+                   "increment", "decrement", "use", "set_quantity"}
+
+        assert len({example["id"] for example in corpus}) == len(corpus)
+        assert {example["action"] for example in corpus} <= actions
+
+    def test_accuracy_has_not_regressed(self, report, thresholds):
+        """Test per-action precision/recall and entity F1 stay above thresholds."""
+        assert check_thresholds(report, thresholds, check_latency=False) == []
+
+    @latency_benchmark
+    def test_latency_has_not_regressed(self, report, thresholds):
+        """Test p99 latency and throughput stay within thresholds."""
+        failures = check_thresholds(report, thresholds)
+
+        assert [failure for failure in failures if "latency" in failure or "throughput" in failure] == []
@@ -0,0 +1,248 @@
+"""
+Unit tests for server-side voice command execution.
+"""
+
+import uuid
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.future import select
+
+from bruno_ai_server.models.pantry import PantryItem
+from bruno_ai_server.models.user import Household, User
+from bruno_ai_server.services import voice_command_executor as executor_module
+from bruno_ai_server.services.command_parser import CommandResult, PantryAction, ParsedEntity
+from bruno_ai_server.services.notification_hub import PANTRY_ITEM_CHANGED, NotificationHub
+from bruno_ai_server.services.voice_command_executor import VoiceCommandExecutor
+
+
+def command(action, *entities):
+    return CommandResult(action=action, entities=list(entities), raw_text="", confidence=0.9)
+
+
+@pytest_asyncio.fixture
+async def household(test_session):
+    """Create a household with milk and eggs."""
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex[:8]}@example.com", name="Cook")
+    test_session.add(user)
+    await test_session.flush()
+
+    household = Household(name="Home", invite_code=uuid.uuid4().hex[:8], admin_user_id=user.id)
+    test_session.add(household)
+    await test_session.flush()
+
+    test_session.add_all([
+        PantryItem(name="Whole Milk", quantity=1, unit="gallon", household_id=household.id, added_by_user_id=user.id),
+        PantryItem(name="Eggs", quantity=12, unit="piece", household_id=household.id, added_by_user_id=user.id),
+    ])
+    await test_session.commit()
+    return household
+
+
+async def get_item(session, household_id, name):
+    result = await session.execute(
+        select(PantryItem).where(PantryItem.household_id == household_id, PantryItem.name == name)
+    )
+    return result.scalar_one_or_none()
+
+
+class TestVoiceCommandExecutor:
+    """Test executing parsed commands and undoing them."""
+
+    @pytest.mark.asyncio
+    async def test_add_creates_items(self, test_session, household):
+        """Test an add command creates every entity in one go."""
+        executor = VoiceCommandExecutor()
+        user_id = household.admin_user_id
+
+        execution = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.ADD,
+            ParsedEntity(name="chicken", quantity=2, unit="pound", expiration_date=date(2030, 1, 1)),
+            ParsedEntity(name="bread"),
+        ))
+
+        assert execution.applied
+        assert [(item.name, item.operation) for item in execution.items] == [
+            ("chicken", "created"), ("bread", "created")
+        ]
+        chicken = await get_item(test_session, household.id, "chicken")
+        assert chicken.quantity == 2 and chicken.unit == "pound"
+        assert execution.undo_token
+
+    @pytest.mark.asyncio
+    async def test_add_tops_up_existing_item(self, test_session, household):
+        """Test adding an item the pantry holds increments it instead of duplicating it."""
+        executor = VoiceCommandExecutor()
+        user_id = household.admin_user_id
+
+        first = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.ADD, ParsedEntity(name="bread")
+        ))
+        second = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.ADD, ParsedEntity(name="bread"), ParsedEntity(name="milk", quantity=2, unit="quart")
+        ))
+
+        assert [item.operation for item in first.items] == ["created"]
+        assert [(item.name, item.operation) for item in second.items] == [
+            ("bread", "updated"), ("Whole Milk", "updated")
+        ]
+        rows = await test_session.execute(
+            select(PantryItem).where(PantryItem.household_id == household.id, PantryItem.name == "bread")
+        )
+        assert [item.quantity for item in rows.scalars()] == [2]
+        assert (await get_item(test_session, household.id, "Whole Milk")).quantity == pytest.approx(1.5, rel=1e-3)
+
+        assert await executor.undo(test_session, user_id, second.undo_token)
+        assert (await get_item(test_session, household.id, "bread")).quantity == 1
+        assert (await get_item(test_session, household.id, "Whole Milk")).quantity == 1
+
+    @pytest.mark.asyncio
+    async def test_add_in_incompatible_unit_creates_item(self, test_session, household):
+        """Test an amount that cannot be added to the matched item gets its own item."""
+        executor = VoiceCommandExecutor()
+
+        execution = await executor.execute(test_session, household.admin_user_id, household.id, command(
+            PantryAction.ADD, ParsedEntity(name="eggs", quantity=500, unit="gram")
+        ))
+
+        assert [item.operation for item in execution.items] == ["created"]
+        assert (await get_item(test_session, household.id, "Eggs")).quantity == 12
+
+    @pytest.mark.asyncio
+    async def test_use_converts_units(self, test_session, household):
+        """Test a spoken amount is converted to the item's unit."""
+        executor = VoiceCommandExecutor()
+
+        execution = await executor.execute(test_session, household.admin_user_id, household.id, command(
+            PantryAction.USE, ParsedEntity(name="milk", quantity=2, unit="quart")
+        ))
+
+        assert execution.items[0].name == "Whole Milk"
+        assert execution.items[0].quantity == pytest.approx(0.5, rel=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_unresolved_names_are_reported(self, test_session, household):
+        """Test entities without a matching item are skipped and reported."""
+        executor = VoiceCommandExecutor()
+
+        execution = await executor.execute(test_session, household.admin_user_id, household.id, command(
+            PantryAction.DELETE, ParsedEntity(name="zucchini"), ParsedEntity(name="eggs")
+        ))
+
+        assert execution.unresolved == ["zucchini"]
+        assert [item.operation for item in execution.items] == ["deleted"]
+        assert await get_item(test_session, household.id, "Eggs") is None
+
+    @pytest.mark.asyncio
+    async def test_undo_restores_pantry(self, test_session, household):
+        """Test undo reverses deletes and adjustments, once, for the same user."""
+        executor = VoiceCommandExecutor()
+        user_id = household.admin_user_id
+
+        deleted = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.DELETE, ParsedEntity(name="eggs")
+        ))
+        used = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.USE, ParsedEntity(name="milk", quantity=1, unit="gallon")
+        ))
+
+        assert await executor.undo(test_session, uuid.uuid4(), used.undo_token) is None
+        assert await executor.undo(test_session, user_id, used.undo_token)
+        assert await executor.undo(test_session, user_id, used.undo_token) is None
+        assert await executor.undo(test_session, user_id, deleted.undo_token)
+
+        assert (await get_item(test_session, household.id, "Whole Milk")).quantity == 1
+        assert (await get_item(test_session, household.id, "Eggs")).quantity == 12
+
+    @pytest.mark.asyncio
+    async def test_expired_undo_token(self, test_session, household):
+        """Test undo tokens stop working after their TTL."""
+        executor = VoiceCommandExecutor(undo_ttl_seconds=0)
+
+        execution = await executor.execute(test_session, household.admin_user_id, household.id, command(
+            PantryAction.INCREMENT, ParsedEntity(name="eggs", quantity=6)
+        ))
+
+        assert await executor.undo(test_session, household.admin_user_id, execution.undo_token) is None
+
+    @pytest.mark.asyncio
+    async def test_read_only_actions_do_not_write(self, test_session, household):
+        """Test check commands only report matching items."""
+        executor = VoiceCommandExecutor()
+
+        execution = await executor.execute(test_session, household.admin_user_id, household.id, command(
+            PantryAction.CHECK, ParsedEntity(name="milk")
+        ))
+
+        assert not execution.applied
+        assert execution.undo_token is None
+        assert execution.items[0].operation == "matched"
+
+    @pytest.mark.asyncio
+    async def test_undo_redeemable_by_any_executor(self, test_session, household):
+        """Test undo records live in the database, not in the executing process."""
+        execution = await VoiceCommandExecutor().execute(
+            test_session, household.admin_user_id, household.id,
+            command(PantryAction.DELETE, ParsedEntity(name="eggs"))
+        )
+
+        restored = await VoiceCommandExecutor().undo(test_session, household.admin_user_id, execution.undo_token)
+
+        assert [(item.name, item.operation) for item in restored] == [("Eggs", "created")]
+        assert (await get_item(test_session, household.id, "Eggs")).quantity == 12
+
+    @pytest.mark.asyncio
+    async def test_undo_skips_items_changed_since(self, test_session, household):
+        """Test undo leaves created and updated items alone once someone else changed them."""
+        executor = VoiceCommandExecutor()
+        user_id = household.admin_user_id
+
+        added = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.ADD, ParsedEntity(name="bread")
+        ))
+        used = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.USE, ParsedEntity(name="eggs", quantity=2)
+        ))
+        (await get_item(test_session, household.id, "bread")).quantity = 3
+        (await get_item(test_session, household.id, "Eggs")).quantity = 4
+        await test_session.commit()
+
+        assert await executor.undo(test_session, user_id, added.undo_token) == []
+        assert await executor.undo(test_session, user_id, used.undo_token) == []
+        assert (await get_item(test_session, household.id, "bread")).quantity == 3
+        assert (await get_item(test_session, household.id, "Eggs")).quantity == 4
+
+    @pytest.mark.asyncio
+    async def test_same_item_named_twice_deleted_once(self, test_session, household):
+        """Test an item resolved by two names is deleted and restored once."""
+        executor = VoiceCommandExecutor()
+        user_id = household.admin_user_id
+
+        execution = await executor.execute(test_session, user_id, household.id, command(
+            PantryAction.DELETE, ParsedEntity(name="eggs"), ParsedEntity(name="egg")
+        ))
+        restored = await executor.undo(test_session, user_id, execution.undo_token)
+
+        assert [item.operation for item in execution.items] == ["deleted"]
+        assert len(restored) == 1
+        assert (await get_item(test_session, household.id, "Eggs")).quantity == 12
+
+    @pytest.mark.asyncio
+    async def test_changes_published_after_commit(self, test_session, household, monkeypatch):
+        """Test executed and undone changes reach the household's subscribers."""
+        hub = NotificationHub()
+        monkeypatch.setattr(executor_module, "notification_hub", hub)
+        subscription = hub.subscribe(household.id)
+        executor = VoiceCommandExecutor()
+
+        execution = await executor.execute(test_session, household.admin_user_id, household.id, command(
+            PantryAction.ADD, ParsedEntity(name="bread")
+        ))
+        created = await subscription.get(timeout=0.1)
+        await executor.undo(test_session, household.admin_user_id, execution.undo_token)
+        undone = await subscription.get(timeout=0.1)
+
+        assert created.type == PANTRY_ITEM_CHANGED
+        assert created.data == {"item_id": str(execution.items[0].item_id), "change": "created"}
+        assert undone.data == {"item_id": str(execution.items[0].item_id), "change": "deleted"}